@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Measure the startup cost of the jcompile-dispatch command line.
+
+Every measurement runs in a fresh interpreter:
+
+- ``import``: cumulative import time of ``jdevtools.jcompile_dispatch`` as
+  reported by ``python -X importtime``
+- ``--version``, ``--help`` and ``no-op``: wall time of ``main()`` called
+  the way the console script calls it, minus the wall time of a bare
+  ``python -c pass``. ``no-op`` is the default run in a project whose POM was
+  generated by the same command before, the common case in hooks and CI.
+
+Medians over ``--runs`` runs are compared with the budgets. The exit status is
+1 when one is exceeded. Bytecode is compiled up front, as it is for an
+installed package, so the first run does not pay for compilation.
+
+Usage:
+    python3 benchmarks/bench_cli_startup.py [--runs N] [--json]
+    python3 benchmarks/bench_cli_startup.py --import-budget-ms 5 --version-budget-ms 10 \
+        --noop-budget-ms 10
+"""
+
+import argparse
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODULE = "jdevtools.jcompile_dispatch"
+# What the generated console script does
+ENTRY_POINT = "import sys; from %s import main; sys.exit(main())" % MODULE
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    return env
+
+
+def import_ms():
+    """Return the cumulative import time of the CLI module in milliseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + MODULE],
+                            cwd=ROOT, env=_env(), stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == MODULE:
+            return int(fields[1]) / 1000.0
+    raise RuntimeError("No import time reported for %s" % MODULE)
+
+
+def wall_ms(args, cwd=ROOT):
+    """Return the wall time of one interpreter run in milliseconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=cwd, env=_env(),
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    """Main entry point for the startup benchmark."""
+    parser = argparse.ArgumentParser(description="jcompile-dispatch startup benchmark")
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Fresh interpreter runs per measurement (default: 10)')
+    parser.add_argument('--import-budget-ms', type=float, default=5.0,
+                        help='Budget for importing the CLI module (default: 5)')
+    parser.add_argument('--version-budget-ms', type=float, default=10.0,
+                        help='Budget for --version over a bare interpreter (default: 10)')
+    parser.add_argument('--help-budget-ms', type=float, default=50.0,
+                        help='Budget for --help over a bare interpreter (default: 50)')
+    parser.add_argument('--noop-budget-ms', type=float, default=10.0,
+                        help='Budget for a repeated run with nothing to do over a bare '
+                             'interpreter (default: 10)')
+    parser.add_argument('--json', action='store_true',
+                        help='Print machine-readable results')
+    args = parser.parse_args()
+
+    compileall.compile_dir(os.path.join(ROOT, "jdevtools"), quiet=1)
+
+    command = ["-c", ENTRY_POINT]
+    samples = {"import": [], "--version": [], "--help": [], "no-op": []}
+    with tempfile.TemporaryDirectory() as project_dir:
+        # The first run generates the POM; every measured run finds it up to date
+        wall_ms(command, cwd=project_dir)
+        for _ in range(args.runs):
+            baseline = wall_ms(["-c", "pass"])
+            samples["import"].append(import_ms())
+            samples["--version"].append(wall_ms(command + ["--version"]) - baseline)
+            samples["--help"].append(wall_ms(command + ["--help"]) - baseline)
+            samples["no-op"].append(wall_ms(command, cwd=project_dir) - baseline)
+
+    budgets = {"import": args.import_budget_ms, "--version": args.version_budget_ms,
+               "--help": args.help_budget_ms, "no-op": args.noop_budget_ms}
+    results = [{
+        "measurement": name,
+        "median_ms": round(statistics.median(values), 3),
+        "budget_ms": budgets[name],
+        "within_budget": statistics.median(values) <= budgets[name],
+    } for name, values in samples.items()]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("%-12s %10s %10s" % ("measurement", "median ms", "budget ms"))
+        for result in results:
+            print("%-12s %10.2f %10.2f%s" % (
+                result["measurement"], result["median_ms"], result["budget_ms"],
+                "" if result["within_budget"] else "  OVER BUDGET"))
+    return 0 if all(result["within_budget"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark PomGenerator on synthetic existing POMs of realistic size.
+
+Each existing POM has N properties, N dependencies and N build plugins. Two
+phases are measured separately:
+
+- ``merge``: ``_merge_with_existing()`` on a freshly built tree, which
+  includes parsing the existing POM
+- ``generate``: a full uncached ``generate()``, i.e. tree building, merging
+  and streaming the result to disk
+
+Times are the best of ``--repeat`` runs. Peak memory is measured with
+tracemalloc in a separate run, so tracing does not distort the times.
+
+Results can be saved as a baseline and later runs compared against it; the
+committed baseline is ``benchmarks/pom-bench-baseline.json``. The exit status
+is 1 when a phase is slower or uses more memory than the baseline allows.
+
+Usage:
+    python3 benchmarks/bench_pom_generator.py [--sizes N ...] [--json]
+    python3 benchmarks/bench_pom_generator.py --save-baseline benchmarks/pom-bench-baseline.json
+    python3 benchmarks/bench_pom_generator.py --baseline benchmarks/pom-bench-baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.pom_generator import PomGenerator
+from jdevtools.pom_writer import POM_NAMESPACE, write_pom
+
+PHASES = ("merge", "generate")
+
+
+def build_existing(size):
+    """Build an existing POM with ``size`` properties, dependencies and plugins."""
+    ns = POM_NAMESPACE
+
+    def sub(parent, tag, text=None):
+        elem = ET.SubElement(parent, "{%s}%s" % (ns, tag))
+        elem.text = text
+        return elem
+
+    root = ET.Element("{%s}project" % ns)
+    sub(root, "modelVersion", "4.0.0")
+    sub(root, "groupId", "org.example")
+    sub(root, "artifactId", "bench")
+    sub(root, "version", "1.0.0")
+
+    props = sub(root, "properties")
+    # Overlaps with generated properties exercise the conflict path
+    sub(props, "maven.compiler.source", "21")
+    for i in range(size):
+        sub(props, "example.property%d" % i, "value-%d" % i)
+
+    deps = sub(root, "dependencies")
+    for i in range(size):
+        dep = sub(deps, "dependency")
+        sub(dep, "groupId", "org.example.group%d" % (i % 97))
+        sub(dep, "artifactId", "artifact-%d" % i)
+        sub(dep, "version", "1.%d.0" % (i % 13))
+        if i % 5 == 0:
+            sub(dep, "scope", "test")
+
+    plugins = sub(sub(root, "build"), "plugins")
+    for i in range(size):
+        plugin = sub(plugins, "plugin")
+        sub(plugin, "groupId", "org.example.plugins")
+        sub(plugin, "artifactId", "plugin-%d" % i)
+        sub(plugin, "version", "2.%d" % (i % 7))
+        sub(sub(plugin, "configuration"), "skip", "false")
+    native = sub(plugins, "plugin")
+    sub(native, "groupId", "org.graalvm.buildtools")
+    sub(native, "artifactId", "native-maven-plugin")
+    sub(native, "version", "0.9.20")
+    return root
+
+
+def _merge(existing_path, output_path):
+    fresh = PomGenerator(use_cache=False, quiet=True)._build_tree()
+    generator = PomGenerator(existing_pom=existing_path, use_cache=False, quiet=True,
+                             strict=True)
+    return lambda: generator._merge_with_existing(fresh)
+
+
+def _generate(existing_path, output_path):
+    generator = PomGenerator(existing_pom=existing_path, use_cache=False, quiet=True,
+                             strict=True)
+    return lambda: generator.generate(output_path)
+
+
+SETUPS = {"merge": _merge, "generate": _generate}
+
+
+def measure(size, phase, repeat):
+    """
+    Measure one phase at one size.
+
+    Returns:
+        Result dict with best time, all run times and traced peak memory
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        existing_path = os.path.join(tmpdir, "existing.xml")
+        output_path = os.path.join(tmpdir, "pom.xml")
+        with open(existing_path, "w", encoding="utf-8", newline="\n") as f:
+            write_pom(build_existing(size), f)
+
+        runs = []
+        for _ in range(repeat):
+            operation = SETUPS[phase](existing_path, output_path)
+            start = time.perf_counter()
+            operation()
+            runs.append(time.perf_counter() - start)
+
+        operation = SETUPS[phase](existing_path, output_path)
+        tracemalloc.start()
+        try:
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "size": size,
+            "phase": phase,
+            "seconds": min(runs),
+            "runs": runs,
+            "peak_kb": peak // 1024,
+            "existing_bytes": os.path.getsize(existing_path),
+        }
+
+
+def compare(results, baseline, max_slowdown, max_memory_growth, min_seconds):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Result dicts of this run
+        baseline: Baseline document as written by ``--save-baseline``
+        max_slowdown: Allowed relative time increase, e.g. 0.25
+        max_memory_growth: Allowed relative peak memory increase
+        min_seconds: Absolute slack for times, so tiny sizes are not flagged
+            for timer noise
+
+    Returns:
+        List of regression descriptions
+    """
+    previous = {(r["size"], r["phase"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        base = previous.get((result["size"], result["phase"]))
+        if base is None:
+            continue
+        allowed = base["seconds"] * (1 + max_slowdown) + min_seconds
+        if result["seconds"] > allowed:
+            regressions.append("%s at %d: %.3fs vs %.3fs baseline (+%.0f%%)" % (
+                result["phase"], result["size"], result["seconds"], base["seconds"],
+                100.0 * (result["seconds"] / base["seconds"] - 1) if base["seconds"] else 0))
+        if result["peak_kb"] > base["peak_kb"] * (1 + max_memory_growth) + 64:
+            regressions.append("%s at %d: %d KB peak vs %d KB baseline" % (
+                result["phase"], result["size"], result["peak_kb"], base["peak_kb"]))
+    return regressions
+
+
+def main():
+    """Main entry point for the generator benchmark."""
+    parser = argparse.ArgumentParser(description="PomGenerator benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 1000, 10000, 50000],
+                        help='Properties, dependencies and plugins per existing POM')
+    parser.add_argument('--phases', nargs='+', choices=PHASES, default=list(PHASES),
+                        help='Phases to measure (default: all)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per measurement, the best is kept (default: 3)')
+    parser.add_argument('--json', action='store_true',
+                        help='Print machine-readable results')
+    parser.add_argument('--save-baseline', metavar='FILE',
+                        help='Write the results as a baseline')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='Compare against a baseline and fail on regressions')
+    parser.add_argument('--max-slowdown', type=float, default=0.25,
+                        help='Allowed time increase over the baseline (default: 0.25)')
+    parser.add_argument('--max-memory-growth', type=float, default=0.10,
+                        help='Allowed peak memory increase over the baseline (default: 0.10)')
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help='Absolute time slack per measurement (default: 0.005)')
+    args = parser.parse_args()
+
+    results = [measure(size, phase, args.repeat)
+               for size in args.sizes for phase in args.phases]
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_slowdown,
+                              args.max_memory_growth, args.min_seconds)
+        document["regressions"] = regressions
+
+    if args.json:
+        print(json.dumps(document, indent=2))
+    else:
+        print("%-8s %-10s %10s %12s %14s" % ("size", "phase", "seconds", "peak KB", "existing KB"))
+        for result in results:
+            print("%-8d %-10s %10.3f %12d %14d" % (
+                result["size"], result["phase"], result["seconds"],
+                result["peak_kb"], result["existing_bytes"] // 1024))
+        for regression in regressions:
+            print("REGRESSION: %s" % regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
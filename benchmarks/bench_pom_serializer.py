@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Compare the legacy tostring/minidom pipeline with the streaming POM writer.
+
+Each measurement runs in a fresh interpreter so the peak RSS reported by
+``getrusage`` belongs to a single serializer.
+
+Usage:
+    python3 benchmarks/bench_pom_serializer.py [--dependencies N ...] [--json]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.pom_writer import POM_NAMESPACE, write_pom
+
+
+def build_tree(dependency_count):
+    """Build a POM tree with the given number of dependencies."""
+    ns = POM_NAMESPACE
+    root = ET.Element("{%s}project" % ns)
+    ET.SubElement(root, "{%s}modelVersion" % ns).text = "4.0.0"
+    deps = ET.SubElement(root, "{%s}dependencies" % ns)
+    for i in range(dependency_count):
+        dep = ET.SubElement(deps, "{%s}dependency" % ns)
+        ET.SubElement(dep, "{%s}groupId" % ns).text = "org.example.group%d" % (i % 97)
+        ET.SubElement(dep, "{%s}artifactId" % ns).text = "artifact-%d" % i
+        ET.SubElement(dep, "{%s}version" % ns).text = "1.%d.0" % (i % 13)
+        ET.SubElement(dep, "{%s}scope" % ns).text = "compile"
+    return root
+
+
+def serialize_legacy(root, output_path):
+    """Serialize the way PomGenerator.generate() used to."""
+    from xml.dom import minidom
+
+    ET.register_namespace('', POM_NAMESPACE)
+    xml_str = ET.tostring(root, encoding='unicode')
+    dom = minidom.parseString(xml_str)
+    pretty_xml = dom.toprettyxml(indent="  ")
+    lines = [line for line in pretty_xml.split('\n') if line.strip()]
+    pretty_xml = '\n'.join(lines)
+    with open(output_path, 'w') as f:
+        f.write(pretty_xml)
+
+
+def serialize_streaming(root, output_path):
+    """Serialize with the streaming writer."""
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+        write_pom(root, f)
+
+
+def run_child(mode, dependency_count):
+    """Measure one serializer in this process and print a JSON result."""
+    root = build_tree(dependency_count)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    serializer = serialize_legacy if mode == "legacy" else serialize_streaming
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "pom.xml")
+        start = time.perf_counter()
+        serializer(root, output_path)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(output_path)
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "mode": mode,
+        "dependencies": dependency_count,
+        "seconds": elapsed,
+        "rss_growth_kb": max(peak_rss - baseline_rss, 0),
+        "bytes": size,
+    }))
+
+
+def measure(mode, dependency_count):
+    """Run one measurement in a fresh interpreter."""
+    output = subprocess.check_output([
+        sys.executable, __file__, "--child", mode,
+        "--dependencies", str(dependency_count),
+    ])
+    return json.loads(output)
+
+
+def main():
+    """Main entry point for the serializer benchmark."""
+    parser = argparse.ArgumentParser(description="POM serializer benchmark")
+    parser.add_argument('--dependencies', type=int, nargs='+',
+                        default=[1000, 10000, 50000],
+                        help='Dependency counts to benchmark')
+    parser.add_argument('--json', action='store_true',
+                        help='Print machine-readable results')
+    parser.add_argument('--child', choices=['legacy', 'streaming'],
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.dependencies[0])
+        return 0
+
+    results = []
+    for count in args.dependencies:
+        for mode in ("legacy", "streaming"):
+            results.append(measure(mode, count))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print("%-12s %-10s %10s %14s" % ("deps", "mode", "seconds", "RSS growth KB"))
+    for result in results:
+        print("%-12d %-10s %10.3f %14d" % (
+            result["dependencies"], result["mode"],
+            result["seconds"], result["rss_growth_kb"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
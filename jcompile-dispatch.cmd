@@ -6,55 +6,35 @@ setlocal enabledelayedexpansion
 
 set "SCRIPT_DIR=%~dp0"
 
-REM Default behavior: clean and compile
-set "MAVEN_GOALS=clean compile"
-set "MAVEN_OPTS=-T 1C"
-
-:parse_args
-if "%~1"=="" goto end_parse
-if /i "%~1"=="--parallel" (
-    if not "%~2"=="" (
-        set "MAVEN_OPTS=-T %~2"
-        shift
-    )
-    shift
-    goto parse_args
-)
-if /i "%~1"=="--goals" (
-    set "MAVEN_GOALS=%~2"
-    shift
-    shift
-    goto parse_args
-)
-if /i "%~1"=="--threads" (
-    set "MAVEN_OPTS=-T %~2"
-    shift
-    shift
-    goto parse_args
-)
+REM Scheduling (parallelism, memory budgets, module order) is done by the
+REM Python dispatch engine; --parallel/--threads map to its worker count.
 if /i "%~1"=="-h" goto show_help
 if /i "%~1"=="--help" goto show_help
-
-echo Unknown option: %~1
-exit /b 1
+goto run
 
 :show_help
 echo Usage: jcompile-dispatch [OPTIONS]
 echo.
 echo Options:
-echo   --parallel [N]    Use parallel compilation (default: 1 thread per core)
-echo   --threads N       Use exactly N threads for compilation
-echo   --goals GOALS     Custom Maven goals (default: clean compile)
-echo   -h, --help        Display this help message
+echo   --parallel [N]        Concurrent module builds (default: 1 per core)
+echo   --threads N           Use exactly N concurrent module builds
+echo   --goals GOALS         Custom Maven goals, with install when modules depend
+echo                         on each other (default: clean install -DskipTests,
+echo                         without clean when the build cache is enabled)
+echo   --memory SIZE         Total memory budget (default: available memory)
+echo   --goal-memory G=SIZE  Memory budget per goal, e.g. native:compile=6g
+echo   --fail-at-end         Keep building modules unaffected by a failure
+echo   --profile             Record module and mojo timings in .jdevtools/
+echo   -h, --help            Display this help message
 exit /b 0
 
-:end_parse
+:run
 
-echo [jcompile-dispatch] Starting dispatch compilation with %MAVEN_OPTS%
-echo [jcompile-dispatch] Maven goals: %MAVEN_GOALS%
+echo [jcompile-dispatch] Starting dispatch compilation
 
-REM Execute Maven with parallel compilation
-call "%SCRIPT_DIR%mvnw.cmd" %MAVEN_OPTS% %MAVEN_GOALS%
+REM Execute the dispatch engine against the Maven wrapper
+set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+python -m jdevtools.dispatch --mvn "%SCRIPT_DIR%mvnw.cmd" %*
 
 if %ERRORLEVEL% equ 0 (
     echo [jcompile-dispatch] Dispatch compilation completed successfully!
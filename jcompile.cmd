@@ -9,6 +9,9 @@ set "SCRIPT_DIR=%~dp0"
 REM Default Maven goals
 set "MAVEN_GOALS=compile"
 set "MAVEN_OPTS="
+set "NETWORK_MODE="
+set "WATCH="
+set "WATCH_MODULE=%CD%"
 
 :parse_args
 if "%~1"=="" goto end_parse
@@ -23,10 +26,27 @@ if /i "%~1"=="--skip-tests" (
     goto parse_args
 )
 if /i "%~1"=="--offline" (
+    set "NETWORK_MODE=offline"
     set "MAVEN_OPTS=%MAVEN_OPTS% -o"
     shift
     goto parse_args
 )
+if /i "%~1"=="--online" (
+    set "NETWORK_MODE=online"
+    shift
+    goto parse_args
+)
+if /i "%~1"=="--watch" (
+    set "WATCH=1"
+    shift
+    goto parse_args
+)
+if /i "%~1"=="--module" (
+    set "WATCH_MODULE=%~2"
+    shift
+    shift
+    goto parse_args
+)
 if /i "%~1"=="--debug" (
     set "MAVEN_OPTS=%MAVEN_OPTS% -X"
     shift
@@ -52,6 +72,9 @@ echo Options:
 echo   --clean           Clean before compiling
 echo   --skip-tests      Skip test compilation
 echo   --offline         Work offline
+echo   --online          Never switch to offline mode automatically
+echo   --watch           Recompile changed sources and their dependents on every change
+echo   --module DIR      Module watched by --watch (default: current directory)
 echo   --debug           Enable debug output
 echo   --quiet           Quiet output
 echo   -h, --help        Display this help message
@@ -59,6 +82,28 @@ exit /b 0
 
 :end_parse
 
+REM Watch mode builds once with Maven, including the test classpath
+if defined WATCH set "MAVEN_GOALS=!MAVEN_GOALS:compile=test-compile dependency:build-classpath!"
+
+REM Work offline when everything the build needs is in the local repository
+if not defined NETWORK_MODE (
+    set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+    python -m jdevtools.offline --project "%SCRIPT_DIR%." check --goals="%MAVEN_GOALS% %MAVEN_OPTS%" > "%TEMP%\jdevtools-offline.txt" 2>nul
+    if !ERRORLEVEL! equ 0 (
+        set /p OFFLINE_STATUS=<"%TEMP%\jdevtools-offline.txt"
+        set "MAVEN_OPTS=!MAVEN_OPTS! -o"
+        echo [jcompile] !OFFLINE_STATUS!, working offline
+    )
+    del "%TEMP%\jdevtools-offline.txt" 2>nul
+)
+
+if defined WATCH (
+    echo [jcompile] Starting watch mode...
+    set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+    python -m jdevtools.watch --project "!WATCH_MODULE!" --mvn "%SCRIPT_DIR%mvnw.cmd" --goals "!MAVEN_GOALS!" --maven-args="!MAVEN_OPTS!"
+    exit /b !ERRORLEVEL!
+)
+
 echo [jcompile] Starting compilation...
 
 REM Execute Maven compilation
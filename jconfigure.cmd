@@ -46,6 +46,20 @@ if %ERRORLEVEL% equ 0 (
 )
 goto :eof
 
+REM Function to write startup-tuned Maven JVM settings and the CDS archive
+:tune_maven_jvm
+echo [jconfigure] Tuning Maven JVM startup...
+set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+python -m jdevtools.jvmconfig --project "%SCRIPT_DIR%." --mvn "%SCRIPT_DIR%mvnw.cmd" %2 %3 %4 %5
+exit /b %ERRORLEVEL%
+
+REM Function to refresh the local repository index and report offline readiness
+:index_repository
+echo [jconfigure] Indexing the local Maven repository...
+set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+python -m jdevtools.offline --project "%SCRIPT_DIR%." %2 %3 index
+exit /b %ERRORLEVEL%
+
 REM Function to show configuration
 :show_config
 echo.
@@ -63,6 +77,9 @@ if exist "%SCRIPT_DIR%pom.xml" (
 ) else (
     echo [jconfigure] WARNING: No pom.xml found in current directory
 )
+REM Build cache status and hit rate of the last dispatched build
+set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+python -m jdevtools.build_cache --project "%SCRIPT_DIR%." 2>nul
 echo.
 goto :eof
 
@@ -86,6 +103,15 @@ if /i "%COMMAND%"=="check" (
 ) else if /i "%COMMAND%"=="test" (
     echo [jconfigure] Testing Maven wrapper...
     call :test_maven_wrapper
+) else if /i "%COMMAND%"=="tune" (
+    call :check_maven_wrapper
+    if %ERRORLEVEL% neq 0 exit /b 1
+    call :tune_maven_jvm %*
+    if %ERRORLEVEL% neq 0 exit /b 1
+    echo [jconfigure] Maven JVM tuning completed!
+) else if /i "%COMMAND%"=="index" (
+    call :index_repository %*
+    if %ERRORLEVEL% neq 0 exit /b 1
 ) else if /i "%COMMAND%"=="show" (
     call :show_config
 ) else if /i "%COMMAND%"=="info" (
@@ -110,6 +136,12 @@ echo.
 echo Commands:
 echo   check       Check and verify configuration
 echo   test        Test Maven wrapper
+echo   tune        Write .mvn/jvm.config and .mvn/maven.config, refresh the
+echo               AppCDS archive and report the cold-start improvement
+echo               (options: --force, --runs N, --no-measure)
+echo   index       Refresh the index of the local Maven repository and report
+echo               whether jcompile and jtest can work offline
+echo               (options: --repository DIR)
 echo   show        Show current configuration
 echo   help        Display this help message
 echo.
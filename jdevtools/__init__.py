@@ -1,3 +1,6 @@
 """JDevtools - Curated Dev tools for creating native apps in Core Java and Java."""
 
 __version__ = "0.1.0"
+
+# Per-project state directory (caches, indexes, logs), relative to the project root
+STATE_DIR = ".jdevtools"
@@ -0,0 +1,260 @@
+"""
+Local Maven build cache support.
+
+Writes ``.mvn/extensions.xml`` and ``.mvn/maven-build-cache-config.xml`` so
+the maven-build-cache-extension restores the outputs of modules whose inputs
+are unchanged from a file-based cache directory, and collects the cache hit
+rate of dispatched builds from Maven's output.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+import xml.etree.ElementTree as ET
+
+from jdevtools.pom_cache import write_if_changed
+from jdevtools.pom_merge import local_name
+from jdevtools.pom_writer import write_pom
+
+EXTENSION_GROUP = "org.apache.maven.extensions"
+EXTENSION_ARTIFACT = "maven-build-cache-extension"
+EXTENSION_VERSION = "1.2.0"
+
+EXTENSIONS_NAMESPACE = "http://maven.apache.org/EXTENSIONS/1.1.0"
+CONFIG_NAMESPACE = "http://maven.apache.org/BUILD-CACHE-CONFIG/1.0.0"
+CONFIG_NAME = "maven-build-cache-config.xml"
+
+STATS_FILE = "build-cache-stats.json"
+
+# Messages logged by the extension for each project
+HIT_MARKER = "Found cached build, restoring"
+MISS_MARKERS = (
+    "Local build was not found by checksum",
+    "continuing with non cached build",
+)
+
+
+def _load_plain(path, root_tag, namespace):
+    """
+    Parse an XML file with namespaces stripped, or create an empty root.
+
+    The default namespace is kept as a plain ``xmlns`` attribute so the
+    document is written back without generated prefixes.
+    """
+    if os.path.isfile(path):
+        root = ET.parse(path).getroot()
+        for elem in root.iter():
+            if isinstance(elem.tag, str):
+                elem.tag = local_name(elem.tag)
+    else:
+        root = ET.Element(root_tag)
+    root.set("xmlns", namespace)
+    return root
+
+
+def _child(parent, name, create=True):
+    for child in parent:
+        if isinstance(child.tag, str) and child.tag == name:
+            return child
+    if not create:
+        return None
+    return ET.SubElement(parent, name)
+
+
+def _set_text(parent, name, value):
+    _child(parent, name).text = value
+
+
+def extensions_root(path):
+    """
+    Return ``extensions.xml`` with the build-cache extension registered.
+
+    Other extensions are kept; an existing build-cache entry is updated to
+    the supported version.
+    """
+    root = _load_plain(path, "extensions", EXTENSIONS_NAMESPACE)
+    for extension in root:
+        if extension.tag != "extension":
+            continue
+        group = _child(extension, "groupId", create=False)
+        artifact = _child(extension, "artifactId", create=False)
+        if group is not None and artifact is not None and \
+                (group.text or "").strip() == EXTENSION_GROUP and \
+                (artifact.text or "").strip() == EXTENSION_ARTIFACT:
+            _set_text(extension, "version", EXTENSION_VERSION)
+            return root
+
+    extension = ET.SubElement(root, "extension")
+    _set_text(extension, "groupId", EXTENSION_GROUP)
+    _set_text(extension, "artifactId", EXTENSION_ARTIFACT)
+    _set_text(extension, "version", EXTENSION_VERSION)
+    return root
+
+
+def config_root(path, cache_dir=None):
+    """
+    Return the build-cache configuration, pointing at ``cache_dir`` if given.
+
+    Settings already present in an existing configuration are kept; only
+    the enabled flag and an explicitly passed cache location are enforced.
+    Without a location the extension caches next to the local repository,
+    in ``~/.m2/build-cache`` by default.
+    """
+    root = _load_plain(path, "cache", CONFIG_NAMESPACE)
+    configuration = _child(root, "configuration")
+    _set_text(configuration, "enabled", "true")
+    if _child(configuration, "hashAlgorithm", create=False) is None:
+        _set_text(configuration, "hashAlgorithm", "XX")
+    local = _child(configuration, "local")
+    if cache_dir:
+        _set_text(local, "location", cache_dir)
+    if _child(local, "maxBuildsCached", create=False) is None:
+        _set_text(local, "maxBuildsCached", "3")
+
+    if _child(root, "input", create=False) is None:
+        glob = ET.SubElement(ET.SubElement(ET.SubElement(root, "input"), "global"), "glob")
+        glob.text = "{*.java,*.xml,*.properties,*.yaml,*.yml}"
+    return root
+
+
+def write_build_cache_config(project_dir, cache_dir=None):
+    """
+    Enable the local build cache for a project.
+
+    Args:
+        project_dir: Project directory receiving ``.mvn/``
+        cache_dir: Cache directory. The configuration is usually committed,
+            so without one no machine-specific path is written and the
+            extension default (~/.m2/build-cache) applies.
+
+    Returns:
+        List of files that changed
+    """
+    mvn_dir = os.path.join(project_dir, ".mvn")
+    os.makedirs(mvn_dir, exist_ok=True)
+    if cache_dir:
+        cache_dir = os.path.abspath(cache_dir)
+
+    changed = []
+    for path, root in (
+            (os.path.join(mvn_dir, "extensions.xml"),
+             extensions_root(os.path.join(mvn_dir, "extensions.xml"))),
+            (os.path.join(mvn_dir, CONFIG_NAME),
+             config_root(os.path.join(mvn_dir, CONFIG_NAME), cache_dir))):
+        if write_if_changed(path, lambda stream, root=root: write_pom(root, stream))[0]:
+            changed.append(path)
+    return changed
+
+
+def build_cache_enabled(project_dir):
+    """Check whether a project builds with the build-cache extension enabled."""
+    mvn_dir = os.path.join(project_dir, ".mvn")
+    try:
+        extensions = ET.parse(os.path.join(mvn_dir, "extensions.xml")).getroot()
+    except (OSError, ET.ParseError):
+        return False
+    registered = any(
+        isinstance(elem.tag, str) and local_name(elem.tag) == "artifactId" and
+        (elem.text or "").strip() == EXTENSION_ARTIFACT
+        for elem in extensions.iter())
+    if not registered:
+        return False
+
+    try:
+        config = ET.parse(os.path.join(mvn_dir, CONFIG_NAME)).getroot()
+    except (OSError, ET.ParseError):
+        # The extension is enabled by default without a configuration
+        return True
+    for elem in config.iter():
+        if isinstance(elem.tag, str) and local_name(elem.tag) == "enabled":
+            return (elem.text or "").strip().lower() != "false"
+    return True
+
+
+class BuildCacheStats:
+    """Dispatcher line handler recording cache hits and misses per module."""
+
+    def __init__(self, state_dir):
+        """
+        Initialize the collector.
+
+        Args:
+            state_dir: Directory receiving ``build-cache-stats.json``
+        """
+        self.path = os.path.join(state_dir, STATS_FILE)
+        self.modules = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, task, line):
+        if HIT_MARKER in line:
+            outcome = "hit"
+        elif any(marker in line for marker in MISS_MARKERS):
+            outcome = "miss"
+        else:
+            return
+        with self._lock:
+            # A failed restore after a hit still rebuilds the module
+            if self.modules.get(task.module.id) != "miss":
+                self.modules[task.module.id] = outcome
+
+    def counts(self):
+        """Return ``(hits, misses)``."""
+        hits = sum(1 for outcome in self.modules.values() if outcome == "hit")
+        return hits, len(self.modules) - hits
+
+    def save(self, goals=None):
+        """Write the statistics of this build, replacing the previous ones."""
+        hits, misses = self.counts()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({
+                "finished": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "goals": goals,
+                "hits": hits,
+                "misses": misses,
+                "modules": self.modules,
+            }, f, indent=2, sort_keys=True)
+
+
+def format_stats(state_dir):
+    """
+    Describe the cache hit rate of the last dispatched build.
+
+    Returns:
+        Summary line, or None if no statistics were recorded
+    """
+    try:
+        with open(os.path.join(state_dir, STATS_FILE), encoding="utf-8") as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return None
+    total = stats["hits"] + stats["misses"]
+    if not total:
+        return "Build cache: no cache lookups in the last build"
+    return "Build cache: %d/%d modules restored (%.0f%% hit rate) in the last build" % (
+        stats["hits"], total, 100.0 * stats["hits"] / total)
+
+
+def main(argv=None):
+    """Print the build cache status of a project."""
+    from jdevtools.dispatch import STATE_DIR
+
+    parser = argparse.ArgumentParser(description="Show the Maven build cache status")
+    parser.add_argument('--project', default='.',
+                        help='Project directory (default: current directory)')
+    args = parser.parse_args(argv)
+
+    project_dir = os.path.abspath(args.project)
+    if not build_cache_enabled(project_dir):
+        print("Build cache: disabled")
+        return 0
+    print(format_stats(os.path.join(project_dir, STATE_DIR)) or
+          "Build cache: enabled, no build recorded yet")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
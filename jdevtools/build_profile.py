@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Build timing profiler for dispatched Maven builds.
+
+Maven announces every mojo execution with a line such as::
+
+    [INFO] --- maven-compiler-plugin:3.11.0:compile (default-compile) @ core ---
+
+The profiler is a dispatcher line handler that timestamps these lines as the
+output streams in. A mojo runs until the next one starts or Maven reports the
+build result. The time before the first mojo is Maven startup and project model
+building. At the end of the build, the profile is written as a JSON summary
+and as a Chrome trace-event file, which can be opened in ``chrome://tracing``
+or Perfetto.
+
+Only lines containing ``---`` or ``BUILD`` are inspected further, so the
+profiler can stay enabled in CI.
+"""
+
+import datetime
+import json
+import os
+import re
+import threading
+import time
+
+PROFILE_FILE = "build-profile.json"
+TRACE_FILE = "build-trace.json"
+
+MOJO_RE = re.compile(
+    r"--- ([^\s:]+):([^\s:]+):([^\s:]+)(?: \(([^)]*)\))? @ (\S+) ---")
+RESULT_MARKERS = ("BUILD SUCCESS", "BUILD FAILURE")
+
+# Lifecycle phase of the default bindings, keyed by short plugin name and goal
+GOAL_PHASES = {
+    "clean:clean": "clean",
+    "resources:resources": "process-resources",
+    "compiler:compile": "compile",
+    "resources:testResources": "process-test-resources",
+    "compiler:testCompile": "test-compile",
+    "surefire:test": "test",
+    "jar:jar": "package",
+    "war:war": "package",
+    "native:compile": "package",
+    "native:compile-no-fork": "package",
+    "rpm:rpm": "package",
+    "jdeb:jdeb": "package",
+    "failsafe:integration-test": "integration-test",
+    "failsafe:verify": "verify",
+    "install:install": "install",
+    "deploy:deploy": "deploy",
+}
+
+
+def short_plugin_name(artifact_id):
+    """
+    Shorten a plugin artifact id the way Maven's plugin prefixes do.
+
+    ``maven-compiler-plugin`` becomes ``compiler`` and ``native-maven-plugin``
+    becomes ``native``.
+    """
+    name = artifact_id
+    if name.startswith("maven-"):
+        name = name[len("maven-"):]
+    for suffix in ("-maven-plugin", "-plugin"):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class Mojo:
+    """One mojo execution observed in a module's output."""
+
+    def __init__(self, plugin, version, goal, execution, started):
+        self.plugin = plugin
+        self.version = version
+        self.goal = goal
+        self.execution = execution
+        self.started = started
+        self.ended = None
+
+    @property
+    def name(self):
+        return "%s:%s" % (self.plugin, self.goal)
+
+    @property
+    def phase(self):
+        return GOAL_PHASES.get(self.name)
+
+
+class BuildProfiler:
+    """Dispatcher line handler attributing wall time to modules and mojos."""
+
+    def __init__(self, state_dir, clock=time.monotonic):
+        """
+        Initialize the profiler.
+
+        Args:
+            state_dir: Directory receiving the profile and trace files
+            clock: Monotonic clock, the same as the dispatcher's
+        """
+        self.state_dir = state_dir
+        self.clock = clock
+        self.mojos = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, task, line):
+        if "--- " in line:
+            match = MOJO_RE.search(line)
+            if not match:
+                return
+            now = self.clock()
+            plugin, version, goal, execution, _ = match.groups()
+            with self._lock:
+                mojos = self.mojos.setdefault(task.module.id, [])
+            if mojos:
+                mojos[-1].ended = now
+            mojos.append(Mojo(short_plugin_name(plugin), version, goal, execution, now))
+        elif "BUILD " in line and any(marker in line for marker in RESULT_MARKERS):
+            with self._lock:
+                mojos = self.mojos.get(task.module.id)
+            if mojos and mojos[-1].ended is None:
+                mojos[-1].ended = self.clock()
+
+    def _spans(self, task):
+        """Return ``(name, category, start, end, args)`` spans of a finished task."""
+        end = task.started + task.duration
+        mojos = self.mojos.get(task.module.id, [])
+        spans = []
+        if mojos:
+            spans.append(("maven startup", "startup", task.started, mojos[0].started, {}))
+        for mojo in mojos:
+            spans.append(("%s (%s)" % (mojo.name, mojo.execution) if mojo.execution else mojo.name,
+                          "mojo", mojo.started, min(mojo.ended or end, end),
+                          {"plugin": mojo.plugin, "version": mojo.version, "goal": mojo.goal,
+                           "execution": mojo.execution, "phase": mojo.phase}))
+        if mojos and mojos[-1].ended is not None and mojos[-1].ended < end:
+            spans.append(("maven shutdown", "shutdown", mojos[-1].ended, end, {}))
+        return spans
+
+    def summary(self, tasks, build_start, goals=None):
+        """
+        Summarize where the build spent its time.
+
+        Args:
+            tasks: Dict of module id -> Task after the build
+            build_start: Clock value when the build started
+            goals: Maven goals as a string
+
+        Returns:
+            JSON-serializable dict
+        """
+        finished = [t for t in tasks.values() if t.started is not None and t.duration is not None]
+        modules = {}
+        plugins = {}
+        phases = {}
+        for task in finished:
+            entry = {"status": task.status, "seconds": round(task.duration, 3),
+                     "start": round(task.started - build_start, 3), "mojos": []}
+            for name, category, start, end, args in self._spans(task):
+                seconds = max(end - start, 0.0)
+                if category == "mojo":
+                    entry["mojos"].append(dict(args, seconds=round(seconds, 3)))
+                    plugins[args["plugin"]] = plugins.get(args["plugin"], 0.0) + seconds
+                    phase = args["phase"] or "other"
+                    phases[phase] = phases.get(phase, 0.0) + seconds
+                else:
+                    entry[category + "_seconds"] = round(seconds, 3)
+            modules[task.module.id] = entry
+
+        end = max([t.started + t.duration for t in finished] or [build_start])
+        return {
+            "finished": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "goals": goals,
+            "wall_seconds": round(end - build_start, 3),
+            "modules": modules,
+            "plugins": {k: round(v, 3) for k, v in plugins.items()},
+            "phases": {k: round(v, 3) for k, v in phases.items()},
+        }
+
+    def trace(self, tasks, build_start):
+        """
+        Build Chrome trace events for the finished tasks.
+
+        Concurrent modules are placed on separate rows, one per worker slot.
+
+        Returns:
+            Trace dict in the JSON object format
+        """
+        finished = sorted((t for t in tasks.values()
+                           if t.started is not None and t.duration is not None),
+                          key=lambda t: (t.started, t.module.id))
+
+        def micros(value):
+            return int(round((value - build_start) * 1e6))
+
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 0,
+                   "args": {"name": "jcompile-dispatch"}}]
+        lanes = []
+        for task in finished:
+            end = task.started + task.duration
+            lane = next((i for i, busy in enumerate(lanes) if busy <= task.started), len(lanes))
+            if lane == len(lanes):
+                lanes.append(end)
+                events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane + 1,
+                               "args": {"name": "worker %d" % (lane + 1)}})
+            lanes[lane] = end
+            events.append({"name": task.module.id, "cat": "module", "ph": "X", "pid": 1,
+                           "tid": lane + 1, "ts": micros(task.started),
+                           "dur": micros(end) - micros(task.started),
+                           "args": {"status": task.status}})
+            for name, category, start, stop, args in self._spans(task):
+                events.append({"name": name, "cat": category, "ph": "X", "pid": 1,
+                               "tid": lane + 1, "ts": micros(start),
+                               "dur": max(micros(stop) - micros(start), 0),
+                               "args": dict(args, module=task.module.id)})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, tasks, build_start, goals=None):
+        """
+        Write the JSON summary and the trace file.
+
+        Returns:
+            Tuple ``(summary, summary_path, trace_path)``
+        """
+        summary = self.summary(tasks, build_start, goals)
+        os.makedirs(self.state_dir, exist_ok=True)
+        summary_path = os.path.join(self.state_dir, PROFILE_FILE)
+        trace_path = os.path.join(self.state_dir, TRACE_FILE)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(tasks, build_start), f)
+        return summary, summary_path, trace_path
+
+
+def format_slowest(summary, limit=5):
+    """
+    Describe the slowest mojo executions of a profile summary.
+
+    Returns:
+        List of lines, slowest first
+    """
+    mojos = [(mojo["seconds"], module, mojo)
+             for module, entry in summary["modules"].items() for mojo in entry["mojos"]]
+    mojos.sort(key=lambda item: (-item[0], item[1]))
+    return ["%6.1fs  %s:%s (%s) @ %s" % (seconds, mojo["plugin"], mojo["goal"],
+                                        mojo["execution"] or "-", module)
+            for seconds, module, mojo in mojos[:limit]]
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Class-level dependency index for change-aware test selection.
+
+Reads the constant pool of every compiled class under ``target/classes`` and
+``target/test-classes`` of each reactor module and records which classes it
+references. The index is persisted in ``.jdevtools/class-index.json`` and
+only class files whose size or mtime changed are re-read.
+
+Files changed since a git ref are mapped to their classes, and the test
+classes that reach them through the reverse dependency graph are selected.
+Compile-time constants are inlined by javac and leave no reference behind,
+so a change to a constant alone may select too few tests.
+"""
+
+import argparse
+import json
+import os
+import re
+import struct
+import subprocess
+import sys
+
+from jdevtools.dispatch import STATE_DIR
+from jdevtools.reactor import discover_poms
+
+INDEX_FILE = "class-index.json"
+INDEX_FORMAT = 2
+
+# Exit status of main() when no test is affected
+NOTHING_TO_RUN = 3
+
+# Surefire's default includes
+TEST_NAME_RE = re.compile(r"^(Test.*|.*Test|.*Tests|.*TestCase)$")
+
+_DESCRIPTOR_RE = re.compile(r"L([\w/$]+)[;<]")
+_SOURCE_RE = re.compile(r"(?:^|/)src/(main|test)/java/(.+)\.java$")
+
+# Constant pool entry sizes after the tag byte, for fixed-size entries
+_CP_SIZES = {3: 4, 4: 4, 5: 8, 6: 8, 7: 2, 8: 2, 9: 4, 10: 4, 11: 4,
+             12: 4, 15: 3, 16: 2, 17: 4, 18: 4, 19: 2, 20: 2}
+
+
+def parse_class(data):
+    """
+    Read a class file's name and the classes its constant pool references.
+
+    References come from CONSTANT_Class entries and from type descriptors
+    and generic signatures, which also cover field, parameter and
+    annotation types.
+
+    Args:
+        data: Contents of a ``.class`` file
+
+    Returns:
+        Tuple ``(binary_name, set_of_binary_names)`` in dotted form
+    """
+    name, refs, _ = _read_class(data)
+    return name, refs
+
+
+def _read_class(data):
+    """Parse a class file, see parse_class(); also reports constant fields."""
+    if data[:4] != b"\xca\xfe\xba\xbe":
+        raise ValueError("Not a class file")
+    count = struct.unpack_from(">H", data, 8)[0]
+    offset = 10
+    utf8 = {}
+    class_entries = {}
+    index = 1
+    while index < count:
+        tag = data[offset]
+        if tag == 1:
+            length = struct.unpack_from(">H", data, offset + 1)[0]
+            utf8[index] = data[offset + 3:offset + 3 + length].decode("utf-8", "replace")
+            offset += 3 + length
+        elif tag in _CP_SIZES:
+            if tag == 7:
+                class_entries[index] = struct.unpack_from(">H", data, offset + 1)[0]
+            offset += 1 + _CP_SIZES[tag]
+            # Long and double take two constant pool slots
+            if tag in (5, 6):
+                index += 1
+        else:
+            raise ValueError("Unknown constant pool tag %d" % tag)
+        index += 1
+
+    this_class = struct.unpack_from(">H", data, offset + 2)[0]
+    name = utf8[class_entries[this_class]]
+
+    refs = set()
+    for name_index in class_entries.values():
+        ref = utf8.get(name_index, "")
+        if ref.startswith("["):
+            refs.update(_DESCRIPTOR_RE.findall(ref))
+        else:
+            refs.add(ref)
+    for value in utf8.values():
+        if "L" in value and (";" in value or "<" in value):
+            refs.update(_DESCRIPTOR_RE.findall(value))
+    refs.discard(name)
+
+    # Fields with a ConstantValue attribute are compile-time constants
+    interfaces = struct.unpack_from(">H", data, offset + 6)[0]
+    offset += 8 + 2 * interfaces
+    constants = False
+    for _ in range(struct.unpack_from(">H", data, offset)[0]):
+        attributes = struct.unpack_from(">H", data, offset + 8)[0]
+        offset += 10
+        for _ in range(attributes):
+            attr_name, length = struct.unpack_from(">HI", data, offset)
+            constants = constants or utf8.get(attr_name) == "ConstantValue"
+            offset += 6 + length
+    return name.replace("/", "."), {r.replace("/", ".") for r in refs if r}, constants
+
+
+def top_level(binary_name):
+    """Return the top-level class of a (possibly nested) binary class name."""
+    return binary_name.split("$", 1)[0]
+
+
+class ClassIndex:
+    """Persistent, incrementally updated class dependency index of a project."""
+
+    def __init__(self, project_dir=".", index_path=None):
+        """
+        Initialize the index.
+
+        Args:
+            project_dir: Reactor root directory
+            index_path: Index file (default: <project>/.jdevtools/class-index.json)
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.index_path = index_path or os.path.join(self.project_dir, STATE_DIR, INDEX_FILE)
+        # Relative class file path -> {"stamp", "name", "refs", "constants", "test"}
+        self.entries = {}
+        self.scanned = 0
+
+    def module_dirs(self):
+        """Return the directories of all reactor modules."""
+        if not os.path.isfile(os.path.join(self.project_dir, "pom.xml")):
+            return [self.project_dir]
+        return [os.path.dirname(os.path.abspath(p)) for p in discover_poms(self.project_dir)]
+
+    def load(self):
+        """Load the persisted index, starting empty if it is missing or outdated."""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == INDEX_FORMAT:
+                self.entries = data.get("classes", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Persist the index atomically."""
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": INDEX_FORMAT, "classes": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def update(self):
+        """
+        Bring the index up to date with the class files on disk.
+
+        Only new or changed class files are parsed; entries of deleted class
+        files are dropped.
+
+        Returns:
+            Number of class files parsed
+        """
+        self.load()
+        seen = set()
+        self.scanned = 0
+        for module_dir in self.module_dirs():
+            for output, is_test in (("classes", False), ("test-classes", True)):
+                base = os.path.join(module_dir, "target", output)
+                for dirpath, _, filenames in os.walk(base):
+                    for filename in filenames:
+                        if not filename.endswith(".class") or filename == "module-info.class":
+                            continue
+                        path = os.path.join(dirpath, filename)
+                        key = os.path.relpath(path, self.project_dir)
+                        seen.add(key)
+                        st = os.stat(path)
+                        stamp = [st.st_size, st.st_mtime_ns]
+                        entry = self.entries.get(key)
+                        if entry is not None and entry["stamp"] == stamp:
+                            continue
+                        with open(path, "rb") as f:
+                            name, refs, constants = _read_class(f.read())
+                        self.entries[key] = {"stamp": stamp, "name": name,
+                                             "refs": sorted(refs), "constants": constants,
+                                             "test": is_test}
+                        self.scanned += 1
+        for key in set(self.entries) - seen:
+            del self.entries[key]
+        self.save()
+        return self.scanned
+
+    def dependents(self, changed_classes):
+        """
+        Find the classes that transitively depend on ``changed_classes``.
+
+        Args:
+            changed_classes: Top-level class names of changed sources
+
+        Returns:
+            Set of binary class names, including the changed classes and
+            their nested classes
+        """
+        dependents = {}
+        by_top_level = {}
+        for entry in self.entries.values():
+            by_top_level.setdefault(top_level(entry["name"]), []).append(entry["name"])
+            for ref in entry["refs"]:
+                dependents.setdefault(ref, set()).add(entry["name"])
+
+        queue = []
+        for name in changed_classes:
+            queue.extend(by_top_level.get(name, []))
+        affected = set(queue)
+        while queue:
+            for dependent in dependents.get(queue.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(dependent)
+        return affected
+
+    def declares_constants(self, classes):
+        """
+        Tell whether any of ``classes`` declares compile-time constants.
+
+        javac inlines such constants into the classes using them, so their
+        users cannot be found through the dependency graph.
+
+        Args:
+            classes: Top-level class names
+
+        Returns:
+            True if one of the classes or their nested classes has a
+            ``final`` primitive or String field initialized with a constant
+        """
+        classes = set(classes)
+        return any(entry.get("constants") and top_level(entry["name"]) in classes
+                   for entry in self.entries.values())
+
+    def affected_tests(self, changed_classes):
+        """
+        Find test classes that transitively depend on ``changed_classes``.
+
+        Args:
+            changed_classes: Top-level class names of changed sources
+
+        Returns:
+            Sorted list of top-level test class names
+        """
+        tests = {top_level(entry["name"]) for entry in self.entries.values() if entry["test"]}
+        known = {top_level(entry["name"]) for entry in self.entries.values()}
+
+        selected = {top_level(name) for name in self.dependents(changed_classes)} & tests
+        # Changed tests that are not compiled yet
+        selected.update(name for name in changed_classes if name not in known)
+        return sorted(name for name in selected
+                      if TEST_NAME_RE.match(name.rsplit(".", 1)[-1]))
+
+
+def selection_args(tests):
+    """Return the Maven arguments running only the given test classes."""
+    # Modules without any of the selected tests must not fail the build
+    return ["-Dtest=%s" % ",".join(tests),
+            "-Dsurefire.failIfNoSpecifiedTests=false", "-DfailIfNoTests=false"]
+
+
+def _git(project_dir, *args):
+    return subprocess.run(["git"] + list(args), cwd=project_dir, check=True,
+                          stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+
+def changed_files(project_dir, ref="HEAD"):
+    """
+    List files changed since ``ref``, including uncommitted and untracked ones.
+
+    Returns:
+        Paths relative to the repository root, using forward slashes
+    """
+    changed = set(_git(project_dir, "diff", "--name-only", ref, "--").splitlines())
+    changed.update(_git(project_dir, "ls-files", "--others", "--exclude-standard",
+                        "--full-name").splitlines())
+    return sorted(path for path in changed if path)
+
+
+def classify_changes(paths):
+    """
+    Map changed files to top-level class names.
+
+    Args:
+        paths: Changed file paths
+
+    Returns:
+        Tuple ``(class_names, needs_full_run)``; ``needs_full_run`` is True
+        when a change (a POM or a resource) cannot be attributed to classes
+    """
+    classes = set()
+    full_run = False
+    for path in paths:
+        match = _SOURCE_RE.search(path)
+        if match:
+            classes.add(match.group(2).replace("/", "."))
+        elif path.endswith("pom.xml") or "/src/main/" in "/" + path or \
+                "/src/test/" in "/" + path:
+            full_run = True
+    return classes, full_run
+
+
+def main(argv=None):
+    """
+    Print the surefire arguments selecting tests affected since a git ref.
+
+    Prints nothing when the full suite has to run, and exits with
+    NOTHING_TO_RUN when no test is affected.
+    """
+    parser = argparse.ArgumentParser(
+        description="Select the tests affected by changes since a git ref")
+    parser.add_argument('--project', default='.',
+                        help='Reactor root directory (default: current directory)')
+    parser.add_argument('--ref', default='HEAD',
+                        help='Git ref to compare against (default: HEAD)')
+    args = parser.parse_args(argv)
+
+    try:
+        index = ClassIndex(args.project)
+        index.update()
+        classes, full_run = classify_changes(changed_files(index.project_dir, args.ref))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if full_run or not index.entries:
+        print("Changes since %s need the full test suite" % args.ref, file=sys.stderr)
+        return 0
+    tests = index.affected_tests(classes)
+    if not tests:
+        print("No tests affected by changes since %s" % args.ref, file=sys.stderr)
+        return NOTHING_TO_RUN
+    print("%d test class(es) affected by changes since %s (%d class file(s) re-indexed)"
+          % (len(tests), args.ref, index.scanned), file=sys.stderr)
+    print(" ".join(selection_args(tests)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Memory-aware dispatcher for Maven reactor builds.
+
+Reads the reactor's ``<modules>`` and inter-module dependencies, builds the
+module DAG and runs one ``mvn -pl <module>`` invocation per module on a pool
+of workers. A module only starts when its upstream modules have finished
+and its goals' memory budget fits into what is still free. Ready modules
+are ordered by the length of their remaining critical path, and smaller
+modules are only backfilled when they are expected to finish before
+memory frees up for the critical one.
+
+Because every module is built by its own Maven invocation, a module can only
+resolve its upstream modules from a repository. The dispatcher installs them
+into a project-local repository under ``.jdevtools/`` that is chained in
+front of the user's local repository, so the goals of a reactor with
+inter-module dependencies have to include ``install``.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from jdevtools import STATE_DIR
+from jdevtools.build_cache import BuildCacheStats, build_cache_enabled, format_stats
+from jdevtools.build_profile import BuildProfiler, format_slowest
+from jdevtools.effective import ParentResolver, interpolate
+from jdevtools.pom_merge import local_name
+from jdevtools.reactor import discover_poms
+
+HISTORY_FILE = "dispatch-history.json"
+REPOSITORY_DIR = "repository"
+
+DEFAULT_GOALS = "clean install -DskipTests"
+# With the build cache, clean would throw away outputs the cache can restore
+CACHED_DEFAULT_GOALS = "install -DskipTests"
+
+# Goals that make a module's artifacts resolvable by its dependents
+INSTALL_GOALS = {"install", "deploy"}
+# Goals that run without resolving dependencies
+NO_RESOLUTION_GOALS = {"clean", "validate"}
+
+# Estimated peak memory of one Maven invocation per goal, in MB
+GOAL_MEMORY_MB = {
+    "clean": 256,
+    "validate": 256,
+    "compile": 1024,
+    "test-compile": 1024,
+    "test": 1536,
+    "package": 1536,
+    "verify": 1536,
+    "install": 1536,
+    "deploy": 1536,
+    "native:compile": 6144,
+    "native:compile-no-fork": 6144,
+    "rpm:rpm": 1024,
+    "jdeb:jdeb": 1024,
+}
+DEFAULT_GOAL_MEMORY_MB = 1024
+
+_SIZE_UNITS = {"k": 1.0 / 1024, "m": 1, "g": 1024, "t": 1024 * 1024}
+
+
+def parse_size(value):
+    """
+    Parse a memory size such as ``6g``, ``512m`` or ``6GB`` into MB.
+
+    Plain numbers are taken as MB.
+    """
+    text = str(value).strip().lower().rstrip("b")
+    if text and text[-1] in _SIZE_UNITS:
+        return int(float(text[:-1]) * _SIZE_UNITS[text[-1]])
+    return int(float(text))
+
+
+def parse_jobs(value):
+    """Parse a worker count: ``N`` or a per-core multiplier such as ``1C``."""
+    text = str(value).strip().upper()
+    if text.endswith("C"):
+        return max(1, int(float(text[:-1] or "1") * (os.cpu_count() or 1)))
+    return max(1, int(text))
+
+
+def available_memory_mb():
+    """Return the memory available for builds, in MB."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return 8192
+
+
+def goal_memory(goals, overrides=None):
+    """
+    Estimate the peak memory of running ``goals`` on one module.
+
+    Args:
+        goals: List of Maven goals/phases
+        overrides: Dict of goal -> MB taking precedence over the defaults
+
+    Returns:
+        Budget in MB (the largest of the individual goals)
+    """
+    table = dict(GOAL_MEMORY_MB)
+    table.update(overrides or {})
+    return max([table.get(goal, DEFAULT_GOAL_MEMORY_MB) for goal in goals
+                if not goal.startswith("-")] or [0])
+
+
+def user_repository():
+    """Return the user's local Maven repository."""
+    return os.path.join(os.path.expanduser("~"), ".m2", "repository")
+
+
+class Module:
+    """One project of the reactor."""
+
+    def __init__(self, pom_path, group_id, artifact_id, references):
+        self.pom_path = pom_path
+        self.group_id = group_id
+        self.artifact_id = artifact_id
+        # groupId:artifactId of dependencies and the parent
+        self.references = references
+        self.depends_on = set()
+        self.dependents = set()
+
+    @property
+    def id(self):
+        return "%s:%s" % (self.group_id, self.artifact_id)
+
+
+def read_module(pom_path, resolver=None):
+    """
+    Read a module's coordinates and the coordinates it depends on.
+
+    Coordinates are interpolated with ``project.groupId``/``project.version``
+    and the properties the module declares or inherits, so a sibling written
+    as ``${project.groupId}`` still yields its edge.
+
+    Args:
+        pom_path: Path to the module POM
+        resolver: ParentResolver for inherited properties (default: a new one)
+    """
+    root = ET.parse(pom_path).getroot()
+
+    def text(elem, name):
+        for child in elem:
+            if isinstance(child.tag, str) and local_name(child.tag) == name:
+                return (child.text or "").strip()
+        return None
+
+    def child(elem, name):
+        for c in elem:
+            if isinstance(c.tag, str) and local_name(c.tag) == name:
+                return c
+        return None
+
+    properties = dict((resolver or ParentResolver()).resolve(pom_path).properties)
+    properties.setdefault("project.artifactId", text(root, "artifactId") or "")
+
+    def coordinates(elem):
+        return "%s:%s" % (interpolate(text(elem, "groupId"), properties),
+                          interpolate(text(elem, "artifactId"), properties))
+
+    references = set()
+    group_id = text(root, "groupId")
+    parent = child(root, "parent")
+    if parent is not None:
+        group_id = group_id or text(parent, "groupId")
+        references.add(coordinates(parent))
+
+    deps = child(root, "dependencies")
+    if deps is not None:
+        for dep in deps:
+            if isinstance(dep.tag, str):
+                references.add(coordinates(dep))
+
+    return Module(pom_path, interpolate(group_id, properties),
+                  interpolate(text(root, "artifactId"), properties), references)
+
+
+def load_graph(root_dir):
+    """
+    Build the module DAG of a reactor.
+
+    Args:
+        root_dir: Directory containing the aggregator ``pom.xml``
+
+    Returns:
+        Dict of module id -> Module with dependency edges filled in
+    """
+    modules = {}
+    # Shared so a parent of many modules is parsed once
+    resolver = ParentResolver()
+    for pom_path in discover_poms(root_dir):
+        module = read_module(pom_path, resolver)
+        modules.setdefault(module.id, module)
+
+    for module in modules.values():
+        for ref in module.references:
+            if ref in modules and ref != module.id:
+                module.depends_on.add(ref)
+                modules[ref].dependents.add(module.id)
+
+    # Kahn's algorithm doubles as a cycle check
+    remaining = {m.id: len(m.depends_on) for m in modules.values()}
+    queue = [mid for mid, count in remaining.items() if count == 0]
+    visited = 0
+    while queue:
+        mid = queue.pop()
+        visited += 1
+        for dependent in modules[mid].dependents:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                queue.append(dependent)
+    if visited != len(modules):
+        cycle = sorted(mid for mid, count in remaining.items() if count)
+        raise ValueError("Module dependency cycle between: %s" % ", ".join(cycle))
+    return modules
+
+
+class Task:
+    """Scheduling state of one module."""
+
+    def __init__(self, module, memory_mb, estimate):
+        self.module = module
+        self.memory_mb = memory_mb
+        self.estimate = estimate
+        self.priority = estimate
+        self.status = "pending"
+        self.started = None
+        self.duration = None
+        self.log_path = None
+
+
+class Dispatcher:
+    """Schedules Maven invocations over the module DAG."""
+
+    def __init__(self, root_dir=".", goals=None, mvn=None, jobs=None,
+                 memory_mb=None, goal_memory_mb=None, maven_args=None,
+                 fail_at_end=False, out=None, line_handlers=None, build_cache=None,
+                 profile=False):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            root_dir: Reactor root directory
+            goals: Maven goals/phases as a string or list (default: clean
+                install without tests, or install when the build cache is
+                enabled)
+            mvn: Maven executable (default: the project's mvnw, else mvn)
+            jobs: Maximum concurrent Maven invocations (default: CPU count)
+            memory_mb: Total memory budget (default: available memory)
+            goal_memory_mb: Per-goal memory overrides in MB
+            maven_args: Extra arguments passed to every Maven invocation
+            fail_at_end: Keep building unaffected modules after a failure
+            out: Stream for progress messages (default: stdout)
+            line_handlers: Callables ``(task, line)`` fed every output line
+            build_cache: Whether the build cache extension is in use
+                (default: detected from .mvn/extensions.xml)
+            profile: Record per-module and per-mojo timings and write a
+                JSON summary and a Chrome trace to the state directory
+        """
+        self.root_dir = os.path.abspath(root_dir)
+        self.maven_args = list(maven_args or [])
+        if build_cache is None:
+            build_cache = build_cache_enabled(self.root_dir) and \
+                "-Dmaven.build.cache.enabled=false" not in self.maven_args
+        self.build_cache = build_cache
+        if goals is None:
+            goals = CACHED_DEFAULT_GOALS if build_cache else DEFAULT_GOALS
+        self.goals = goals.split() if isinstance(goals, str) else list(goals)
+        if mvn is None:
+            wrapper = os.path.join(self.root_dir, "mvnw.cmd" if os.name == "nt" else "mvnw")
+            mvn = wrapper if os.path.isfile(wrapper) else "mvn"
+        self.mvn = [mvn] if isinstance(mvn, str) else list(mvn)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.memory_mb = memory_mb or available_memory_mb()
+        self.goal_memory_mb = goal_memory_mb or {}
+        self.fail_at_end = fail_at_end
+        self.out = out or sys.stdout
+        self.line_handlers = list(line_handlers or [])
+        self.state_dir = os.path.join(self.root_dir, STATE_DIR)
+        self.repository = os.path.join(self.state_dir, REPOSITORY_DIR)
+        self.cache_stats = BuildCacheStats(self.state_dir) if build_cache else None
+        if self.cache_stats:
+            self.line_handlers.append(self.cache_stats)
+        self.profiler = BuildProfiler(self.state_dir) if profile else None
+        if self.profiler:
+            self.line_handlers.append(self.profiler)
+        self._print_lock = threading.Lock()
+
+    def _log(self, message):
+        with self._print_lock:
+            print("[jcompile-dispatch] %s" % message, file=self.out)
+            self.out.flush()
+
+    def _history_path(self):
+        return os.path.join(self.state_dir, HISTORY_FILE)
+
+    def _load_history(self):
+        try:
+            with open(self._history_path(), encoding="utf-8") as f:
+                return json.load(f).get(" ".join(self.goals), {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_history(self, tasks):
+        try:
+            with open(self._history_path(), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        entry = data.setdefault(" ".join(self.goals), {})
+        for task in tasks.values():
+            if task.status == "done":
+                entry[task.module.id] = round(task.duration, 3)
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(self._history_path(), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    def plan(self):
+        """
+        Create tasks and compute their critical-path priorities.
+
+        Returns:
+            Dict of module id -> Task
+        """
+        modules = load_graph(self.root_dir)
+        history = self._load_history()
+        memory = goal_memory(self.goals, self.goal_memory_mb)
+        tasks = {mid: Task(module, memory, history.get(mid, 1.0))
+                 for mid, module in modules.items()}
+
+        # Priority = own estimate + longest chain of dependents after it
+        order = []
+        remaining = {mid: len(m.dependents) for mid, m in modules.items()}
+        stack = [mid for mid, count in remaining.items() if count == 0]
+        while stack:
+            mid = stack.pop()
+            order.append(mid)
+            for upstream in modules[mid].depends_on:
+                remaining[upstream] -= 1
+                if remaining[upstream] == 0:
+                    stack.append(upstream)
+        for mid in order:
+            task = tasks[mid]
+            downstream = [tasks[d].priority for d in task.module.dependents]
+            task.priority = task.estimate + max(downstream or [0])
+        return tasks
+
+    def repository_args(self):
+        """
+        Return the Maven arguments selecting the project-local repository.
+
+        Upstream modules are installed into and resolved from the
+        repository in the state directory, which is chained in front of the
+        user's local repository (``maven.repo.local.tail``, Maven 3.9+) so
+        third-party artifacts are still shared. Nothing is added when the
+        Maven arguments already choose a local repository.
+        """
+        if any(arg.startswith("-Dmaven.repo.local=") for arg in self.maven_args):
+            return []
+        return ["-Dmaven.repo.local=%s" % self.repository,
+                "-Dmaven.repo.local.tail=%s" % user_repository()]
+
+    def check_goals(self, tasks):
+        """
+        Refuse goals that leave dependents without their upstream modules.
+
+        Raises:
+            ValueError: When a module has dependents in the reactor and the
+                goals resolve dependencies without installing them
+        """
+        phases = [goal for goal in self.goals if not goal.startswith("-")]
+        if INSTALL_GOALS.intersection(phases) or set(phases) <= NO_RESOLUTION_GOALS:
+            return
+        upstream = sorted(mid for mid, task in tasks.items() if task.module.dependents)
+        if upstream:
+            raise ValueError(
+                "Goals '%s' do not install, so modules depending on %s could only "
+                "resolve stale or missing artifacts; add install to the goals, "
+                "e.g. --goals \"install -DskipTests\""
+                % (" ".join(self.goals), ", ".join(upstream)))
+
+    def command(self, task, multi_module=True):
+        """Return the Maven command line for a task."""
+        command = self.mvn + ["-B"] + self.maven_args
+        if multi_module:
+            command += self.repository_args() + ["-pl", task.module.id]
+        return command + self.goals
+
+    def _execute(self, task, multi_module):
+        log_dir = os.path.join(self.state_dir, "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        task.log_path = os.path.join(log_dir, task.module.id.replace(":", "_") + ".log")
+        command = self.command(task, multi_module)
+
+        with open(task.log_path, "w", encoding="utf-8") as log:
+            process = subprocess.Popen(command, cwd=self.root_dir,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       universal_newlines=True, errors="replace")
+            for line in process.stdout:
+                log.write(line)
+                for handler in self.line_handlers:
+                    handler(task, line)
+            return process.wait()
+
+    def _pick(self, ready, free_mb, running):
+        """Choose the next task to start, or None to wait."""
+        top = ready[0]
+        if top.memory_mb <= free_mb or not running:
+            return top
+        # Backfill only with tasks expected to finish before any running
+        # task would release memory for the critical-path task
+        now = time.monotonic()
+        horizon = min(max(t.estimate - (now - t.started), 0) for t in running.values())
+        for task in ready[1:]:
+            if task.memory_mb <= free_mb and task.estimate <= horizon:
+                return task
+        return None
+
+    def _skip_dependents(self, tasks, task):
+        stack = list(task.module.dependents)
+        while stack:
+            dependent = tasks[stack.pop()]
+            if dependent.status == "pending":
+                dependent.status = "skipped"
+                stack.extend(dependent.module.dependents)
+
+    def run(self):
+        """
+        Build every module.
+
+        Returns:
+            Dict of module id -> Task with final status and duration
+        """
+        tasks = self.plan()
+        multi_module = len(tasks) > 1
+        self.check_goals(tasks)
+        waiting = {mid: len(t.module.depends_on) for mid, t in tasks.items()}
+        ready = [t for mid, t in tasks.items() if waiting[mid] == 0]
+        running = {}
+        free_mb = self.memory_mb
+        stopping = False
+        build_start = time.monotonic()
+
+        self._log("Dispatching %d module(s) with %d worker(s), %d MB memory budget"
+                  % (len(tasks), self.jobs, self.memory_mb))
+        self._log("Maven goals: %s" % " ".join(self.goals))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while running or (ready and not stopping):
+                ready.sort(key=lambda t: (-t.priority, t.module.id))
+                while ready and not stopping and len(running) < self.jobs:
+                    task = self._pick(ready, free_mb, running)
+                    if task is None:
+                        break
+                    if task.memory_mb > free_mb:
+                        self._log("Warning: %s needs %d MB, only %d MB free"
+                                  % (task.module.id, task.memory_mb, free_mb))
+                    ready.remove(task)
+                    free_mb -= task.memory_mb
+                    task.status = "running"
+                    task.started = time.monotonic()
+                    running[executor.submit(self._execute, task, multi_module)] = task
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    free_mb += task.memory_mb
+                    task.duration = time.monotonic() - task.started
+                    try:
+                        returncode = future.result()
+                    except OSError as e:
+                        self._log("Could not start Maven: %s" % e)
+                        returncode = -1
+
+                    if returncode == 0:
+                        task.status = "done"
+                        self._log("✓ %s (%.1fs)" % (task.module.id, task.duration))
+                        for dependent in task.module.dependents:
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0 and tasks[dependent].status == "pending":
+                                ready.append(tasks[dependent])
+                    else:
+                        task.status = "failed"
+                        self._log("✗ %s failed (%.1fs), log: %s"
+                                  % (task.module.id, task.duration, task.log_path))
+                        self._skip_dependents(tasks, task)
+                        ready = [t for t in ready if t.status == "pending"]
+                        if not self.fail_at_end:
+                            stopping = True
+
+        for task in tasks.values():
+            if task.status == "pending":
+                task.status = "skipped"
+        self._save_history(tasks)
+        if self.cache_stats:
+            self.cache_stats.save(" ".join(self.goals))
+
+        counts = {}
+        for task in tasks.values():
+            counts[task.status] = counts.get(task.status, 0) + 1
+        self._log("Finished in %.1fs: %d built, %d failed, %d skipped"
+                  % (time.monotonic() - build_start, counts.get("done", 0),
+                     counts.get("failed", 0), counts.get("skipped", 0)))
+        if self.cache_stats:
+            self._log(format_stats(self.state_dir))
+        if self.profiler:
+            summary, summary_path, trace_path = self.profiler.save(
+                tasks, build_start, " ".join(self.goals))
+            slowest = format_slowest(summary)
+            if slowest:
+                self._log("Slowest mojos:")
+                for line in slowest:
+                    self._log("  " + line)
+            self._log("Profile: %s, trace: %s" % (summary_path, trace_path))
+        return tasks
+
+
+def _goal_memory_arg(value):
+    goal, _, size = value.partition("=")
+    if not goal or not size:
+        raise argparse.ArgumentTypeError("expected GOAL=SIZE, e.g. native:compile=6g")
+    return goal, parse_size(size)
+
+
+def main(argv=None):
+    """Main entry point for the dispatch engine."""
+    parser = argparse.ArgumentParser(
+        prog="jcompile-dispatch",
+        description="Dispatch Maven builds across the reactor module graph",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build and install every module without tests, one worker per core
+  jcompile-dispatch
+
+  # Run the tests, too
+  jcompile-dispatch --goals "clean install"
+
+  # Package with native images, at most 4 builds, 16 GB budget
+  jcompile-dispatch --jobs 4 --memory 16g --goals "install native:compile"
+
+  # Tell the scheduler native-image needs 8 GB here
+  jcompile-dispatch --goal-memory native:compile=8g --goals "install native:compile"
+
+  # Find out which modules and plugins make the build slow
+  jcompile-dispatch --profile --goals "install native:compile"
+        """
+    )
+    parser.add_argument('--goals', default=None,
+                        help='Maven goals, including install when modules depend on '
+                             'each other (default: clean install -DskipTests, without '
+                             'clean when the build cache is enabled)')
+    parser.add_argument('--jobs', '--threads', dest='jobs', default=None,
+                        help='Concurrent Maven invocations: N or per-core like 1C (default: 1C)')
+    parser.add_argument('--parallel', nargs='?', const='1C', default=None,
+                        help='Same as --jobs (default: 1 per core)')
+    parser.add_argument('--memory', default=None,
+                        help='Total memory budget, e.g. 16g (default: available memory)')
+    parser.add_argument('--goal-memory', type=_goal_memory_arg, action='append',
+                        default=[], metavar='GOAL=SIZE',
+                        help='Memory budget for a goal, e.g. native:compile=6g')
+    parser.add_argument('--fail-at-end', action='store_true',
+                        help='Keep building modules unaffected by a failure')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record module and mojo timings as a JSON summary '
+                             'and a Chrome trace in .jdevtools/')
+    parser.add_argument('--mvn', default=None,
+                        help='Maven executable (default: ./mvnw, then mvn)')
+    parser.add_argument('--project', default='.',
+                        help='Reactor root directory (default: current directory)')
+    args = parser.parse_args(argv)
+
+    try:
+        dispatcher = Dispatcher(
+            root_dir=args.project,
+            goals=args.goals,
+            mvn=args.mvn,
+            jobs=parse_jobs(args.jobs or args.parallel or "1C"),
+            memory_mb=parse_size(args.memory) if args.memory else None,
+            goal_memory_mb=dict(args.goal_memory),
+            fail_at_end=args.fail_at_end,
+            profile=args.profile,
+        )
+        tasks = dispatcher.run()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0 if all(t.status == "done" for t in tasks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
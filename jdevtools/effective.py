@@ -0,0 +1,507 @@
+"""
+Effective-POM resolution against a local Maven repository.
+
+Resolves the ``<parent>`` chain and ``import``-scoped BOMs of a POM so the
+generator can tell which properties and dependencies are already inherited.
+Parsed POMs are summarized into plain dicts, memoized per process and
+persisted in an on-disk index in the project's ``.jdevtools`` directory,
+keyed by file size and mtime, so a parent shared by hundreds of modules is
+parsed once.
+"""
+
+import json
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+
+from jdevtools import STATE_DIR
+from jdevtools.pom_stamp import project_root
+from jdevtools.pom_merge import DEFAULT_PLUGIN_GROUP, local_name
+
+DEFAULT_REPOSITORY = os.path.join(os.path.expanduser("~"), ".m2", "repository")
+INDEX_NAME = "pom-index.json"
+INDEX_FORMAT = 3
+
+_PROPERTY_RE = re.compile(r"\$\{([^}]+)\}")
+
+
+def interpolate(value, properties, max_depth=10):
+    """
+    Expand ``${name}`` references in ``value``.
+
+    Args:
+        value: String to expand (may be None)
+        properties: Dict of property values
+        max_depth: Maximum number of nested expansion rounds
+
+    Returns:
+        The expanded string; unknown references are left as they are
+    """
+    if not value or "${" not in value:
+        return value
+    for _ in range(max_depth):
+        expanded = _PROPERTY_RE.sub(
+            lambda m: properties.get(m.group(1), m.group(0)), value)
+        if expanded == value:
+            break
+        value = expanded
+    return value
+
+
+def project_index_path(pom_path):
+    """
+    Return the summary index of the project a POM belongs to.
+
+    The project is the outermost directory above the POM that still holds a
+    ``pom.xml``, so all modules of a reactor share one index in its
+    ``.jdevtools`` state directory.
+    """
+    return os.path.join(project_root(pom_path), STATE_DIR, INDEX_NAME)
+
+
+def dependency_id(group_id, artifact_id, type_="jar", classifier=""):
+    """Return the string key identifying a dependency."""
+    return ":".join([group_id, artifact_id, type_ or "jar", classifier or ""])
+
+
+def _child_text(elem, name):
+    for child in elem:
+        if isinstance(child.tag, str) and local_name(child.tag) == name:
+            return (child.text or "").strip()
+    return None
+
+
+def _child(elem, name):
+    for child in elem:
+        if isinstance(child.tag, str) and local_name(child.tag) == name:
+            return child
+    return None
+
+
+def _summarize_dependencies(container):
+    deps = {}
+    if container is None:
+        return deps
+    for dep in container:
+        if not isinstance(dep.tag, str) or local_name(dep.tag) != "dependency":
+            continue
+        key = dependency_id(_child_text(dep, "groupId") or "",
+                            _child_text(dep, "artifactId") or "",
+                            _child_text(dep, "type") or "jar",
+                            _child_text(dep, "classifier") or "")
+        info = {
+            "version": _child_text(dep, "version"),
+            "scope": _child_text(dep, "scope") or "compile",
+        }
+        if _child_text(dep, "optional") == "true":
+            info["optional"] = True
+        exclusions = _child(dep, "exclusions")
+        if exclusions is not None:
+            info["exclusions"] = ["%s:%s" % (_child_text(e, "groupId") or "*",
+                                             _child_text(e, "artifactId") or "*")
+                                  for e in exclusions if isinstance(e.tag, str)]
+        deps.setdefault(key, info)
+    return deps
+
+
+def _summarize_plugin_versions(build):
+    """Map ``groupId:artifactId`` to the plugin version declared in ``<build>``."""
+    versions = {}
+    if build is None:
+        return versions
+    management = _child(build, "pluginManagement")
+    containers = [_child(management, "plugins") if management is not None else None,
+                  _child(build, "plugins")]
+    for container in containers:
+        if container is None:
+            continue
+        for plugin in container:
+            if not isinstance(plugin.tag, str):
+                continue
+            version = _child_text(plugin, "version")
+            if version:
+                versions["%s:%s" % (_child_text(plugin, "groupId") or DEFAULT_PLUGIN_GROUP,
+                                    _child_text(plugin, "artifactId") or "")] = version
+    return versions
+
+
+def _summarize_plugins(build):
+    """Return ``groupId:artifactId`` of the plugins declared in ``<build><plugins>``."""
+    plugins = []
+    if build is not None and _child(build, "plugins") is not None:
+        for plugin in _child(build, "plugins"):
+            if isinstance(plugin.tag, str):
+                plugins.append("%s:%s" % (
+                    _child_text(plugin, "groupId") or DEFAULT_PLUGIN_GROUP,
+                    _child_text(plugin, "artifactId") or ""))
+    return plugins
+
+
+def _summarize_activation(activation):
+    """
+    Reduce a profile's ``<activation>`` to what can be evaluated offline.
+
+    Returns:
+        Dict with ``activeByDefault``, ``property`` (``[name, value]`` or
+        None) and ``other`` (whether jdk, os or file conditions are present)
+    """
+    summary = {"activeByDefault": False, "property": None, "other": False}
+    if activation is None:
+        return summary
+    for child in activation:
+        if not isinstance(child.tag, str):
+            continue
+        name = local_name(child.tag)
+        if name == "activeByDefault":
+            summary["activeByDefault"] = (child.text or "").strip() == "true"
+        elif name == "property":
+            summary["property"] = [_child_text(child, "name") or "", _child_text(child, "value")]
+        else:
+            summary["other"] = True
+    return summary
+
+
+def _summarize_profiles(container):
+    profiles = []
+    if container is None:
+        return profiles
+    for profile in container:
+        if not isinstance(profile.tag, str) or local_name(profile.tag) != "profile":
+            continue
+        build = _child(profile, "build")
+        profiles.append({
+            "id": _child_text(profile, "id") or "default",
+            "activation": _summarize_activation(_child(profile, "activation")),
+            "plugins": _summarize_plugins(build),
+            "plugin_versions": _summarize_plugin_versions(build),
+        })
+    return profiles
+
+
+def summarize_root(root):
+    """
+    Reduce a parsed POM to the facts needed for inheritance.
+
+    Args:
+        root: Root element of the POM
+
+    Returns:
+        JSON-serializable dict
+    """
+    parent = _child(root, "parent")
+    parent_info = None
+    if parent is not None:
+        parent_info = {
+            "groupId": _child_text(parent, "groupId"),
+            "artifactId": _child_text(parent, "artifactId"),
+            "version": _child_text(parent, "version"),
+            "relativePath": _child_text(parent, "relativePath"),
+        }
+
+    properties = {}
+    props = _child(root, "properties")
+    if props is not None:
+        for prop in props:
+            if isinstance(prop.tag, str):
+                properties[local_name(prop.tag)] = (prop.text or "").strip()
+
+    managed_container = _child(root, "dependencyManagement")
+    if managed_container is not None:
+        managed_container = _child(managed_container, "dependencies")
+
+    build = _child(root, "build")
+
+    group_id = _child_text(root, "groupId")
+    version = _child_text(root, "version")
+    if parent_info:
+        group_id = group_id or parent_info["groupId"]
+        version = version or parent_info["version"]
+
+    return {
+        "groupId": group_id,
+        "artifactId": _child_text(root, "artifactId"),
+        "version": version,
+        "parent": parent_info,
+        "properties": properties,
+        "dependencies": _summarize_dependencies(_child(root, "dependencies")),
+        "managed": _summarize_dependencies(managed_container),
+        "plugins": _summarize_plugins(build),
+        "plugin_versions": _summarize_plugin_versions(build),
+        "profiles": _summarize_profiles(_child(root, "profiles")),
+    }
+
+
+class InheritedModel:
+    """What a POM inherits from its parent chain and imported BOMs."""
+
+    def __init__(self):
+        self.properties = {}
+        self.dependencies = {}
+        self.managed = {}
+        self.plugins = set()
+        # groupId:artifactId -> version from <plugins> or <pluginManagement>
+        self.plugin_versions = {}
+        # Profiles of the POM and its parents, nearest first, as summarized
+        self.profiles = []
+        # (path, size, mtime_ns) of every POM that contributed
+        self.sources = []
+
+    def has_dependency(self, key, version, scope):
+        """Check whether an identical dependency is already inherited."""
+        inherited = self.dependencies.get(key)
+        if inherited is None:
+            return False
+        return (inherited.get("version") == version and
+                inherited.get("scope", "compile") == (scope or "compile"))
+
+
+class ParentResolver:
+    """Resolves parent POMs and BOMs from a local repository with caching."""
+
+    def __init__(self, repository=None, index_path=None):
+        """
+        Initialize the resolver.
+
+        Args:
+            repository: Local repository directory (default: ~/.m2/repository)
+            index_path: On-disk summary index, usually from
+                project_index_path() (default: memoize in this process only)
+        """
+        self.repository = repository or DEFAULT_REPOSITORY
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._memo = {}
+        self._index = None
+        self._dirty = {}
+        self.parsed = 0
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        if not self.index_path:
+            self._index = {}
+            return self._index
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != INDEX_FORMAT:
+                data = {}
+        except (OSError, ValueError):
+            data = {}
+        self._index = data.get("entries", {})
+        return self._index
+
+    def summary(self, path):
+        """
+        Return the summary of a POM file, parsing it at most once.
+
+        Args:
+            path: Path to the POM file
+
+        Returns:
+            Summary dict, or None if the file does not exist
+        """
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = [st.st_size, st.st_mtime_ns]
+
+        with self._lock:
+            cached = self._memo.get(path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            entry = self._load_index().get(path)
+            if entry is not None and entry.get("stamp") == stamp:
+                self._memo[path] = (stamp, entry["summary"])
+                return entry["summary"]
+
+        summary = summarize_root(ET.parse(path).getroot())
+        with self._lock:
+            self.parsed += 1
+            self._memo[path] = (stamp, summary)
+            self._dirty[path] = {"stamp": stamp, "summary": summary}
+        return summary
+
+    def save(self):
+        """Persist newly parsed summaries to the on-disk index."""
+        with self._lock:
+            if not self._dirty or not self.index_path:
+                self._dirty = {}
+                return
+            dirty, self._dirty = self._dirty, {}
+        # Re-read so entries written by other processes are kept
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data.get("entries", {}) if data.get("format") == INDEX_FORMAT else {}
+        except (OSError, ValueError):
+            entries = {}
+        entries.update(dirty)
+        tmp_path = "%s.%d.%d.tmp" % (self.index_path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": INDEX_FORMAT, "entries": entries}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # The index is an optimization; never fail generation over it
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._index = entries
+
+    def repository_pom(self, group_id, artifact_id, version):
+        """Return the path of an artifact's POM in the local repository."""
+        return os.path.join(self.repository, *group_id.split("."),
+                            artifact_id, version,
+                            "%s-%s.pom" % (artifact_id, version))
+
+    def _parent_path(self, summary, pom_dir, properties):
+        parent = summary.get("parent")
+        if not parent or not parent.get("artifactId"):
+            return None
+        group_id = interpolate(parent.get("groupId") or "", properties)
+        artifact_id = interpolate(parent["artifactId"], properties)
+        version = interpolate(parent.get("version") or "", properties)
+
+        relative = parent.get("relativePath")
+        if relative is None:
+            relative = "../pom.xml"
+        if relative:
+            candidate = os.path.join(pom_dir, relative)
+            if os.path.isdir(candidate):
+                candidate = os.path.join(candidate, "pom.xml")
+            local = self.summary(candidate)
+            if local and local.get("artifactId") == artifact_id and \
+                    local.get("groupId") == group_id:
+                return candidate
+
+        if group_id and version:
+            candidate = self.repository_pom(group_id, artifact_id, version)
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def _record_source(self, model, path):
+        st = os.stat(path)
+        model.sources.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+
+    def _import_boms(self, model, managed, properties, seen):
+        for key, info in list(managed.items()):
+            group_id, artifact_id, type_, _ = key.split(":")
+            if type_ != "pom" or info.get("scope") != "import":
+                continue
+            version = interpolate(info.get("version") or "", properties)
+            bom_path = self.repository_pom(interpolate(group_id, properties),
+                                           interpolate(artifact_id, properties),
+                                           version)
+            if bom_path in seen or not os.path.isfile(bom_path):
+                continue
+            seen.add(bom_path)
+            bom = self.resolve(bom_path, seen=seen)
+            model.sources.extend(bom.sources)
+            for dep_key, dep in bom.managed.items():
+                model.managed.setdefault(dep_key, dep)
+
+    def resolve(self, pom_path, seen=None):
+        """
+        Resolve what ``pom_path`` inherits, including its own declarations.
+
+        Nearer declarations win over those further up the parent chain.
+
+        Args:
+            pom_path: Path to the POM to resolve
+            seen: Paths already visited (cycle guard)
+
+        Returns:
+            InheritedModel for the POM itself
+        """
+        seen = set() if seen is None else seen
+        model = InheritedModel()
+        chain = []
+        path = pom_path
+        properties = {}
+        while path and os.path.abspath(path) not in (p for p, _ in chain):
+            summary = self.summary(path)
+            if summary is None:
+                break
+            chain.append((os.path.abspath(path), summary))
+            for name, value in summary["properties"].items():
+                properties.setdefault(name, value)
+            path = self._parent_path(summary, os.path.dirname(path), properties)
+
+        for path, summary in chain:
+            self._record_source(model, path)
+            model.plugins.update(summary["plugins"])
+            for key, version in summary["plugin_versions"].items():
+                model.plugin_versions.setdefault(key, version)
+            for profile in summary["profiles"]:
+                model.profiles.append(dict(profile, plugin_versions=dict(
+                    profile["plugin_versions"])))
+            # Copy entries: summaries are shared with the memo and the index
+            for key, dep in summary["dependencies"].items():
+                model.dependencies.setdefault(key, dict(dep))
+            for key, dep in summary["managed"].items():
+                model.managed.setdefault(key, dict(dep))
+
+        own = chain[0][1] if chain else {}
+        properties.setdefault("project.groupId", own.get("groupId") or "")
+        properties.setdefault("project.version", own.get("version") or "")
+        for name, value in properties.items():
+            model.properties[name] = interpolate(value, properties)
+        for deps in (model.dependencies, model.managed):
+            for dep in deps.values():
+                dep["version"] = interpolate(dep.get("version"), properties)
+        for versions in [model.plugin_versions] + [p["plugin_versions"] for p in model.profiles]:
+            for key, version in versions.items():
+                versions[key] = interpolate(version, properties)
+
+        self._import_boms(model, dict(model.managed), properties, seen)
+        return model
+
+    def inherited(self, pom_path):
+        """
+        Resolve what ``pom_path`` inherits from its parents and BOMs only.
+
+        Args:
+            pom_path: Path to the child POM
+
+        Returns:
+            InheritedModel, empty if the POM has no resolvable parent
+        """
+        summary = self.summary(pom_path)
+        if summary is None:
+            return InheritedModel()
+        parent_path = self._parent_path(summary, os.path.dirname(pom_path),
+                                        summary["properties"])
+        model = self.resolve(parent_path) if parent_path else InheritedModel()
+
+        # BOMs imported by the child itself also count as inherited management
+        own_managed = {k: dict(v) for k, v in summary["managed"].items()}
+        properties = dict(model.properties)
+        properties.update(summary["properties"])
+        self._import_boms(model, own_managed, properties, set())
+        return model
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(repository=None, index_path=None):
+    """
+    Return a process-wide resolver for the given repository.
+
+    Sharing the resolver lets every PomGenerator in a process, such as a
+    batch worker, reuse the same memoized parents.
+    """
+    key = (repository or DEFAULT_REPOSITORY, index_path)
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            resolver = ParentResolver(repository, index_path)
+            _resolvers[key] = resolver
+        return resolver
@@ -4,295 +4,91 @@ jcompile-dispatch - Java compilation dispatcher with native image and packaging
 
 This tool generates Maven POM files with GraalVM native-image support and
 platform-specific packaging plugins (deb/rpm for Linux).
+
+The command line front end runs once per module in hooks and CI, so it only
+imports what it needs: ``--version`` returns before argparse is loaded, a
+repeated plain run whose stamp in the POM cache still matches (see
+``jdevtools.pom_stamp``) returns before argparse and the generator are
+loaded, and the generator with its XML and platform dependencies is imported
+after the arguments have been parsed. ``PomGenerator`` lives in
+``jdevtools.pom_generator`` and is still importable from here.
 """
 
-import argparse
-import os
-import platform
 import sys
-import xml.etree.ElementTree as ET
-from pathlib import Path
-from xml.dom import minidom
 
+from jdevtools import __version__
 
-class PomGenerator:
-    """Generates Maven POM files with native image and packaging support."""
-    
-    def __init__(self, existing_pom=None):
-        """
-        Initialize the POM generator.
-        
-        Args:
-            existing_pom: Path to existing POM file to merge with (optional)
-        """
-        self.existing_pom = existing_pom
-        self.namespace = "http://maven.apache.org/POM/4.0.0"
-        
-    def _get_os_type(self):
-        """Determine the operating system type."""
-        system = platform.system().lower()
-        if system == "linux":
-            return "linux"
-        elif system == "darwin":
-            return "mac"
-        elif system == "windows":
-            return "windows"
-        else:
-            return "unknown"
-    
-    def _create_base_pom(self):
-        """Create a base POM structure."""
-        ET.register_namespace('', self.namespace)
-        
-        root = ET.Element("{%s}project" % self.namespace)
-        root.set("{http://www.w3.org/2001/XMLSchema-instance}schemaLocation",
-                "http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd")
-        
-        # Model version
-        model_version = ET.SubElement(root, "{%s}modelVersion" % self.namespace)
-        model_version.text = "4.0.0"
-        
-        # Basic project info
-        group_id = ET.SubElement(root, "{%s}groupId" % self.namespace)
-        group_id.text = "com.example"
-        
-        artifact_id = ET.SubElement(root, "{%s}artifactId" % self.namespace)
-        artifact_id.text = "my-app"
-        
-        version = ET.SubElement(root, "{%s}version" % self.namespace)
-        version.text = "1.0-SNAPSHOT"
-        
-        return root
-    
-    def _add_properties(self, root):
-        """Add properties section to POM."""
-        properties = ET.SubElement(root, "{%s}properties" % self.namespace)
-        
-        maven_compiler_source = ET.SubElement(properties, "{%s}maven.compiler.source" % self.namespace)
-        maven_compiler_source.text = "11"
-        
-        maven_compiler_target = ET.SubElement(properties, "{%s}maven.compiler.target" % self.namespace)
-        maven_compiler_target.text = "11"
-        
-        project_build_source = ET.SubElement(properties, "{%s}project.build.sourceEncoding" % self.namespace)
-        project_build_source.text = "UTF-8"
-        
-        native_image_version = ET.SubElement(properties, "{%s}native.maven.plugin.version" % self.namespace)
-        native_image_version.text = "0.9.28"
-        
-        return properties
-    
-    def _add_native_image_plugin(self, plugins):
-        """Add GraalVM native-image plugin."""
-        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
-        
-        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
-        group_id.text = "org.graalvm.buildtools"
-        
-        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
-        artifact_id.text = "native-maven-plugin"
-        
-        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
-        version.text = "${native.maven.plugin.version}"
-        
-        extensions = ET.SubElement(plugin, "{%s}extensions" % self.namespace)
-        extensions.text = "true"
-        
-        configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
-        
-        image_name = ET.SubElement(configuration, "{%s}imageName" % self.namespace)
-        image_name.text = "${project.artifactId}"
-        
-        main_class = ET.SubElement(configuration, "{%s}mainClass" % self.namespace)
-        main_class.text = "${mainClass}"
-        
-        build_args = ET.SubElement(configuration, "{%s}buildArgs" % self.namespace)
-        
-        build_arg1 = ET.SubElement(build_args, "{%s}buildArg" % self.namespace)
-        build_arg1.text = "--no-fallback"
-        
-        build_arg2 = ET.SubElement(build_args, "{%s}buildArg" % self.namespace)
-        build_arg2.text = "--enable-url-protocols=http,https"
-        
-        return plugin
-    
-    def _add_rpm_plugin(self, plugins):
-        """Add Maven RPM plugin for Linux."""
-        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
-        
-        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
-        group_id.text = "org.codehaus.mojo"
-        
-        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
-        artifact_id.text = "rpm-maven-plugin"
-        
-        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
-        version.text = "2.2.0"
-        
-        configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
-        
-        name_elem = ET.SubElement(configuration, "{%s}name" % self.namespace)
-        name_elem.text = "${project.artifactId}"
-        
-        version_elem = ET.SubElement(configuration, "{%s}version" % self.namespace)
-        version_elem.text = "${project.version}"
-        
-        group_elem = ET.SubElement(configuration, "{%s}group" % self.namespace)
-        group_elem.text = "Applications/Development"
-        
-        packager = ET.SubElement(configuration, "{%s}packager" % self.namespace)
-        packager.text = "JDevtools"
-        
-        return plugin
-    
-    def _add_deb_plugin(self, plugins):
-        """Add Maven DEB plugin for Linux."""
-        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
-        
-        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
-        group_id.text = "org.vafer"
-        
-        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
-        artifact_id.text = "jdeb"
-        
-        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
-        version.text = "1.10"
-        
-        configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
-        
-        data_set = ET.SubElement(configuration, "{%s}dataSet" % self.namespace)
-        
-        data = ET.SubElement(data_set, "{%s}data" % self.namespace)
-        
-        src = ET.SubElement(data, "{%s}src" % self.namespace)
-        src.text = "${project.build.directory}/${project.build.finalName}.jar"
-        
-        type_elem = ET.SubElement(data, "{%s}type" % self.namespace)
-        type_elem.text = "file"
-        
-        mapper = ET.SubElement(data, "{%s}mapper" % self.namespace)
-        
-        mapper_type = ET.SubElement(mapper, "{%s}type" % self.namespace)
-        mapper_type.text = "perm"
-        
-        prefix = ET.SubElement(mapper, "{%s}prefix" % self.namespace)
-        prefix.text = "/usr/share/${project.artifactId}"
-        
-        return plugin
-    
-    def _merge_with_existing(self, new_root):
-        """
-        Merge new POM with existing POM file if provided.
-        
-        Args:
-            new_root: The new POM root element
-            
-        Returns:
-            Merged POM root element
-        """
-        if not self.existing_pom or not os.path.exists(self.existing_pom):
-            return new_root
-        
-        try:
-            tree = ET.parse(self.existing_pom)
-            existing_root = tree.getroot()
-            
-            # Merge basic project info if exists
-            for tag in ['groupId', 'artifactId', 'version', 'name', 'description']:
-                existing_elem = existing_root.find("{%s}%s" % (self.namespace, tag))
-                new_elem = new_root.find("{%s}%s" % (self.namespace, tag))
-                
-                if existing_elem is not None:
-                    if new_elem is not None:
-                        new_elem.text = existing_elem.text
-                    else:
-                        # Insert after modelVersion
-                        model_version = new_root.find("{%s}modelVersion" % self.namespace)
-                        idx = list(new_root).index(model_version) + 1
-                        new_root.insert(idx, existing_elem)
-            
-            # Merge properties
-            existing_props = existing_root.find("{%s}properties" % self.namespace)
-            new_props = new_root.find("{%s}properties" % self.namespace)
-            
-            if existing_props is not None and new_props is not None:
-                for prop in existing_props:
-                    prop_name = prop.tag.replace("{%s}" % self.namespace, "")
-                    existing_new_prop = new_props.find("{%s}%s" % (self.namespace, prop_name))
-                    if existing_new_prop is None:
-                        new_props.append(prop)
-            
-            # Merge dependencies if they exist
-            existing_deps = existing_root.find("{%s}dependencies" % self.namespace)
-            if existing_deps is not None:
-                new_deps = new_root.find("{%s}dependencies" % self.namespace)
-                if new_deps is None:
-                    new_root.append(existing_deps)
-                else:
-                    # Merge dependencies
-                    for dep in existing_deps:
-                        new_deps.append(dep)
-            
-            return new_root
-        except Exception as e:
-            print(f"Warning: Could not merge with existing POM: {e}")
-            return new_root
-    
-    def generate(self, output_path="pom.xml"):
-        """
-        Generate the POM file.
-        
-        Args:
-            output_path: Path where to save the generated POM file
-            
-        Returns:
-            Path to generated POM file
-        """
-        # Create base POM structure
-        root = self._create_base_pom()
-        
-        # Add properties
-        self._add_properties(root)
-        
-        # Add build section
-        build = ET.SubElement(root, "{%s}build" % self.namespace)
-        plugins = ET.SubElement(build, "{%s}plugins" % self.namespace)
-        
-        # Always add native image plugin
-        self._add_native_image_plugin(plugins)
-        
-        # Add platform-specific plugins
-        os_type = self._get_os_type()
-        if os_type == "linux":
-            self._add_rpm_plugin(plugins)
-            self._add_deb_plugin(plugins)
-            print("Added Linux-specific packaging plugins (RPM and DEB)")
-        
-        # Merge with existing POM if provided
-        root = self._merge_with_existing(root)
-        
-        # Pretty print the XML
-        xml_str = ET.tostring(root, encoding='unicode')
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-        
-        # Remove extra blank lines
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        pretty_xml = '\n'.join(lines)
-        
-        # Write to file
-        with open(output_path, 'w') as f:
-            f.write(pretty_xml)
-        
-        print(f"Generated POM file: {output_path}")
-        print(f"Platform: {os_type}")
-        print(f"Native image support: enabled")
-        
-        return output_path
+# Names that moved to other modules, resolved on first access
+_LAZY_EXPORTS = {
+    "PomGenerator": "jdevtools.pom_generator",
+}
+
+
+def __getattr__(name):
+    """Import moved names lazily, keeping ``import jdevtools.jcompile_dispatch`` cheap."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 
-def main():
+def _generator_options(args):
+    """Translate parsed command line arguments into PomGenerator options."""
+    return {
+        'use_cache': not args.force,
+        'resolve_parents': args.resolve_parents,
+        'repository': args.repository,
+        'native_profile': args.native_profile,
+        'native_threads': args.native_threads,
+        'native_memory': args.native_memory,
+        'jmh': args.jmh,
+        'jlink': args.jlink,
+        'appcds': args.appcds,
+    }
+
+
+def _print_next_steps(linux, jmh=False, jlink=False, appcds=False):
+    """Print what to do with a generated POM."""
+    print("\nNext steps:")
+    print("1. Review and customize the generated POM file")
+    print("2. Set the mainClass property for native image generation")
+    print("3. Run 'mvn clean package native:compile' to build native image")
+    print("   (add -Pnative-release or -Pnative-size for optimized builds)")
+    if jmh:
+        print("   Run 'jbench' to run the JMH benchmarks and compare with the baseline")
+    if linux:
+        package = "package " if jlink or appcds else ""
+        print("4. Run 'mvn %srpm:rpm' to create RPM package" % package)
+        print("5. Run 'mvn %sjdeb:jdeb' to create DEB package" % package)
+
+
+def main(argv=None):
     """Main entry point for jcompile-dispatch."""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Only a leading --version skips argparse; anywhere else it may be an
+    # option value (--output --version) that argparse has to reject
+    if argv[:1] == ["--version"]:
+        print(f"jcompile-dispatch {__version__}")
+        return 0
+    
+    # A repeated plain run is answered from the stamp next to the cache
+    # sidecar, before argparse and the generator are imported
+    from jdevtools import pom_stamp
+    output_path = pom_stamp.is_noop(argv)
+    if output_path is not None:
+        options = pom_stamp.plain_options(argv)
+        print(f"POM file up to date: {output_path}")
+        _print_next_steps(sys.platform.startswith("linux"),
+                          jlink=options.get("--jlink", False),
+                          appcds=options.get("--appcds", False))
+        return 0
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Java compilation dispatcher with native image and packaging support",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -306,6 +102,9 @@ Examples:
   
   # Generate POM in current directory
   jcompile-dispatch
+  
+  # Regenerate every module POM of a reactor in place
+  jcompile-dispatch --batch . --jobs 8
         """
     )
     
@@ -321,26 +120,139 @@ Examples:
         default='pom.xml'
     )
     
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate and rewrite the POM even if nothing changed'
+    )
+    
+    parser.add_argument(
+        '--native-profile',
+        metavar='{dev,release,size}',
+        default='dev',
+        help='Default native-image build profile (default: dev)'
+    )
+    
+    parser.add_argument(
+        '--native-threads',
+        type=int,
+        metavar='N',
+        default=None,
+        help='Worker threads for native-image builds (default: all cores)'
+    )
+    
+    parser.add_argument(
+        '--native-memory',
+        metavar='SIZE',
+        default=None,
+        help='Memory cap for native-image builds, e.g. 8g (default: per profile)'
+    )
+    
+    parser.add_argument(
+        '--resolve-parents',
+        action='store_true',
+        help='Skip properties and dependencies already inherited from parent POMs and BOMs'
+    )
+    
+    parser.add_argument(
+        '--repository',
+        metavar='DIR',
+        help='Local Maven repository used to resolve parents (default: ~/.m2/repository)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--maven-config',
+        action='store_true',
+        help='Also write startup-tuned .mvn/jvm.config and .mvn/maven.config'
+    )
+    
+    parser.add_argument(
+        '--build-cache',
+        nargs='?',
+        const='',
+        metavar='DIR',
+        default=None,
+        help='Enable the local Maven build cache in .mvn/ '
+             '(default DIR: the extension default, ~/.m2/build-cache)'
+    )
+    
+    parser.add_argument(
+        '--jmh',
+        action='store_true',
+        help='Add a "jmh" profile running JMH benchmarks from src/jmh/java (see jbench)'
+    )
+    
+    parser.add_argument(
+        '--jlink',
+        action='store_true',
+        help='Build a minimal jlink runtime during package and ship it in the DEB/RPM packages'
+    )
+    
+    parser.add_argument(
+        '--appcds',
+        action='store_true',
+        help='Dump an application CDS archive from a training run of mainClass and start '
+             'the packaged app with it (implies --jlink)'
+    )
+    
+    parser.add_argument(
+        '--batch',
+        metavar='ROOT',
+        help='Regenerate the POM of every module reachable from ROOT/pom.xml in place',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Number of worker processes for --batch (default: CPU count)',
+        default=None
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
-        version='jcompile-dispatch 0.1.0'
+        version=f'jcompile-dispatch {__version__}'
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    # Deferred until generation actually runs
+    from jdevtools.pom_generator import PomGenerator
+    
+    if args.native_profile not in PomGenerator.NATIVE_PROFILES:
+        parser.error("argument --native-profile: invalid choice: %r (choose from %s)" % (
+            args.native_profile, ", ".join(sorted(PomGenerator.NATIVE_PROFILES))))
+    
+    if args.batch:
+        from jdevtools.reactor import run_batch
+        try:
+            result = run_batch(args.batch, jobs=args.jobs,
+                               generator_options=_generator_options(args))
+            # .mvn/ belongs to the reactor root, not to every module
+            if args.maven_config:
+                from jdevtools.jvmconfig import write_maven_configs
+                write_maven_configs(args.batch)
+            if args.build_cache is not None:
+                from jdevtools.build_cache import write_build_cache_config
+                write_build_cache_config(args.batch, args.build_cache or None)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 1 if result.counts["failed"] else 0
     
     try:
-        generator = PomGenerator(existing_pom=args.existing)
+        generator = PomGenerator(existing_pom=args.existing,
+                                 maven_config=args.maven_config,
+                                 build_cache=args.build_cache is not None,
+                                 build_cache_dir=args.build_cache or None,
+                                 **_generator_options(args))
         output_file = generator.generate(output_path=args.output)
+        pom_stamp.record(argv)
         
-        print("\nNext steps:")
-        print("1. Review and customize the generated POM file")
-        print("2. Set the mainClass property for native image generation")
-        print("3. Run 'mvn clean package native:compile' to build native image")
-        if generator._get_os_type() == "linux":
-            print("4. Run 'mvn rpm:rpm' to create RPM package")
-            print("5. Run 'mvn jdeb:jdeb' to create DEB package")
-        
+        _print_next_steps(generator._get_os_type() == "linux",
+                          jmh=args.jmh, jlink=args.jlink, appcds=args.appcds)
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+jbench - Run JMH benchmarks and compare them with a stored baseline.
+
+Runs the benchmarks of the ``jmh`` profile emitted by
+``jcompile-dispatch --jmh``, reads JMH's JSON result file and compares every
+benchmark with the baseline, by default ``jmh-baseline.json`` in the project.
+
+A benchmark counts as regressed only when both hold:
+
+- its score got worse by more than the threshold (default 5%), in the
+  direction of its mode: lower throughput, or higher time per operation
+- the 99.9% confidence intervals JMH reports for the baseline and the new
+  score do not overlap, so the difference is not measurement noise
+
+The exit status is 1 when a benchmark regressed. The first run, and every
+run with ``--save-baseline``, stores its results as the new baseline.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+
+from jdevtools.pgo import maven_command
+
+BASELINE_FILE = "jmh-baseline.json"
+RESULT_FILE = os.path.join("target", "jmh-result.json")
+DEFAULT_THRESHOLD = 0.05
+
+# JMH modes whose score is a rate; all other modes measure time per operation
+HIGHER_IS_BETTER = ("thrpt",)
+
+
+def benchmark_key(entry):
+    """Return the name identifying a benchmark result: method, mode and parameters."""
+    key = "%s [%s]" % (entry["benchmark"], entry.get("mode", ""))
+    params = entry.get("params")
+    if params:
+        key += " " + ",".join("%s=%s" % item for item in sorted(params.items()))
+    return key
+
+
+class Measurement:
+    """Score of one benchmark with JMH's confidence interval."""
+
+    def __init__(self, mode, score, error, unit):
+        self.mode = mode
+        self.score = score
+        # Half-width of the 99.9% confidence interval; NaN for single samples
+        self.error = error if error is not None and not math.isnan(error) else 0.0
+        self.unit = unit
+
+    @classmethod
+    def from_json(cls, entry):
+        """Create a measurement from one entry of a JMH JSON result file."""
+        metric = entry["primaryMetric"]
+        error = metric.get("scoreError")
+        return cls(entry.get("mode", ""), float(metric["score"]),
+                   float(error) if error not in (None, "NaN") else None,
+                   metric.get("scoreUnit", ""))
+
+    @property
+    def interval(self):
+        """Confidence interval of the score."""
+        return self.score - self.error, self.score + self.error
+
+    def improvement(self, baseline):
+        """Relative change against a baseline; positive means faster."""
+        if not baseline.score:
+            return 0.0
+        change = (self.score - baseline.score) / baseline.score
+        return change if self.mode in HIGHER_IS_BETTER else -change
+
+    def overlaps(self, other):
+        """Whether the confidence intervals of two measurements overlap."""
+        low, high = self.interval
+        other_low, other_high = other.interval
+        return low <= other_high and other_low <= high
+
+
+def load_results(path):
+    """
+    Read a JMH JSON result file.
+
+    Returns:
+        Dict of benchmark key -> Measurement
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    return {benchmark_key(entry): Measurement.from_json(entry) for entry in entries}
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare benchmark results with a baseline.
+
+    Args:
+        baseline: Dict of key -> Measurement from load_results()
+        current: Dict of key -> Measurement of the new run
+        threshold: Relative change below which differences are ignored
+
+    Returns:
+        List of (key, baseline, current, change, verdict) rows, where verdict
+        is "ok", "improved", "regressed", "new", "not run" or "unit changed"
+    """
+    rows = []
+    for key in sorted(set(baseline) | set(current)):
+        before, after = baseline.get(key), current.get(key)
+        if before is None:
+            rows.append((key, None, after, None, "new"))
+        elif after is None:
+            rows.append((key, before, None, None, "not run"))
+        elif before.unit != after.unit or before.mode != after.mode:
+            rows.append((key, before, after, None, "unit changed"))
+        else:
+            change = after.improvement(before)
+            verdict = "ok"
+            if abs(change) > threshold and not after.overlaps(before):
+                verdict = "improved" if change > 0 else "regressed"
+            rows.append((key, before, after, change, verdict))
+    return rows
+
+
+def format_report(rows):
+    """Format comparison rows as a table."""
+    def score(measurement):
+        if measurement is None:
+            return "-"
+        return "%.3f ± %.3f %s" % (measurement.score, measurement.error, measurement.unit)
+
+    width = max([len("benchmark")] + [len(row[0]) for row in rows])
+    lines = ["%-*s  %28s  %28s  %8s  %s" % (width, "benchmark", "baseline", "current",
+                                             "change", "verdict")]
+    for key, before, after, change, verdict in rows:
+        lines.append("%-*s  %28s  %28s  %8s  %s" % (
+            width, key, score(before), score(after),
+            "%+.1f%%" % (change * 100.0) if change is not None else "",
+            verdict.upper() if verdict == "regressed" else verdict))
+    return "\n".join(lines)
+
+
+def run_benchmarks(project_dir, include=None, jmh_args=None, out=None):
+    """
+    Compile and run the JMH benchmarks of a project.
+
+    Args:
+        project_dir: Maven project directory
+        include: Regular expression selecting benchmarks (default: all)
+        jmh_args: Extra JMH command line options, e.g. "-f 1 -wi 2"
+        out: Stream for progress messages (default: stdout)
+
+    Returns:
+        Path of the JSON result file
+    """
+    out = out or sys.stdout
+    project_dir = os.path.abspath(project_dir)
+    result = os.path.join(project_dir, RESULT_FILE)
+    args = " ".join(arg for arg in (jmh_args, include) if arg)
+    command = maven_command(project_dir) + [
+        "-Pjmh", "-DskipTests", "-Djmh.result=%s" % result, "-Djmh.args=%s" % args,
+        "test-compile", "exec:exec@run-benchmarks"]
+    print("[jbench] %s" % " ".join(command), file=out)
+    if os.path.exists(result):
+        os.remove(result)
+    subprocess.run(command, cwd=project_dir, check=True)
+    if not os.path.isfile(result):
+        raise RuntimeError("JMH did not write %s" % result)
+    return result
+
+
+def main(argv=None):
+    """Main entry point for jbench."""
+    parser = argparse.ArgumentParser(
+        prog="jbench",
+        description="Run JMH benchmarks and compare them with a stored baseline",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run all benchmarks and compare with jmh-baseline.json
+  jbench
+
+  # Quick run of one benchmark class with a single fork
+  jbench --include 'ParserBenchmark' --jmh-args "-f 1 -wi 2 -i 3"
+
+  # Compare a result file from CI without running anything
+  jbench --results target/jmh-result.json --threshold 0.10
+        """
+    )
+    parser.add_argument('--project', default='.',
+                        help='Maven project directory (default: current directory)')
+    parser.add_argument('--baseline', default=None,
+                        help='Baseline file (default: <project>/%s)' % BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative slowdown tolerated before a benchmark counts as '
+                             'regressed (default: %.2f)' % DEFAULT_THRESHOLD)
+    parser.add_argument('--include', default=None,
+                        help='Regular expression selecting the benchmarks to run')
+    parser.add_argument('--jmh-args', default=None,
+                        help='Extra JMH options, e.g. "-f 1 -wi 2 -i 3"')
+    parser.add_argument('--results', default=None,
+                        help='Compare an existing JMH JSON result file instead of running')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    project_dir = os.path.abspath(args.project)
+    baseline_path = args.baseline or os.path.join(project_dir, BASELINE_FILE)
+    try:
+        results_path = args.results or run_benchmarks(project_dir, args.include, args.jmh_args)
+        current = load_results(results_path)
+        if not os.path.exists(baseline_path) or args.save_baseline:
+            shutil.copyfile(results_path, baseline_path)
+            print("[jbench] Saved %d benchmark result(s) as the baseline: %s"
+                  % (len(current), baseline_path))
+            return 0
+        rows = compare(load_results(baseline_path), current, args.threshold)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(format_report(rows))
+    regressed = [row[0] for row in rows if row[4] == "regressed"]
+    if regressed:
+        print("[jbench] %d benchmark(s) regressed by more than %.0f%%"
+              % (len(regressed), args.threshold * 100.0), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
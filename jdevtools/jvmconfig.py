@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Maven JVM startup tuning and AppCDS archive management.
+
+Writes startup-oriented flags to ``.mvn/jvm.config`` and ``.mvn/maven.config``
+and maintains a class-data-sharing archive of Maven's own classes in
+``.mvn/maven-cds.jsa``:
+
+- JDK 19+: ``-XX:+AutoCreateSharedArchive`` lets the JVM create and refresh
+  the archive itself.
+- JDK 13-18: the archive is dumped with ``-XX:ArchiveClassesAtExit`` during a
+  training run and recreated when the JDK or Maven distribution changes.
+- Older JDKs only get the non-CDS flags.
+
+The launchers pass ``jvm.config`` to the JVM verbatim, without expanding
+variables, so the archive is named by its absolute path. That makes
+``jvm.config`` specific to the checkout: it is regenerated here and listed,
+together with the archive, in ``.mvn/.gitignore``.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ARCHIVE_NAME = "maven-cds.jsa"
+STAMP_NAME = "maven-cds.stamp"
+
+# Files in .mvn/ that only hold for this checkout and JDK
+CHECKOUT_FILES = ["jvm.config", ARCHIVE_NAME, STAMP_NAME]
+
+# Flags that shorten JVM startup for short-lived Maven invocations
+STARTUP_JVM_FLAGS = [
+    "-XX:+UseSerialGC",
+    "-XX:TieredStopAtLevel=1",
+    "-Xss1m",
+]
+
+STARTUP_MAVEN_FLAGS = [
+    "--no-transfer-progress",
+]
+
+_GC_FLAG_RE = re.compile(r"^-XX:\+Use\w*GC$")
+_VERSION_RE = re.compile(r'version "([^"]+)"')
+
+# Training run that loads Maven's core, model building and lifecycle classes
+DEFAULT_TRAINING_ARGS = ["-q", "-o", "validate"]
+
+
+def flag_key(flag):
+    """
+    Return the identity of a JVM flag, so conflicting values are detected.
+
+    ``-XX:+Foo``/``-XX:-Foo``/``-XX:Foo=1`` share the key ``Foo``, all GC
+    selection flags share ``GC``, and ``-Xss1m`` has the key ``-Xss``.
+    """
+    if _GC_FLAG_RE.match(flag):
+        return "GC"
+    if flag.startswith("-XX:"):
+        name = flag[4:].lstrip("+-")
+        return name.split("=", 1)[0]
+    for prefix in ("-Xss", "-Xmx", "-Xms", "-Xshare:"):
+        if flag.startswith(prefix):
+            return prefix
+    return flag.split("=", 1)[0]
+
+
+def merge_flags(existing, wanted):
+    """
+    Append ``wanted`` flags to ``existing`` ones unless already configured.
+
+    Flags the user already set (by key) are left untouched.
+
+    Args:
+        existing: Flags currently in the config file
+        wanted: Flags to add
+
+    Returns:
+        Merged list of flags
+    """
+    keys = {flag_key(flag) for flag in existing}
+    merged = list(existing)
+    for flag in wanted:
+        if flag_key(flag) not in keys:
+            keys.add(flag_key(flag))
+            merged.append(flag)
+    return merged
+
+
+def parse_java_version(output):
+    """
+    Parse the output of ``java -version``.
+
+    Returns:
+        Tuple ``(major, full_version)`` or ``(None, None)``
+    """
+    match = _VERSION_RE.search(output)
+    if not match:
+        return None, None
+    full = match.group(1)
+    parts = full.split(".")
+    major = int(parts[1]) if parts[0] == "1" else int(re.match(r"\d+", parts[0]).group(0))
+    return major, full
+
+
+def _read_flags(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().split()
+    except OSError:
+        return []
+
+
+def _write_if_changed(path, content):
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
+
+
+class MavenJvmConfigurator:
+    """Generates Maven JVM configuration and its CDS archive for one project."""
+
+    def __init__(self, project_dir=".", mvn=None, java=None, out=None):
+        """
+        Initialize the configurator.
+
+        Args:
+            project_dir: Project directory containing (or receiving) ``.mvn/``
+            mvn: Maven executable (default: the project's mvnw, else mvn)
+            java: Java executable (default: $JAVA_HOME/bin/java, else java)
+            out: Stream for progress messages (default: stdout)
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.mvn_dir = os.path.join(self.project_dir, ".mvn")
+        if mvn is None:
+            wrapper = os.path.join(self.project_dir, "mvnw.cmd" if os.name == "nt" else "mvnw")
+            mvn = wrapper if os.path.isfile(wrapper) else "mvn"
+        self.mvn = mvn
+        if java is None:
+            java_home = os.environ.get("JAVA_HOME")
+            java = os.path.join(java_home, "bin", "java") if java_home else "java"
+        self.java = java
+        self.out = out or sys.stdout
+        self.archive = os.path.join(self.mvn_dir, ARCHIVE_NAME)
+        self._java_version = None
+
+    def _log(self, message):
+        print("[jconfigure] %s" % message, file=self.out)
+
+    def java_version(self):
+        """Return ``(major, full_version)`` of the configured JDK."""
+        if self._java_version is None:
+            try:
+                result = subprocess.run([self.java, "-version"], stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT, universal_newlines=True)
+                self._java_version = parse_java_version(result.stdout)
+            except OSError:
+                self._java_version = (None, None)
+        return self._java_version
+
+    def cds_flags(self):
+        """Return the CDS flags supported by the configured JDK."""
+        major, _ = self.java_version()
+        if major is None or major < 13:
+            return []
+        if major >= 19:
+            return ["-XX:+AutoCreateSharedArchive",
+                    "-XX:SharedArchiveFile=%s" % self.archive]
+        if os.path.isfile(self.archive):
+            return ["-XX:SharedArchiveFile=%s" % self.archive]
+        return []
+
+    def jvm_flags(self):
+        """Return the merged contents of ``.mvn/jvm.config`` as a flag list."""
+        existing = _read_flags(os.path.join(self.mvn_dir, "jvm.config"))
+        # Archive flags are owned by this tool and recomputed every time
+        existing = [f for f in existing if ARCHIVE_NAME not in f and
+                    flag_key(f) != "AutoCreateSharedArchive"]
+        return merge_flags(existing, STARTUP_JVM_FLAGS + self.cds_flags())
+
+    def write_configs(self):
+        """
+        Write ``.mvn/jvm.config``, ``.mvn/maven.config`` and ``.mvn/.gitignore``.
+
+        Returns:
+            List of files that changed
+        """
+        changed = []
+        jvm_config = os.path.join(self.mvn_dir, "jvm.config")
+        if _write_if_changed(jvm_config, " ".join(self.jvm_flags()) + "\n"):
+            changed.append(jvm_config)
+
+        maven_config = os.path.join(self.mvn_dir, "maven.config")
+        flags = merge_flags(_read_flags(maven_config), STARTUP_MAVEN_FLAGS)
+        if _write_if_changed(maven_config, " ".join(flags) + "\n"):
+            changed.append(maven_config)
+
+        # Keep the checkout-specific files out of version control
+        gitignore = os.path.join(self.mvn_dir, ".gitignore")
+        try:
+            with open(gitignore, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            lines = []
+        lines += [name for name in CHECKOUT_FILES if name not in lines]
+        if _write_if_changed(gitignore, "\n".join(lines) + "\n"):
+            changed.append(gitignore)
+        return changed
+
+    def _stamp(self):
+        """Fingerprint what the archive depends on: JDK, Maven and JVM flags."""
+        digest = hashlib.sha256()
+        digest.update(repr(self.java_version()).encode("utf-8"))
+        wrapper_props = os.path.join(self.mvn_dir, "wrapper", "maven-wrapper.properties")
+        try:
+            with open(wrapper_props, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(self.mvn.encode("utf-8"))
+        digest.update(" ".join(STARTUP_JVM_FLAGS).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _run_maven(self, args, extra_opts=None):
+        env = dict(os.environ)
+        if extra_opts:
+            env["MAVEN_OPTS"] = (" ".join(extra_opts) + " " + env.get("MAVEN_OPTS", "")).strip()
+        return subprocess.run([self.mvn] + list(args), cwd=self.project_dir, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+
+    def _training_args(self):
+        # validate needs a project; fall back to --version outside of one
+        if os.path.isfile(os.path.join(self.project_dir, "pom.xml")):
+            return DEFAULT_TRAINING_ARGS
+        return ["--version"]
+
+    def refresh_archive(self, force=False):
+        """
+        Create or refresh the CDS archive of Maven's classes.
+
+        Args:
+            force: Recreate even if the archive is up to date
+
+        Returns:
+            True if the archive was (re)created
+        """
+        major, full = self.java_version()
+        if major is None or major < 13:
+            self._log("JDK %s does not support dynamic CDS archives; skipping" % (full or "?"))
+            return False
+
+        stamp_path = os.path.join(self.mvn_dir, STAMP_NAME)
+        stamp = self._stamp()
+        try:
+            with open(stamp_path, encoding="utf-8") as f:
+                current = json.load(f).get("stamp")
+        except (OSError, ValueError):
+            current = None
+        if not force and current == stamp and os.path.isfile(self.archive):
+            self._log("CDS archive is up to date")
+            return False
+
+        if os.path.exists(self.archive):
+            os.remove(self.archive)
+        # Without an archive on disk, JDK 13-18 get no archive flags, so the
+        # dump run does not also try to map one from jvm.config
+        self.write_configs()
+        if major >= 19:
+            # The JVM dumps the archive itself when the first run exits
+            self._run_maven(self._training_args())
+        else:
+            self._run_maven(self._training_args(),
+                            ["-XX:ArchiveClassesAtExit=%s" % self.archive])
+        self.write_configs()
+
+        if not os.path.isfile(self.archive):
+            self._log("Warning: training run did not produce %s" % self.archive)
+            return False
+        with open(stamp_path, "w", encoding="utf-8") as f:
+            json.dump({"stamp": stamp, "java": full}, f)
+        self._log("CDS archive created: %s" % os.path.relpath(self.archive, self.project_dir))
+        return True
+
+    def measure(self, runs=3):
+        """
+        Compare cold-start time of Maven without and with the tuned configuration.
+
+        Returns:
+            Tuple ``(baseline_seconds, tuned_seconds)`` (medians)
+        """
+        def median_time():
+            durations = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                self._run_maven(self._training_args())
+                durations.append(time.perf_counter() - start)
+            durations.sort()
+            return durations[len(durations) // 2]
+
+        jvm_config = os.path.join(self.mvn_dir, "jvm.config")
+        try:
+            os.replace(jvm_config, jvm_config + ".tuned")
+            baseline = median_time()
+        finally:
+            os.replace(jvm_config + ".tuned", jvm_config)
+        tuned = median_time()
+
+        self._log("Maven cold start: %.0f ms default, %.0f ms tuned (%+.1f%%)" % (
+            baseline * 1000, tuned * 1000, (tuned - baseline) / baseline * 100.0))
+        return baseline, tuned
+
+
+def write_maven_configs(project_dir, java=None):
+    """
+    Write the startup-tuned ``.mvn`` configuration for a project.
+
+    Used by the POM generator; does not run Maven.
+
+    Returns:
+        List of files that changed
+    """
+    return MavenJvmConfigurator(project_dir, java=java).write_configs()
+
+
+def main(argv=None):
+    """Main entry point for Maven JVM tuning."""
+    parser = argparse.ArgumentParser(
+        description="Tune Maven JVM startup and maintain an AppCDS archive")
+    parser.add_argument('--project', default='.',
+                        help='Project directory (default: current directory)')
+    parser.add_argument('--mvn', default=None,
+                        help='Maven executable (default: ./mvnw, then mvn)')
+    parser.add_argument('--force', action='store_true',
+                        help='Recreate the CDS archive even if it is up to date')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Runs per configuration when measuring (default: 3)')
+    parser.add_argument('--no-measure', action='store_true',
+                        help='Skip the cold-start measurement')
+    args = parser.parse_args(argv)
+
+    try:
+        configurator = MavenJvmConfigurator(args.project, mvn=args.mvn)
+        for path in configurator.write_configs():
+            configurator._log("Wrote %s" % os.path.relpath(path, configurator.project_dir))
+        configurator.refresh_archive(force=args.force)
+        if not args.no_measure:
+            configurator.measure(runs=args.runs)
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
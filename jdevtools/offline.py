@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+"""
+Offline readiness of a project against the local Maven repository.
+
+Keeps an index of the artifacts in the local repository, refreshed
+incrementally: only directories whose mtime changed since the last refresh
+are listed again. A project is ready for offline builds when every artifact
+Maven needs for the requested goals is in the index:
+
+- the parent POMs and imported BOMs of every reactor module
+- dependencies in the scopes the goals resolve, and their compile and
+  runtime dependencies, following the local POMs
+- the plugins of every module, its parents and its active profiles, and the
+  default lifecycle plugins bound by the goals, with their dependencies;
+  versions come from ``<plugins>`` and ``<pluginManagement>``, else from the
+  defaults of the wrapper's Maven version
+- surefire's JUnit Platform provider when tests run on the JUnit Platform
+- core extensions registered in ``.mvn/extensions.xml``
+
+The check is conservative: a version that cannot be resolved (unknown
+property, version range, plugin prefix not declared in the project, plugin
+without a version and no known default) makes the project not ready.
+Profiles are active when selected with ``-P`` among the goals, through a
+``-D`` property condition, ``activeByDefault``, or a jdk, os or file
+condition, which is assumed to hold. Only their plugins are considered.
+
+Usage:
+    python3 -m jdevtools.offline --project . index
+    python3 -m jdevtools.offline --project . check --goals "clean compile"
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+
+from jdevtools.build_profile import short_plugin_name
+from jdevtools.effective import (DEFAULT_REPOSITORY, dependency_id, get_resolver,
+                                 interpolate, project_index_path)
+from jdevtools.pom_merge import DEFAULT_PLUGIN_GROUP, local_name
+
+INDEX_NAME = ".jdevtools-artifact-index.json"
+INDEX_FORMAT = 1
+
+# Exit status of ``check`` when something is missing
+NOT_READY = 2
+
+# Files that do not make an artifact available
+_IGNORED_SUFFIXES = (".lastUpdated", ".part", ".tmp", ".lock", ".sha1", ".md5",
+                     ".sha256", ".sha512", ".asc")
+_SNAPSHOT_STAMP_RE = re.compile(r"^\d{8}\.\d{6}-\d+")
+
+# Dependency type -> (classifier, extension) of the file it resolves to
+TYPE_FILES = {
+    "jar": ("", "jar"),
+    "pom": ("", "pom"),
+    "maven-plugin": ("", "jar"),
+    "test-jar": ("tests", "jar"),
+    "ejb": ("", "jar"),
+    "ejb-client": ("client", "jar"),
+    "bundle": ("", "jar"),
+    "war": ("", "war"),
+    "ear": ("", "ear"),
+    "java-source": ("sources", "jar"),
+    "javadoc": ("javadoc", "jar"),
+}
+
+DEFAULT_PHASES = [
+    "validate", "initialize", "generate-sources", "process-sources",
+    "generate-resources", "process-resources", "compile", "process-classes",
+    "generate-test-sources", "process-test-sources", "generate-test-resources",
+    "process-test-resources", "test-compile", "process-test-classes", "test",
+    "prepare-package", "package", "pre-integration-test", "integration-test",
+    "post-integration-test", "verify", "install", "deploy",
+]
+
+# Plugins bound to the default lifecycle of jar packaging
+LIFECYCLE_PLUGINS = [
+    ("process-resources", "maven-resources-plugin"),
+    ("compile", "maven-compiler-plugin"),
+    ("test", "maven-surefire-plugin"),
+    ("package", "maven-jar-plugin"),
+    ("install", "maven-install-plugin"),
+    ("deploy", "maven-deploy-plugin"),
+]
+CLEAN_PLUGIN = "maven-clean-plugin"
+SUREFIRE_PLUGIN = "maven-surefire-plugin"
+
+# Versions Maven binds to plugins declared without one, per Maven version
+# (maven-core's default-bindings.xml)
+DEFAULT_PLUGIN_VERSIONS = {
+    "3.9.6": {
+        "maven-clean-plugin": "3.2.0",
+        "maven-resources-plugin": "3.3.1",
+        "maven-compiler-plugin": "3.11.0",
+        "maven-surefire-plugin": "3.2.2",
+        "maven-jar-plugin": "3.3.0",
+        "maven-install-plugin": "3.1.1",
+        "maven-deploy-plugin": "3.1.1",
+    },
+}
+
+# Provider surefire loads at test time for JUnit Platform tests
+SUREFIRE_GROUP = "org.apache.maven.surefire"
+JUNIT_PLATFORM_PROVIDER = "surefire-junit-platform"
+JUNIT_PLATFORM_GROUPS = ("org.junit.jupiter", "org.junit.platform", "org.junit.vintage")
+
+_WRAPPER_MAVEN_RE = re.compile(r"apache-maven-([^/]+?)-bin\.(?:zip|tar\.gz)")
+
+# Dependency scopes resolved up to a phase
+_COMPILE_SCOPES = ("compile", "provided", "system")
+_TEST_SCOPES = _COMPILE_SCOPES + ("runtime", "test")
+
+
+def local_repository(settings_path=None):
+    """
+    Return the local repository configured in the user's Maven settings.
+
+    Args:
+        settings_path: settings.xml to read (default: ~/.m2/settings.xml)
+
+    Returns:
+        The ``<localRepository>`` directory, or ~/.m2/repository
+    """
+    settings_path = settings_path or os.path.join(os.path.expanduser("~"), ".m2", "settings.xml")
+    try:
+        root = ET.parse(settings_path).getroot()
+    except (OSError, ET.ParseError):
+        return DEFAULT_REPOSITORY
+    for elem in root:
+        if isinstance(elem.tag, str) and local_name(elem.tag) == "localRepository" \
+                and elem.text and elem.text.strip():
+            return os.path.expanduser(interpolate(elem.text.strip(),
+                                                  {"user.home": os.path.expanduser("~")}))
+    return DEFAULT_REPOSITORY
+
+
+def artifact_suffix(type_="jar", classifier=""):
+    """Return the file name suffix after ``<artifactId>-<version>`` for a type."""
+    default_classifier, extension = TYPE_FILES.get(type_ or "jar", ("", type_))
+    classifier = classifier or default_classifier
+    return "%s.%s" % ("-" + classifier if classifier else "", extension)
+
+
+def _version_key(version):
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part)
+            for part in re.split(r"[.\-]", version)]
+
+
+def _version_suffixes(artifact_id, version, names):
+    """Return the file suffixes of the artifact files in a version directory."""
+    prefixes = ["%s-%s" % (artifact_id, version)]
+    if version.endswith("-SNAPSHOT"):
+        # Snapshots downloaded from a remote repository carry a timestamp
+        prefixes.append("%s-%s-" % (artifact_id, version[:-len("-SNAPSHOT")]))
+    suffixes = set()
+    for name in names:
+        if name.endswith(_IGNORED_SUFFIXES):
+            continue
+        if name.startswith(prefixes[0]):
+            suffixes.add(name[len(prefixes[0]):])
+        elif len(prefixes) > 1 and name.startswith(prefixes[1]):
+            stamp = _SNAPSHOT_STAMP_RE.match(name[len(prefixes[1]):])
+            if stamp:
+                suffixes.add(name[len(prefixes[1]) + stamp.end():])
+    return sorted(suffixes)
+
+
+class RepositoryIndex:
+    """Artifacts available in a local Maven repository."""
+
+    def __init__(self, repository=None, index_path=None):
+        """
+        Initialize the index.
+
+        Args:
+            repository: Local repository directory (default: from settings.xml)
+            index_path: On-disk index (default: inside the repository)
+        """
+        self.repository = repository or local_repository()
+        self.index_path = index_path or os.path.join(self.repository, INDEX_NAME)
+        # Relative directory -> [mtime_ns, subdirectories, artifact file suffixes]
+        self.dirs = {}
+        self.reread = 0
+        self._artifacts = None
+        self._versions = None
+
+    def load(self):
+        """Load the on-disk index; a missing or stale file leaves it empty."""
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == INDEX_FORMAT and data.get("repository") == self.repository:
+                self.dirs = data.get("dirs", {})
+        except (OSError, ValueError):
+            self.dirs = {}
+        self._artifacts = None
+        return self
+
+    def save(self):
+        """Write the index atomically."""
+        tmp_path = "%s.%d.%d.tmp" % (self.index_path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": INDEX_FORMAT, "repository": self.repository,
+                           "dirs": self.dirs}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # The index is an optimization; the next refresh rebuilds it
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _read_dir(self, rel, path, mtime_ns):
+        subdirs, files = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                else:
+                    files.append(entry.name)
+        parts = rel.split("/")
+        suffixes = []
+        if files and len(parts) >= 3:
+            suffixes = _version_suffixes(parts[-2], parts[-1], files)
+        return [mtime_ns, sorted(subdirs), suffixes]
+
+    def refresh(self):
+        """
+        Bring the index up to date with the repository.
+
+        A directory is listed again only when its mtime changed, which it
+        does whenever an entry is added to or removed from it.
+
+        Returns:
+            Number of directories that were listed again
+        """
+        old, new = self.dirs, {}
+        self.reread = 0
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.repository, *rel.split("/")) if rel else self.repository
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+                entry = old.get(rel)
+                if entry is None or entry[0] != mtime_ns:
+                    entry = self._read_dir(rel, path, mtime_ns)
+                    self.reread += 1
+            except OSError:
+                continue
+            new[rel] = entry
+            stack.extend(rel + "/" + name if rel else name for name in entry[1])
+        self.dirs = new
+        self._artifacts = None
+        return self.reread
+
+    def _build_lookup(self):
+        self._artifacts, self._versions = {}, {}
+        for rel, (_, _, suffixes) in self.dirs.items():
+            if not suffixes:
+                continue
+            parts = rel.split("/")
+            group_artifact = "%s:%s" % (".".join(parts[:-2]), parts[-2])
+            self._artifacts["%s:%s" % (group_artifact, parts[-1])] = set(suffixes)
+            self._versions.setdefault(group_artifact, []).append(parts[-1])
+
+    @property
+    def artifact_count(self):
+        """Number of artifact versions in the index."""
+        if self._artifacts is None:
+            self._build_lookup()
+        return len(self._artifacts)
+
+    def has(self, group_id, artifact_id, version, suffix=".pom"):
+        """Check whether a file of an artifact is in the repository."""
+        if self._artifacts is None:
+            self._build_lookup()
+        return suffix in self._artifacts.get("%s:%s:%s" % (group_id, artifact_id, version), ())
+
+    def versions(self, group_id, artifact_id):
+        """Return the indexed versions of an artifact, newest first."""
+        if self._artifacts is None:
+            self._build_lookup()
+        return sorted(self._versions.get("%s:%s" % (group_id, artifact_id), ()),
+                      key=_version_key, reverse=True)
+
+
+def goal_phases(goals):
+    """
+    Split Maven goals into lifecycle phases and plugin goals.
+
+    Returns:
+        Tuple of (whether clean runs, last default-lifecycle phase or None,
+        list of ``prefix:goal`` or ``groupId:artifactId[:version]:goal`` goals)
+    """
+    clean, last, plugin_goals = False, None, []
+    for goal in goals:
+        if goal.startswith("-"):
+            # Options such as -Pprofile or -Dname=a:b are not goals
+            continue
+        if goal in ("pre-clean", "clean", "post-clean"):
+            clean = True
+        elif goal in DEFAULT_PHASES:
+            if last is None or DEFAULT_PHASES.index(goal) > DEFAULT_PHASES.index(last):
+                last = goal
+        elif ":" in goal:
+            plugin_goals.append(goal)
+    return clean, last, plugin_goals
+
+
+def goal_options(goals):
+    """
+    Read the profile and property options given among Maven goals.
+
+    Returns:
+        Tuple of (profile ids activated with -P, profile ids deactivated with
+        ``-P!id`` or ``-P-id``, dict of ``-D`` properties)
+    """
+    enabled, disabled, properties = set(), set(), {}
+    goals = list(goals)
+    for i, goal in enumerate(goals):
+        if goal in ("-P", "--activate-profiles", "-D", "--define"):
+            value = goals[i + 1] if i + 1 < len(goals) else ""
+            option = goal[:2] if goal.startswith("-") and len(goal) == 2 else \
+                ("-P" if goal == "--activate-profiles" else "-D")
+        elif goal[:2] in ("-P", "-D"):
+            option, value = goal[:2], goal[2:]
+        else:
+            continue
+        if option == "-D":
+            name, _, prop_value = value.partition("=")
+            properties[name] = prop_value or "true"
+            continue
+        for profile_id in value.split(","):
+            profile_id = profile_id.strip().lstrip("?")
+            if profile_id[:1] in ("!", "-"):
+                disabled.add(profile_id[1:])
+            elif profile_id:
+                enabled.add(profile_id)
+    return enabled, disabled, properties
+
+
+def maven_version(project_dir):
+    """
+    Return the Maven version of a project's wrapper.
+
+    Returns:
+        Version string, or None without a wrapper distribution URL
+    """
+    path = os.path.join(project_dir, ".mvn", "wrapper", "maven-wrapper.properties")
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                if key.strip() == "distributionUrl":
+                    match = _WRAPPER_MAVEN_RE.search(value)
+                    return match.group(1) if match else None
+    except OSError:
+        pass
+    return None
+
+
+class OfflineCheck:
+    """Collects what a project build needs and looks it up in the index."""
+
+    def __init__(self, project_dir, index, goals=("compile",), resolver=None):
+        """
+        Initialize the check.
+
+        Args:
+            project_dir: Reactor root directory
+            index: RepositoryIndex to look artifacts up in
+            goals: Maven goals and phases of the build
+            resolver: ParentResolver (default: shared resolver of the repository
+                with the project's summary index)
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.index = index
+        self.goals = list(goals)
+        self.resolver = resolver or get_resolver(
+            index.repository, project_index_path(os.path.join(self.project_dir, "pom.xml")))
+        self.maven_version = maven_version(self.project_dir)
+        self.profiles, self.disabled_profiles, self.properties = goal_options(self.goals)
+        self.required = set()
+        self.missing = set()
+        self.unresolved = set()
+        self._closures = {}
+        self._reactor = {}
+
+    @property
+    def ready(self):
+        """Whether every required artifact is available locally."""
+        return not self.missing and not self.unresolved
+
+    def _require(self, group_id, artifact_id, version, type_="jar", classifier=""):
+        """Record that an artifact file is needed; return whether it is present."""
+        coords = "%s:%s:%s" % (group_id, artifact_id, version or "?")
+        if not group_id or not artifact_id or not version or "${" in coords \
+                or version[0] in "[(":
+            self.unresolved.add(coords)
+            return False
+        present = True
+        suffixes = [".pom"]
+        if type_ != "pom":
+            suffixes.append(artifact_suffix(type_, classifier))
+        for suffix in suffixes:
+            self.required.add((coords, suffix))
+            if not self.index.has(group_id, artifact_id, version, suffix):
+                self.missing.add("%s (%s-%s%s)" % (coords, artifact_id, version, suffix))
+                present = False
+        return present
+
+    def _require_parents(self, pom_path):
+        """Require the parent POMs of a POM that are not reactor modules."""
+        seen = set()
+        path = pom_path
+        while path and path not in seen:
+            seen.add(path)
+            summary = self.resolver.summary(path)
+            parent = summary and summary.get("parent")
+            if not parent or not parent.get("artifactId"):
+                return
+            properties = summary["properties"]
+            next_path = self.resolver._parent_path(summary, os.path.dirname(path), properties)
+            if next_path is None or \
+                    not os.path.abspath(next_path).startswith(self.project_dir + os.sep):
+                if not self._require(interpolate(parent.get("groupId") or "", properties),
+                                     interpolate(parent["artifactId"], properties),
+                                     interpolate(parent.get("version") or "", properties),
+                                     "pom"):
+                    return
+            path = next_path
+
+    def _repository_model(self, group_id, artifact_id, version):
+        """Resolve an artifact's POM from the repository, requiring its parents and BOMs."""
+        path = self.resolver.repository_pom(group_id, artifact_id, version)
+        if not os.path.isfile(path):
+            return None
+        self._require_parents(path)
+        model = self.resolver.resolve(path)
+        self._require_boms(model)
+        return model
+
+    def _require_boms(self, model):
+        for key, info in model.managed.items():
+            group_id, artifact_id, type_, _ = key.split(":")
+            if type_ == "pom" and info.get("scope") == "import":
+                if self._require(group_id, artifact_id, info.get("version"), "pom"):
+                    self._repository_model(group_id, artifact_id, info["version"])
+
+    def _transitive(self, group_id, artifact_id, version):
+        """Return the compile and runtime dependencies declared by an artifact's POM."""
+        coords = (group_id, artifact_id, version)
+        if coords not in self._closures:
+            model = self._repository_model(group_id, artifact_id, version)
+            deps = []
+            for key, dep in (model.dependencies.items() if model else ()):
+                if dep.get("optional") or dep.get("scope", "compile") not in ("compile", "runtime"):
+                    continue
+                version = dep.get("version") or model.managed.get(key, {}).get("version")
+                deps.append((key, version, dep.get("exclusions", [])))
+            self._closures[coords] = deps
+        return self._closures[coords]
+
+    def _require_closure(self, roots, managed):
+        """
+        Require artifacts and their transitive dependencies.
+
+        Args:
+            roots: List of (dependency key, version, exclusions)
+            managed: Dependency management that overrides transitive versions
+        """
+        queue = deque((key, version, set(exclusions)) for key, version, exclusions in roots)
+        seen = set()
+        while queue:
+            key, version, exclusions = queue.popleft()
+            group_id, artifact_id, type_, classifier = key.split(":")
+            if (group_id, artifact_id) in seen or "%s:%s" % (group_id, artifact_id) in self._reactor:
+                continue
+            # Nearest declaration wins, as in Maven's dependency mediation
+            seen.add((group_id, artifact_id))
+            if not self._require(group_id, artifact_id, version, type_, classifier):
+                continue
+            for dep_key, dep_version, dep_exclusions in self._transitive(group_id, artifact_id,
+                                                                         version):
+                dep_group, dep_artifact = dep_key.split(":")[:2]
+                if {"*:*", dep_group + ":*", "%s:%s" % (dep_group, dep_artifact)} & exclusions:
+                    continue
+                dep_version = managed.get(dep_key, {}).get("version") or dep_version
+                queue.append((dep_key, dep_version, exclusions | set(dep_exclusions)))
+
+    def _plugin(self, group_id, artifact_id, version):
+        """
+        Require a plugin and its dependencies.
+
+        Without a version, the default Maven binds for the wrapper's version
+        is used; other unversioned plugins are unresolved.
+
+        Returns:
+            The version required, or None
+        """
+        if not version and group_id == DEFAULT_PLUGIN_GROUP:
+            version = DEFAULT_PLUGIN_VERSIONS.get(self.maven_version, {}).get(artifact_id)
+        if not version:
+            self.unresolved.add("%s:%s without a version (no default known for %s)" % (
+                group_id, artifact_id,
+                "Maven " + self.maven_version if self.maven_version else "Maven without a wrapper"))
+            return None
+        self._require_closure([(dependency_id(group_id, artifact_id, "maven-plugin"), version,
+                                [])], {})
+        return version
+
+    def _profile_active(self, profile):
+        """Whether a profile is active for the build's options."""
+        if profile["id"] in self.disabled_profiles:
+            return False
+        if profile["id"] in self.profiles:
+            return True
+        activation = profile["activation"]
+        if activation["property"]:
+            name, value = activation["property"]
+            negated = name.startswith("!")
+            actual = self.properties.get(name.lstrip("!"))
+            if value is None:
+                return (actual is not None) != negated
+            if value.startswith("!"):
+                return actual != value[1:]
+            return actual == value
+        # jdk, os and file conditions cannot be checked here; assume they hold
+        return activation["other"] or activation["activeByDefault"]
+
+    def _module_plugins(self, model, clean, last_phase, plugin_goals):
+        """Yield (groupId, artifactId, version) of the plugins a module's build runs."""
+        plugins = {key: None for key in model.plugins}
+        versions = dict(model.plugin_versions)
+        # Nearest profiles come first and win
+        for profile in reversed(model.profiles):
+            if self._profile_active(profile):
+                plugins.update((key, None) for key in profile["plugins"])
+                versions.update(profile["plugin_versions"])
+        if clean:
+            plugins.setdefault("%s:%s" % (DEFAULT_PLUGIN_GROUP, CLEAN_PLUGIN), None)
+        if last_phase is not None:
+            reached = DEFAULT_PHASES.index(last_phase)
+            for phase, artifact_id in LIFECYCLE_PLUGINS:
+                if DEFAULT_PHASES.index(phase) <= reached:
+                    plugins.setdefault("%s:%s" % (DEFAULT_PLUGIN_GROUP, artifact_id), None)
+        prefixes = {}
+        for key in set(plugins) | set(versions):
+            prefixes.setdefault(short_plugin_name(key.split(":")[1]), key)
+        for goal in plugin_goals:
+            parts = goal.split(":")
+            if len(parts) >= 3:
+                plugins.setdefault("%s:%s" % (parts[0], parts[1]),
+                                   parts[2] if len(parts) == 4 else None)
+            elif parts[0] in prefixes:
+                plugins.setdefault(prefixes[parts[0]], None)
+            else:
+                self.unresolved.add("plugin prefix '%s'" % parts[0])
+        for key, version in sorted(plugins.items()):
+            group_id, artifact_id = key.split(":")
+            yield group_id, artifact_id, version or versions.get(key)
+
+    def _extensions(self):
+        """Yield (groupId, artifactId, version) of ``.mvn/extensions.xml`` entries."""
+        try:
+            root = ET.parse(os.path.join(self.project_dir, ".mvn", "extensions.xml")).getroot()
+        except (OSError, ET.ParseError):
+            return
+        for elem in root:
+            if isinstance(elem.tag, str) and local_name(elem.tag) == "extension":
+                values = {local_name(child.tag): (child.text or "").strip()
+                          for child in elem if isinstance(child.tag, str)}
+                yield values.get("groupId"), values.get("artifactId"), values.get("version")
+
+    def run(self):
+        """
+        Collect the project's requirements and look them up.
+
+        Returns:
+            True when the project can be built offline
+        """
+        from jdevtools.reactor import discover_poms
+
+        clean, last_phase, plugin_goals = goal_phases(self.goals)
+        scopes = ()
+        runs_tests = False
+        if last_phase is not None:
+            reached = DEFAULT_PHASES.index(last_phase)
+            runs_tests = reached >= DEFAULT_PHASES.index("test")
+            scopes = _TEST_SCOPES if reached >= DEFAULT_PHASES.index("test-compile") \
+                else _COMPILE_SCOPES
+
+        poms = list(discover_poms(self.project_dir))
+        models = []
+        for pom_path in poms:
+            summary = self.resolver.summary(pom_path)
+            model = self.resolver.resolve(pom_path)
+            self._reactor["%s:%s" % (model.properties.get("project.groupId"),
+                                     summary.get("artifactId"))] = pom_path
+            models.append((pom_path, model))
+
+        for pom_path, model in models:
+            self._require_parents(pom_path)
+            self._require_boms(model)
+            roots = []
+            for key, dep in model.dependencies.items():
+                scope = dep.get("scope", "compile")
+                if scope not in scopes or scope == "system":
+                    continue
+                version = dep.get("version") or model.managed.get(key, {}).get("version")
+                roots.append((key, version, dep.get("exclusions", [])))
+            self._require_closure(roots, model.managed)
+            junit_platform = any(key.split(":")[0] in JUNIT_PLATFORM_GROUPS
+                                 for key in model.dependencies)
+            for group_id, artifact_id, version in self._module_plugins(
+                    model, clean, last_phase, plugin_goals):
+                if "%s:%s" % (group_id, artifact_id) in self._reactor:
+                    continue
+                version = self._plugin(group_id, artifact_id, version)
+                if artifact_id == SUREFIRE_PLUGIN and version and runs_tests and junit_platform:
+                    # Surefire resolves its provider only when the tests run
+                    self._require_closure([(dependency_id(SUREFIRE_GROUP,
+                                                          JUNIT_PLATFORM_PROVIDER),
+                                            version, [])], {})
+        for group_id, artifact_id, version in self._extensions():
+            self._require_closure([(dependency_id(group_id or "", artifact_id or ""),
+                                    version, [])], {})
+        self.resolver.save()
+        return self.ready
+
+    def report(self, limit=10):
+        """Return a human-readable summary of the check."""
+        if self.ready:
+            return "All %d required artifact files are in the local repository" % len(
+                self.required)
+        problems = sorted(self.unresolved) + sorted(self.missing)
+        lines = ["%d of %d required artifact files are missing locally, %d could not be resolved"
+                 % (len(self.missing), len(self.required), len(self.unresolved))]
+        lines.extend("  " + problem for problem in problems[:limit])
+        if len(problems) > limit:
+            lines.append("  ... and %d more" % (len(problems) - limit))
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    """Main entry point for the offline readiness tool."""
+    parser = argparse.ArgumentParser(
+        description="Index the local Maven repository and check offline readiness")
+    parser.add_argument('--project', default='.',
+                        help='Reactor root directory (default: current directory)')
+    parser.add_argument('--repository', default=None,
+                        help='Local repository (default: from ~/.m2/settings.xml)')
+    parser.add_argument('--index', default=None,
+                        help='Index file (default: <repository>/%s)' % INDEX_NAME)
+    subparsers = parser.add_subparsers(dest='command')
+
+    subparsers.add_parser('index', help='Refresh the index and report offline readiness')
+    check = subparsers.add_parser(
+        'check', help='Exit 0 when the project can be built offline, %d otherwise' % NOT_READY)
+    check.add_argument('--goals', default='compile',
+                       help='Maven goals of the build, with any -P and -D options '
+                            '(default: compile)')
+    check.add_argument('--verbose', action='store_true',
+                       help='List every missing artifact')
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    try:
+        start = time.perf_counter()
+        index = RepositoryIndex(args.repository, args.index).load()
+        reread = index.refresh()
+        index.save()
+        goals = args.goals.split() if args.command == 'check' else ["test"]
+        offline = OfflineCheck(args.project, index, goals)
+        ready = offline.run()
+        if args.command == 'index':
+            print("Indexed %d artifacts in %s (%d directories re-read) in %.2fs"
+                  % (index.artifact_count, index.repository, reread,
+                     time.perf_counter() - start))
+            print(("Ready for offline builds: " if ready else "Not ready for offline builds: ")
+                  + offline.report())
+            return 0
+        print(offline.report(limit=sys.maxsize if args.verbose else 10))
+        return 0 if ready else NOT_READY
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+jpgo - Profile-guided optimization pipeline for GraalVM native images.
+
+Builds a baseline native image, an instrumented image, runs a training
+workload against the instrumented binary, versions the collected ``.iprof``
+profile under ``pgo/`` and builds the optimized image from it. Finally the
+startup time and workload throughput of the baseline and PGO binaries are
+compared.
+
+The Maven profiles used here (``native-pgo-instrument`` and ``native-pgo``)
+are emitted by ``jcompile-dispatch``. PGO requires Oracle GraalVM.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from jdevtools.pom_merge import local_name
+
+
+def read_artifact_id(pom_path):
+    """Read the artifactId of the project itself from a POM."""
+    root = ET.parse(pom_path).getroot()
+    for child in root:
+        if isinstance(child.tag, str) and local_name(child.tag) == "artifactId":
+            return (child.text or "").strip()
+    raise ValueError(f"No artifactId in {pom_path}")
+
+
+def maven_command(project_dir):
+    """Return the Maven executable for a project, preferring its wrapper."""
+    wrapper = os.path.join(project_dir, "mvnw.cmd" if os.name == "nt" else "mvnw")
+    if os.path.isfile(wrapper):
+        return [wrapper]
+    return ["mvn"]
+
+
+def workload_command(template, binary):
+    """
+    Expand a workload command template for a binary.
+
+    Args:
+        template: Command line containing ``{binary}``
+        binary: Path to the binary under test
+
+    Returns:
+        Argument list
+    """
+    return [arg.replace("{binary}", binary) for arg in shlex.split(template)]
+
+
+def time_command(command, runs, cwd=None):
+    """
+    Run a command repeatedly and return the wall-clock time of each run.
+
+    Args:
+        command: Argument list
+        runs: Number of runs
+        cwd: Working directory
+
+    Returns:
+        List of durations in seconds
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def version_profile(iprof_path, profiles_dir, workload=None, now=None):
+    """
+    Store a collected profile under a content-addressed, timestamped name.
+
+    The profile is also copied to ``<profiles_dir>/default.iprof`` and
+    recorded in ``<profiles_dir>/profiles.json``. Storing an identical
+    profile again reuses the existing version.
+
+    Args:
+        iprof_path: Collected ``.iprof`` file
+        profiles_dir: Directory holding versioned profiles
+        workload: Training command, recorded for reference
+        now: Timestamp to use (default: current UTC time)
+
+    Returns:
+        Path to the versioned profile
+    """
+    digest = hashlib.sha256()
+    with open(iprof_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+
+    index_path = os.path.join(profiles_dir, "profiles.json")
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = []
+
+    versions_dir = os.path.join(profiles_dir, "versions")
+    os.makedirs(versions_dir, exist_ok=True)
+
+    existing = [entry for entry in index if entry.get("sha256") == sha]
+    if existing:
+        versioned = os.path.join(profiles_dir, existing[-1]["file"])
+    else:
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        name = "%s-%s.iprof" % (now.strftime("%Y%m%dT%H%M%SZ"), sha[:12])
+        versioned = os.path.join(versions_dir, name)
+        shutil.copyfile(iprof_path, versioned)
+        index.append({
+            "file": os.path.relpath(versioned, profiles_dir),
+            "sha256": sha,
+            "created": now.isoformat(),
+            "workload": workload,
+        })
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+
+    shutil.copyfile(versioned, os.path.join(profiles_dir, "default.iprof"))
+    return versioned
+
+
+class BinaryStats:
+    """Startup and throughput measurements of one binary."""
+
+    def __init__(self, label, startup, workload):
+        self.label = label
+        self.startup = statistics.median(startup) if startup else None
+        self.workload = statistics.median(workload) if workload else None
+
+    @property
+    def throughput(self):
+        """Workload runs per second."""
+        if not self.workload:
+            return None
+        return 1.0 / self.workload
+
+
+def format_report(baseline, optimized):
+    """
+    Format the before/after comparison.
+
+    Args:
+        baseline: BinaryStats of the non-PGO binary (may be None)
+        optimized: BinaryStats of the PGO binary
+
+    Returns:
+        Report text
+    """
+    def delta(before, after):
+        if not before or not after:
+            return ""
+        return "%+.1f%%" % ((after - before) / before * 100.0)
+
+    rows = [("", "baseline", "pgo", "change")]
+    b = baseline or BinaryStats("baseline", [], [])
+    for label, before, after, fmt in (
+            ("startup (ms)", b.startup, optimized.startup, lambda v: "%.1f" % (v * 1000)),
+            ("throughput (runs/s)", b.throughput, optimized.throughput, lambda v: "%.3f" % v)):
+        rows.append((label,
+                     fmt(before) if before else "-",
+                     fmt(after) if after else "-",
+                     delta(before, after)))
+    return "\n".join("%-22s %12s %12s %10s" % row for row in rows)
+
+
+class PgoPipeline:
+    """Runs the instrument / train / optimize cycle for one project."""
+
+    def __init__(self, project_dir, workload, startup_args=None, runs=5,
+                 profiles_dir=None, skip_baseline=False, out=None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            project_dir: Maven project directory
+            workload: Training/benchmark command containing ``{binary}``
+            startup_args: Arguments for the startup measurement (e.g. "--version")
+            runs: Repetitions for each measurement
+            profiles_dir: Where profiles are versioned (default: <project>/pgo)
+            skip_baseline: Do not build and measure a non-PGO binary
+            out: Stream for progress messages (default: stdout)
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        self.workload = workload
+        self.startup_args = shlex.split(startup_args) if startup_args else []
+        self.runs = runs
+        self.profiles_dir = profiles_dir or os.path.join(self.project_dir, "pgo")
+        self.skip_baseline = skip_baseline
+        self.out = out or sys.stdout
+        self.artifact_id = read_artifact_id(os.path.join(self.project_dir, "pom.xml"))
+        self.work_dir = os.path.join(self.project_dir, "target", "pgo")
+
+    def _log(self, message):
+        print("[jpgo] %s" % message, file=self.out)
+
+    def _maven(self, *args):
+        command = maven_command(self.project_dir) + ["-q", "-DskipTests"] + list(args)
+        self._log(" ".join(command))
+        subprocess.run(command, cwd=self.project_dir, check=True)
+
+    def _binary(self, name):
+        suffix = ".exe" if os.name == "nt" else ""
+        return os.path.join(self.project_dir, "target", name + suffix)
+
+    def _measure(self, label, binary):
+        startup = time_command([binary] + self.startup_args, self.runs)
+        workload = time_command(workload_command(self.workload, binary), self.runs,
+                                cwd=self.work_dir)
+        return BinaryStats(label, startup, workload)
+
+    def build_baseline(self):
+        """Build the regular native image and keep a copy of it."""
+        self._maven("package", "native:compile")
+        baseline = os.path.join(self.work_dir, self.artifact_id + "-baseline")
+        shutil.copy2(self._binary(self.artifact_id), baseline)
+        return baseline
+
+    def train(self):
+        """Build the instrumented image, run the workload and collect the profile."""
+        self._maven("-Pnative-pgo-instrument", "package", "native:compile")
+        instrumented = self._binary(self.artifact_id + "-instrumented")
+
+        train_dir = os.path.join(self.work_dir, "train")
+        shutil.rmtree(train_dir, ignore_errors=True)
+        os.makedirs(train_dir)
+        command = workload_command(self.workload, instrumented)
+        self._log("training: %s" % " ".join(command))
+        subprocess.run(command, cwd=train_dir, check=True)
+
+        # Instrumented binaries dump default.iprof into the working directory
+        iprof = os.path.join(train_dir, "default.iprof")
+        if not os.path.isfile(iprof):
+            raise RuntimeError("Training run did not produce %s" % iprof)
+        return version_profile(iprof, self.profiles_dir, workload=self.workload)
+
+    def build_optimized(self, profile):
+        """Build the PGO-optimized image from ``profile``."""
+        self._maven("-Pnative-pgo", "-Dnative.pgo.profile=%s" % profile,
+                    "package", "native:compile")
+        return self._binary(self.artifact_id)
+
+    def run(self):
+        """
+        Run the full pipeline.
+
+        Returns:
+            Tuple ``(baseline_stats, optimized_stats, profile_path)``
+        """
+        os.makedirs(self.work_dir, exist_ok=True)
+        baseline = None
+        if not self.skip_baseline:
+            baseline_binary = self.build_baseline()
+            baseline = self._measure("baseline", baseline_binary)
+
+        profile = self.train()
+        self._log("profile: %s" % os.path.relpath(profile, self.project_dir))
+        optimized = self._measure("pgo", self.build_optimized(profile))
+
+        print(format_report(baseline, optimized), file=self.out)
+        return baseline, optimized, profile
+
+
+def main():
+    """Main entry point for jpgo."""
+    parser = argparse.ArgumentParser(
+        description="Profile-guided optimization pipeline for native images",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Train with a benchmark run and compare against a regular native image
+  jpgo --workload "{binary} --iterations 10000"
+
+  # Measure startup with --version, skip the baseline build
+  jpgo --workload "{binary} serve --exit-after 500" --startup-args "--version" --skip-baseline
+        """
+    )
+    parser.add_argument('--workload', required=True,
+                        help='Training workload command; {binary} is replaced by the binary path')
+    parser.add_argument('--startup-args', default=None,
+                        help='Arguments used to measure startup time (e.g. "--version")')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Repetitions for each measurement (default: 5)')
+    parser.add_argument('--project', default='.',
+                        help='Maven project directory (default: current directory)')
+    parser.add_argument('--profiles-dir', default=None,
+                        help='Directory for versioned profiles (default: <project>/pgo)')
+    parser.add_argument('--skip-baseline', action='store_true',
+                        help='Do not build and measure a non-PGO binary')
+    args = parser.parse_args()
+
+    try:
+        PgoPipeline(args.project, args.workload, startup_args=args.startup_args,
+                    runs=args.runs, profiles_dir=args.profiles_dir,
+                    skip_baseline=args.skip_baseline).run()
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Content fingerprints for no-op POM regeneration.
+
+A sidecar file in the project's ``.jdevtools/pom-cache`` directory records the
+fingerprint of the generator inputs and the stat/hash of the output it
+produced. When both still match, a repeated run can stop before building the
+XML tree; when only the inputs changed, the freshly serialized bytes are
+compared against the current file and the write is skipped if they are
+identical.
+
+The project is the outermost directory above the POM that still holds a
+``pom.xml``, so every module of a reactor keeps its sidecar in the reactor
+root's state directory rather than next to its POM.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from jdevtools.pom_stamp import sidecar_path
+
+CACHE_FORMAT = 1
+_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path):
+    """
+    Hash a file in fixed-size chunks.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest, or None if the file does not exist
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def fingerprint_inputs(options, existing_pom=None):
+    """
+    Fingerprint everything that influences the generated POM.
+
+    Args:
+        options: JSON-serializable dict of generator settings
+        existing_pom: Path to the existing POM being merged (optional)
+
+    Returns:
+        Hex digest of the inputs
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(options, sort_keys=True).encode('utf-8'))
+    digest.update(b'\0existing\0')
+    if existing_pom:
+        existing_hash = sha256_file(existing_pom)
+        digest.update((existing_hash or 'missing').encode('ascii'))
+    return digest.hexdigest()
+
+
+class HashingWriter:
+    """Text stream that encodes to UTF-8, hashes and forwards to a binary file."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.digest = hashlib.sha256()
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.digest.update(data)
+        self.raw.write(data)
+        return len(text)
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+
+def _legacy_sidecar_path(output_path):
+    """Sidecar location of earlier versions, next to the POM."""
+    directory, name = os.path.split(os.path.abspath(output_path))
+    return os.path.join(directory, ".%s.jdevtools-cache" % name)
+
+
+class PomCache:
+    """Reads and writes the fingerprint sidecar of one generated POM."""
+
+    def __init__(self, output_path):
+        """
+        Initialize the cache.
+
+        Args:
+            output_path: Path of the generated POM
+        """
+        self.output_path = output_path
+        self.path = sidecar_path(output_path)
+
+    def load(self):
+        """Return the recorded sidecar data, or an empty dict."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('format') != CACHE_FORMAT:
+            return {}
+        return data
+
+    def is_fresh(self, inputs):
+        """
+        Check whether the output was produced from ``inputs`` and is untouched.
+
+        Only the sidecar and a stat of the output are read.
+        """
+        data = self.load()
+        if data.get('inputs') != inputs:
+            return False
+        try:
+            st = os.stat(self.output_path)
+        except OSError:
+            return False
+        return data.get('size') == st.st_size and data.get('mtime_ns') == st.st_mtime_ns
+
+    def store(self, inputs, output_hash):
+        """Record the inputs and the current state of the output file."""
+        st = os.stat(self.output_path)
+        data = {
+            'format': CACHE_FORMAT,
+            'inputs': inputs,
+            'output': output_hash,
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+        }
+        tmp_path = "%s.%d.%d.tmp" % (self.path, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            legacy = _legacy_sidecar_path(self.output_path)
+            if os.path.exists(legacy):
+                os.remove(legacy)
+        except OSError:
+            # The cache is an optimization; never fail generation over it
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def write_if_changed(output_path, serialize):
+    """
+    Serialize to a temporary file and replace ``output_path`` only on change.
+
+    Args:
+        output_path: Destination file
+        serialize: Callable receiving a text stream to write the document to
+
+    Returns:
+        Tuple ``(changed, output_hash)``
+    """
+    tmp_path = "%s.%d.%d.tmp" % (output_path, os.getpid(), threading.get_ident())
+    try:
+        with open(tmp_path, 'wb') as raw:
+            writer = HashingWriter(raw)
+            serialize(writer)
+        new_hash = writer.hexdigest()
+        if new_hash == sha256_file(output_path):
+            os.remove(tmp_path)
+            return False, new_hash
+        if os.path.exists(output_path):
+            try:
+                os.chmod(tmp_path, os.stat(output_path).st_mode & 0o7777)
+            except OSError:
+                pass
+        os.replace(tmp_path, output_path)
+        return True, new_hash
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,1323 @@
+"""
+Maven POM generation with native image and packaging support.
+
+Builds POM files with GraalVM native-image support and platform-specific
+packaging plugins (deb/rpm for Linux), merged into an existing POM. The
+command line front end lives in ``jdevtools.jcompile_dispatch``.
+
+``generate()`` writes the POM to disk. ``build()`` and ``render()`` return the
+element tree or the serialized document without writing or printing anything,
+for embedding the generator in other tools.
+"""
+
+import collections
+import copy
+import io
+import os
+import platform
+import threading
+import xml.etree.ElementTree as ET
+
+from jdevtools import __version__
+from jdevtools.pom_cache import PomCache, fingerprint_inputs, write_if_changed
+from jdevtools.pom_merge import PomMerger, local_name
+from jdevtools.pom_writer import POM_NAMESPACE, write_pom
+
+# Generated trees per generator configuration, shared by all generators of
+# a process and deep-copied for every POM, see PomGenerator._generated_tree().
+# Least recently used configurations are evicted beyond MAX_TEMPLATES.
+MAX_TEMPLATES = 32
+_templates = collections.OrderedDict()
+_templates_lock = threading.Lock()
+
+# Written to src/jmh/java when the JMH profile is requested and the
+# directory does not exist yet
+JMH_EXAMPLE_BENCHMARK = """\
+package benchmarks;
+
+import java.util.concurrent.TimeUnit;
+
+import org.openjdk.jmh.annotations.Benchmark;
+import org.openjdk.jmh.annotations.BenchmarkMode;
+import org.openjdk.jmh.annotations.Fork;
+import org.openjdk.jmh.annotations.Measurement;
+import org.openjdk.jmh.annotations.Mode;
+import org.openjdk.jmh.annotations.OutputTimeUnit;
+import org.openjdk.jmh.annotations.Scope;
+import org.openjdk.jmh.annotations.State;
+import org.openjdk.jmh.annotations.Warmup;
+
+@BenchmarkMode(Mode.AverageTime)
+@OutputTimeUnit(TimeUnit.NANOSECONDS)
+@Warmup(iterations = 3, time = 1)
+@Measurement(iterations = 5, time = 1)
+@Fork(2)
+@State(Scope.Thread)
+public class ExampleBenchmark {
+
+    private final StringBuilder builder = new StringBuilder();
+
+    @Benchmark
+    public String concatenate() {
+        builder.setLength(0);
+        for (int i = 0; i < 100; i++) {
+            builder.append(i);
+        }
+        return builder.toString();
+    }
+}
+"""
+
+# Written to target/appcds by the "jlink-runtime" execution when an
+# application CDS archive is requested. Dumps the archive from a training run
+# and reports the best of RUNS startups with and without it. Avoids "${"
+# so neither Maven nor Ant interpolate anything.
+APPCDS_TRAINING_SCRIPT = """\
+#!/bin/sh
+# Usage: train.sh JAVA ARCHIVE CLASSPATH MAIN_CLASS "JVM FLAGS" RUNS "TRAINING ARGS"
+java=$1 archive=$2 classpath=$3 main=$4 flags=$5 runs=$6 args=$7
+rm -f "$archive"
+echo "[appcds] Training run: $main $args"
+"$java" -XX:ArchiveClassesAtExit="$archive" $flags -cp "$classpath" "$main" $args > /dev/null || exit 1
+test -f "$archive" || { echo "[appcds] The JVM did not write $archive"; exit 1; }
+case $(date +%N) in
+    *[!0-9]*) echo "[appcds] No nanosecond clock, startup time not measured"; exit 0 ;;
+esac
+fastest() {
+    best=
+    i=0
+    while [ $i -lt "$runs" ]; do
+        start=$(date +%s%N)
+        "$java" "$@" -cp "$classpath" "$main" $args > /dev/null 2>&1
+        elapsed=$(( ($(date +%s%N) - start) / 1000000 ))
+        if [ -z "$best" ] || [ $elapsed -lt $best ]; then best=$elapsed; fi
+        i=$((i + 1))
+    done
+    echo $best
+}
+default=$(fastest -Xshare:auto)
+report="default JVM $default ms"
+if [ -n "$flags" ]; then
+    report="$report, app.jvm.flags $(fastest $flags) ms"
+fi
+cds=$(fastest -XX:SharedArchiveFile="$archive" $flags)
+echo "[appcds] Startup, best of $runs: $report, with CDS archive $cds ms"
+if [ "$default" -gt 0 ]; then
+    echo "[appcds] Startup time change: $(( (cds - default) * 100 / default ))%"
+fi
+"""
+
+
+class PomGenerator:
+    """Generates Maven POM files with native image and packaging support."""
+    
+    NATIVE_PLUGIN_VERSION = "0.9.28"
+    RPM_PLUGIN_VERSION = "2.2.0"
+    DEB_PLUGIN_VERSION = "1.10"
+    SUREFIRE_PLUGIN_VERSION = "3.2.5"
+    JMH_VERSION = "1.37"
+    BUILD_HELPER_PLUGIN_VERSION = "3.5.0"
+    EXEC_PLUGIN_VERSION = "3.1.1"
+    DEPENDENCY_PLUGIN_VERSION = "3.6.1"
+    ANTRUN_PLUGIN_VERSION = "3.1.0"
+    
+    # Files of a jlink runtime image that must stay executable when packaged
+    RUNTIME_EXECUTABLES = ("bin/**", "lib/jspawnhelper")
+    
+    # Application CDS archive, dumped into target/ and installed next to the jar
+    APPCDS_ARCHIVE = "app-cds.jsa"
+    
+    # Benchmark sources added to the test sources by the "jmh" profile
+    JMH_SOURCE_DIR = "src/jmh/java"
+    
+    # JUnit Platform parallel execution, switched on with -Djunit.parallel.enabled=true.
+    # Classes run concurrently, methods of one class stay on one thread.
+    JUNIT_PARALLEL_PARAMETERS = [
+        "junit.jupiter.execution.parallel.enabled = ${junit.parallel.enabled}",
+        "junit.jupiter.execution.parallel.mode.default = same_thread",
+        "junit.jupiter.execution.parallel.mode.classes.default = concurrent",
+        "junit.jupiter.execution.parallel.config.strategy = dynamic",
+        "junit.jupiter.execution.parallel.config.dynamic.factor = 1",
+    ]
+    
+    # Native-image build profiles. "dev" trades runtime speed for fast
+    # quick-build compiles, "release" fully optimizes, "size" minimizes the
+    # binary. Values become the native.* properties referenced by buildArgs.
+    NATIVE_PROFILES = {
+        "dev": {"optimization": "b", "gc": "serial", "march": "native", "memory": "4g"},
+        "release": {"optimization": "3", "gc": "G1", "march": None, "memory": "8g"},
+        "size": {"optimization": "s", "gc": "serial", "march": "compatibility", "memory": "6g"},
+    }
+    
+    def __init__(self, existing_pom=None, use_cache=True, quiet=False, strict=False,
+                 resolve_parents=False, repository=None, native_profile="dev",
+                 native_threads=None, native_memory=None, maven_config=False,
+                 build_cache=False, build_cache_dir=None, jmh=False, jlink=False,
+                 appcds=False):
+        """
+        Initialize the POM generator.
+        
+        Args:
+            existing_pom: Path to existing POM file to merge with (optional)
+            use_cache: Skip regeneration when inputs and output are unchanged
+            quiet: Suppress progress messages
+            strict: Raise instead of warning when the existing POM cannot be merged
+            resolve_parents: Skip content already inherited from parents and BOMs
+            repository: Local Maven repository for parent resolution
+                (default: ~/.m2/repository)
+            native_profile: Native-image profile whose settings are the defaults
+            native_threads: Worker threads for native-image (default: all cores)
+            native_memory: Build memory cap for native-image, e.g. "8g"
+                (default: per profile)
+            maven_config: Also write startup-tuned .mvn/jvm.config and
+                .mvn/maven.config next to the output POM
+            build_cache: Also write .mvn/extensions.xml and a build-cache
+                configuration enabling the local build cache
+            build_cache_dir: Local cache directory (default: the extension's,
+                ~/.m2/build-cache)
+            jmh: Add the "jmh" profile that compiles and runs JMH benchmarks
+                from src/jmh/java, and create that directory with an example
+                benchmark when it does not exist
+            jlink: Build a minimal Java runtime with jdeps and jlink during
+                package and ship it, instead of relying on a system JDK, in
+                the DEB and RPM packages
+            appcds: Also dump an application CDS archive from a training run
+                of mainClass on that runtime, report the startup time with
+                and without it, and make the launcher use it together with
+                the app.jvm.flags property. Implies jlink, as an archive only works with the JVM
+                that created it.
+        """
+        if native_profile not in self.NATIVE_PROFILES:
+            raise ValueError(f"Unknown native profile: {native_profile}")
+        self.existing_pom = existing_pom
+        self.use_cache = use_cache
+        self.quiet = quiet
+        self.strict = strict
+        self.resolve_parents = resolve_parents or repository is not None
+        self.repository = repository
+        self.native_profile = native_profile
+        self.native_threads = native_threads
+        self.native_memory = native_memory
+        self.maven_config = maven_config
+        self.build_cache = build_cache or build_cache_dir is not None
+        self.build_cache_dir = build_cache_dir
+        self.jmh = jmh
+        self.jlink = jlink or appcds
+        self.appcds = appcds
+        self.namespace = POM_NAMESPACE
+        # Outcome of the last generate() call: "written", "unchanged" or "cached"
+        self.status = None
+        
+    def _log(self, message):
+        """Print a progress message unless running quietly."""
+        if not self.quiet:
+            print(message)
+    
+    def _get_os_type(self):
+        """Determine the operating system type."""
+        system = platform.system().lower()
+        if system == "linux":
+            return "linux"
+        elif system == "darwin":
+            return "mac"
+        elif system == "windows":
+            return "windows"
+        else:
+            return "unknown"
+    
+    def _get_arch(self):
+        """Determine the CPU architecture family."""
+        machine = platform.machine().lower()
+        if machine in ("x86_64", "amd64"):
+            return "amd64"
+        elif machine in ("aarch64", "arm64"):
+            return "aarch64"
+        else:
+            return machine or "unknown"
+    
+    def _native_settings(self, profile):
+        """
+        Resolve the native.* property values of a native-image profile.
+        
+        Args:
+            profile: Name of a profile in NATIVE_PROFILES
+            
+        Returns:
+            Ordered list of (property name, value) pairs
+        """
+        settings = self.NATIVE_PROFILES[profile]
+        
+        gc = settings["gc"]
+        if gc == "G1" and self._get_os_type() != "linux":
+            # G1 is only available for Linux native images
+            gc = "serial"
+        
+        march = settings["march"]
+        if march is None:
+            # Newest instruction set GraalVM targets by default on this architecture
+            march = {"amd64": "x86-64-v3", "aarch64": "armv8.1-a"}.get(
+                self._get_arch(), "compatibility")
+        
+        values = [
+            ("native.optimization", settings["optimization"]),
+            ("native.gc", gc),
+            ("native.march", march),
+            ("native.memory", self.native_memory or settings["memory"]),
+        ]
+        if self.native_threads:
+            values.append(("native.parallelism", str(self.native_threads)))
+        return values
+    
+    def _create_base_pom(self):
+        """Create a base POM structure."""
+        ET.register_namespace('', self.namespace)
+        
+        root = ET.Element("{%s}project" % self.namespace)
+        root.set("{http://www.w3.org/2001/XMLSchema-instance}schemaLocation",
+                "http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd")
+        
+        # Model version
+        model_version = ET.SubElement(root, "{%s}modelVersion" % self.namespace)
+        model_version.text = "4.0.0"
+        
+        # Basic project info
+        group_id = ET.SubElement(root, "{%s}groupId" % self.namespace)
+        group_id.text = "com.example"
+        
+        artifact_id = ET.SubElement(root, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "my-app"
+        
+        version = ET.SubElement(root, "{%s}version" % self.namespace)
+        version.text = "1.0-SNAPSHOT"
+        
+        return root
+    
+    def _add_properties(self, root):
+        """Add properties section to POM."""
+        properties = ET.SubElement(root, "{%s}properties" % self.namespace)
+        
+        maven_compiler_source = ET.SubElement(properties, "{%s}maven.compiler.source" % self.namespace)
+        maven_compiler_source.text = "11"
+        
+        maven_compiler_target = ET.SubElement(properties, "{%s}maven.compiler.target" % self.namespace)
+        maven_compiler_target.text = "11"
+        
+        project_build_source = ET.SubElement(properties, "{%s}project.build.sourceEncoding" % self.namespace)
+        project_build_source.text = "UTF-8"
+        
+        native_image_version = ET.SubElement(properties, "{%s}native.maven.plugin.version" % self.namespace)
+        native_image_version.text = self.NATIVE_PLUGIN_VERSION
+        
+        pgo_profile = ET.SubElement(properties, "{%s}native.pgo.profile" % self.namespace)
+        pgo_profile.text = "${project.basedir}/pgo/default.iprof"
+        
+        # Test forks: one per core, reused across test classes. Plain
+        # forkCount/reuseForks so -DforkCount=N on the command line still wins.
+        fork_count = ET.SubElement(properties, "{%s}forkCount" % self.namespace)
+        fork_count.text = "1C"
+        
+        reuse_forks = ET.SubElement(properties, "{%s}reuseForks" % self.namespace)
+        reuse_forks.text = "true"
+        
+        junit_parallel = ET.SubElement(properties, "{%s}junit.parallel.enabled" % self.namespace)
+        junit_parallel.text = "false"
+        
+        # Defaults for the native-image build, taken from the default profile
+        for name, value in self._native_settings(self.native_profile):
+            prop = ET.SubElement(properties, "{%s}%s" % (self.namespace, name))
+            prop.text = value
+        
+        if self.jlink:
+            # Release analyzed in multi-release jars, jlink compression level and
+            # modules jdeps cannot see, e.g. ones only loaded through reflection
+            for name, value in (("jlink.release", "${maven.compiler.target}"),
+                                ("jlink.compress", "2"),
+                                ("jlink.add.modules", "")):
+                prop = ET.SubElement(properties, "{%s}%s" % (self.namespace, name))
+                prop.text = value
+        
+        if self.appcds:
+            # JVM flags of the launcher, empty so the application keeps the
+            # JVM's defaults (C2, default GC). Also used for the training run
+            # because the archive must be dumped with the GC the application
+            # runs with. Arguments making mainClass exit after a representative
+            # startup, and the number of timed startups per configuration.
+            for name, value in (("app.jvm.flags", ""),
+                                ("appcds.training.args", ""),
+                                ("appcds.runs", "5")):
+                prop = ET.SubElement(properties, "{%s}%s" % (self.namespace, name))
+                prop.text = value
+
+        return properties
+    
+    def _add_native_image_plugin(self, plugins):
+        """Add GraalVM native-image plugin."""
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.graalvm.buildtools"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "native-maven-plugin"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = "${native.maven.plugin.version}"
+        
+        extensions = ET.SubElement(plugin, "{%s}extensions" % self.namespace)
+        extensions.text = "true"
+        
+        configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
+        
+        image_name = ET.SubElement(configuration, "{%s}imageName" % self.namespace)
+        image_name.text = "${project.artifactId}"
+        
+        main_class = ET.SubElement(configuration, "{%s}mainClass" % self.namespace)
+        main_class.text = "${mainClass}"
+        
+        build_args = ET.SubElement(configuration, "{%s}buildArgs" % self.namespace)
+        
+        build_arg1 = ET.SubElement(build_args, "{%s}buildArg" % self.namespace)
+        build_arg1.text = "--no-fallback"
+        
+        build_arg2 = ET.SubElement(build_args, "{%s}buildArg" % self.namespace)
+        build_arg2.text = "--enable-url-protocols=http,https"
+        
+        # Build speed vs. runtime speed tuning, set through native.* properties
+        tuning_args = [
+            "-O${native.optimization}",
+            "--gc=${native.gc}",
+            "-march=${native.march}",
+            "-J-Xmx${native.memory}",
+        ]
+        if self.native_threads:
+            tuning_args.append("--parallelism=${native.parallelism}")
+        for arg in tuning_args:
+            build_arg = ET.SubElement(build_args, "{%s}buildArg" % self.namespace)
+            build_arg.text = arg
+        
+        return plugin
+    
+    def _add_surefire_management(self, build):
+        """
+        Manage the surefire version and JUnit Platform configuration.
+        
+        Managed rather than declared, so a surefire plugin declared in the
+        existing POM keeps its own configuration and inherits this one.
+        """
+        management = ET.SubElement(build, "{%s}pluginManagement" % self.namespace)
+        plugins = ET.SubElement(management, "{%s}plugins" % self.namespace)
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.apache.maven.plugins"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "maven-surefire-plugin"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = self.SUREFIRE_PLUGIN_VERSION
+        
+        configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
+        properties = ET.SubElement(configuration, "{%s}properties" % self.namespace)
+        parameters = ET.SubElement(properties, "{%s}configurationParameters" % self.namespace)
+        parameters.text = "\n".join(self.JUNIT_PARALLEL_PARAMETERS)
+        
+        return plugin
+    
+    def _add_native_profiles(self, root):
+        """
+        Add one Maven profile per native-image build profile.
+        
+        Activating a profile (e.g. ``-Pnative-release``) overrides the
+        native.* properties used by the native-image build arguments.
+        """
+        profiles = root.find("{%s}profiles" % self.namespace)
+        if profiles is None:
+            profiles = ET.SubElement(root, "{%s}profiles" % self.namespace)
+        
+        for name in self.NATIVE_PROFILES:
+            profile = ET.SubElement(profiles, "{%s}profile" % self.namespace)
+            
+            profile_id = ET.SubElement(profile, "{%s}id" % self.namespace)
+            profile_id.text = "native-%s" % name
+            
+            properties = ET.SubElement(profile, "{%s}properties" % self.namespace)
+            for prop_name, value in self._native_settings(name):
+                prop = ET.SubElement(properties, "{%s}%s" % (self.namespace, prop_name))
+                prop.text = value
+        
+        return profiles
+    
+    def _add_pgo_profiles(self, root):
+        """
+        Add the profile-guided optimization profiles for native images.
+        
+        ``native-pgo-instrument`` builds an instrumented binary named
+        ``<artifactId>-instrumented`` that records a ``.iprof`` profile when
+        run; ``native-pgo`` builds the optimized binary from the profile in
+        the native.pgo.profile property.
+        """
+        profiles = root.find("{%s}profiles" % self.namespace)
+        if profiles is None:
+            profiles = ET.SubElement(root, "{%s}profiles" % self.namespace)
+        
+        pgo_profiles = [
+            ("native-pgo-instrument", "${project.artifactId}-instrumented", "--pgo-instrument"),
+            ("native-pgo", None, "--pgo=${native.pgo.profile}"),
+        ]
+        for profile_name, image_name, build_arg_text in pgo_profiles:
+            profile = ET.SubElement(profiles, "{%s}profile" % self.namespace)
+            
+            profile_id = ET.SubElement(profile, "{%s}id" % self.namespace)
+            profile_id.text = profile_name
+            
+            build = ET.SubElement(profile, "{%s}build" % self.namespace)
+            plugins = ET.SubElement(build, "{%s}plugins" % self.namespace)
+            plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+            
+            group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+            group_id.text = "org.graalvm.buildtools"
+            
+            artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+            artifact_id.text = "native-maven-plugin"
+            
+            configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
+            
+            if image_name:
+                image_name_elem = ET.SubElement(configuration, "{%s}imageName" % self.namespace)
+                image_name_elem.text = image_name
+            
+            # Appended to the build args of the main plugin configuration
+            build_args = ET.SubElement(configuration, "{%s}buildArgs" % self.namespace)
+            build_args.set("combine.children", "append")
+            
+            build_arg = ET.SubElement(build_args, "{%s}buildArg" % self.namespace)
+            build_arg.text = build_arg_text
+        
+        return profiles
+    
+    def _add_jmh_profile(self, root):
+        """
+        Add the JMH benchmark profile.
+        
+        ``-Pjmh`` adds src/jmh/java to the test sources, with JMH and its
+        annotation processor on the test classpath, so ``test-compile``
+        generates the benchmark harness. ``exec:exec@run-benchmarks`` then
+        runs all benchmarks, passing ${jmh.args} to JMH, and writes the
+        results as JSON to ${jmh.result}.
+        """
+        profiles = root.find("{%s}profiles" % self.namespace)
+        if profiles is None:
+            profiles = ET.SubElement(root, "{%s}profiles" % self.namespace)
+        
+        profile = ET.SubElement(profiles, "{%s}profile" % self.namespace)
+        
+        profile_id = ET.SubElement(profile, "{%s}id" % self.namespace)
+        profile_id.text = "jmh"
+        
+        properties = ET.SubElement(profile, "{%s}properties" % self.namespace)
+        for name, value in (("jmh.version", self.JMH_VERSION),
+                            ("jmh.args", ""),
+                            ("jmh.result", "${project.build.directory}/jmh-result.json")):
+            prop = ET.SubElement(properties, "{%s}%s" % (self.namespace, name))
+            prop.text = value
+        
+        dependencies = ET.SubElement(profile, "{%s}dependencies" % self.namespace)
+        for artifact in ("jmh-core", "jmh-generator-annprocess"):
+            dependency = ET.SubElement(dependencies, "{%s}dependency" % self.namespace)
+            
+            group_id = ET.SubElement(dependency, "{%s}groupId" % self.namespace)
+            group_id.text = "org.openjdk.jmh"
+            
+            artifact_id = ET.SubElement(dependency, "{%s}artifactId" % self.namespace)
+            artifact_id.text = artifact
+            
+            version = ET.SubElement(dependency, "{%s}version" % self.namespace)
+            version.text = "${jmh.version}"
+            
+            scope = ET.SubElement(dependency, "{%s}scope" % self.namespace)
+            scope.text = "test"
+        
+        build = ET.SubElement(profile, "{%s}build" % self.namespace)
+        plugins = ET.SubElement(build, "{%s}plugins" % self.namespace)
+        
+        # Benchmark sources compile with the tests
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.codehaus.mojo"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "build-helper-maven-plugin"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = self.BUILD_HELPER_PLUGIN_VERSION
+        
+        executions = ET.SubElement(plugin, "{%s}executions" % self.namespace)
+        execution = ET.SubElement(executions, "{%s}execution" % self.namespace)
+        
+        execution_id = ET.SubElement(execution, "{%s}id" % self.namespace)
+        execution_id.text = "add-jmh-sources"
+        
+        phase = ET.SubElement(execution, "{%s}phase" % self.namespace)
+        phase.text = "generate-test-sources"
+        
+        goals = ET.SubElement(execution, "{%s}goals" % self.namespace)
+        goal = ET.SubElement(goals, "{%s}goal" % self.namespace)
+        goal.text = "add-test-source"
+        
+        configuration = ET.SubElement(execution, "{%s}configuration" % self.namespace)
+        sources = ET.SubElement(configuration, "{%s}sources" % self.namespace)
+        source = ET.SubElement(sources, "{%s}source" % self.namespace)
+        source.text = self.JMH_SOURCE_DIR
+        
+        # Not bound to a phase; run explicitly as exec:exec@run-benchmarks
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.codehaus.mojo"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "exec-maven-plugin"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = self.EXEC_PLUGIN_VERSION
+        
+        executions = ET.SubElement(plugin, "{%s}executions" % self.namespace)
+        execution = ET.SubElement(executions, "{%s}execution" % self.namespace)
+        
+        execution_id = ET.SubElement(execution, "{%s}id" % self.namespace)
+        execution_id.text = "run-benchmarks"
+        
+        goals = ET.SubElement(execution, "{%s}goals" % self.namespace)
+        goal = ET.SubElement(goals, "{%s}goal" % self.namespace)
+        goal.text = "exec"
+        
+        configuration = ET.SubElement(execution, "{%s}configuration" % self.namespace)
+        
+        executable = ET.SubElement(configuration, "{%s}executable" % self.namespace)
+        executable.text = "java"
+        
+        classpath_scope = ET.SubElement(configuration, "{%s}classpathScope" % self.namespace)
+        classpath_scope.text = "test"
+        
+        arguments = ET.SubElement(configuration, "{%s}commandlineArgs" % self.namespace)
+        arguments.text = ("-classpath %classpath org.openjdk.jmh.Main "
+                          "-rf json -rff ${jmh.result} ${jmh.args}")
+        
+        return profile
+    
+    def _write_jmh_sources(self, project_dir):
+        """Create the benchmark source set with an example benchmark if it is missing."""
+        source_dir = os.path.join(project_dir, *self.JMH_SOURCE_DIR.split("/"))
+        if os.path.exists(source_dir):
+            return None
+        package_dir = os.path.join(source_dir, "benchmarks")
+        os.makedirs(package_dir)
+        path = os.path.join(package_dir, "ExampleBenchmark.java")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(JMH_EXAMPLE_BENCHMARK)
+        return path
+    
+    def _add_jlink_plugins(self, plugins):
+        """
+        Add the jdeps/jlink runtime image build, bound to the package phase.
+        
+        The runtime dependencies are copied to target/lib. jdeps then lists
+        the JDK modules the application jar and its dependencies need, and
+        jlink builds target/runtime from just those modules, without debug
+        information, header files and man pages. A launcher script running
+        the application on that runtime is written to target/launcher.
+        
+        With appcds, jlink also adds the JDK's default CDS archive to the
+        runtime, which the application archive builds upon. The training
+        script then dumps target/app-cds.jsa and reports startup times.
+        Training run and launcher list the classpath in the same sorted
+        order, as the JVM rejects an archive whose classpath differs.
+        """
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.apache.maven.plugins"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "maven-dependency-plugin"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = self.DEPENDENCY_PLUGIN_VERSION
+        
+        executions = ET.SubElement(plugin, "{%s}executions" % self.namespace)
+        execution = ET.SubElement(executions, "{%s}execution" % self.namespace)
+        
+        execution_id = ET.SubElement(execution, "{%s}id" % self.namespace)
+        execution_id.text = "copy-runtime-dependencies"
+        
+        phase = ET.SubElement(execution, "{%s}phase" % self.namespace)
+        phase.text = "package"
+        
+        goals = ET.SubElement(execution, "{%s}goals" % self.namespace)
+        goal = ET.SubElement(goals, "{%s}goal" % self.namespace)
+        goal.text = "copy-dependencies"
+        
+        configuration = ET.SubElement(execution, "{%s}configuration" % self.namespace)
+        
+        output_directory = ET.SubElement(configuration, "{%s}outputDirectory" % self.namespace)
+        output_directory.text = "${project.build.directory}/lib"
+        
+        include_scope = ET.SubElement(configuration, "{%s}includeScope" % self.namespace)
+        include_scope.text = "runtime"
+        
+        # Declared after the dependency plugin, so it runs second in package
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.apache.maven.plugins"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "maven-antrun-plugin"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = self.ANTRUN_PLUGIN_VERSION
+        
+        executions = ET.SubElement(plugin, "{%s}executions" % self.namespace)
+        execution = ET.SubElement(executions, "{%s}execution" % self.namespace)
+        
+        execution_id = ET.SubElement(execution, "{%s}id" % self.namespace)
+        execution_id.text = "jlink-runtime"
+        
+        phase = ET.SubElement(execution, "{%s}phase" % self.namespace)
+        phase.text = "package"
+        
+        goals = ET.SubElement(execution, "{%s}goals" % self.namespace)
+        goal = ET.SubElement(goals, "{%s}goal" % self.namespace)
+        goal.text = "run"
+        
+        configuration = ET.SubElement(execution, "{%s}configuration" % self.namespace)
+        target = ET.SubElement(configuration, "{%s}target" % self.namespace)
+        
+        # jlink refuses to write into an existing directory
+        delete = ET.SubElement(target, "{%s}delete" % self.namespace)
+        delete.set("dir", "${project.build.directory}/runtime")
+        
+        # Projects without runtime dependencies get no lib directory
+        mkdir = ET.SubElement(target, "{%s}mkdir" % self.namespace)
+        mkdir.set("dir", "${project.build.directory}/lib")
+        
+        # jdeps.modules and jlink.modules are Ant properties set at run time
+        jdeps = ET.SubElement(target, "{%s}exec" % self.namespace)
+        jdeps.set("executable", "${java.home}/bin/jdeps")
+        jdeps.set("outputproperty", "jdeps.modules")
+        jdeps.set("failonerror", "true")
+        for value in ("--ignore-missing-deps", "--quiet", "--recursive",
+                      "--multi-release", "${jlink.release}", "--print-module-deps",
+                      "--class-path", "${project.build.directory}/lib/*",
+                      "${project.build.directory}/${project.build.finalName}.jar"):
+            arg = ET.SubElement(jdeps, "{%s}arg" % self.namespace)
+            arg.set("value", value)
+        
+        condition = ET.SubElement(target, "{%s}condition" % self.namespace)
+        condition.set("property", "jlink.modules")
+        condition.set("value", "${jdeps.modules},${jlink.add.modules}")
+        condition.set("else", "${jdeps.modules}")
+        length = ET.SubElement(condition, "{%s}length" % self.namespace)
+        length.set("string", "${jlink.add.modules}")
+        length.set("when", "greater")
+        length.set("length", "0")
+        
+        jlink = ET.SubElement(target, "{%s}exec" % self.namespace)
+        jlink.set("executable", "${java.home}/bin/jlink")
+        jlink.set("failonerror", "true")
+        jlink_args = ["--add-modules", "${jlink.modules}", "--strip-debug",
+                      "--no-header-files", "--no-man-pages", "--compress=${jlink.compress}"]
+        if self.appcds:
+            jlink_args.append("--generate-cds-archive")
+        for value in jlink_args + ["--output", "${project.build.directory}/runtime"]:
+            arg = ET.SubElement(jlink, "{%s}arg" % self.namespace)
+            arg.set("value", value)
+        
+        # The jar first, then the dependencies in a reproducible order
+        classpath = ET.SubElement(target, "{%s}path" % self.namespace)
+        classpath.set("id", "app.classpath")
+        jar = ET.SubElement(classpath, "{%s}pathelement" % self.namespace)
+        jar.set("location", "${project.build.directory}/${project.build.finalName}.jar")
+        sort = ET.SubElement(classpath, "{%s}sort" % self.namespace)
+        fileset = ET.SubElement(sort, "{%s}fileset" % self.namespace)
+        fileset.set("dir", "${project.build.directory}/lib")
+        fileset.set("includes", "*.jar")
+        
+        # launcher.classpath and build.classpath are Ant properties as well
+        launcher_classpath = ET.SubElement(target, "{%s}pathconvert" % self.namespace)
+        launcher_classpath.set("property", "launcher.classpath")
+        launcher_classpath.set("refid", "app.classpath")
+        launcher_classpath.set("pathsep", ":")
+        mapping = ET.SubElement(launcher_classpath, "{%s}map" % self.namespace)
+        mapping.set("from", "${project.build.directory}/")
+        mapping.set("to", "$APP_HOME/")
+        
+        java_options = ""
+        if self.appcds:
+            java_options = ("-XX:SharedArchiveFile=\"$APP_HOME/%s\" -Xshare:auto "
+                            "${app.jvm.flags} " % self.APPCDS_ARCHIVE)
+        launcher = ET.SubElement(target, "{%s}echo" % self.namespace)
+        launcher.set("file", "${project.build.directory}/launcher/${project.artifactId}")
+        launcher.text = (
+            "#!/bin/sh\n"
+            "APP_HOME=/usr/share/${project.artifactId}\n"
+            "exec \"$APP_HOME/runtime/bin/java\" " + java_options +
+            "-cp \"${launcher.classpath}\" ${mainClass} \"$@\"\n")
+        
+        if self.appcds:
+            self._add_appcds_training(target)
+        
+        return plugin
+    
+    def _add_appcds_training(self, target):
+        """Add the training run dumping the application CDS archive to the Ant target."""
+        script = ET.SubElement(target, "{%s}echo" % self.namespace)
+        script.set("file", "${project.build.directory}/appcds/train.sh")
+        script.text = APPCDS_TRAINING_SCRIPT
+        
+        build_classpath = ET.SubElement(target, "{%s}pathconvert" % self.namespace)
+        build_classpath.set("property", "build.classpath")
+        build_classpath.set("refid", "app.classpath")
+        build_classpath.set("pathsep", ":")
+        
+        training = ET.SubElement(target, "{%s}exec" % self.namespace)
+        training.set("executable", "sh")
+        training.set("failonerror", "true")
+        for value in ("${project.build.directory}/appcds/train.sh",
+                      "${project.build.directory}/runtime/bin/java",
+                      "${project.build.directory}/%s" % self.APPCDS_ARCHIVE,
+                      "${build.classpath}", "${mainClass}", "${app.jvm.flags}",
+                      "${appcds.runs}", "${appcds.training.args}"):
+            arg = ET.SubElement(training, "{%s}arg" % self.namespace)
+            arg.set("value", value)
+        
+        return training
+    
+    def _add_rpm_plugin(self, plugins):
+        """Add Maven RPM plugin for Linux."""
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.codehaus.mojo"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "rpm-maven-plugin"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = self.RPM_PLUGIN_VERSION
+        
+        configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
+        
+        name_elem = ET.SubElement(configuration, "{%s}name" % self.namespace)
+        name_elem.text = "${project.artifactId}"
+        
+        version_elem = ET.SubElement(configuration, "{%s}version" % self.namespace)
+        version_elem.text = "${project.version}"
+        
+        group_elem = ET.SubElement(configuration, "{%s}group" % self.namespace)
+        group_elem.text = "Applications/Development"
+        
+        packager = ET.SubElement(configuration, "{%s}packager" % self.namespace)
+        packager.text = "JDevtools"
+        
+        if self.jlink:
+            home = "/usr/share/${project.artifactId}"
+            target = "${project.build.directory}"
+            mappings = ET.SubElement(configuration, "{%s}mappings" % self.namespace)
+            self._add_rpm_mapping(mappings, home, target + "/${project.build.finalName}.jar")
+            self._add_rpm_mapping(mappings, home + "/lib", target + "/lib")
+            self._add_rpm_mapping(mappings, home + "/runtime", target + "/runtime",
+                                  excludes=self.RUNTIME_EXECUTABLES)
+            self._add_rpm_mapping(mappings, home + "/runtime", target + "/runtime",
+                                  filemode="755", includes=self.RUNTIME_EXECUTABLES,
+                                  directory_included=False)
+            self._add_rpm_mapping(mappings, "/usr/bin", target + "/launcher",
+                                  filemode="755", directory_included=False)
+            if self.appcds:
+                self._add_rpm_mapping(mappings, home, target + "/" + self.APPCDS_ARCHIVE,
+                                      directory_included=False)
+        
+        return plugin
+    
+    def _add_rpm_mapping(self, mappings, directory, location, filemode=None,
+                         includes=(), excludes=(), directory_included=True):
+        """Add one ``<mapping>`` of files into the RPM."""
+        mapping = ET.SubElement(mappings, "{%s}mapping" % self.namespace)
+        
+        directory_elem = ET.SubElement(mapping, "{%s}directory" % self.namespace)
+        directory_elem.text = directory
+        
+        if filemode:
+            filemode_elem = ET.SubElement(mapping, "{%s}filemode" % self.namespace)
+            filemode_elem.text = filemode
+        
+        if not directory_included:
+            # Do not claim ownership of shared directories such as /usr/bin
+            included = ET.SubElement(mapping, "{%s}directoryIncluded" % self.namespace)
+            included.text = "false"
+        
+        sources = ET.SubElement(mapping, "{%s}sources" % self.namespace)
+        source = ET.SubElement(sources, "{%s}source" % self.namespace)
+        
+        location_elem = ET.SubElement(source, "{%s}location" % self.namespace)
+        location_elem.text = location
+        
+        for name, patterns in (("includes", includes), ("excludes", excludes)):
+            if patterns:
+                patterns_elem = ET.SubElement(source, "{%s}%s" % (self.namespace, name))
+                for pattern in patterns:
+                    pattern_elem = ET.SubElement(patterns_elem, "{%s}%s" % (self.namespace, name[:-1]))
+                    pattern_elem.text = pattern
+        
+        return mapping
+    
+    def _add_deb_plugin(self, plugins):
+        """Add Maven DEB plugin for Linux."""
+        plugin = ET.SubElement(plugins, "{%s}plugin" % self.namespace)
+        
+        group_id = ET.SubElement(plugin, "{%s}groupId" % self.namespace)
+        group_id.text = "org.vafer"
+        
+        artifact_id = ET.SubElement(plugin, "{%s}artifactId" % self.namespace)
+        artifact_id.text = "jdeb"
+        
+        version = ET.SubElement(plugin, "{%s}version" % self.namespace)
+        version.text = self.DEB_PLUGIN_VERSION
+        
+        configuration = ET.SubElement(plugin, "{%s}configuration" % self.namespace)
+        
+        data_set = ET.SubElement(configuration, "{%s}dataSet" % self.namespace)
+        
+        home = "/usr/share/${project.artifactId}"
+        target = "${project.build.directory}"
+        self._add_deb_data(data_set, target + "/${project.build.finalName}.jar", "file", home)
+        
+        if self.jlink:
+            self._add_deb_data(data_set, target + "/lib", "directory", home + "/lib")
+            # jdeb does not keep file modes, so executables are mapped separately
+            self._add_deb_data(data_set, target + "/runtime", "directory", home + "/runtime",
+                               excludes=self.RUNTIME_EXECUTABLES)
+            self._add_deb_data(data_set, target + "/runtime", "directory", home + "/runtime",
+                               filemode="755", includes=self.RUNTIME_EXECUTABLES)
+            self._add_deb_data(data_set, target + "/launcher", "directory", "/usr/bin",
+                               filemode="755")
+            if self.appcds:
+                self._add_deb_data(data_set, target + "/" + self.APPCDS_ARCHIVE, "file", home)
+        
+        return plugin
+    
+    def _add_deb_data(self, data_set, src, type_, prefix, filemode=None,
+                      includes=(), excludes=()):
+        """Add one ``<data>`` entry to the DEB data set."""
+        data = ET.SubElement(data_set, "{%s}data" % self.namespace)
+        
+        src_elem = ET.SubElement(data, "{%s}src" % self.namespace)
+        src_elem.text = src
+        
+        type_elem = ET.SubElement(data, "{%s}type" % self.namespace)
+        type_elem.text = type_
+        
+        if includes:
+            includes_elem = ET.SubElement(data, "{%s}includes" % self.namespace)
+            includes_elem.text = ",".join(includes)
+        if excludes:
+            excludes_elem = ET.SubElement(data, "{%s}excludes" % self.namespace)
+            excludes_elem.text = ",".join(excludes)
+        
+        mapper = ET.SubElement(data, "{%s}mapper" % self.namespace)
+        
+        mapper_type = ET.SubElement(mapper, "{%s}type" % self.namespace)
+        mapper_type.text = "perm"
+        
+        prefix_elem = ET.SubElement(mapper, "{%s}prefix" % self.namespace)
+        prefix_elem.text = prefix
+        
+        if filemode:
+            filemode_elem = ET.SubElement(mapper, "{%s}filemode" % self.namespace)
+            filemode_elem.text = filemode
+        
+        return data
+    
+    def _merge_roots(self, new_root, existing_root, existing_path=None):
+        """
+        Merge an existing POM tree into a generated one.
+        
+        Args:
+            new_root: The new POM root element (modified in place)
+            existing_root: Root element of the existing POM (consumed)
+            existing_path: File of the existing POM, needed to resolve parents
+            
+        Returns:
+            Merged POM root element
+        """
+        generated_props = set()
+        props = new_root.find("{%s}properties" % self.namespace)
+        if props is not None:
+            generated_props = {local_name(prop.tag) for prop in props}
+        generated_plugins = set()
+        plugins = new_root.find("{%s}build/{%s}plugins" % (self.namespace, self.namespace))
+        if plugins is not None:
+            merger = PomMerger(self.namespace)
+            generated_plugins = {merger.plugin_key(plugin) for plugin in plugins}
+        
+        # A module inheriting its groupId or version from <parent> must not
+        # get the template coordinates, they would change its identity
+        inherited_coords = []
+        if existing_root.find("{%s}parent" % self.namespace) is not None or \
+                existing_root.find("parent") is not None:
+            inherited_coords = [tag for tag in ("groupId", "version")
+                                if existing_root.find("{%s}%s" % (self.namespace, tag)) is None
+                                and existing_root.find(tag) is None]
+        
+        # Index-based merge of project info, properties, dependencies,
+        # dependency management, build plugins and profiles
+        merged = PomMerger(self.namespace).merge(new_root, existing_root)
+        for tag in inherited_coords:
+            elem = merged.find("{%s}%s" % (self.namespace, tag))
+            if elem is not None:
+                merged.remove(elem)
+        
+        if self.resolve_parents and existing_path:
+            self._drop_inherited(merged, generated_props, generated_plugins, existing_path)
+        return merged
+    
+    def _merge_with_existing(self, new_root):
+        """
+        Merge new POM with existing POM file if provided.
+        
+        Args:
+            new_root: The new POM root element
+            
+        Returns:
+            Merged POM root element
+        """
+        if not self.existing_pom or not os.path.exists(self.existing_pom):
+            return new_root
+        
+        try:
+            existing_root = ET.parse(self.existing_pom).getroot()
+            merged = self._merge_roots(new_root, existing_root, self.existing_pom)
+            if self.resolve_parents:
+                self._resolver(self.existing_pom).save()
+            return merged
+        except Exception as e:
+            if self.strict:
+                raise
+            print(f"Warning: Could not merge with existing POM: {e}")
+            return new_root
+    
+    def _options(self):
+        """
+        Collect the settings that influence the generated POM.
+        
+        Returns:
+            JSON-serializable dict used for input fingerprinting
+        """
+        options = {
+            'tool_version': __version__,
+            'os_type': self._get_os_type(),
+            'plugin_versions': {
+                'native-maven-plugin': self.NATIVE_PLUGIN_VERSION,
+                'rpm-maven-plugin': self.RPM_PLUGIN_VERSION,
+                'jdeb': self.DEB_PLUGIN_VERSION,
+                'maven-surefire-plugin': self.SUREFIRE_PLUGIN_VERSION,
+            },
+            'jmh': [self.JMH_VERSION, self.BUILD_HELPER_PLUGIN_VERSION,
+                    self.EXEC_PLUGIN_VERSION] if self.jmh else None,
+            'jlink': [self.DEPENDENCY_PLUGIN_VERSION,
+                      self.ANTRUN_PLUGIN_VERSION] if self.jlink else None,
+            'appcds': self.appcds,
+            'resolve_parents': self.resolve_parents,
+            'arch': self._get_arch(),
+            'native': [self.native_profile, self.native_threads, self.native_memory],
+        }
+        if self.resolve_parents and self.existing_pom and os.path.exists(self.existing_pom):
+            # Parent and BOM files that the output depends on
+            options['inherited_sources'] = self._resolver(self.existing_pom).inherited(
+                self.existing_pom).sources
+        return options
+    
+    def fingerprint(self):
+        """
+        Fingerprint the generator inputs.
+        
+        Returns:
+            Hex digest over the existing POM bytes and generator options
+        """
+        existing = self.existing_pom
+        if existing and not os.path.exists(existing):
+            existing = None
+        return fingerprint_inputs(self._options(), existing)
+    
+    def _create_generated_tree(self):
+        """Build the generated POM tree, before merging, from scratch."""
+        # Create base POM structure
+        root = self._create_base_pom()
+        
+        # Add properties
+        self._add_properties(root)
+        
+        # Add build section
+        build = ET.SubElement(root, "{%s}build" % self.namespace)
+        self._add_surefire_management(build)
+        plugins = ET.SubElement(build, "{%s}plugins" % self.namespace)
+        
+        # Always add native image plugin
+        self._add_native_image_plugin(plugins)
+        
+        if self.jlink:
+            self._add_jlink_plugins(plugins)
+        
+        # Add platform-specific plugins
+        os_type = self._get_os_type()
+        if os_type == "linux":
+            self._add_rpm_plugin(plugins)
+            self._add_deb_plugin(plugins)
+        
+        # Selectable native-image build profiles
+        self._add_native_profiles(root)
+        self._add_pgo_profiles(root)
+        if self.jmh:
+            self._add_jmh_profile(root)
+        
+        return root
+    
+    def _generated_tree(self):
+        """
+        Return a fresh copy of the generated POM tree.
+        
+        The generated plugins, properties and profiles depend only on the
+        generator settings, so they are built once per configuration and
+        process. Every POM gets a deep copy that the merge may modify.
+        """
+        key = (type(self), self.namespace, self._get_os_type(), self.native_profile,
+               self.native_threads, self.native_memory, self.NATIVE_PLUGIN_VERSION,
+               self.RPM_PLUGIN_VERSION, self.DEB_PLUGIN_VERSION,
+               self.SUREFIRE_PLUGIN_VERSION, self.jmh, self.JMH_VERSION,
+               self.BUILD_HELPER_PLUGIN_VERSION, self.EXEC_PLUGIN_VERSION, self.jlink,
+               self.DEPENDENCY_PLUGIN_VERSION, self.ANTRUN_PLUGIN_VERSION, self.appcds)
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is not None:
+                _templates.move_to_end(key)
+        if template is None:
+            template = self._create_generated_tree()
+            with _templates_lock:
+                template = _templates.setdefault(key, template)
+                while len(_templates) > MAX_TEMPLATES:
+                    _templates.popitem(last=False)
+        return copy.deepcopy(template)
+    
+    def _build_tree(self):
+        """Build and merge the POM element tree."""
+        root = self._generated_tree()
+        if self._get_os_type() == "linux":
+            self._log("Added Linux-specific packaging plugins (RPM and DEB)")
+        
+        # Merge with existing POM if provided
+        return self._merge_with_existing(root)
+    
+    def _existing_root(self, existing):
+        """
+        Load an existing POM given to build().
+        
+        Returns:
+            Tuple ``(root, path)``; root is None when there is nothing to merge
+        """
+        if existing is None:
+            existing = self.existing_pom
+            if not existing or not os.path.exists(existing):
+                return None, None
+        if isinstance(existing, ET.Element):
+            return copy.deepcopy(existing), None
+        if isinstance(existing, bytes) or \
+                (isinstance(existing, str) and existing.lstrip().startswith("<")):
+            return ET.fromstring(existing), None
+        existing = os.fspath(existing)
+        return ET.parse(existing).getroot(), existing
+    
+    def build(self, existing=None):
+        """
+        Build the merged POM element tree without writing or printing anything.
+        
+        Safe to call from several threads on the same generator.
+        
+        Args:
+            existing: Existing POM to merge with, as a file path, XML text or
+                bytes, or an element, which is not modified
+                (default: the generator's existing_pom)
+            
+        Returns:
+            Root ``project`` element
+            
+        Raises:
+            ET.ParseError: If the existing POM is not well-formed XML
+            OSError: If the existing POM file cannot be read
+        """
+        root = self._generated_tree()
+        existing_root, existing_path = self._existing_root(existing)
+        if existing_root is None:
+            return root
+        return self._merge_roots(root, existing_root, existing_path)
+    
+    def render(self, existing=None):
+        """
+        Serialize the merged POM without writing or printing anything.
+        
+        Args:
+            existing: Existing POM to merge with, as for build()
+            
+        Returns:
+            The POM document as a string, identical to what generate() writes
+        """
+        stream = io.StringIO()
+        write_pom(self.build(existing), stream)
+        return stream.getvalue()
+    
+    def render_bytes(self, existing=None):
+        """
+        Serialize the merged POM as UTF-8 bytes, see render().
+        
+        Returns:
+            The encoded POM document
+        """
+        return self.render(existing).encode("utf-8")
+    
+    def _resolver(self, pom_path):
+        """Return the shared parent resolver for the repository and the POM's project."""
+        from jdevtools.effective import get_resolver, project_index_path
+        return get_resolver(self.repository, project_index_path(pom_path))
+    
+    def _drop_inherited(self, root, generated_props, generated_plugins, existing_path):
+        """
+        Remove entries the existing POM already inherits unchanged.
+        
+        Generated properties whose value matches the inherited one (and the
+        ``<properties>`` section if that leaves it empty) and dependencies
+        identical to an inherited dependency are dropped. Generated plugins
+        whose version the parent chain pins lose their ``<version>``, so the
+        inherited one applies; their configuration is kept. Dependency versions
+        equal to the one an inherited dependencyManagement section or BOM
+        manages are removed, so the managed version stays authoritative.
+        
+        Args:
+            root: Merged POM root element
+            generated_props: Names of the properties added by the generator
+            generated_plugins: ``(groupId, artifactId)`` of the generated
+                build plugins
+            existing_path: File of the existing POM
+        """
+        from jdevtools.effective import dependency_id, interpolate
+        
+        resolver = self._resolver(existing_path)
+        inherited = resolver.inherited(existing_path)
+        
+        properties = dict(inherited.properties)
+        props = root.find("{%s}properties" % self.namespace)
+        if props is not None:
+            for prop in list(props):
+                name = local_name(prop.tag)
+                if name in generated_props and \
+                        inherited.properties.get(name) == (prop.text or "").strip():
+                    props.remove(prop)
+                else:
+                    properties[name] = (prop.text or "").strip()
+            if len(props) == 0:
+                root.remove(props)
+        
+        merger = PomMerger(self.namespace)
+        plugins = root.find("{%s}build/{%s}plugins" % (self.namespace, self.namespace))
+        if plugins is not None:
+            for plugin in plugins:
+                key = merger.plugin_key(plugin)
+                version_elem = plugin.find("{%s}version" % self.namespace)
+                if key in generated_plugins and version_elem is not None and \
+                        inherited.plugin_versions.get("%s:%s" % key):
+                    plugin.remove(version_elem)
+        
+        deps = root.find("{%s}dependencies" % self.namespace)
+        if deps is not None:
+            for dep in list(deps):
+                version_elem = dep.find("{%s}version" % self.namespace)
+                version = version_elem.text.strip() if version_elem is not None and \
+                    version_elem.text else None
+                scope = dep.findtext("{%s}scope" % self.namespace)
+                key = dependency_id(*merger.dependency_key(dep))
+                if inherited.has_dependency(key, version, scope and scope.strip()):
+                    deps.remove(dep)
+                    continue
+                managed = inherited.managed.get(key)
+                if version and managed and \
+                        managed.get("version") == interpolate(version, properties):
+                    dep.remove(version_elem)
+    
+    def _write_mvn_files(self, project_dir):
+        """Write the requested .mvn/ project configuration files."""
+        changed = []
+        if self.maven_config:
+            from jdevtools.jvmconfig import write_maven_configs
+            changed += write_maven_configs(project_dir)
+        if self.build_cache:
+            from jdevtools.build_cache import write_build_cache_config
+            changed += write_build_cache_config(project_dir, self.build_cache_dir)
+        for path in changed:
+            self._log(f"Generated Maven config: {path}")
+    
+    def generate(self, output_path="pom.xml"):
+        """
+        Generate the POM file.
+        
+        The file is only rewritten when its content changes, so unchanged
+        POMs keep their mtime. With caching enabled, a sidecar fingerprint
+        lets repeated runs return before the XML tree is built.
+        
+        Args:
+            output_path: Path where to save the generated POM file
+            
+        Returns:
+            Path to generated POM file
+        """
+        cache = PomCache(output_path) if self.use_cache else None
+        inputs = self.fingerprint() if cache else None
+        
+        project_dir = os.path.dirname(os.path.abspath(output_path))
+        self._write_mvn_files(project_dir)
+        if self.jmh:
+            example = self._write_jmh_sources(project_dir)
+            if example:
+                self._log(f"Created example benchmark: {example}")
+        
+        if cache and cache.is_fresh(inputs):
+            self.status = "cached"
+            self._log(f"POM file up to date: {output_path}")
+            return output_path
+        
+        root = self._build_tree()
+        
+        # Stream the indented tree to disk, replacing the file only on change
+        if self.use_cache:
+            changed, output_hash = write_if_changed(
+                output_path, lambda stream: write_pom(root, stream))
+        else:
+            with open(output_path, 'w', encoding='utf-8', newline='\n') as f:
+                write_pom(root, f)
+            changed, output_hash = True, None
+        self.status = "written" if changed else "unchanged"
+        
+        if cache:
+            # Regenerating in place feeds the output back in as the next input
+            if self.existing_pom and os.path.exists(self.existing_pom) and \
+                    os.path.samefile(self.existing_pom, output_path):
+                inputs = self.fingerprint()
+            cache.store(inputs, output_hash)
+        
+        if changed:
+            self._log(f"Generated POM file: {output_path}")
+        else:
+            self._log(f"POM file unchanged: {output_path}")
+        self._log(f"Platform: {self._get_os_type()}")
+        self._log(f"Native image support: enabled")
+        
+        return output_path
@@ -0,0 +1,230 @@
+"""
+Indexed merge engine for Maven POM element trees.
+
+Merges an existing POM into a freshly generated one. Every keyed section is
+indexed once, so merging is linear in the size of both documents, and the
+result of merging a POM into its own output is the same output.
+"""
+
+from jdevtools.pom_writer import POM_NAMESPACE
+
+# Canonical order of top-level POM elements, used when a section has to be
+# created in the generated tree.
+PROJECT_ORDER = [
+    "modelVersion", "parent", "groupId", "artifactId", "version", "packaging",
+    "name", "description", "url", "inceptionYear", "organization", "licenses",
+    "developers", "contributors", "mailingLists", "prerequisites", "modules",
+    "scm", "issueManagement", "ciManagement", "distributionManagement",
+    "properties", "dependencyManagement", "dependencies", "repositories",
+    "pluginRepositories", "build", "reporting", "profiles",
+]
+
+BUILD_ORDER = [
+    "sourceDirectory", "scriptSourceDirectory", "testSourceDirectory",
+    "outputDirectory", "testOutputDirectory", "extensions", "defaultGoal",
+    "resources", "testResources", "directory", "finalName", "filters",
+    "pluginManagement", "plugins",
+]
+
+# Project information copied from the existing POM, which wins over defaults
+PROJECT_INFO = ["groupId", "artifactId", "version", "name", "description"]
+
+DEFAULT_PLUGIN_GROUP = "org.apache.maven.plugins"
+
+
+def local_name(tag):
+    """Strip the namespace from a Clark-notation tag."""
+    if tag[:1] == "{":
+        return tag.split("}", 1)[1]
+    return tag
+
+
+class PomMerger:
+    """Merges an existing POM tree into a generated POM tree."""
+
+    def __init__(self, namespace=POM_NAMESPACE):
+        """
+        Initialize the merger.
+
+        Args:
+            namespace: XML namespace of the POM elements
+        """
+        self.namespace = namespace
+
+    def _tag(self, name):
+        return "{%s}%s" % (self.namespace, name)
+
+    def _text(self, elem, name, default=""):
+        child = elem.find(self._tag(name))
+        if child is None or child.text is None:
+            return default
+        return child.text.strip()
+
+    def dependency_key(self, dep):
+        """Return the Maven coordinates identifying a dependency."""
+        return (
+            self._text(dep, "groupId"),
+            self._text(dep, "artifactId"),
+            self._text(dep, "type", "jar"),
+            self._text(dep, "classifier"),
+        )
+
+    def plugin_key(self, plugin):
+        """Return the Maven coordinates identifying a plugin."""
+        return (
+            self._text(plugin, "groupId", DEFAULT_PLUGIN_GROUP),
+            self._text(plugin, "artifactId"),
+        )
+
+    def profile_key(self, profile):
+        """Return the id identifying a profile."""
+        return self._text(profile, "id", "default")
+
+    def property_key(self, prop):
+        """Return the name identifying a property."""
+        return local_name(prop.tag)
+
+    def normalize(self, root):
+        """
+        Move elements of a POM written without a namespace into the POM namespace.
+
+        Args:
+            root: Root element of a parsed POM
+
+        Returns:
+            The same root element
+        """
+        if root.tag[:1] == "{":
+            return root
+        for elem in root.iter():
+            if isinstance(elem.tag, str) and elem.tag[:1] != "{":
+                elem.tag = self._tag(elem.tag)
+        return root
+
+    def _ensure_child(self, parent, name, order):
+        """Return the named child of ``parent``, creating it in canonical order."""
+        child = parent.find(self._tag(name))
+        if child is not None:
+            return child
+        child = parent.makeelement(self._tag(name), {})
+        self._insert_ordered(parent, child, order)
+        return child
+
+    def _insert_ordered(self, parent, elem, order):
+        """Insert ``elem`` into ``parent`` at its canonical position."""
+        name = local_name(elem.tag)
+        rank = order.index(name) if name in order else len(order)
+        for idx, sibling in enumerate(parent):
+            if not isinstance(sibling.tag, str):
+                continue
+            sibling_name = local_name(sibling.tag)
+            if sibling_name in order and order.index(sibling_name) > rank:
+                parent.insert(idx, elem)
+                return
+        parent.append(elem)
+
+    def merge_keyed(self, new_container, existing_container, key_fn):
+        """
+        Append children of ``existing_container`` whose key is not yet present.
+
+        Generated children keep their position and win over existing ones with
+        the same key; existing-only children follow in their original order.
+
+        Args:
+            new_container: Container element in the generated tree
+            existing_container: Matching container in the existing tree
+            key_fn: Function mapping a child element to its identity key
+        """
+        seen = set()
+        for child in new_container:
+            if isinstance(child.tag, str):
+                seen.add(key_fn(child))
+        for child in list(existing_container):
+            if not isinstance(child.tag, str):
+                continue
+            key = key_fn(child)
+            if key not in seen:
+                seen.add(key)
+                new_container.append(child)
+
+    def _merge_container(self, new_parent, existing_parent, path, key_fn, order):
+        """Keyed-merge the container at ``path`` (a list of tag names)."""
+        existing = existing_parent
+        for name in path:
+            existing = existing.find(self._tag(name))
+            if existing is None:
+                return
+        target = new_parent
+        for depth, name in enumerate(path):
+            target = self._ensure_child(target, name, order if depth == 0 else [])
+        self.merge_keyed(target, existing, key_fn)
+
+    def _merge_project_info(self, new_root, existing_root):
+        for tag in PROJECT_INFO:
+            existing_elem = existing_root.find(self._tag(tag))
+            if existing_elem is None:
+                continue
+            new_elem = new_root.find(self._tag(tag))
+            if new_elem is not None:
+                new_elem.text = existing_elem.text
+            else:
+                self._insert_ordered(new_root, existing_elem, PROJECT_ORDER)
+
+    def _merge_build(self, new_root, existing_root):
+        existing_build = existing_root.find(self._tag("build"))
+        if existing_build is None:
+            return
+        new_build = self._ensure_child(new_root, "build", PROJECT_ORDER)
+        self._merge_container(new_build, existing_build, ["plugins"],
+                              self.plugin_key, BUILD_ORDER)
+        self._merge_container(new_build, existing_build,
+                              ["pluginManagement", "plugins"],
+                              self.plugin_key, BUILD_ORDER)
+        for child in existing_build:
+            if not isinstance(child.tag, str):
+                continue
+            name = local_name(child.tag)
+            if name in ("plugins", "pluginManagement"):
+                continue
+            if new_build.find(child.tag) is None:
+                self._insert_ordered(new_build, child, BUILD_ORDER)
+
+    def merge(self, new_root, existing_root):
+        """
+        Merge ``existing_root`` into ``new_root``.
+
+        Args:
+            new_root: Root element of the generated POM (modified in place)
+            existing_root: Root element of the existing POM
+
+        Returns:
+            The merged root element
+        """
+        self.normalize(existing_root)
+        self._merge_project_info(new_root, existing_root)
+
+        handled = set(PROJECT_INFO)
+        handled.update(["modelVersion", "properties", "dependencies",
+                        "dependencyManagement", "build", "profiles"])
+
+        self._merge_container(new_root, existing_root, ["properties"],
+                              self.property_key, PROJECT_ORDER)
+        self._merge_container(new_root, existing_root,
+                              ["dependencyManagement", "dependencies"],
+                              self.dependency_key, PROJECT_ORDER)
+        self._merge_container(new_root, existing_root, ["dependencies"],
+                              self.dependency_key, PROJECT_ORDER)
+        self._merge_build(new_root, existing_root)
+        self._merge_container(new_root, existing_root, ["profiles"],
+                              self.profile_key, PROJECT_ORDER)
+
+        # Carry over everything else the generator does not produce itself
+        for child in list(existing_root):
+            if not isinstance(child.tag, str):
+                continue
+            if local_name(child.tag) in handled:
+                continue
+            if new_root.find(child.tag) is None:
+                self._insert_ordered(new_root, child, PROJECT_ORDER)
+
+        return new_root
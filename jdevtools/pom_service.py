@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Long-running local POM generation service.
+
+Keeps PomGenerator instances and their generated trees warm in one process
+and serves generation over HTTP, on a TCP port or a Unix socket. Every
+request is handled on its own thread.
+
+Endpoints:
+    POST /pom      Generate a POM. The request body is the existing POM to
+                   merge with (may be empty). Query parameters select the
+                   generator settings: native_profile, native_threads,
+                   native_memory and resolve_parents. Alternatively ``path``
+                   names an existing POM file under one of the server's
+                   project roots (--root), which is needed for
+                   resolve_parents.
+    GET /health    Liveness check
+
+Example:
+    jpom-server --socket /tmp/jpom.sock &
+    curl --unix-socket /tmp/jpom.sock --data-binary @pom.xml \\
+        'http://localhost/pom?native_profile=release'
+"""
+
+import argparse
+import collections
+import os
+import re
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from jdevtools import __version__
+from jdevtools.pom_generator import PomGenerator
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest accepted request body
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Warm generators kept; the least recently used settings are evicted
+MAX_GENERATORS = 16
+MAX_NATIVE_THREADS = 1024
+
+_MEMORY_RE = re.compile(r"^[1-9]\d{0,6}[kmg]$", re.IGNORECASE)
+
+_TRUE = ("1", "true", "yes", "on")
+
+
+class PomService:
+    """Generators shared by all request threads, one per settings combination.
+
+    At most MAX_GENERATORS generators are kept warm.
+
+    Args:
+        roots: Directories that ``path`` parameters may point into. Without
+            roots, requests can only send the existing POM as a body.
+    """
+
+    def __init__(self, roots=()):
+        self.roots = [os.path.realpath(root) for root in roots]
+        self._generators = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def generator(self, query):
+        """
+        Return the warm generator for the settings in a query string.
+
+        Args:
+            query: Dict of query parameter -> list of values
+
+        Raises:
+            ValueError: For unknown parameters or invalid values
+        """
+        unknown = set(query) - {"native_profile", "native_threads", "native_memory",
+                                "resolve_parents", "path"}
+        if unknown:
+            raise ValueError("Unknown parameter(s): %s" % ", ".join(sorted(unknown)))
+
+        def value(name):
+            return query[name][-1] if name in query else None
+
+        threads = value("native_threads")
+        if threads and not (threads.isdigit() and 1 <= int(threads) <= MAX_NATIVE_THREADS):
+            raise ValueError("native_threads must be between 1 and %d" % MAX_NATIVE_THREADS)
+        memory = value("native_memory")
+        if memory and not _MEMORY_RE.match(memory):
+            raise ValueError("native_memory must be a size such as 512m or 8g")
+        options = (
+            value("native_profile") or "dev",
+            int(threads) if threads else None,
+            memory.lower() if memory else None,
+            (value("resolve_parents") or "").lower() in _TRUE,
+        )
+        with self._lock:
+            generator = self._generators.get(options)
+            if generator is None:
+                generator = PomGenerator(native_profile=options[0], native_threads=options[1],
+                                         native_memory=options[2], resolve_parents=options[3],
+                                         use_cache=False, quiet=True, strict=True)
+                self._generators[options] = generator
+                while len(self._generators) > MAX_GENERATORS:
+                    self._generators.popitem(last=False)
+            else:
+                self._generators.move_to_end(options)
+            return generator
+
+    def resolve_path(self, path):
+        """
+        Return the real path of a requested POM file.
+
+        Raises:
+            ValueError: If the path, after resolving symlinks and "..", is
+                outside every project root
+        """
+        real = os.path.realpath(path)
+        for root in self.roots:
+            if os.path.commonpath([root, real]) == root:
+                return real
+        raise ValueError("Path is outside the project roots: %s" % path)
+
+    def generate(self, query, body):
+        """
+        Generate a POM for one request.
+
+        Returns:
+            The POM document as UTF-8 bytes
+        """
+        generator = self.generator(query)
+        existing = body or None
+        if "path" in query:
+            if body:
+                raise ValueError("Pass either a request body or a path, not both")
+            existing = self.resolve_path(query["path"][-1])
+        return generator.render_bytes(existing)
+
+
+class PomRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a PomService."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "jpom-server/" + __version__
+
+    def _reply(self, status, body, content_type="text/plain; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/health":
+            self._reply(200, b"ok\n")
+        else:
+            self._reply(404, b"Not found\n")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        # The body cannot be skipped without a valid length, so the
+        # connection is closed after rejecting it
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._reply(400, b"Invalid Content-Length\n")
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._reply(413, b"Request body too large\n")
+            return
+        body = self.rfile.read(length) if length else b""
+        if url.path != "/pom":
+            self._reply(404, b"Not found\n")
+            return
+        try:
+            pom = self.server.service.generate(parse_qs(url.query), body)
+        except (ValueError, ET.ParseError, OSError) as e:
+            self._reply(400, ("Error: %s\n" % e).encode("utf-8"))
+            return
+        except Exception as e:
+            self._reply(500, ("Error: %s\n" % e).encode("utf-8"))
+            return
+        self._reply(200, pom, "application/xml; charset=utf-8")
+
+    def address_string(self):
+        # Unix socket peers have no address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PomHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server on a TCP port."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service=None, verbose=False):
+        self.service = service or PomService()
+        self.verbose = verbose
+        super().__init__(address, PomRequestHandler)
+
+
+if hasattr(socket, "AF_UNIX"):
+    class PomUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Threaded HTTP server on a Unix socket."""
+
+        daemon_threads = True
+
+        def __init__(self, path, service=None, verbose=False):
+            self.service = service or PomService()
+            self.verbose = verbose
+            # A socket file left behind by a previous server blocks bind();
+            # anything else at the path is not ours to delete
+            try:
+                mode = os.lstat(path).st_mode
+            except FileNotFoundError:
+                mode = None
+            if mode is not None:
+                if not stat.S_ISSOCK(mode):
+                    raise FileExistsError("Not a socket, refusing to replace: %s" % path)
+                os.remove(path)
+            super().__init__(path, PomRequestHandler)
+
+        def server_close(self):
+            super().server_close()
+            try:
+                os.remove(self.server_address)
+            except OSError:
+                pass
+
+
+def main(argv=None):
+    """Run the POM generation service until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="jpom-server",
+        description="Serve POM generation over HTTP from a warm process")
+    parser.add_argument('--socket', metavar='PATH', default=None,
+                        help='Listen on a Unix socket instead of a TCP port')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help='Address to listen on (default: %s)' % DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help='Port to listen on (default: %d)' % DEFAULT_PORT)
+    parser.add_argument('--root', metavar='DIR', action='append', default=None,
+                        help='Directory that path parameters may read POMs from; '
+                             'repeatable (default: current directory)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Log every request to stderr')
+    args = parser.parse_args(argv)
+
+    try:
+        service = PomService(args.root or [os.getcwd()])
+        if args.socket:
+            if not hasattr(socket, "AF_UNIX"):
+                raise ValueError("Unix sockets are not supported on this platform")
+            server = PomUnixServer(args.socket, service, verbose=args.verbose)
+            where = args.socket
+        else:
+            server = PomHTTPServer((args.host, args.port), service, verbose=args.verbose)
+            where = "http://%s:%d" % server.server_address[:2]
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print("[jpom-server] Listening on %s" % where, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
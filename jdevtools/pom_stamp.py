@@ -0,0 +1,150 @@
+"""
+Cache locations and the no-op stamp of jcompile-dispatch.
+
+The POM cache keeps one JSON sidecar per generated POM under the project's
+``.jdevtools/pom-cache`` directory. Checking that sidecar needs the generator
+itself, because its fingerprint covers the platform, the plugin versions and
+the options; importing the generator, argparse and json costs far more than a
+repeated run otherwise does. Next to the sidecar, a plain-text stamp
+therefore records the command line of the last plain run together with the
+stat of the existing and the generated POM. When the stamp of an identical
+command still matches, the command line front end can report the POM as up
+to date before any of those imports. This module only imports ``os`` and
+``sys``.
+"""
+
+import os
+import sys
+
+from jdevtools import STATE_DIR, __version__
+
+CACHE_DIR = "pom-cache"
+
+# Options of a run that writes nothing but the POM and its sidecar. Everything
+# else (--batch, --force, --jmh, --maven-config, ...) takes the full path.
+_VALUE_OPTIONS = ("--existing", "--output", "--native-profile",
+                  "--native-threads", "--native-memory")
+_FLAG_OPTIONS = ("--jlink", "--appcds")
+
+# Generator sources whose edits change the output without a version bump
+_GENERATOR_MODULES = ("pom_generator.py", "pom_merge.py", "pom_writer.py")
+
+
+def project_root(path):
+    """Return the outermost directory above ``path`` that still holds a ``pom.xml``."""
+    project_dir = os.path.dirname(os.path.abspath(path))
+    parent = os.path.dirname(project_dir)
+    while parent != project_dir and os.path.isfile(os.path.join(parent, "pom.xml")):
+        project_dir, parent = parent, os.path.dirname(parent)
+    return project_dir
+
+
+def _state_path(output_path, suffix):
+    output_path = os.path.abspath(output_path)
+    root = project_root(output_path)
+    return os.path.join(root, STATE_DIR, CACHE_DIR,
+                        os.path.relpath(output_path, root) + suffix)
+
+
+def sidecar_path(output_path):
+    """Return the path of the fingerprint sidecar for ``output_path``."""
+    return _state_path(output_path, ".json")
+
+
+def stamp_path(output_path):
+    """Return the path of the no-op stamp for ``output_path``."""
+    return _state_path(output_path, ".noop")
+
+
+def plain_options(argv):
+    """
+    Parse the command line of a run that only generates one POM.
+
+    Args:
+        argv: Command line arguments, without the program name
+
+    Returns:
+        Dict of option name to value (``True`` for flags), or None when the
+        run does anything else or needs argparse to interpret it
+    """
+    options = {}
+    args = iter(argv)
+    for arg in args:
+        name, sep, value = arg.partition("=")
+        if name in _VALUE_OPTIONS:
+            if not sep:
+                value = next(args, None)
+                if value is None or value.startswith("-"):
+                    return None
+        elif name in _FLAG_OPTIONS and not sep:
+            value = True
+        else:
+            return None
+        options[name] = value
+    return options
+
+
+def _stat_line(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    return "%d %d" % (st.st_size, st.st_mtime_ns)
+
+
+def _stamp(argv, options):
+    """Return the stamp text of a plain run, from the current state on disk."""
+    if hasattr(os, "uname"):
+        machine = os.uname().machine
+    else:
+        machine = os.environ.get("PROCESSOR_ARCHITECTURE", "")
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    existing = options.get("--existing")
+    lines = [
+        "jcompile-dispatch %s" % __version__,
+        "%s %s" % (sys.platform, machine),
+        " ".join(_stat_line(os.path.join(package_dir, name)) for name in _GENERATOR_MODULES),
+        repr(list(argv)),
+        os.path.abspath(existing) if existing else "",
+        _stat_line(existing) if existing else "",
+        _stat_line(options.get("--output", "pom.xml")),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def is_noop(argv):
+    """
+    Check whether a plain run with ``argv`` would leave everything as it is.
+
+    Returns:
+        The output path when the stamp of the last identical run still
+        matches, otherwise None
+    """
+    options = plain_options(argv)
+    if options is None:
+        return None
+    output_path = options.get("--output", "pom.xml")
+    try:
+        with open(stamp_path(output_path), encoding="utf-8") as f:
+            recorded = f.read()
+    except (OSError, ValueError):
+        return None
+    return output_path if recorded == _stamp(argv, options) else None
+
+
+def record(argv):
+    """Record the stamp after a successful plain run with ``argv``."""
+    options = plain_options(argv)
+    if options is None:
+        return
+    path = stamp_path(options.get("--output", "pom.xml"))
+    tmp_path = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(_stamp(argv, options))
+        os.replace(tmp_path, path)
+    except OSError:
+        # Like the sidecar, the stamp is an optimization only
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
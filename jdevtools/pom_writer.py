@@ -0,0 +1,157 @@
+"""
+Streaming serializer for Maven POM element trees.
+
+Writes an indented document straight to a text stream in a single pass over
+the tree, without building an intermediate string or a second DOM.
+"""
+
+import xml.etree.ElementTree as ET
+
+POM_NAMESPACE = "http://maven.apache.org/POM/4.0.0"
+XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Namespaces that always get the same prefix so output stays stable.
+_WELL_KNOWN_PREFIXES = {
+    POM_NAMESPACE: "",
+    XSI_NAMESPACE: "xsi",
+}
+
+
+def _escape_text(text):
+    """Escape character data for use inside an element."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def _escape_attrib(value):
+    """Escape character data for use inside a double-quoted attribute."""
+    value = _escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    return value
+
+
+class PomWriter:
+    """Writes an ElementTree element as an indented XML document."""
+
+    def __init__(self, stream, indent="  "):
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Text stream to write to
+            indent: String used for one level of indentation
+        """
+        self.stream = stream
+        self.indent = indent
+        self._generated_prefixes = 0
+
+    def write(self, root):
+        """
+        Write the XML declaration followed by the element tree.
+
+        Args:
+            root: Root element of the document
+        """
+        self.stream.write(XML_DECLARATION)
+        # Scope maps namespace URI -> prefix, plus None -> default namespace URI
+        self._write_element(root, 0, {None: ""})
+
+    def _qualify(self, name, scope, declarations, is_attribute=False):
+        """
+        Turn a Clark-notation name into a prefixed name for the current scope.
+
+        New namespace declarations required by the name are appended to
+        ``declarations`` and recorded in ``scope``.
+        """
+        if name[:1] != "{":
+            if is_attribute or scope[None] == "":
+                return name
+            # Unqualified element inside a default namespace: reset it
+            declarations.append(("xmlns", ""))
+            scope[None] = ""
+            return name
+
+        uri, local = name[1:].split("}", 1)
+        if not is_attribute and scope[None] == uri:
+            return local
+        prefix = scope.get(uri)
+        if prefix is None or (prefix == "" and is_attribute):
+            prefix = _WELL_KNOWN_PREFIXES.get(uri)
+            if prefix == "" and not is_attribute and scope[None] == "":
+                declarations.append(("xmlns", uri))
+                scope[None] = uri
+                return local
+            if not prefix:
+                self._generated_prefixes += 1
+                prefix = "ns%d" % self._generated_prefixes
+            declarations.append(("xmlns:" + prefix, uri))
+            scope[uri] = prefix
+        return "%s:%s" % (prefix, local)
+
+    def _write_element(self, elem, depth, parent_scope):
+        """Write one element and, recursively, its children."""
+        write = self.stream.write
+        pad = self.indent * depth
+        tag = elem.tag
+
+        if tag is ET.Comment:
+            write("%s<!--%s-->\n" % (pad, elem.text or ""))
+            return
+        if tag is ET.ProcessingInstruction:
+            write("%s<?%s?>\n" % (pad, elem.text or ""))
+            return
+
+        scope = dict(parent_scope)
+        declarations = []
+        qname = self._qualify(tag, scope, declarations)
+
+        attributes = []
+        for key, value in elem.items():
+            attributes.append(
+                (self._qualify(key, scope, declarations, is_attribute=True), value)
+            )
+
+        start = [pad, "<", qname]
+        for key, value in declarations + attributes:
+            start.append(' %s="%s"' % (key, _escape_attrib(value)))
+
+        text = elem.text
+        if len(elem):
+            start.append(">\n")
+            write("".join(start))
+            if text and text.strip():
+                write("%s%s%s\n" % (pad, self.indent, _escape_text(text.strip())))
+            for child in elem:
+                self._write_element(child, depth + 1, scope)
+                tail = child.tail
+                if tail and tail.strip():
+                    write("%s%s%s\n" % (pad, self.indent, _escape_text(tail.strip())))
+            write("%s</%s>\n" % (pad, qname))
+        elif text and (text.strip() or "\n" not in text):
+            start.append(">%s</%s>\n" % (_escape_text(text), qname))
+            write("".join(start))
+        else:
+            start.append("/>\n")
+            write("".join(start))
+
+
+def write_pom(root, stream, indent="  "):
+    """
+    Serialize a POM element tree to a text stream.
+
+    Args:
+        root: Root ``project`` element
+        stream: Text stream to write to
+        indent: String used for one level of indentation
+    """
+    PomWriter(stream, indent=indent).write(root)
@@ -0,0 +1,171 @@
+"""
+Reactor-wide batch generation of Maven POM files.
+
+Discovers every module of a reactor by following ``<modules>`` from the root
+POM and regenerates each module's POM in place across a process pool.
+"""
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from jdevtools.pom_merge import local_name
+
+
+def read_modules(pom_path):
+    """
+    Read the ``<modules>`` entries of a POM.
+
+    Args:
+        pom_path: Path to the POM file
+
+    Returns:
+        List of module paths as written in the POM
+    """
+    modules = []
+    for _, elem in ET.iterparse(pom_path, events=("end",)):
+        if not isinstance(elem.tag, str):
+            continue
+        name = local_name(elem.tag)
+        if name == "module" and elem.text and elem.text.strip():
+            modules.append(elem.text.strip())
+        elif name == "modules":
+            break
+        elif name in ("dependencies", "build", "profiles"):
+            # <modules> comes before these sections in well-formed POMs
+            elem.clear()
+    return modules
+
+
+def _module_pom(base_dir, module):
+    """Resolve a module entry to the path of its POM file."""
+    path = os.path.normpath(os.path.join(base_dir, module))
+    if os.path.isdir(path):
+        return os.path.join(path, "pom.xml")
+    return path
+
+
+def discover_poms(root_dir):
+    """
+    Yield the POM of ``root_dir`` and of every module reachable from it.
+
+    Modules are visited breadth-first; each POM is yielded at most once.
+
+    Args:
+        root_dir: Directory containing the aggregator ``pom.xml``
+
+    Yields:
+        Paths to POM files
+    """
+    root_pom = _module_pom(root_dir, ".")
+    if not os.path.isfile(root_pom):
+        raise FileNotFoundError(f"No pom.xml found in {root_dir}")
+
+    seen = set()
+    queue = [root_pom]
+    while queue:
+        pom_path = queue.pop(0)
+        real_path = os.path.realpath(pom_path)
+        if real_path in seen:
+            continue
+        seen.add(real_path)
+        yield pom_path
+
+        try:
+            modules = read_modules(pom_path)
+        except ET.ParseError:
+            # Reported when the module itself is generated
+            continue
+        base_dir = os.path.dirname(pom_path)
+        for module in modules:
+            child = _module_pom(base_dir, module)
+            if os.path.isfile(child):
+                queue.append(child)
+
+
+def generate_module(pom_path, generator_options=None):
+    """
+    Regenerate one module's POM in place.
+
+    Runs in a worker process; failures are returned instead of raised so one
+    broken module does not abort the batch.
+
+    Args:
+        pom_path: Path to the module POM
+        generator_options: Extra keyword arguments for PomGenerator
+
+    Returns:
+        Tuple ``(pom_path, status, error)``
+    """
+    from jdevtools.pom_generator import PomGenerator
+
+    options = dict(generator_options or {})
+    options.update(existing_pom=pom_path, quiet=True, strict=True)
+    try:
+        generator = PomGenerator(**options)
+        generator.generate(output_path=pom_path)
+        return pom_path, generator.status, None
+    except Exception as e:
+        return pom_path, "failed", f"{type(e).__name__}: {e}"
+
+
+class BatchResult:
+    """Summary of a batch run."""
+
+    def __init__(self):
+        self.counts = {"written": 0, "unchanged": 0, "cached": 0, "failed": 0}
+        self.failures = []
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def add(self, pom_path, status, error):
+        self.counts[status] = self.counts.get(status, 0) + 1
+        if error is not None:
+            self.failures.append((pom_path, error))
+
+    def summary(self):
+        """Return a one-line summary of the batch."""
+        return ("Processed %d modules: %d written, %d unchanged, %d cached, %d failed"
+                % (self.total, self.counts["written"], self.counts["unchanged"],
+                   self.counts["cached"], self.counts["failed"]))
+
+
+def run_batch(root_dir, jobs=None, generator_options=None, out=None):
+    """
+    Regenerate every module POM of a reactor in parallel.
+
+    At most ``2 * jobs`` modules are in flight at any time, so memory stays
+    bounded regardless of the number of modules.
+
+    Args:
+        root_dir: Directory containing the aggregator ``pom.xml``
+        jobs: Number of worker processes (default: CPU count)
+        generator_options: Extra keyword arguments for PomGenerator
+        out: Stream for the summary (default: stdout)
+
+    Returns:
+        BatchResult describing the run
+    """
+    out = out or sys.stdout
+    jobs = jobs or os.cpu_count() or 1
+    window = 2 * jobs
+    result = BatchResult()
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = set()
+        for pom_path in discover_poms(root_dir):
+            pending.add(executor.submit(generate_module, pom_path, generator_options))
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result.add(*future.result())
+        for future in wait(pending).done:
+            result.add(*future.result())
+
+    print(result.summary(), file=out)
+    for pom_path, error in sorted(result.failures):
+        print(f"  FAILED {pom_path}: {error}", file=out)
+    return result
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Timing-balanced test sharding.
+
+Per-class test durations are collected from ``target/surefire-reports`` of
+every module by a separate ``--record`` step into a durations file (by
+default ``.jdevtools/test-durations.json``), so the history survives
+``mvn clean`` and runs that only executed a subset of the tests. Test classes
+are assigned to shards longest-first, each to the shard with the least total
+time so far, which keeps the shards' finishing times close.
+
+The assignment is deterministic: machines that see the same test classes and
+the same durations file compute the same shards. Sharding therefore only
+reads an explicitly passed, shared durations file and never the reports of
+the machine it runs on, which differ from shard to shard.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+from jdevtools.class_index import (
+    NOTHING_TO_RUN, TEST_NAME_RE, ClassIndex, changed_files, classify_changes,
+    selection_args, top_level,
+)
+from jdevtools.dispatch import STATE_DIR
+
+DURATIONS_FILE = "test-durations.json"
+
+# Duration assumed for classes without history when nothing is known at all
+DEFAULT_DURATION = 1.0
+
+
+def parse_shard(value):
+    """
+    Parse a shard specification ``i/n`` (1-based).
+
+    Returns:
+        Tuple ``(index, count)``
+    """
+    index, sep, count = str(value).partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = 0
+    if not sep or count < 1 or not 1 <= index <= count:
+        raise ValueError("Invalid shard %r, expected i/n with 1 <= i <= n" % value)
+    return index, count
+
+
+def read_report_time(path):
+    """
+    Read the test class name and total time from a surefire XML report.
+
+    Only the root element is parsed.
+
+    Returns:
+        Tuple ``(class_name, seconds)`` or None for unreadable reports
+    """
+    try:
+        for _, elem in ET.iterparse(path, events=("start",)):
+            name = elem.get("name")
+            time = elem.get("time")
+            if not name or time is None:
+                return None
+            return name, float(time.replace(",", ""))
+    except (ET.ParseError, ValueError, OSError):
+        return None
+    return None
+
+
+def read_durations(path):
+    """
+    Read a durations file.
+
+    Returns:
+        Dict of test class name -> seconds, empty if the file does not exist
+
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def report_durations(module_dirs):
+    """
+    Read the per-class durations of the latest surefire reports.
+
+    Args:
+        module_dirs: Directories of the reactor modules
+
+    Returns:
+        Dict of test class name -> seconds
+    """
+    durations = {}
+    for module_dir in module_dirs:
+        reports = os.path.join(module_dir, "target", "surefire-reports")
+        try:
+            names = os.listdir(reports)
+        except OSError:
+            continue
+        for name in names:
+            if name.startswith("TEST-") and name.endswith(".xml"):
+                result = read_report_time(os.path.join(reports, name))
+                if result:
+                    durations[result[0]] = result[1]
+    return durations
+
+
+def record_durations(path, module_dirs, merge=()):
+    """
+    Merge the latest surefire reports into a durations file.
+
+    This is the only function that writes durations; sharding just reads
+    them, so every shard of a run sees the same file.
+
+    Args:
+        path: Durations file to update
+        module_dirs: Directories of the reactor modules
+        merge: Further durations files, e.g. recorded by other shards
+
+    Returns:
+        Dict of test class name -> seconds as written
+    """
+    durations = read_durations(path)
+    for other in merge:
+        durations.update(read_durations(other))
+    durations.update(report_durations(module_dirs))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    return durations
+
+
+def assign_shards(tests, durations, count):
+    """
+    Split test classes into ``count`` shards of similar total duration.
+
+    Classes without history are assumed to take the median known duration.
+
+    Args:
+        tests: Test class names
+        durations: Dict of class name -> seconds
+        count: Number of shards
+
+    Returns:
+        List of ``count`` sorted lists of class names
+    """
+    known = sorted(durations[t] for t in tests if t in durations)
+    default = known[len(known) // 2] if known else DEFAULT_DURATION
+    weighted = sorted(((durations.get(t, default), t) for t in set(tests)),
+                      key=lambda item: (-item[0], item[1]))
+
+    heap = [(0.0, i) for i in range(count)]
+    shards = [[] for _ in range(count)]
+    for duration, test in weighted:
+        total, i = heapq.heappop(heap)
+        shards[i].append(test)
+        heapq.heappush(heap, (total + duration, i))
+    return [sorted(shard) for shard in shards]
+
+
+def main(argv=None):
+    """Print the surefire arguments selecting the tests of one shard."""
+    parser = argparse.ArgumentParser(
+        description="Select a timing-balanced shard of the test classes")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--shard',
+                      help='Shard to run as i/n, e.g. 2/4; needs --durations')
+    mode.add_argument('--record', action='store_true',
+                      help='Merge the surefire reports of this checkout into the '
+                           'durations file instead of selecting tests')
+    parser.add_argument('--durations', metavar='FILE', default=None,
+                        help='Durations file shared by every shard, only read when sharding '
+                             '(default with --record: %s/%s)' % (STATE_DIR, DURATIONS_FILE))
+    parser.add_argument('--merge', metavar='FILE', nargs='+', default=[],
+                        help='With --record, also merge these durations files, '
+                             'e.g. the ones recorded by the other shards')
+    parser.add_argument('--project', default='.',
+                        help='Reactor root directory (default: current directory)')
+    parser.add_argument('--ref', default=None,
+                        help='Only shard tests affected by changes since this git ref')
+    args = parser.parse_args(argv)
+    if args.shard and not args.durations:
+        parser.error("--shard needs --durations FILE, identical on every shard")
+    if args.merge and not args.record:
+        parser.error("--merge only applies to --record")
+
+    try:
+        class_index = ClassIndex(args.project)
+        if args.record:
+            path = args.durations or os.path.join(class_index.project_dir, STATE_DIR,
+                                                  DURATIONS_FILE)
+            durations = record_durations(path, class_index.module_dirs(), args.merge)
+            print("Recorded durations of %d test class(es) in %s" % (len(durations), path),
+                  file=sys.stderr)
+            return 0
+
+        index, count = parse_shard(args.shard)
+        durations = read_durations(args.durations)
+        class_index.update()
+        tests = {top_level(entry["name"]) for entry in class_index.entries.values()
+                 if entry["test"]}
+        tests = [t for t in tests if TEST_NAME_RE.match(t.rsplit(".", 1)[-1])]
+        if not tests:
+            print("No compiled test classes found; compile the tests first",
+                  file=sys.stderr)
+            return 1
+        if args.ref:
+            classes, full_run = classify_changes(
+                changed_files(class_index.project_dir, args.ref))
+            if not full_run:
+                tests = class_index.affected_tests(classes)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not tests:
+        print("No tests affected by changes since %s" % args.ref, file=sys.stderr)
+        return NOTHING_TO_RUN
+    shard = assign_shards(tests, durations, count)[index - 1]
+    if not shard:
+        print("Shard %d/%d has no tests" % (index, count), file=sys.stderr)
+        return NOTHING_TO_RUN
+    estimate = sum(durations.get(t, 0.0) for t in shard)
+    print("Shard %d/%d: %d of %d test class(es), ~%.0fs by history"
+          % (index, count, len(shard), len(tests), estimate), file=sys.stderr)
+    print(" ".join(selection_args(shard)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Test-performance history from surefire reports.
+
+``TEST-*.xml`` reports are parsed with expat while they are read in fixed-size
+chunks. Only testcase attributes are kept, never ``system-out`` or stack
+traces, so memory stays bounded even for reports of hundreds of MB. The same
+pass hashes the file. A report whose content hash is already stored is
+skipped, and unchanged files are recognized by size and mtime without being
+read at all.
+
+Results go to a SQLite database in ``.jdevtools/test-history.db``. Each
+ingestion that adds reports is one run. Queries list the slowest tests,
+tests whose duration keeps growing across runs, and flaky tests.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+import xml.parsers.expat
+
+from jdevtools.dispatch import STATE_DIR
+from jdevtools.reactor import discover_poms
+
+DATABASE_FILE = "test-history.db"
+REPORT_DIRS = ("surefire-reports", "failsafe-reports")
+
+_CHUNK_SIZE = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(id)
+);
+CREATE INDEX IF NOT EXISTS reports_path ON reports(path);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    class TEXT NOT NULL,
+    name TEXT NOT NULL,
+    time REAL NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_test ON results(class, name, run_id);
+"""
+
+# Child elements of <testcase> and the status they imply, strongest last
+_STATUS_RANK = {"passed": 0, "skipped": 1, "flaky": 2, "failed": 3, "error": 4}
+_STATUS_ELEMENTS = {
+    "skipped": "skipped",
+    "flakyFailure": "flaky",
+    "flakyError": "flaky",
+    "failure": "failed",
+    "rerunFailure": "failed",
+    "error": "error",
+    "rerunError": "error",
+}
+
+
+def _seconds(value):
+    try:
+        return float((value or "0").replace(",", ""))
+    except ValueError:
+        return 0.0
+
+
+def parse_report(path):
+    """
+    Stream-parse a surefire report.
+
+    Args:
+        path: Path to a ``TEST-*.xml`` file
+
+    Returns:
+        Tuple ``(sha256, results)`` with results as
+        ``(class, name, seconds, status)`` tuples
+    """
+    results = []
+    state = {"suite": "", "case": None, "depth": 0}
+
+    def start(tag, attrs):
+        state["depth"] += 1
+        if state["depth"] == 1:
+            state["suite"] = attrs.get("name", "")
+        elif tag == "testcase":
+            state["case"] = [attrs.get("classname") or state["suite"],
+                             attrs.get("name", ""), _seconds(attrs.get("time")), "passed"]
+        elif state["case"] is not None and tag in _STATUS_ELEMENTS:
+            status = _STATUS_ELEMENTS[tag]
+            if _STATUS_RANK[status] > _STATUS_RANK[state["case"][3]]:
+                state["case"][3] = status
+
+    def end(tag):
+        state["depth"] -= 1
+        if tag == "testcase" and state["case"] is not None:
+            results.append(tuple(state["case"]))
+            state["case"] = None
+
+    parser = xml.parsers.expat.ParserCreate()
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            parser.Parse(chunk, False)
+    parser.Parse(b"", True)
+    return digest.hexdigest(), results
+
+
+def find_reports(project_dir):
+    """Yield the surefire and failsafe reports of every reactor module."""
+    if os.path.isfile(os.path.join(project_dir, "pom.xml")):
+        module_dirs = [os.path.dirname(os.path.abspath(p)) for p in discover_poms(project_dir)]
+    else:
+        module_dirs = [project_dir]
+    for module_dir in module_dirs:
+        for name in REPORT_DIRS:
+            directory = os.path.join(module_dir, "target", name)
+            try:
+                entries = sorted(os.listdir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.startswith("TEST-") and entry.endswith(".xml"):
+                    yield os.path.join(directory, entry)
+
+
+class SurefireHistory:
+    """SQLite store of test results across runs."""
+
+    def __init__(self, db_path):
+        """
+        Open (and create) the database.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def ingest(self, paths, label=None):
+        """
+        Add reports to the store as one run.
+
+        Reports already stored (same content hash) are skipped. Everything is
+        written in a single transaction.
+
+        Args:
+            paths: Report files
+            label: Optional run label, e.g. a commit id
+
+        Returns:
+            Tuple ``(new_reports, new_results)``
+        """
+        db = self.connection
+        known_stats = {}
+        for path, size, mtime_ns in db.execute("SELECT path, size, mtime_ns FROM reports"):
+            known_stats.setdefault(path, set()).add((size, mtime_ns))
+
+        run_id = None
+        new_reports = new_results = 0
+        with db:
+            for path in paths:
+                path = os.path.abspath(path)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if (st.st_size, st.st_mtime_ns) in known_stats.get(path, ()):
+                    continue
+                try:
+                    sha, results = parse_report(path)
+                except xml.parsers.expat.ExpatError as e:
+                    print("Skipping unreadable report %s: %s" % (path, e), file=sys.stderr)
+                    continue
+                if db.execute("SELECT 1 FROM reports WHERE sha256 = ?", (sha,)).fetchone():
+                    continue
+                if run_id is None:
+                    run_id = db.execute("INSERT INTO runs (started, label) VALUES (?, ?)",
+                                        (time.time(), label)).lastrowid
+                report_id = db.execute(
+                    "INSERT INTO reports (sha256, path, size, mtime_ns, run_id) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (sha, path, st.st_size, st.st_mtime_ns, run_id)).lastrowid
+                db.executemany(
+                    "INSERT INTO results (run_id, report_id, class, name, time, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(run_id, report_id) + result for result in results])
+                new_reports += 1
+                new_results += len(results)
+        return new_reports, new_results
+
+    def _recent_runs(self, runs):
+        rows = self.connection.execute(
+            "SELECT id FROM runs ORDER BY id DESC LIMIT ?", (runs,)).fetchall()
+        return min(row[0] for row in rows) if rows else 0
+
+    def slowest(self, limit=20, runs=5):
+        """
+        Return the tests with the highest average time over the last runs.
+
+        Returns:
+            List of ``(class, name, average_seconds, samples)``
+        """
+        return self.connection.execute(
+            "SELECT class, name, AVG(time), COUNT(*) FROM results "
+            "WHERE run_id >= ? AND status != 'skipped' "
+            "GROUP BY class, name ORDER BY AVG(time) DESC LIMIT ?",
+            (self._recent_runs(runs), limit)).fetchall()
+
+    def slowing(self, limit=20, runs=10, min_growth=0.2, min_seconds=0.05):
+        """
+        Return tests whose time trends upward across the last runs.
+
+        The trend is the least-squares slope over a test's samples in run
+        order; growth is the fitted increase relative to the fitted start.
+
+        Args:
+            limit: Maximum number of tests
+            runs: Number of most recent runs to consider
+            min_growth: Minimum relative growth, e.g. 0.2 for +20%
+            min_seconds: Ignore tests faster than this at their latest run
+
+        Returns:
+            List of ``(class, name, first_seconds, last_seconds, growth)``
+        """
+        series = {}
+        for cls, name, duration in self.connection.execute(
+                "SELECT class, name, time FROM results "
+                "WHERE run_id >= ? AND status != 'skipped' ORDER BY run_id",
+                (self._recent_runs(runs),)):
+            series.setdefault((cls, name), []).append(duration)
+
+        trending = []
+        for (cls, name), times in series.items():
+            n = len(times)
+            if n < 3 or times[-1] < min_seconds:
+                continue
+            mean_x = (n - 1) / 2.0
+            mean_y = sum(times) / n
+            slope = sum((i - mean_x) * (t - mean_y) for i, t in enumerate(times)) / \
+                sum((i - mean_x) ** 2 for i in range(n))
+            start = mean_y - slope * mean_x
+            growth = slope * (n - 1) / start if start > 0 else 0.0
+            if slope > 0 and growth >= min_growth:
+                trending.append((cls, name, times[0], times[-1], growth))
+        trending.sort(key=lambda row: -row[4])
+        return trending[:limit]
+
+    def flaky(self, limit=20, runs=10):
+        """
+        Return tests that passed only on rerun, or both passed and failed.
+
+        Returns:
+            List of ``(class, name, passed, failed, flaky)`` counts
+        """
+        return self.connection.execute(
+            "SELECT class, name, "
+            "SUM(status = 'passed'), SUM(status IN ('failed', 'error')), "
+            "SUM(status = 'flaky') FROM results WHERE run_id >= ? "
+            "GROUP BY class, name "
+            "HAVING SUM(status = 'flaky') > 0 OR "
+            "(SUM(status = 'passed') > 0 AND SUM(status IN ('failed', 'error')) > 0) "
+            "ORDER BY SUM(status != 'passed') DESC, class, name LIMIT ?",
+            (self._recent_runs(runs), limit)).fetchall()
+
+
+def _print_rows(header, rows, fmt):
+    print(header)
+    if not rows:
+        print("  (none)")
+    for row in rows:
+        print(fmt % row)
+
+
+def main(argv=None):
+    """Main entry point for the test history tool."""
+    parser = argparse.ArgumentParser(
+        prog="jtest-history",
+        description="Record and query test durations from surefire reports")
+    parser.add_argument('--project', default='.',
+                        help='Reactor root directory (default: current directory)')
+    parser.add_argument('--db', default=None,
+                        help='Database file (default: <project>/.jdevtools/test-history.db)')
+    subparsers = parser.add_subparsers(dest='command')
+
+    ingest = subparsers.add_parser('ingest', help='Add surefire reports to the history')
+    ingest.add_argument('reports', nargs='*',
+                        help='Report files (default: all target/*-reports of the reactor)')
+    ingest.add_argument('--label', default=None, help='Label of this run, e.g. a commit id')
+
+    for name, help_text in (('slowest', 'List the slowest tests'),
+                            ('slowing', 'List tests that keep getting slower'),
+                            ('flaky', 'List flaky tests')):
+        query = subparsers.add_parser(name, help=help_text)
+        query.add_argument('--limit', type=int, default=20, help='Maximum rows (default: 20)')
+        query.add_argument('--runs', type=int, default=None,
+                           help='Number of recent runs to consider')
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    project_dir = os.path.abspath(args.project)
+    history = SurefireHistory(args.db or os.path.join(project_dir, STATE_DIR, DATABASE_FILE))
+    try:
+        if args.command == 'ingest':
+            reports = args.reports or list(find_reports(project_dir))
+            new_reports, new_results = history.ingest(reports, label=args.label)
+            print("Recorded %d test result(s) from %d new report(s)" % (new_results, new_reports))
+        elif args.command == 'slowest':
+            _print_rows("Slowest tests (average seconds):",
+                        history.slowest(args.limit, args.runs or 5),
+                        "  %s.%s  %.3fs  (%d runs)")
+        elif args.command == 'slowing':
+            rows = [(cls, name, first, last, growth * 100.0)
+                    for cls, name, first, last, growth in
+                    history.slowing(args.limit, args.runs or 10)]
+            _print_rows("Tests getting slower (first -> last run):", rows,
+                        "  %s.%s  %.3fs -> %.3fs  (+%.0f%% trend)")
+        else:
+            rows = [(cls, name, passed, failed + flaky)
+                    for cls, name, passed, failed, flaky in
+                    history.flaky(args.limit, args.runs or 10)]
+            _print_rows("Flaky tests:", rows, "  %s.%s  %d passed, %d failed or rerun")
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
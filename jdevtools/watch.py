@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+"""
+Watch mode for jcompile: incremental recompilation on every source change.
+
+One Maven run compiles the project and writes its test classpath. After
+that, ``src/main/java`` and ``src/test/java`` are watched with inotify, or
+by polling file modification times where inotify is not available. A burst
+of changes, such as an IDE saving several files, is collected until the
+sources have been quiet for the debounce interval and then compiled as one
+cycle.
+
+A cycle recompiles the changed sources plus every class that transitively
+depends on them according to the class index (``jdevtools.class_index``),
+main sources before test sources. javac inlines compile-time constants, so
+their users leave no trace in the index: when a changed class declares
+constants, the whole module is recompiled instead. Deleted sources also have
+their class files removed. Sources of a failed batch, and of the test batch skipped
+after a failed main batch, are compiled again in every following cycle
+until they compile. The compiler is javac running inside one long-lived JVM,
+started with the JDK 11+ source launcher, so after the first cycle neither
+Maven nor javac pay their start-up and warm-up costs again.
+
+Only Java sources are recompiled. Resources, POM changes and compiler
+settings other than the release, source/target level and encoding
+properties need a regular ``jcompile``.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import shlex
+import struct
+import subprocess
+import sys
+import time
+
+from jdevtools.class_index import ClassIndex, top_level
+from jdevtools.dispatch import STATE_DIR
+from jdevtools.effective import ParentResolver
+from jdevtools.pgo import maven_command
+from jdevtools.reactor import read_modules
+
+# Source root -> (output directory under target/, generated sources directory)
+SOURCE_ROOTS = {
+    os.path.join("src", "main", "java"): ("classes", "generated-sources/annotations"),
+    os.path.join("src", "test", "java"): ("test-classes", "generated-test-sources/test-annotations"),
+}
+
+WATCH_GOALS = "test-compile dependency:build-classpath"
+CLASSPATH_FILE = "watch-classpath.txt"
+DEFAULT_DEBOUNCE = 0.2
+DEFAULT_POLL_INTERVAL = 0.5
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+_EVENT = struct.Struct("iIII")
+
+# Compiler server run with the source launcher. Reads one request per blank
+# line terminated block: options, then source files ending in ".java".
+# Answers with javac's diagnostics followed by the DONE_MARKER line.
+DONE_MARKER = "@@jdevtools-javac "
+JAVAC_SERVER_SOURCE = """\
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.io.PrintWriter;
+import java.io.StringWriter;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.List;
+import javax.tools.JavaCompiler;
+import javax.tools.StandardJavaFileManager;
+import javax.tools.ToolProvider;
+
+public class JavacServer {
+    public static void main(String[] args) throws Exception {
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        // Shared by all requests, so opened jars stay cached
+        StandardJavaFileManager fileManager = compiler.getStandardFileManager(null, null, null);
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        PrintStream out = new PrintStream(System.out, true, "UTF-8");
+        List<String> options = new ArrayList<>();
+        List<String> sources = new ArrayList<>();
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (!line.isEmpty()) {
+                (line.endsWith(".java") ? sources : options).add(line);
+                continue;
+            }
+            StringWriter diagnostics = new StringWriter();
+            boolean ok;
+            try {
+                ok = compiler.getTask(diagnostics, fileManager, null, options, null,
+                        fileManager.getJavaFileObjectsFromStrings(sources)).call();
+            } catch (RuntimeException e) {
+                e.printStackTrace(new PrintWriter(diagnostics));
+                ok = false;
+            }
+            out.print(diagnostics);
+            out.println("%sexit=" + (ok ? 0 : 1));
+            options.clear();
+            sources.clear();
+        }
+    }
+}
+""" % DONE_MARKER
+
+
+def java_sources(roots):
+    """Yield every Java source file under the given directories."""
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(".java"):
+                    yield os.path.join(dirpath, filename)
+
+
+class InotifyWatcher:
+    """Reports changed Java sources through Linux inotify, called with ctypes."""
+
+    def __init__(self, roots):
+        self.roots = list(roots)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, "inotify_init1: %s" % os.strerror(errno))
+        # Watch descriptor -> watched directory
+        self._dirs = {}
+        for root in self.roots:
+            self._watch_tree(root)
+
+    def _watch_tree(self, directory):
+        """Watch a directory and its subdirectories; return the files found in them."""
+        found = []
+        for dirpath, _, filenames in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                # ENOSPC: fs.inotify.max_user_watches is exhausted
+                errno = ctypes.get_errno()
+                raise OSError(errno, "inotify_add_watch %s: %s" % (dirpath, os.strerror(errno)))
+            self._dirs[wd] = dirpath
+            found.extend(os.path.join(dirpath, filename) for filename in filenames)
+        return found
+
+    def _read(self):
+        """Read pending events and return the paths they name."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so every source may have changed
+                paths.update(java_sources(self.roots))
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and os.path.isdir(path):
+                    # Files may have been created before the watch was added
+                    paths.update(self._watch_tree(path))
+                continue
+            paths.add(path)
+        return paths
+
+    def poll(self, timeout=None):
+        """
+        Wait for changed Java sources.
+
+        Args:
+            timeout: Seconds to wait at most (default: until something changes)
+
+        Returns:
+            Set of changed, created or deleted ``.java`` paths; empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready:
+                changed = {path for path in self._read() if path.endswith(".java")}
+                if changed:
+                    return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+    def close(self):
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Reports changed Java sources by comparing size and mtime snapshots."""
+
+    def __init__(self, roots, interval=DEFAULT_POLL_INTERVAL):
+        self.roots = list(roots)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for path in java_sources(self.roots):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout=None):
+        """
+        Wait for changed Java sources.
+
+        Args:
+            timeout: Seconds to wait at most (default: until something changes)
+
+        Returns:
+            Set of changed, created or deleted ``.java`` paths; empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = max(0.0, min(delay, deadline - time.monotonic()))
+            time.sleep(delay)
+            current = self._scan()
+            changed = {path for path in set(current) | set(self._snapshot)
+                       if current.get(path) != self._snapshot.get(path)}
+            self._snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        """Stop watching."""
+
+
+def create_watcher(roots, poll_interval=None, out=None):
+    """
+    Create the best available watcher for the source roots.
+
+    Args:
+        roots: Directories to watch recursively
+        poll_interval: Poll every this many seconds instead of using inotify
+        out: Stream for progress messages (default: stdout)
+
+    Returns:
+        InotifyWatcher on Linux, PollingWatcher otherwise or on failure
+    """
+    out = out or sys.stdout
+    if poll_interval is None and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError) as e:
+            print("[jcompile] inotify unavailable (%s), polling instead" % e, file=out)
+    return PollingWatcher(roots, poll_interval or DEFAULT_POLL_INTERVAL)
+
+
+def wait_for_changes(watcher, debounce=DEFAULT_DEBOUNCE):
+    """
+    Wait for a change and collect the burst it belongs to.
+
+    Returns once no further change arrived for ``debounce`` seconds.
+
+    Returns:
+        Set of changed paths
+    """
+    changed = watcher.poll()
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+class JavacServer:
+    """javac in one long-lived JVM, so compiles after the first one run warm."""
+
+    def __init__(self, work_dir, java=None):
+        """
+        Initialize the server; the JVM starts on first use.
+
+        Args:
+            work_dir: Directory receiving the server source
+            java: Java executable of a JDK 11+ (default: $JAVA_HOME/bin/java, else java)
+        """
+        self.work_dir = work_dir
+        if java is None:
+            java_home = os.environ.get("JAVA_HOME")
+            java = os.path.join(java_home, "bin", "java") if java_home else "java"
+        self.java = java
+        self._process = None
+
+    def start(self):
+        """Start the compiler JVM unless it is running."""
+        if self._process is not None and self._process.poll() is None:
+            return
+        os.makedirs(self.work_dir, exist_ok=True)
+        source = os.path.join(self.work_dir, "JavacServer.java")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write(JAVAC_SERVER_SOURCE)
+        self._process = subprocess.Popen([self.java, source], stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE, encoding="utf-8", bufsize=1)
+
+    def compile(self, options, sources):
+        """
+        Compile sources.
+
+        Args:
+            options: javac options
+            sources: Source file paths
+
+        Returns:
+            Tuple ``(ok, diagnostics)``
+        """
+        self.start()
+        request = "".join(line + "\n" for line in list(options) + list(sources)) + "\n"
+        self._process.stdin.write(request)
+        self._process.stdin.flush()
+        diagnostics = []
+        for line in self._process.stdout:
+            if line.startswith(DONE_MARKER):
+                return line.strip() == DONE_MARKER + "exit=0", "".join(diagnostics)
+            diagnostics.append(line)
+        self._process = None
+        raise RuntimeError("The compiler JVM exited: %s" % "".join(diagnostics).strip())
+
+    def close(self):
+        """Stop the compiler JVM."""
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+
+class Cycle:
+    """Outcome of one incremental compilation."""
+
+    def __init__(self, changed, dependents, deleted, ok, diagnostics, seconds, retried=0,
+                 full=False):
+        self.changed = changed
+        self.dependents = dependents
+        self.deleted = deleted
+        # Sources of earlier failed or skipped batches compiled again
+        self.retried = retried
+        # Every source was compiled because a changed class declares constants
+        self.full = full
+        self.ok = ok
+        self.diagnostics = diagnostics
+        self.seconds = seconds
+
+    def summary(self):
+        """One line describing the cycle and its latency."""
+        parts = ["%d changed" % self.changed]
+        if self.dependents:
+            parts.append("%d dependent" % self.dependents)
+        if self.deleted:
+            parts.append("%d deleted" % self.deleted)
+        if self.retried:
+            parts.append("%d retried" % self.retried)
+        outcome = "compiled" if self.ok else "FAILED"
+        full = " (constants changed, full rebuild)" if self.full else ""
+        return "%s source(s) %s in %.0f ms%s" % (", ".join(parts), outcome,
+                                                  self.seconds * 1000.0, full)
+
+
+class IncrementalCompiler:
+    """Recompiles changed sources and their dependents of one Maven module."""
+
+    def __init__(self, project_dir=".", compiler=None, index=None, out=None, mvn=None):
+        """
+        Initialize the compiler.
+
+        Args:
+            project_dir: Maven module directory
+            compiler: Object with a JavacServer compatible ``compile()``
+                (default: a JavacServer)
+            index: ClassIndex of the module (default: a new one)
+            out: Stream for progress messages (default: stdout)
+            mvn: Maven executable of the initial build, e.g. the reactor's
+                wrapper (default: the module's mvnw, else mvn)
+        """
+        self.project_dir = os.path.abspath(project_dir)
+        pom = os.path.join(self.project_dir, "pom.xml")
+        if not os.path.isfile(pom):
+            raise FileNotFoundError("No pom.xml found in %s" % self.project_dir)
+        if read_modules(pom):
+            raise ValueError("Watch mode compiles a single module; run it in a module "
+                             "directory or pass --module DIR")
+        state_dir = os.path.join(self.project_dir, STATE_DIR)
+        self.compiler = compiler or JavacServer(os.path.join(state_dir, "javac-server"))
+        self.index = index or ClassIndex(self.project_dir)
+        self.out = out or sys.stdout
+        self.classpath_file = os.path.join(state_dir, CLASSPATH_FILE)
+        self.target_dir = os.path.join(self.project_dir, "target")
+        self.mvn = [mvn] if mvn else maven_command(self.project_dir)
+        self._options = None
+        # Source root -> sources of failed or skipped batches. javac writes
+        # nothing when a batch fails, so they are compiled again next cycle.
+        self.pending = {root: set() for root in SOURCE_ROOTS}
+
+    def _log(self, message):
+        print("[jcompile] %s" % message, file=self.out)
+
+    def source_roots(self):
+        """Return the existing source roots of the module."""
+        return [os.path.join(self.project_dir, root) for root in SOURCE_ROOTS
+                if os.path.isdir(os.path.join(self.project_dir, root))]
+
+    def initial_build(self, goals=WATCH_GOALS, maven_args=()):
+        """
+        Compile the module with Maven and record its test classpath.
+
+        Args:
+            goals: Maven goals, which must include dependency:build-classpath
+            maven_args: Extra Maven options, e.g. ["-o"]
+        """
+        os.makedirs(os.path.dirname(self.classpath_file), exist_ok=True)
+        command = self.mvn + list(maven_args) + goals.split() + [
+            "-Dmdep.outputFile=%s" % self.classpath_file, "-Dmdep.includeScope=test"]
+        self._log(" ".join(command))
+        subprocess.run(command, cwd=self.project_dir, check=True)
+        self.index.update()
+
+    def compiler_options(self):
+        """Return the javac options derived from the module's compiler properties."""
+        if self._options is None:
+            properties = ParentResolver().resolve(
+                os.path.join(self.project_dir, "pom.xml")).properties
+            options = ["-g"]
+            release = properties.get("maven.compiler.release")
+            if release:
+                options += ["--release", release]
+            else:
+                for name in ("source", "target"):
+                    value = properties.get("maven.compiler.%s" % name)
+                    if value:
+                        options += ["-%s" % name, value]
+            encoding = (properties.get("maven.compiler.encoding") or
+                        properties.get("project.build.sourceEncoding"))
+            if encoding:
+                options += ["-encoding", encoding]
+            self._options = options
+        return self._options
+
+    def _dependency_classpath(self):
+        if not os.path.isfile(self.classpath_file):
+            raise RuntimeError("No classpath in %s; run the initial build first"
+                               % self.classpath_file)
+        with open(self.classpath_file, encoding="utf-8") as f:
+            content = f.read().strip()
+        return [entry for entry in content.split(os.pathsep) if entry]
+
+    def _javac_options(self, root):
+        output, generated = SOURCE_ROOTS[root]
+        output_dir = os.path.join(self.target_dir, output)
+        generated_dir = os.path.join(self.target_dir, *generated.split("/"))
+        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(generated_dir, exist_ok=True)
+        classpath = [output_dir]
+        if output != "classes":
+            classpath.append(os.path.join(self.target_dir, "classes"))
+        classpath += self._dependency_classpath()
+        return self.compiler_options() + ["-d", output_dir, "-s", generated_dir,
+                                          "-classpath", os.pathsep.join(classpath)]
+
+    def _locate(self, path):
+        """Return ``(source_root, class_name)`` of a source path, or None."""
+        for root in SOURCE_ROOTS:
+            base = os.path.join(self.project_dir, root) + os.sep
+            if path.startswith(base) and path.endswith(".java"):
+                return root, path[len(base):-len(".java")].replace(os.sep, ".")
+        return None
+
+    def _delete_classes(self, root, name):
+        """Remove the class files of a top-level class and its nested classes."""
+        package, _, simple = name.rpartition(".")
+        directory = os.path.join(self.target_dir, SOURCE_ROOTS[root][0], *package.split("."))
+        if not os.path.isdir(directory):
+            return
+        for filename in os.listdir(directory):
+            if filename == simple + ".class" or (filename.startswith(simple + "$") and
+                                                 filename.endswith(".class")):
+                os.remove(os.path.join(directory, filename))
+
+    def compile(self, changed_paths):
+        """
+        Recompile changed sources and every class depending on them.
+
+        Args:
+            changed_paths: Changed, created or deleted source files
+
+        Returns:
+            Cycle
+        """
+        start = time.perf_counter()
+        batches = {root: set() for root in SOURCE_ROOTS}
+        changed = set()
+        deleted = 0
+        for path in changed_paths:
+            located = self._locate(os.path.abspath(path))
+            if located is None:
+                continue
+            root, name = located
+            changed.add(name)
+            if os.path.isfile(path):
+                batches[root].add(os.path.abspath(path))
+            else:
+                self._delete_classes(root, name)
+                deleted += 1
+
+        dependents = 0
+        # Users of inlined constants have no reference to find them by
+        full = self.index.declares_constants(changed)
+        if full:
+            for root in SOURCE_ROOTS:
+                for dirpath, _, filenames in os.walk(os.path.join(self.project_dir, root)):
+                    for filename in filenames:
+                        source = os.path.join(dirpath, filename)
+                        if filename.endswith(".java") and source not in batches[root]:
+                            batches[root].add(source)
+                            dependents += 1
+        for name in {top_level(n) for n in self.index.dependents(changed)} - changed:
+            for root in SOURCE_ROOTS:
+                source = os.path.join(self.project_dir, root, *name.split(".")) + ".java"
+                if os.path.isfile(source):
+                    if source not in batches[root]:
+                        batches[root].add(source)
+                        dependents += 1
+                    break
+
+        retried = 0
+        for root in SOURCE_ROOTS:
+            carried = {path for path in self.pending[root] if os.path.isfile(path)}
+            retried += len(carried - batches[root])
+            batches[root] |= carried
+
+        ok, diagnostics = True, []
+        # Test sources compile against the freshly compiled main classes
+        for root in SOURCE_ROOTS:
+            if not batches[root]:
+                continue
+            if ok:
+                ok, output = self.compiler.compile(self._javac_options(root),
+                                                   sorted(batches[root]))
+                diagnostics.append(output)
+            # A failed batch and every batch skipped after it stay pending
+            self.pending[root] = set() if ok else batches[root]
+        self.index.update()
+        return Cycle(len(changed) - deleted, dependents, deleted, ok, "".join(diagnostics),
+                     time.perf_counter() - start, retried, full)
+
+
+def main(argv=None):
+    """Main entry point for jcompile --watch."""
+    parser = argparse.ArgumentParser(
+        prog="jcompile --watch",
+        description="Recompile changed Java sources and their dependents on every change")
+    parser.add_argument('--project', default='.',
+                        help='Maven module directory (default: current directory)')
+    parser.add_argument('--mvn', default=None,
+                        help='Maven executable of the initial build (default: the '
+                             "module's mvnw, then mvn)")
+    parser.add_argument('--goals', default=WATCH_GOALS,
+                        help='Maven goals of the initial build (default: %s)' % WATCH_GOALS)
+    parser.add_argument('--maven-args', default='',
+                        help='Extra Maven options for the initial build, e.g. "-o -q"')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help='Seconds without changes that end a burst (default: %.1f)'
+                             % DEFAULT_DEBOUNCE)
+    parser.add_argument('--poll', type=float, default=None, metavar='SECONDS',
+                        help='Poll for changes every SECONDS instead of using inotify')
+    parser.add_argument('--java', default=None,
+                        help='Java executable of a JDK 11+ running the compiler '
+                             '(default: $JAVA_HOME/bin/java, else java)')
+    args = parser.parse_args(argv)
+
+    builder = watcher = None
+    try:
+        builder = IncrementalCompiler(args.project, mvn=args.mvn)
+        if args.java:
+            builder.compiler.java = args.java
+        builder.initial_build(args.goals, shlex.split(args.maven_args))
+        builder.compiler.start()
+        roots = builder.source_roots()
+        if not roots:
+            raise RuntimeError("No source directories to watch in %s" % builder.project_dir)
+        watcher = create_watcher(roots, args.poll)
+        mode = ("inotify" if isinstance(watcher, InotifyWatcher)
+                else "polling every %.1f s" % watcher.interval)
+        print("[jcompile] Watching %s (%s), press Ctrl+C to stop" % (
+            ", ".join(os.path.relpath(r, builder.project_dir) for r in roots), mode))
+        while True:
+            cycle = builder.compile(wait_for_changes(watcher, args.debounce))
+            if cycle.diagnostics:
+                print(cycle.diagnostics, end="", file=sys.stderr)
+            print("[jcompile] %s" % cycle.summary())
+    except KeyboardInterrupt:
+        print("\n[jcompile] Watch mode stopped")
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if watcher is not None:
+            watcher.close()
+        if builder is not None:
+            builder.compiler.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,10 @@ set "SCRIPT_DIR=%~dp0"
 REM Default Maven goals
 set "MAVEN_GOALS=test"
 set "MAVEN_OPTS="
+set "NETWORK_MODE="
+set "AFFECTED_REF="
+set "SHARD="
+set "DURATIONS="
 
 :parse_args
 if "%~1"=="" goto end_parse
@@ -34,11 +38,27 @@ if /i "%~1"=="--method" (
     shift
     goto parse_args
 )
+if /i "%~1"=="--affected" (
+    set "AFFECTED_REF=HEAD"
+    set "NEXT_ARG=%~2"
+    if not "%~2"=="" if not "!NEXT_ARG:~0,1!"=="-" (
+        set "AFFECTED_REF=%~2"
+        shift
+    )
+    shift
+    goto parse_args
+)
 if /i "%~1"=="--offline" (
+    set "NETWORK_MODE=offline"
     set "MAVEN_OPTS=%MAVEN_OPTS% -o"
     shift
     goto parse_args
 )
+if /i "%~1"=="--online" (
+    set "NETWORK_MODE=online"
+    shift
+    goto parse_args
+)
 if /i "%~1"=="--debug" (
     set "MAVEN_OPTS=%MAVEN_OPTS% -X"
     shift
@@ -49,13 +69,26 @@ if /i "%~1"=="--quiet" (
     shift
     goto parse_args
 )
+if /i "%~1"=="--shard" (
+    set "SHARD=%~2"
+    shift
+    shift
+    goto parse_args
+)
+if /i "%~1"=="--durations" (
+    set "DURATIONS=%~2"
+    shift
+    shift
+    goto parse_args
+)
 if /i "%~1"=="--parallel" (
-    set "THREAD_COUNT=4"
+    set "FORK_COUNT=4"
     if not "%~2"=="" (
-        set "THREAD_COUNT=%~2"
+        set "FORK_COUNT=%~2"
         shift
     )
-    set "MAVEN_OPTS=%MAVEN_OPTS% -Dparallel=all -DthreadCount=!THREAD_COUNT!"
+    REM Parallel test JVMs; works with every surefire provider
+    set "MAVEN_OPTS=%MAVEN_OPTS% -DforkCount=!FORK_COUNT! -DreuseForks=true"
     shift
     goto parse_args
 )
@@ -75,8 +108,12 @@ echo   --compile         Compile before testing
 echo   --integration     Run integration tests (verify phase)
 echo   --single CLASS    Run a single test class
 echo   --method CLASS    Run specific test method
-echo   --parallel [N]    Run tests in parallel (default 4 threads)
+echo   --affected [REF]  Run only tests affected by changes since REF (default HEAD)
+echo   --shard I/N       Run shard I of N, balanced by the --durations file
+echo   --durations FILE  Test durations shared by all shards (read-only)
+echo   --parallel [N]    Run tests in N parallel JVM forks (default 4)
 echo   --offline         Work offline
+echo   --online          Never switch to offline mode automatically
 echo   --debug           Enable debug output
 echo   --quiet           Quiet output
 echo   -h, --help        Display this help message
@@ -84,12 +121,63 @@ exit /b 0
 
 :end_parse
 
+REM Work offline when everything the build needs is in the local repository
+if not defined NETWORK_MODE (
+    set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+    python -m jdevtools.offline --project "%SCRIPT_DIR%." check --goals="%MAVEN_GOALS% %MAVEN_OPTS%" > "%TEMP%\jdevtools-offline.txt" 2>nul
+    if !ERRORLEVEL! equ 0 (
+        set /p OFFLINE_STATUS=<"%TEMP%\jdevtools-offline.txt"
+        set "MAVEN_OPTS=!MAVEN_OPTS! -o"
+        echo [jtest] !OFFLINE_STATUS!, working offline
+    )
+    del "%TEMP%\jdevtools-offline.txt" 2>nul
+)
+
+REM Select tests from the class dependency index
+set "SELECT_CMD="
+if not "%AFFECTED_REF%"=="" set "SELECT_CMD=jdevtools.class_index --ref %AFFECTED_REF%"
+if not "%SHARD%"=="" (
+    if "%DURATIONS%"=="" (
+        echo [jtest] --shard needs --durations FILE, the same file on every shard.
+        exit /b 1
+    )
+    REM Every shard must see the complete set of compiled test classes
+    call "%SCRIPT_DIR%mvnw.cmd" -q %MAVEN_OPTS% test-compile
+    set "SELECT_CMD=jdevtools.shard --shard %SHARD% --durations "%DURATIONS%""
+    if not "%AFFECTED_REF%"=="" set "SELECT_CMD=!SELECT_CMD! --ref %AFFECTED_REF%"
+)
+if defined SELECT_CMD (
+    set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+    python -m !SELECT_CMD! --project "%SCRIPT_DIR%." > "%TEMP%\jtest-affected.txt"
+    set "SELECT_STATUS=!ERRORLEVEL!"
+    if "!SELECT_STATUS!"=="3" (
+        echo [jtest] Nothing to test.
+        exit /b 0
+    )
+    if not "!SELECT_STATUS!"=="0" (
+        echo [jtest] Test selection failed!
+        exit /b 1
+    )
+    set "SELECTION="
+    set /p SELECTION=<"%TEMP%\jtest-affected.txt"
+    set "MAVEN_OPTS=!MAVEN_OPTS! !SELECTION!"
+)
+
 echo [jtest] Starting tests...
 
 REM Execute Maven tests
 call "%SCRIPT_DIR%mvnw.cmd" %MAVEN_OPTS% %MAVEN_GOALS%
+set "TEST_STATUS=%ERRORLEVEL%"
+
+REM Record durations and outcomes, failed runs included, in the test history
+set "PYTHONPATH=%SCRIPT_DIR%;%PYTHONPATH%"
+python -m jdevtools.surefire_db --project "%SCRIPT_DIR%." ingest
+if %ERRORLEVEL% neq 0 echo [jtest] WARNING: Could not record test history
+REM Local duration history; never the shared --durations file
+python -m jdevtools.shard --project "%SCRIPT_DIR%." --record 2>nul
+if %ERRORLEVEL% neq 0 echo [jtest] WARNING: Could not record test durations
 
-if %ERRORLEVEL% equ 0 (
+if %TEST_STATUS% equ 0 (
     echo [jtest] Tests completed successfully!
 ) else (
     echo [jtest] Tests failed!
@@ -18,7 +18,11 @@ setup(
     packages=find_packages(),
     entry_points={
         'console_scripts': [
+            'jbench=jdevtools.jmh:main',
             'jcompile-dispatch=jdevtools.jcompile_dispatch:main',
+            'jpgo=jdevtools.pgo:main',
+            'jpom-server=jdevtools.pom_service:main',
+            'jtest-history=jdevtools.surefire_db:main',
         ],
     },
     classifiers=[
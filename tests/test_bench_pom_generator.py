@@ -0,0 +1,75 @@
+"""Tests for the PomGenerator benchmark's baseline comparison."""
+
+import json
+import os
+import sys
+
+# Add the benchmarks directory to path for imports
+BENCHMARKS = os.path.join(os.path.dirname(__file__), '..', 'benchmarks')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BENCHMARKS)
+
+from bench_pom_generator import PHASES, compare
+
+
+def _result(size, phase, seconds, peak_kb):
+    return {'size': size, 'phase': phase, 'seconds': seconds, 'runs': [seconds],
+            'peak_kb': peak_kb, 'existing_bytes': 0}
+
+
+BASELINE = {'results': [_result(1000, 'merge', 1.0, 1000),
+                        _result(1000, 'generate', 2.0, 2000)]}
+
+
+def test_compare_within_limits():
+    """Test that results inside the allowed slowdown and growth pass."""
+    results = [_result(1000, 'merge', 1.2, 1090),
+               _result(1000, 'generate', 2.0, 2000),
+               _result(50, 'merge', 9.0, 9000)]
+    assert compare(results, BASELINE, 0.25, 0.10, 0.005) == [], \
+        "Sizes missing from the baseline should not be compared"
+    assert compare([_result(1000, 'merge', 0.004, 1000)],
+                   {'results': [_result(1000, 'merge', 0.0, 1000)]}, 0.25, 0.10, 0.005) == [], \
+        "The absolute slack should absorb timer noise"
+
+    print("✓ Comparison within limits test passed")
+
+
+def test_compare_reports_regressions():
+    """Test that slower or hungrier phases are reported."""
+    regressions = compare([_result(1000, 'merge', 1.5, 1000),
+                           _result(1000, 'generate', 2.0, 2400)], BASELINE, 0.25, 0.10, 0.005)
+    assert len(regressions) == 2, regressions
+    assert regressions[0].startswith('merge at 1000: 1.500s vs 1.000s baseline (+50%)')
+    assert regressions[1] == 'generate at 1000: 2400 KB peak vs 2000 KB baseline'
+
+    print("✓ Regression report test passed")
+
+
+def test_committed_baseline_covers_all_phases():
+    """Test that the committed baseline is readable and complete."""
+    with open(os.path.join(BENCHMARKS, 'pom-bench-baseline.json'), encoding='utf-8') as f:
+        baseline = json.load(f)
+    measured = {(r['size'], r['phase']) for r in baseline['results']}
+    assert measured == {(size, phase) for size in (10, 1000, 10000, 50000) for phase in PHASES}
+    assert compare(baseline['results'], baseline, 0.0, 0.0, 0.0) == [], \
+        "A baseline should not regress against itself"
+
+    print("✓ Committed baseline test passed")
+
+
+if __name__ == '__main__':
+    print("Running bench_pom_generator tests...\n")
+
+    try:
+        test_compare_within_limits()
+        test_compare_reports_regressions()
+        test_committed_baseline_covers_all_phases()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,141 @@
+"""Tests for build_cache module."""
+
+import io
+import json
+import os
+import stat
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.build_cache import (
+    build_cache_enabled, format_stats, write_build_cache_config,
+)
+from jdevtools.dispatch import Dispatcher
+from jdevtools.jcompile_dispatch import PomGenerator
+
+# Stand-in for Maven with the build cache: core is restored, app is rebuilt
+FAKE_MVN = """#!/bin/sh
+case "$*" in
+  *com.test:core*) echo "[INFO] Found cached build, restoring com.test:core from cache by checksum 1" ;;
+  *com.test:app*) echo "[INFO] Local build was not found by checksum 2 for com.test:app" ;;
+esac
+echo "goals: $*"
+"""
+
+EXISTING_EXTENSIONS = """<?xml version="1.0" encoding="UTF-8"?>
+<extensions xmlns="http://maven.apache.org/EXTENSIONS/1.1.0">
+  <extension>
+    <groupId>kr.motd.maven</groupId>
+    <artifactId>os-maven-plugin</artifactId>
+    <version>1.7.1</version>
+  </extension>
+</extensions>
+"""
+
+POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>%s</artifactId>
+    <version>1.0</version>
+    %s
+</project>"""
+
+
+def test_write_config_keeps_other_extensions():
+    """Test that enabling the cache merges into existing .mvn files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, '.mvn'))
+        with open(os.path.join(tmpdir, '.mvn', 'extensions.xml'), 'w') as f:
+            f.write(EXISTING_EXTENSIONS)
+        assert not build_cache_enabled(tmpdir)
+
+        cache_dir = os.path.join(tmpdir, 'cache')
+        assert len(write_build_cache_config(tmpdir, cache_dir)) == 2
+        assert write_build_cache_config(tmpdir, cache_dir) == [], "Rewrite should be a no-op"
+        assert build_cache_enabled(tmpdir), "Extension should be registered and enabled"
+
+        content = open(os.path.join(tmpdir, '.mvn', 'extensions.xml')).read()
+        assert 'os-maven-plugin' in content, "Other extensions should be kept"
+        assert 'ns1:' not in content, "Namespace should stay the default one"
+        config = ET.parse(os.path.join(tmpdir, '.mvn', 'maven-build-cache-config.xml'))
+        location = [e.text for e in config.iter() if e.tag.endswith('location')]
+        assert location == [cache_dir], "Cache should point at the local directory"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_build_cache_config(tmpdir)
+        content = open(os.path.join(tmpdir, '.mvn', 'maven-build-cache-config.xml')).read()
+        assert '<location>' not in content and os.path.expanduser('~') not in content, \
+            "The default cache directory should be left to the extension"
+        assert build_cache_enabled(tmpdir)
+
+        cache_dir = os.path.join(tmpdir, 'cache')
+        write_build_cache_config(tmpdir, cache_dir)
+        assert write_build_cache_config(tmpdir) == [], "A configured location should be kept"
+        content = open(os.path.join(tmpdir, '.mvn', 'maven-build-cache-config.xml')).read()
+        assert '<location>%s</location>' % cache_dir in content
+
+    print("✓ Build cache config test passed")
+
+
+def test_dispatch_drops_clean_and_records_hits():
+    """Test that the dispatcher skips clean and records the hit rate."""
+    if os.name == 'nt':
+        print("⊘ Skipping dispatch test on Windows")
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, 'pom.xml'), 'w') as f:
+            f.write(POM % ('root', '<modules><module>core</module><module>app</module></modules>'))
+        for name in ('core', 'app'):
+            os.makedirs(os.path.join(tmpdir, name))
+            with open(os.path.join(tmpdir, name, 'pom.xml'), 'w') as f:
+                f.write(POM % (name, ''))
+        mvn = os.path.join(tmpdir, 'fake-mvn')
+        with open(mvn, 'w') as f:
+            f.write(FAKE_MVN)
+        os.chmod(mvn, os.stat(mvn).st_mode | stat.S_IEXEC)
+
+        assert Dispatcher(tmpdir, mvn=mvn).goals == ['clean', 'install', '-DskipTests']
+        write_build_cache_config(tmpdir, os.path.join(tmpdir, 'cache'))
+        dispatcher = Dispatcher(tmpdir, mvn=mvn, jobs=2, memory_mb=8192, out=io.StringIO())
+        assert dispatcher.goals == ['install', '-DskipTests'], "clean should be dropped with the cache"
+        dispatcher.run()
+
+        state_dir = os.path.join(tmpdir, '.jdevtools')
+        with open(os.path.join(state_dir, 'build-cache-stats.json')) as f:
+            stats = json.load(f)
+        assert stats['modules']['com.test:core'] == 'hit'
+        assert stats['modules']['com.test:app'] == 'miss'
+        assert '1/2 modules restored (50% hit rate)' in format_stats(state_dir)
+
+    print("✓ Dispatch build cache test passed")
+
+
+def test_generator_enables_build_cache():
+    """Test that the POM generator can emit the build cache configuration."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        PomGenerator(quiet=True, build_cache_dir=os.path.join(tmpdir, 'cache')).generate(
+            output_path=os.path.join(tmpdir, 'pom.xml'))
+        assert build_cache_enabled(tmpdir), "Generator should enable the build cache"
+
+    print("✓ Generator build cache test passed")
+
+
+if __name__ == '__main__':
+    print("Running build_cache tests...\n")
+
+    try:
+        test_write_config_keeps_other_extensions()
+        test_dispatch_drops_clean_and_records_hits()
+        test_generator_enables_build_cache()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
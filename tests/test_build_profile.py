@@ -0,0 +1,141 @@
+"""Tests for build_profile module."""
+
+import io
+import json
+import os
+import stat
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.build_profile import BuildProfiler, format_slowest, short_plugin_name
+from jdevtools.dispatch import Dispatcher, Module, Task
+
+# Stand-in for Maven printing mojo headers with pauses in between
+FAKE_MVN = """#!/bin/sh
+echo "[INFO] Scanning for projects..."
+echo "[INFO] --- maven-compiler-plugin:3.11.0:compile (default-compile) @ app ---"
+sleep 0.3
+echo "[INFO] --- native-maven-plugin:0.10.2:compile-no-fork (build-native) @ app ---"
+sleep 0.1
+echo "[INFO] BUILD SUCCESS"
+"""
+
+
+class FakeClock:
+    """Clock returning the values it is set to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _task(module_id, started, duration):
+    group_id, artifact_id = module_id.split(':')
+    task = Task(Module('pom.xml', group_id, artifact_id, set()), 1024, 1.0)
+    task.status = 'done'
+    task.started = started
+    task.duration = duration
+    return task
+
+
+def test_short_plugin_name():
+    """Test plugin prefixes derived from artifact ids."""
+    assert short_plugin_name('maven-compiler-plugin') == 'compiler'
+    assert short_plugin_name('native-maven-plugin') == 'native'
+    assert short_plugin_name('rpm-maven-plugin') == 'rpm'
+    assert short_plugin_name('jdeb') == 'jdeb'
+
+    print("✓ Plugin name test passed")
+
+
+def test_attributes_time_to_mojos():
+    """Test startup, mojo and shutdown spans and the trace layout."""
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        profiler = BuildProfiler(tmpdir, clock=clock)
+        core = _task('com.test:core', 10.0, 10.0)
+        app = _task('com.test:app', 12.0, 4.0)
+        for now, task, line in [
+                (11.0, core, "[INFO] --- compiler:3.11.0:compile (default-compile) @ core ---\n"),
+                (12.5, app, "[INFO] --- compiler:3.11.0:compile (default-compile) @ app ---\n"),
+                (13.0, core, "[INFO] Compiling 12 source files\n"),
+                (15.0, core, "[INFO] --- maven-jar-plugin:3.3.0:jar (default-jar) @ core ---\n"),
+                (15.5, app, "[INFO] BUILD SUCCESS\n"),
+                (19.0, core, "[INFO] BUILD SUCCESS\n")]:
+            clock.now = now
+            profiler(task, line)
+
+        tasks = {'com.test:core': core, 'com.test:app': app}
+        summary, summary_path, trace_path = profiler.save(tasks, 10.0, 'package')
+        entry = summary['modules']['com.test:core']
+        assert entry['startup_seconds'] == 1.0
+        assert entry['shutdown_seconds'] == 1.0
+        assert [(m['plugin'], m['goal'], m['phase'], m['seconds']) for m in entry['mojos']] == \
+            [('compiler', 'compile', 'compile', 4.0), ('jar', 'jar', 'package', 4.0)]
+        assert summary['plugins'] == {'compiler': 7.0, 'jar': 4.0}
+        assert summary['wall_seconds'] == 10.0
+        assert format_slowest(summary, limit=1) == \
+            ['   4.0s  compiler:compile (default-compile) @ com.test:core']
+
+        with open(trace_path) as f:
+            events = json.load(f)['traceEvents']
+        modules = {e['name']: e for e in events if e.get('cat') == 'module'}
+        assert modules['com.test:core']['tid'] != modules['com.test:app']['tid'], \
+            "Concurrent modules should be on separate rows"
+        jar = [e for e in events if e['name'] == 'jar:jar (default-jar)'][0]
+        assert (jar['ts'], jar['dur']) == (5000000, 4000000)
+
+    print("✓ Mojo attribution test passed")
+
+
+def test_dispatch_profile():
+    """Test that --profile writes the summary and trace of a real run."""
+    if os.name == 'nt':
+        print("⊘ Skipping dispatch test on Windows")
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, 'pom.xml'), 'w') as f:
+            f.write("""<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>app</artifactId>
+    <version>1.0</version>
+</project>""")
+        mvn = os.path.join(tmpdir, 'fake-mvn')
+        with open(mvn, 'w') as f:
+            f.write(FAKE_MVN)
+        os.chmod(mvn, os.stat(mvn).st_mode | stat.S_IEXEC)
+
+        out = io.StringIO()
+        Dispatcher(tmpdir, mvn=mvn, jobs=1, memory_mb=4096, out=out, profile=True).run()
+        with open(os.path.join(tmpdir, '.jdevtools', 'build-profile.json')) as f:
+            mojos = json.load(f)['modules']['com.test:app']['mojos']
+        assert [m['plugin'] for m in mojos] == ['compiler', 'native']
+        assert mojos[0]['seconds'] >= 0.25, mojos
+        assert os.path.isfile(os.path.join(tmpdir, '.jdevtools', 'build-trace.json'))
+        assert 'Slowest mojos:' in out.getvalue()
+
+    print("✓ Dispatch profile test passed")
+
+
+if __name__ == '__main__':
+    print("Running build_profile tests...\n")
+
+    try:
+        test_short_plugin_name()
+        test_attributes_time_to_mojos()
+        test_dispatch_profile()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
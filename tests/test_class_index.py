@@ -0,0 +1,161 @@
+"""Tests for class_index module."""
+
+import contextlib
+import io
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.class_index import ClassIndex, classify_changes, main, parse_class
+
+POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>app</artifactId>
+    <version>1.0</version>
+</project>"""
+
+
+def _class_bytes(name, refs=(), descriptors=()):
+    """Build a minimal class file with Class and Utf8 constant pool entries."""
+    pool = []
+
+    def utf8(text):
+        data = text.encode('utf-8')
+        pool.append(b'\x01' + struct.pack('>H', len(data)) + data)
+        return len(pool)
+
+    def class_ref(text):
+        index = utf8(text)
+        pool.append(b'\x07' + struct.pack('>H', index))
+        return len(pool)
+
+    this_class = class_ref(name)
+    super_class = class_ref('java/lang/Object')
+    for ref in refs:
+        class_ref(ref)
+    # A long constant occupies two slots
+    pool.append(b'\x05' + struct.pack('>q', 42))
+    pool.append(None)
+    for descriptor in descriptors:
+        utf8(descriptor)
+
+    entries = b''.join(entry for entry in pool if entry is not None)
+    return (b'\xca\xfe\xba\xbe' + struct.pack('>HHH', 0, 52, len(pool) + 1) + entries +
+            struct.pack('>HHHHHHH', 0x21, this_class, super_class, 0, 0, 0, 0))
+
+
+def _write_class(base, name, **kwargs):
+    path = os.path.join(base, name + '.class')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(_class_bytes(name, **kwargs))
+
+
+def _make_project(tmpdir):
+    """Service <- Controller <- ControllerTest, Util <- UtilTest, FooTest$1 -> Service."""
+    with open(os.path.join(tmpdir, 'pom.xml'), 'w') as f:
+        f.write(POM)
+    classes = os.path.join(tmpdir, 'target', 'classes')
+    tests = os.path.join(tmpdir, 'target', 'test-classes')
+    _write_class(classes, 'com/x/Service')
+    _write_class(classes, 'com/x/Util')
+    _write_class(classes, 'com/x/Controller', descriptors=['(Lcom/x/Service;)V'])
+    _write_class(tests, 'com/x/ControllerTest', refs=['com/x/Controller'])
+    _write_class(tests, 'com/x/UtilTest', refs=['[Lcom/x/Util;'])
+    _write_class(tests, 'com/x/FooTest$1', refs=['com/x/Service'])
+    _write_class(tests, 'com/x/FooTest')
+
+
+def test_parse_class():
+    """Test constant pool parsing of class refs, arrays and descriptors."""
+    name, refs = parse_class(_class_bytes(
+        'com/x/A', refs=['com/x/B', '[[Lcom/x/C;'],
+        descriptors=['(Ljava/util/List<Lcom/x/D;>;)V']))
+    assert name == 'com.x.A'
+    assert {'com.x.B', 'com.x.C', 'com.x.D', 'java.util.List'} <= refs, refs
+    assert 'com.x.A' not in refs, "A class should not depend on itself"
+
+    print("✓ Class parsing test passed")
+
+
+def test_affected_tests_and_incremental_update():
+    """Test transitive selection and re-scanning only changed class files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_project(tmpdir)
+        index = ClassIndex(tmpdir)
+        assert index.update() == 7, "First run should scan every class"
+
+        assert index.affected_tests({'com.x.Service'}) == \
+            ['com.x.ControllerTest', 'com.x.FooTest'], \
+            "Should follow Controller and nested classes to their tests"
+        assert index.affected_tests({'com.x.Util'}) == ['com.x.UtilTest']
+        assert index.affected_tests({'com.x.NewTest'}) == ['com.x.NewTest'], \
+            "Uncompiled changed tests should still be selected"
+
+        os.remove(os.path.join(tmpdir, 'target', 'test-classes', 'com', 'x', 'UtilTest.class'))
+        index = ClassIndex(tmpdir)
+        assert index.update() == 0, "Unchanged classes should not be re-read"
+        assert index.affected_tests({'com.x.Util'}) == []
+
+    print("✓ Affected tests test passed")
+
+
+def test_classify_changes():
+    """Test mapping of changed files to classes."""
+    classes, full = classify_changes(['core/src/main/java/com/x/Service.java', 'README.md'])
+    assert classes == {'com.x.Service'} and not full
+    _, full = classify_changes(['core/src/main/resources/app.properties'])
+    assert full, "Resource changes cannot be attributed to classes"
+
+    print("✓ Change classification test passed")
+
+
+def test_main_against_git():
+    """Test selection from a git diff end to end."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_project(tmpdir)
+        source = os.path.join(tmpdir, 'src', 'main', 'java', 'com', 'x', 'Util.java')
+        os.makedirs(os.path.dirname(source))
+        with open(source, 'w') as f:
+            f.write('class Util {}')
+        with open(os.path.join(tmpdir, '.gitignore'), 'w') as f:
+            f.write('target/\n.jdevtools/\n')
+        git = ['git', '-c', 'user.name=t', '-c', 'user.email=t@t']
+        subprocess.run(git + ['init', '-q'], cwd=tmpdir, check=True)
+        subprocess.run(git + ['add', '.'], cwd=tmpdir, check=True)
+        subprocess.run(git + ['commit', '-q', '-m', 'init'], cwd=tmpdir, check=True)
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            assert main(['--project', tmpdir]) == 3, "Nothing changed, nothing to run"
+        with open(source, 'a') as f:
+            f.write('\n')
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            assert main(['--project', tmpdir]) == 0
+        assert out.getvalue().startswith('-Dtest=com.x.UtilTest '), out.getvalue()
+
+    print("✓ Git selection test passed")
+
+
+if __name__ == '__main__':
+    print("Running class_index tests...\n")
+
+    try:
+        test_parse_class()
+        test_affected_tests_and_incremental_update()
+        test_classify_changes()
+        test_main_against_git()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,286 @@
+"""Tests for dispatch module."""
+
+import io
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.dispatch import (Dispatcher, goal_memory, load_graph, parse_jobs, parse_size,
+                               user_repository)
+
+# Stand-in for Maven: records when each -pl module starts and ends, and
+# fails for modules named in FAIL_MODULES.
+FAKE_MVN = """#!/bin/sh
+module=""
+while [ $# -gt 0 ]; do
+  if [ "$1" = "-pl" ]; then module="$2"; fi
+  shift
+done
+echo "start $module" >> "$DISPATCH_LOG"
+sleep 0.2
+echo "end $module" >> "$DISPATCH_LOG"
+case " $FAIL_MODULES " in *" $module "*) exit 1 ;; esac
+exit 0
+"""
+
+
+def _write_pom(directory, artifact_id, modules=(), deps=()):
+    os.makedirs(directory, exist_ok=True)
+    module_xml = "".join("<module>%s</module>" % m for m in modules)
+    dep_xml = "".join(
+        "<dependency><groupId>com.test</groupId><artifactId>%s</artifactId>"
+        "<version>1.0</version></dependency>" % d for d in deps)
+    with open(os.path.join(directory, 'pom.xml'), 'w') as f:
+        f.write("""<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>%s</artifactId>
+    <version>1.0</version>
+    <modules>%s</modules>
+    <dependencies>%s</dependencies>
+</project>""" % (artifact_id, module_xml, dep_xml))
+
+
+def _make_reactor(tmpdir):
+    """core <- api <- app, core <- util (util is off the critical path)."""
+    _write_pom(tmpdir, 'root', modules=['core', 'api', 'app', 'util'])
+    _write_pom(os.path.join(tmpdir, 'core'), 'core')
+    _write_pom(os.path.join(tmpdir, 'api'), 'api', deps=['core'])
+    _write_pom(os.path.join(tmpdir, 'app'), 'app', deps=['api'])
+    _write_pom(os.path.join(tmpdir, 'util'), 'util', deps=['core'])
+    mvn = os.path.join(tmpdir, 'fake-mvn')
+    with open(mvn, 'w') as f:
+        f.write(FAKE_MVN)
+    os.chmod(mvn, os.stat(mvn).st_mode | stat.S_IEXEC)
+    return mvn
+
+
+def _events(tmpdir):
+    with open(os.path.join(tmpdir, 'dispatch.log')) as f:
+        return [line.split() for line in f.read().splitlines()]
+
+
+def test_parse_helpers():
+    """Test size, worker count and goal memory parsing."""
+    assert parse_size('6g') == 6144
+    assert parse_size('512M') == 512
+    assert parse_size('2GB') == 2048
+    assert parse_jobs('4') == 4
+    assert parse_jobs('1C') == (os.cpu_count() or 1)
+    assert goal_memory(['clean', 'package', 'native:compile']) == 6144
+    assert goal_memory(['compile'], {'compile': 512}) == 512
+    assert goal_memory(['install', '-DskipTests']) == 1536
+
+    print("✓ Parse helpers test passed")
+
+
+def test_load_graph():
+    """Test that inter-module dependencies become DAG edges."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_reactor(tmpdir)
+        graph = load_graph(tmpdir)
+
+        assert set(graph) == {'com.test:root', 'com.test:core', 'com.test:api',
+                              'com.test:app', 'com.test:util'}
+        assert graph['com.test:app'].depends_on == {'com.test:api'}
+        assert graph['com.test:core'].dependents == {'com.test:api', 'com.test:util'}
+
+    print("✓ Module graph test passed")
+
+
+def test_graph_interpolates_coordinates():
+    """Test that ${...} coordinates, inherited ones included, become DAG edges."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, 'pom.xml'), 'w') as f:
+            f.write("""<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>root</artifactId>
+    <version>1.0</version>
+    <packaging>pom</packaging>
+    <properties><core.artifact>core</core.artifact></properties>
+    <modules><module>core</module><module>api</module></modules>
+</project>""")
+        for name, deps in (('core', ''), ('api', """<dependencies>
+        <dependency><groupId>${project.groupId}</groupId>
+            <artifactId>${core.artifact}</artifactId><version>${project.version}</version>
+        </dependency></dependencies>""")):
+            os.makedirs(os.path.join(tmpdir, name))
+            with open(os.path.join(tmpdir, name, 'pom.xml'), 'w') as f:
+                f.write("""<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <parent><groupId>com.test</groupId><artifactId>root</artifactId><version>1.0</version></parent>
+    <artifactId>%s</artifactId>
+    %s
+</project>""" % (name, deps))
+        graph = load_graph(tmpdir)
+
+        assert graph['com.test:api'].depends_on == {'com.test:core', 'com.test:root'}, \
+            graph['com.test:api'].depends_on
+        assert 'com.test:api' in graph['com.test:core'].dependents
+
+    print("✓ Interpolated coordinates test passed")
+
+
+def test_critical_path_priority():
+    """Test that modules on the longest chain are prioritized."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_reactor(tmpdir)
+        tasks = Dispatcher(tmpdir, mvn='mvn', memory_mb=4096).plan()
+
+        assert tasks['com.test:core'].priority == 3.0, "core -> api -> app"
+        assert tasks['com.test:api'].priority > tasks['com.test:util'].priority
+
+    print("✓ Critical path priority test passed")
+
+
+def test_dependency_order_and_memory_budget():
+    """Test that dependencies finish first and memory caps concurrency."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mvn = _make_reactor(tmpdir)
+        os.environ['DISPATCH_LOG'] = os.path.join(tmpdir, 'dispatch.log')
+        os.environ['FAIL_MODULES'] = ''
+        try:
+            # Budget for exactly one compile at a time despite 4 workers
+            tasks = Dispatcher(tmpdir, goals='install', mvn=mvn, jobs=4,
+                               memory_mb=1024, out=io.StringIO()).run()
+        finally:
+            del os.environ['DISPATCH_LOG']
+            del os.environ['FAIL_MODULES']
+
+        assert all(t.status == 'done' for t in tasks.values())
+        events = _events(tmpdir)
+        running = 0
+        for kind, _ in events:
+            running += 1 if kind == 'start' else -1
+            assert running <= 1, "Memory budget should serialize builds"
+        order = [module for kind, module in events if kind == 'end']
+        assert order.index('com.test:core') < order.index('com.test:api') \
+            < order.index('com.test:app')
+        assert os.path.exists(os.path.join(tmpdir, '.jdevtools', 'dispatch-history.json'))
+
+    print("✓ Dependency order and memory budget test passed")
+
+
+def test_failure_skips_dependents():
+    """Test that a failed module skips its dependents but not unrelated ones."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mvn = _make_reactor(tmpdir)
+        os.environ['DISPATCH_LOG'] = os.path.join(tmpdir, 'dispatch.log')
+        os.environ['FAIL_MODULES'] = 'com.test:api'
+        try:
+            tasks = Dispatcher(tmpdir, goals='install', mvn=mvn, jobs=2,
+                               memory_mb=8192, fail_at_end=True,
+                               out=io.StringIO()).run()
+        finally:
+            del os.environ['DISPATCH_LOG']
+            del os.environ['FAIL_MODULES']
+
+        assert tasks['com.test:api'].status == 'failed'
+        assert tasks['com.test:app'].status == 'skipped'
+        assert tasks['com.test:util'].status == 'done'
+
+    print("✓ Failure isolation test passed")
+
+
+def test_goals_must_install_upstream_modules():
+    """Test the project-local repository and that non-installing goals are refused."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mvn = _make_reactor(tmpdir)
+        dispatcher = Dispatcher(tmpdir, mvn=mvn, memory_mb=4096, out=io.StringIO())
+        tasks = dispatcher.plan()
+        command = dispatcher.command(tasks['com.test:api'])
+        repository = os.path.join(tmpdir, '.jdevtools', 'repository')
+        assert command == [mvn, '-B', '-Dmaven.repo.local=' + repository,
+                           '-Dmaven.repo.local.tail=' + user_repository(),
+                           '-pl', 'com.test:api', 'clean', 'install', '-DskipTests']
+        assert dispatcher.command(tasks['com.test:api'], multi_module=False) == \
+            [mvn, '-B', 'clean', 'install', '-DskipTests']
+
+        custom = Dispatcher(tmpdir, mvn=mvn, maven_args=['-Dmaven.repo.local=/r'])
+        assert custom.command(tasks['com.test:api'])[:3] == [mvn, '-B', '-Dmaven.repo.local=/r'], \
+            "An explicit local repository should be kept"
+
+        for goals in ('compile', 'clean package'):
+            try:
+                Dispatcher(tmpdir, goals=goals, mvn=mvn, out=io.StringIO()).run()
+                assert False, "%s should be refused" % goals
+            except ValueError as e:
+                assert 'do not install' in str(e) and 'com.test:core' in str(e), str(e)
+        assert not os.path.exists(os.path.join(tmpdir, '.jdevtools', 'logs')), \
+            "Nothing should be built with refused goals"
+        Dispatcher(tmpdir, goals='clean', mvn=mvn).check_goals(tasks)
+
+        _write_pom(os.path.join(tmpdir, 'single'), 'single')
+        single = Dispatcher(os.path.join(tmpdir, 'single'), goals='compile', mvn=mvn)
+        single.check_goals(single.plan())
+
+    print("✓ Installing goals test passed")
+
+
+def test_real_reactor_resolves_siblings():
+    """Test that a real Maven build of a dependent module sees its sibling."""
+    if shutil.which('mvn') is None or shutil.which('javac') is None:
+        print("⊘ Skipping real reactor test (Maven or a JDK not found)")
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_pom(tmpdir, 'root', modules=['core', 'app'])
+        with open(os.path.join(tmpdir, 'pom.xml')) as f:
+            pom = f.read()
+        with open(os.path.join(tmpdir, 'pom.xml'), 'w') as f:
+            f.write(pom.replace('<version>1.0</version>',
+                                '<version>1.0</version><packaging>pom</packaging>', 1))
+        _write_pom(os.path.join(tmpdir, 'core'), 'core')
+        _write_pom(os.path.join(tmpdir, 'app'), 'app', deps=['core'])
+        sources = (('core', 'Greeting', 'public class Greeting { '
+                    'public static String text() { return "hi"; } }'),
+                   ('app', 'App', 'public class App { public static void main(String[] a) '
+                    '{ System.out.println(Greeting.text()); } }'))
+        for module, name, code in sources:
+            package_dir = os.path.join(tmpdir, module, 'src', 'main', 'java', 'com', 'test')
+            os.makedirs(package_dir)
+            with open(os.path.join(package_dir, name + '.java'), 'w') as f:
+                f.write('package com.test;\n' + code)
+
+        properties = ['-Dmaven.compiler.release=17', '-Dproject.build.sourceEncoding=UTF-8']
+        tasks = Dispatcher(tmpdir, mvn='mvn', jobs=2, memory_mb=8192,
+                           maven_args=properties, out=io.StringIO()).run()
+        assert all(t.status == 'done' for t in tasks.values()), \
+            {mid: (t.status, t.log_path) for mid, t in tasks.items()}
+        jar = os.path.join(tmpdir, '.jdevtools', 'repository', 'com', 'test', 'core', '1.0',
+                           'core-1.0.jar')
+        assert os.path.exists(jar), "core should be installed into the project repository"
+        classpath = os.pathsep.join([jar, os.path.join(tmpdir, 'app', 'target', 'classes')])
+        output = subprocess.check_output(['java', '-cp', classpath, 'com.test.App'],
+                                         universal_newlines=True)
+        assert output.strip() == 'hi'
+
+    print("✓ Real reactor test passed")
+
+
+if __name__ == '__main__':
+    print("Running dispatch tests...\n")
+
+    try:
+        test_parse_helpers()
+        test_load_graph()
+        test_graph_interpolates_coordinates()
+        test_critical_path_priority()
+        test_dependency_order_and_memory_budget()
+        test_failure_skips_dependents()
+        test_goals_must_install_upstream_modules()
+        test_real_reactor_resolves_siblings()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
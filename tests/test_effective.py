@@ -0,0 +1,274 @@
+"""Tests for effective module."""
+
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.effective import ParentResolver, interpolate, project_index_path
+from jdevtools.jcompile_dispatch import PomGenerator
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    %s
+</project>"""
+
+CORP_PARENT = POM % """
+    <groupId>com.corp</groupId>
+    <artifactId>corp-parent</artifactId>
+    <version>7</version>
+    <packaging>pom</packaging>
+    <properties>
+        <maven.compiler.source>11</maven.compiler.source>
+        <slf4j.version>2.0.9</slf4j.version>
+        <corp.bom.version>7</corp.bom.version>
+    </properties>
+    <dependencyManagement>
+        <dependencies>
+            <dependency>
+                <groupId>com.corp</groupId>
+                <artifactId>corp-bom</artifactId>
+                <version>${corp.bom.version}</version>
+                <type>pom</type>
+                <scope>import</scope>
+            </dependency>
+        </dependencies>
+    </dependencyManagement>"""
+
+CORP_BOM = POM % """
+    <groupId>com.corp</groupId>
+    <artifactId>corp-bom</artifactId>
+    <version>7</version>
+    <dependencyManagement>
+        <dependencies>
+            <dependency>
+                <groupId>com.google.guava</groupId>
+                <artifactId>guava</artifactId>
+                <version>32.1.0-jre</version>
+            </dependency>
+            <dependency>
+                <groupId>org.apache.commons</groupId>
+                <artifactId>commons-lang3</artifactId>
+                <version>3.14.0</version>
+            </dependency>
+            <dependency>
+                <groupId>commons-io</groupId>
+                <artifactId>commons-io</artifactId>
+                <version>2.15.1</version>
+            </dependency>
+        </dependencies>
+    </dependencyManagement>"""
+
+REACTOR_PARENT = POM % """
+    <parent>
+        <groupId>com.corp</groupId>
+        <artifactId>corp-parent</artifactId>
+        <version>7</version>
+        <relativePath/>
+    </parent>
+    <artifactId>reactor</artifactId>
+    <version>1.0</version>
+    <dependencies>
+        <dependency>
+            <groupId>org.slf4j</groupId>
+            <artifactId>slf4j-api</artifactId>
+            <version>${slf4j.version}</version>
+        </dependency>
+    </dependencies>
+    <build>
+        <plugins>
+            <plugin>
+                <groupId>org.graalvm.buildtools</groupId>
+                <artifactId>native-maven-plugin</artifactId>
+                <version>0.10.1</version>
+            </plugin>
+        </plugins>
+    </build>"""
+
+CHILD = POM % """
+    <parent>
+        <groupId>com.corp</groupId>
+        <artifactId>reactor</artifactId>
+        <version>1.0</version>
+    </parent>
+    <artifactId>%s</artifactId>
+    <properties>
+        <mainClass>com.corp.Main</mainClass>
+        <lang3.version>3.14.0</lang3.version>
+    </properties>
+    <dependencies>
+        <dependency>
+            <groupId>org.slf4j</groupId>
+            <artifactId>slf4j-api</artifactId>
+            <version>2.0.9</version>
+        </dependency>
+        <dependency>
+            <groupId>com.google.guava</groupId>
+            <artifactId>guava</artifactId>
+        </dependency>
+        <dependency>
+            <groupId>org.apache.commons</groupId>
+            <artifactId>commons-lang3</artifactId>
+            <version>${lang3.version}</version>
+        </dependency>
+        <dependency>
+            <groupId>commons-io</groupId>
+            <artifactId>commons-io</artifactId>
+            <version>2.11.0</version>
+        </dependency>
+    </dependencies>"""
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def _make_workspace(tmpdir, modules=('child',)):
+    repo = os.path.join(tmpdir, 'repo')
+    _write(os.path.join(repo, 'com', 'corp', 'corp-parent', '7', 'corp-parent-7.pom'),
+           CORP_PARENT)
+    _write(os.path.join(repo, 'com', 'corp', 'corp-bom', '7', 'corp-bom-7.pom'),
+           CORP_BOM)
+    project = os.path.join(tmpdir, 'project')
+    _write(os.path.join(project, 'pom.xml'), REACTOR_PARENT)
+    for module in modules:
+        _write(os.path.join(project, module, 'pom.xml'), CHILD % module)
+    return repo, project
+
+
+def test_interpolate():
+    """Test nested property expansion."""
+    props = {'a': '${b}-x', 'b': 'v'}
+    assert interpolate('${a}/${missing}', props) == 'v-x/${missing}'
+
+    print("✓ Interpolation test passed")
+
+
+def test_resolve_parent_chain_and_bom():
+    """Test that parents from disk and repository and imported BOMs are resolved."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo, project = _make_workspace(tmpdir)
+        resolver = ParentResolver(repository=repo)
+        inherited = resolver.inherited(os.path.join(project, 'child', 'pom.xml'))
+
+        assert inherited.properties['maven.compiler.source'] == '11'
+        assert inherited.has_dependency('org.slf4j:slf4j-api:jar:', '2.0.9', None), \
+            "Should interpolate inherited dependency versions"
+        assert inherited.managed['com.google.guava:guava:jar:']['version'] == '32.1.0-jre', \
+            "Should import managed dependencies from the BOM"
+        assert len(inherited.sources) == 3, "Should record reactor, parent and BOM"
+
+    print("✓ Parent chain resolution test passed")
+
+
+def test_parents_parsed_once():
+    """Test that shared parents are parsed once and then served from the index."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        modules = ['m%d' % i for i in range(5)]
+        repo, project = _make_workspace(tmpdir, modules)
+
+        index_path = project_index_path(os.path.join(project, 'm3', 'pom.xml'))
+        assert index_path == os.path.join(project, '.jdevtools', 'pom-index.json'), \
+            "Modules should share the index of the reactor root"
+        resolver = ParentResolver(repository=repo, index_path=index_path)
+        for module in modules:
+            resolver.inherited(os.path.join(project, module, 'pom.xml'))
+        assert resolver.parsed == 3 + len(modules), \
+            "Each parent should be parsed once"
+        resolver.save()
+        assert os.path.isfile(index_path)
+        assert not [name for name in os.listdir(repo) if name.endswith('.json')], \
+            "Nothing should be written into the local repository"
+
+        fresh = ParentResolver(repository=repo, index_path=index_path)
+        fresh.inherited(os.path.join(project, 'm0', 'pom.xml'))
+        assert fresh.parsed == 0, "A new resolver should reuse the on-disk index"
+
+    print("✓ Memoized parent test passed")
+
+
+def test_generator_skips_inherited():
+    """Test that the generator drops inherited properties and dependencies."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo, project = _make_workspace(tmpdir)
+        child = os.path.join(project, 'child', 'pom.xml')
+        output = os.path.join(tmpdir, 'out.xml')
+
+        PomGenerator(existing_pom=child, repository=repo).generate(output_path=output)
+        with open(output) as f:
+            content = f.read()
+
+        assert 'maven.compiler.source' not in content, \
+            "Inherited identical property should be skipped"
+        assert 'maven.compiler.target' in content, "Other properties should remain"
+        assert 'slf4j-api' not in content, "Inherited dependency should be skipped"
+        assert 'guava' in content, "Managed-only dependency should remain"
+        assert '<relativePath/>' not in content and 'reactor' in content, \
+            "Should keep the parent declaration"
+        assert os.path.isfile(os.path.join(project, '.jdevtools', 'pom-index.json')), \
+            "The parent index should live in the project's state directory"
+
+        ns = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+        root = ET.parse(output).getroot()
+        versions = {dep.findtext('mvn:artifactId', None, ns): dep.findtext('mvn:version', None, ns)
+                    for dep in root.findall('mvn:dependencies/mvn:dependency', ns)}
+        assert versions == {'guava': None, 'commons-lang3': None, 'commons-io': '2.11.0'}, \
+            "Versions the BOM manages should be stripped, overrides kept: %s" % versions
+        native = [plugin for plugin in root.findall('mvn:build/mvn:plugins/mvn:plugin', ns)
+                  if plugin.findtext('mvn:artifactId', None, ns) == 'native-maven-plugin']
+        assert len(native) == 1 and native[0].find('mvn:version', ns) is None, \
+            "The version the parent pins should apply"
+        assert '--no-fallback' in [arg.text for arg in native[0].iterfind(
+            'mvn:configuration/mvn:buildArgs/mvn:buildArg', ns)], \
+            "The generated configuration should be kept"
+
+    print("✓ Generator inheritance test passed")
+
+
+def test_generator_keeps_plugin_of_bare_parent():
+    """Test that a parent declaring a plugin without a version changes nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo, project = _make_workspace(tmpdir)
+        with open(os.path.join(project, 'pom.xml')) as f:
+            parent = f.read()
+        _write(os.path.join(project, 'pom.xml'),
+               parent.replace('<version>0.10.1</version>', ''))
+        output = os.path.join(tmpdir, 'out.xml')
+
+        PomGenerator(existing_pom=os.path.join(project, 'child', 'pom.xml'),
+                     repository=repo).generate(output_path=output)
+
+        ns = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+        root = ET.parse(output).getroot()
+        native = [plugin for plugin in root.findall('mvn:build/mvn:plugins/mvn:plugin', ns)
+                  if plugin.findtext('mvn:artifactId', None, ns) == 'native-maven-plugin']
+        assert len(native) == 1, "The generated plugin should be kept"
+        assert native[0].findtext('mvn:version', None, ns) == '${native.maven.plugin.version}'
+        assert native[0].find('mvn:configuration/mvn:buildArgs', ns) is not None
+
+    print("✓ Bare parent plugin test passed")
+
+
+if __name__ == '__main__':
+    print("Running effective tests...\n")
+
+    try:
+        test_interpolate()
+        test_resolve_parent_chain_and_bom()
+        test_parents_parsed_once()
+        test_generator_skips_inherited()
+        test_generator_keeps_plugin_of_bare_parent()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -1,6 +1,10 @@
 """Tests for jcompile_dispatch module."""
 
+import contextlib
+import io
 import os
+import stat
+import subprocess
 import tempfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
@@ -161,6 +165,322 @@ def test_properties_preserved():
         print("✓ Properties preservation test passed")
 
 
+def test_native_image_profiles():
+    """Test that native-image build profiles are emitted and selectable."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, 'pom.xml')
+        generator = PomGenerator(native_profile='release', native_threads=6,
+                                 native_memory='12g')
+        generator.generate(output_path=output_file)
+        
+        root = ET.parse(output_file).getroot()
+        ns = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+        
+        profile_ids = [p.text for p in root.findall('mvn:profiles/mvn:profile/mvn:id', ns)]
+        assert profile_ids[:3] == ['native-dev', 'native-release', 'native-size'], \
+            "Should emit one profile per native build profile"
+        
+        # Defaults come from the selected profile
+        props = root.find('mvn:properties', ns)
+        assert props.find('mvn:native.optimization', ns).text == '3'
+        assert props.find('mvn:native.memory', ns).text == '12g'
+        assert props.find('mvn:native.parallelism', ns).text == '6'
+        
+        dev = root.find("mvn:profiles/mvn:profile[mvn:id='native-dev']", ns)
+        assert dev.find('mvn:properties/mvn:native.optimization', ns).text == 'b', \
+            "Dev profile should use quick build mode"
+        
+        build_args = [a.text for a in root.iter('{%s}buildArg' % ns['mvn'])]
+        assert '-O${native.optimization}' in build_args
+        assert '--gc=${native.gc}' in build_args
+        assert '-march=${native.march}' in build_args
+        assert '-J-Xmx${native.memory}' in build_args
+        assert '--parallelism=${native.parallelism}' in build_args
+        
+        print("✓ Native image profiles test passed")
+
+
+def test_unknown_native_profile():
+    """Test that an unknown native profile is rejected."""
+    try:
+        PomGenerator(native_profile='turbo')
+    except ValueError:
+        print("✓ Unknown native profile test passed")
+        return
+    assert False, "Should reject unknown native profiles"
+
+
+def test_surefire_parallel_settings():
+    """Test fork and JUnit Platform settings next to a declared surefire plugin."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        existing = os.path.join(tmpdir, 'existing.xml')
+        with open(existing, 'w') as f:
+            f.write("""<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>app</artifactId>
+    <version>1.0</version>
+    <build>
+        <plugins>
+            <plugin>
+                <artifactId>maven-surefire-plugin</artifactId>
+                <configuration><includes><include>**/*Spec.java</include></includes></configuration>
+            </plugin>
+        </plugins>
+    </build>
+</project>""")
+        output_file = os.path.join(tmpdir, 'pom.xml')
+        PomGenerator(existing_pom=existing, quiet=True).generate(output_path=output_file)
+        
+        ns = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+        root = ET.parse(output_file).getroot()
+        assert root.find('mvn:properties/mvn:forkCount', ns).text == '1C'
+        assert root.find('mvn:properties/mvn:reuseForks', ns).text == 'true'
+        assert root.find('mvn:properties/mvn:junit.parallel.enabled', ns).text == 'false', \
+            "JUnit parallel execution should be opt-in"
+        
+        managed = root.find('mvn:build/mvn:pluginManagement/mvn:plugins/mvn:plugin', ns)
+        assert managed.find('mvn:artifactId', ns).text == 'maven-surefire-plugin'
+        parameters = managed.find('.//mvn:configurationParameters', ns).text
+        assert 'junit.jupiter.execution.parallel.enabled = ${junit.parallel.enabled}' in parameters
+        
+        declared = [p for p in root.findall('mvn:build/mvn:plugins/mvn:plugin', ns)
+                    if p.find('mvn:artifactId', ns).text == 'maven-surefire-plugin']
+        assert declared and declared[0].find('.//mvn:include', ns) is not None, \
+            "The declared surefire configuration should be kept"
+        
+        print("✓ Surefire parallel settings test passed")
+
+
+def test_render_in_memory():
+    """Test that build() and render() match generate() without side effects."""
+    existing = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>in-memory</artifactId>
+    <version>2.0</version>
+</project>"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        existing_path = os.path.join(tmpdir, 'existing.xml')
+        with open(existing_path, 'w') as f:
+            f.write(existing)
+        output_file = os.path.join(tmpdir, 'pom.xml')
+        PomGenerator(existing_pom=existing_path, quiet=True).generate(output_path=output_file)
+        with open(output_file, encoding='utf-8') as f:
+            written = f.read()
+        
+        generator = PomGenerator()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert generator.render(existing) == written
+            assert generator.render_bytes(existing.encode('utf-8')) == written.encode('utf-8')
+            assert generator.render(existing_path) == written
+            existing_root = ET.fromstring(existing)
+            root = generator.build(existing_root)
+        assert out.getvalue() == '', "The in-memory API should not print"
+        assert len(existing_root) == 4, "The caller's element should not be modified"
+        assert sorted(os.listdir(tmpdir)) == ['.jdevtools', 'existing.xml', 'pom.xml']
+        
+        # Generated fragments are shared, but every tree is a separate copy
+        root.find('{http://maven.apache.org/POM/4.0.0}properties').clear()
+        assert 'native.maven.plugin.version' in generator.render()
+    
+    print("✓ In-memory rendering test passed")
+
+
+def test_jmh_profile():
+    """Test the opt-in JMH profile and the example benchmark source set."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, 'pom.xml')
+        PomGenerator(quiet=True).generate(output_path=output_file)
+        ns = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+        ids = [p.text for p in ET.parse(output_file).getroot().findall(
+            'mvn:profiles/mvn:profile/mvn:id', ns)]
+        assert 'jmh' not in ids, "The JMH profile should be opt-in"
+        
+        PomGenerator(jmh=True, quiet=True).generate(output_path=output_file)
+        root = ET.parse(output_file).getroot()
+        profile = [p for p in root.findall('mvn:profiles/mvn:profile', ns)
+                   if p.find('mvn:id', ns).text == 'jmh'][0]
+        assert profile.find('mvn:properties/mvn:jmh.version', ns).text == PomGenerator.JMH_VERSION
+        deps = [d.find('mvn:artifactId', ns).text for d in
+                profile.findall('mvn:dependencies/mvn:dependency', ns)]
+        assert deps == ['jmh-core', 'jmh-generator-annprocess']
+        assert profile.find('.//mvn:sources/mvn:source', ns).text == 'src/jmh/java'
+        run = profile.find(".//mvn:execution[mvn:id='run-benchmarks']", ns)
+        args = run.find('mvn:configuration/mvn:commandlineArgs', ns).text
+        assert 'org.openjdk.jmh.Main -rf json -rff ${jmh.result}' in args
+        
+        example = os.path.join(tmpdir, 'src', 'jmh', 'java', 'benchmarks', 'ExampleBenchmark.java')
+        assert os.path.isfile(example), "An example benchmark should be created"
+        with open(example, 'w') as f:
+            f.write('// edited')
+        PomGenerator(jmh=True, quiet=True, use_cache=False).generate(output_path=output_file)
+        with open(example) as f:
+            assert f.read() == '// edited', "Existing benchmark sources are left alone"
+    
+    print("✓ JMH profile test passed")
+
+
+def test_jlink_runtime_packaging():
+    """Test the jdeps/jlink runtime build and its DEB/RPM data sets."""
+    ns = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+    plain = PomGenerator(quiet=True).build()
+    assert 'maven-antrun-plugin' not in ET.tostring(plain, encoding='unicode'), \
+        "The runtime image should be opt-in"
+    
+    generator = PomGenerator(jlink=True, quiet=True)
+    root = generator.build()
+    plugins = {p.find('mvn:artifactId', ns).text: p
+               for p in root.findall('mvn:build/mvn:plugins/mvn:plugin', ns)}
+    names = list(plugins)
+    assert names.index('maven-dependency-plugin') < names.index('maven-antrun-plugin'), \
+        "Dependencies must be copied before jdeps runs in the same phase"
+    
+    target = plugins['maven-antrun-plugin'].find('.//mvn:target', ns)
+    jdeps, jlink = target.findall('mvn:exec', ns)
+    assert jdeps.get('executable') == '${java.home}/bin/jdeps'
+    assert '--print-module-deps' in [a.get('value') for a in jdeps]
+    jlink_args = [a.get('value') for a in jlink]
+    assert jlink_args[:2] == ['--add-modules', '${jlink.modules}']
+    for flag in ('--strip-debug', '--no-header-files', '--no-man-pages',
+                 '--compress=${jlink.compress}'):
+        assert flag in jlink_args, flag
+    assert '${mainClass}' in target.find('mvn:echo', ns).text
+    
+    if generator._get_os_type() == 'linux':
+        prefixes = [(d.find('mvn:mapper/mvn:prefix', ns).text,
+                     d.findtext('mvn:mapper/mvn:filemode', None, ns))
+                    for d in plugins['jdeb'].findall('.//mvn:dataSet/mvn:data', ns)]
+        assert ('/usr/share/${project.artifactId}/runtime', '755') in prefixes
+        assert ('/usr/share/${project.artifactId}/lib', None) in prefixes
+        assert ('/usr/bin', '755') in prefixes
+        directories = [m.find('mvn:directory', ns).text
+                       for m in plugins['rpm-maven-plugin'].findall('.//mvn:mapping', ns)]
+        assert '/usr/share/${project.artifactId}/runtime' in directories
+        assert '/usr/bin' in directories
+    
+    print("✓ jlink runtime packaging test passed")
+
+
+def test_appcds_training_and_launcher():
+    """Test the CDS training run, the launcher flags and the packaged archive."""
+    ns = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+    generator = PomGenerator(appcds=True, quiet=True)
+    assert generator.jlink, "The archive needs the jlink runtime it was dumped with"
+    root = generator.build()
+    properties = root.find('mvn:properties', ns)
+    assert not properties.find('mvn:app.jvm.flags', ns).text, \
+        "The application should keep the JVM's default GC and JIT"
+    
+    target = root.find(".//mvn:plugin[mvn:artifactId='maven-antrun-plugin']//mvn:target", ns)
+    jdeps, jlink, training = target.findall('mvn:exec', ns)
+    assert '--generate-cds-archive' in [a.get('value') for a in jlink]
+    launcher, script = target.findall('mvn:echo', ns)
+    assert '-XX:SharedArchiveFile="$APP_HOME/app-cds.jsa"' in launcher.text
+    assert '${app.jvm.flags} -cp "${launcher.classpath}"' in launcher.text
+    assert [a.get('value') for a in training][1:] == [
+        '${project.build.directory}/runtime/bin/java',
+        '${project.build.directory}/app-cds.jsa', '${build.classpath}', '${mainClass}',
+        '${app.jvm.flags}', '${appcds.runs}', '${appcds.training.args}']
+    assert '${' not in script.text, "Maven must not interpolate the script"
+    
+    if generator._get_os_type() == 'linux':
+        sources = [d.findtext('mvn:src', None, ns) for d in root.iter('{%s}data' % ns['mvn'])]
+        assert '${project.build.directory}/app-cds.jsa' in sources
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # A JVM that writes the archive when asked and logs its arguments
+        java = os.path.join(tmpdir, 'java')
+        with open(java, 'w') as f:
+            f.write('#!/bin/sh\n'
+                    'echo "$@" >> "%s/calls"\n'
+                    'for arg; do case $arg in -XX:ArchiveClassesAtExit=*) '
+                    ': > "${arg#*=}";; esac; done\n' % tmpdir)
+        os.chmod(java, os.stat(java).st_mode | stat.S_IEXEC)
+        train = os.path.join(tmpdir, 'train.sh')
+        with open(train, 'w') as f:
+            f.write(script.text)
+        archive = os.path.join(tmpdir, 'app-cds.jsa')
+        calls_path = os.path.join(tmpdir, 'calls')
+        for flags, configurations in (('', 2), ('-XX:+UseSerialGC -Xss1m', 3)):
+            if os.path.exists(calls_path):
+                os.remove(calls_path)
+            result = subprocess.run(
+                ['sh', train, java, archive, 'app.jar:lib/a.jar', 'com.example.Main',
+                 flags, '2', '--version'],
+                stdout=subprocess.PIPE, universal_newlines=True, check=True)
+            assert os.path.exists(archive)
+            assert 'with CDS archive' in result.stdout, result.stdout
+            assert ('app.jvm.flags' in result.stdout) == bool(flags), result.stdout
+            assert 'Startup time change:' in result.stdout, result.stdout
+            with open(calls_path) as f:
+                calls = f.read().splitlines()
+            assert len(calls) == 1 + configurations * 2, \
+                "One training run and two startups per configuration"
+        assert calls[0] == ('-XX:ArchiveClassesAtExit=%s -XX:+UseSerialGC -Xss1m '
+                            '-cp app.jar:lib/a.jar com.example.Main --version' % archive)
+        assert calls[-1].startswith('-XX:SharedArchiveFile=%s -XX:+UseSerialGC' % archive)
+    
+    print("✓ AppCDS training test passed")
+
+
+def test_cli_startup_defers_heavy_imports():
+    """Test that importing the CLI and --version load no generator modules."""
+    code = (
+        "import sys\n"
+        "from jdevtools import jcompile_dispatch\n"
+        "assert jcompile_dispatch.main(['--version']) == 0\n"
+        "heavy = ['argparse', 'platform', 'xml.etree.ElementTree', 'xml.dom.minidom',\n"
+        "         'jdevtools.pom_generator']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+        "from jdevtools.jcompile_dispatch import PomGenerator\n"
+        "print(PomGenerator.__module__)\n"
+    )
+    root = os.path.join(os.path.dirname(__file__), '..')
+    result = subprocess.run([sys.executable, '-c', code], cwd=root,
+                            stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    loaded, module = result.stdout.splitlines()[1:]
+    assert loaded == '', f"Heavy modules imported at startup: {loaded}"
+    assert module == 'jdevtools.pom_generator', "PomGenerator should still be importable"
+    
+    from jdevtools.jcompile_dispatch import main
+    err = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(err):
+            main(['--output', '--version'])
+        assert False, "--version as an option value should not short-circuit"
+    except SystemExit as e:
+        assert e.code == 2 and '--output' in err.getvalue(), err.getvalue()
+    
+    print("✓ CLI startup test passed")
+
+
+def test_noop_run_defers_heavy_imports():
+    """Test that a repeated run with nothing to do loads no generator modules."""
+    code = (
+        "import sys\n"
+        "from jdevtools import jcompile_dispatch\n"
+        "assert jcompile_dispatch.main([]) == 0\n"
+        "heavy = ['argparse', 'json', 'platform', 'xml.etree.ElementTree',\n"
+        "         'jdevtools.pom_cache', 'jdevtools.pom_generator']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        runs = [subprocess.run([sys.executable, '-c', code], cwd=tmpdir, env=env,
+                               stdout=subprocess.PIPE, universal_newlines=True, check=True)
+                for _ in range(2)]
+    assert 'jdevtools.pom_generator' in runs[0].stdout.splitlines()[-1], \
+        "The first run should generate the POM"
+    assert runs[1].stdout.startswith("POM file up to date: pom.xml\n"), runs[1].stdout
+    loaded = runs[1].stdout.splitlines()[-1]
+    assert loaded == '', f"Heavy modules imported for a no-op run: {loaded}"
+    
+    print("✓ No-op run startup test passed")
+
+
 if __name__ == '__main__':
     print("Running jcompile-dispatch tests...\n")
     
@@ -170,6 +490,15 @@ if __name__ == '__main__':
         test_linux_specific_plugins()
         test_merge_with_existing()
         test_properties_preserved()
+        test_native_image_profiles()
+        test_unknown_native_profile()
+        test_surefire_parallel_settings()
+        test_render_in_memory()
+        test_jmh_profile()
+        test_jlink_runtime_packaging()
+        test_appcds_training_and_launcher()
+        test_cli_startup_defers_heavy_imports()
+        test_noop_run_defers_heavy_imports()
         
         print("\n✅ All tests passed!")
     except AssertionError as e:
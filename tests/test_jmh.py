@@ -0,0 +1,134 @@
+"""Tests for jmh module."""
+
+import io
+import json
+import os
+import stat
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.jmh import compare, load_results, main, run_benchmarks
+
+# Stand-in for the Maven wrapper: records its arguments and writes a JMH
+# result file to the path given in -Djmh.result
+FAKE_MVNW = """#!/bin/sh
+echo "$@" > mvn-args.txt
+for arg in "$@"; do
+  case "$arg" in
+    -Djmh.result=*) result="${arg#-Djmh.result=}" ;;
+  esac
+done
+mkdir -p "$(dirname "$result")"
+echo '[{"benchmark": "b.Fast.run", "mode": "avgt", "primaryMetric":
+  {"score": 10.0, "scoreError": 0.1, "scoreUnit": "ns/op"}}]' > "$result"
+"""
+
+
+def _entry(name, score, error, mode='avgt', unit='ns/op', params=None):
+    entry = {'benchmark': name, 'mode': mode,
+             'primaryMetric': {'score': score, 'scoreError': error, 'scoreUnit': unit}}
+    if params:
+        entry['params'] = params
+    return entry
+
+
+def _write(path, entries):
+    with open(path, 'w') as f:
+        json.dump(entries, f)
+    return path
+
+
+def test_compare_uses_direction_threshold_and_confidence():
+    """Test regression detection for time and throughput modes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        baseline = load_results(_write(os.path.join(tmpdir, 'base.json'), [
+            _entry('b.Parse.run', 100.0, 2.0, params={'size': '10'}),
+            _entry('b.Parse.run', 900.0, 5.0, params={'size': '100'}),
+            _entry('b.Noisy.run', 100.0, 30.0),
+            _entry('b.Rate.run', 1000.0, 10.0, mode='thrpt', unit='ops/s'),
+            _entry('b.Gone.run', 1.0, 'NaN'),
+        ]))
+        current = load_results(_write(os.path.join(tmpdir, 'cur.json'), [
+            _entry('b.Parse.run', 120.0, 2.0, params={'size': '10'}),  # 20% slower
+            _entry('b.Parse.run', 920.0, 5.0, params={'size': '100'}),  # within threshold
+            _entry('b.Noisy.run', 130.0, 30.0),  # slower, but intervals overlap
+            _entry('b.Rate.run', 1200.0, 10.0, mode='thrpt', unit='ops/s'),  # faster
+            _entry('b.New.run', 1.0, 'NaN'),
+        ]))
+        verdicts = {row[0]: row[4] for row in compare(baseline, current, threshold=0.05)}
+        assert verdicts == {
+            'b.Parse.run [avgt] size=10': 'regressed',
+            'b.Parse.run [avgt] size=100': 'ok',
+            'b.Noisy.run [avgt]': 'ok',
+            'b.Rate.run [thrpt]': 'improved',
+            'b.Gone.run [avgt]': 'not run',
+            'b.New.run [avgt]': 'new',
+        }, verdicts
+
+        verdicts = {row[0]: row[4] for row in compare(baseline, current, threshold=0.25)}
+        assert verdicts['b.Parse.run [avgt] size=10'] == 'ok'
+
+    print("✓ Comparison test passed")
+
+
+def test_cli_baseline_lifecycle():
+    """Test that the first run saves a baseline and regressions fail the run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        baseline = os.path.join(tmpdir, 'jmh-baseline.json')
+        first = _write(os.path.join(tmpdir, 'first.json'), [_entry('b.A.run', 10.0, 0.1)])
+        slower = _write(os.path.join(tmpdir, 'slower.json'), [_entry('b.A.run', 12.0, 0.1)])
+        common = ['--project', tmpdir]
+
+        out = io.StringIO()
+        stdout, sys.stdout = sys.stdout, out
+        try:
+            assert main(common + ['--results', first]) == 0
+            assert os.path.exists(baseline), "The first run should become the baseline"
+            assert main(common + ['--results', first]) == 0
+            assert main(common + ['--results', slower]) == 1
+            assert 'REGRESSED' in out.getvalue()
+            assert main(common + ['--results', slower, '--save-baseline']) == 0
+            assert main(common + ['--results', slower]) == 0
+        finally:
+            sys.stdout = stdout
+
+    print("✓ CLI baseline test passed")
+
+
+def test_run_benchmarks_invokes_maven():
+    """Test the Maven invocation and the result file it produces."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mvnw = os.path.join(tmpdir, 'mvnw')
+        with open(mvnw, 'w') as f:
+            f.write(FAKE_MVNW)
+        os.chmod(mvnw, os.stat(mvnw).st_mode | stat.S_IEXEC)
+
+        result = run_benchmarks(tmpdir, include='Fast', jmh_args='-f 1', out=io.StringIO())
+        assert result == os.path.join(tmpdir, 'target', 'jmh-result.json')
+        assert list(load_results(result)) == ['b.Fast.run [avgt]']
+        with open(os.path.join(tmpdir, 'mvn-args.txt')) as f:
+            args = f.read().split()
+        assert args[0] == '-Pjmh' and args[-2:] == ['test-compile', 'exec:exec@run-benchmarks']
+        assert '-Djmh.args=-f' in args and 'Fast' in args
+
+    print("✓ Maven invocation test passed")
+
+
+if __name__ == '__main__':
+    print("Running jmh tests...\n")
+
+    try:
+        test_compare_uses_direction_threshold_and_confidence()
+        test_cli_baseline_lifecycle()
+        test_run_benchmarks_invokes_maven()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
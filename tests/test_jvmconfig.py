@@ -0,0 +1,153 @@
+"""Tests for jvmconfig module."""
+
+import io
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.jcompile_dispatch import PomGenerator
+from jdevtools.jvmconfig import MavenJvmConfigurator, merge_flags, parse_java_version
+
+# Stand-in for the Maven wrapper: dumps an "archive" like -XX:ArchiveClassesAtExit
+FAKE_MVNW = """#!/bin/sh
+for opt in $MAVEN_OPTS; do
+  case "$opt" in
+    -XX:ArchiveClassesAtExit=*) echo archive > "${opt#-XX:ArchiveClassesAtExit=}" ;;
+  esac
+done
+echo run >> runs.log
+"""
+
+
+def _script(path, content):
+    with open(path, 'w') as f:
+        f.write(content)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def _fake_java(tmpdir, version):
+    return _script(os.path.join(tmpdir, 'java'),
+                   "#!/bin/sh\necho 'openjdk version \"%s\" 2024-01-16' >&2\n" % version)
+
+
+def test_parse_java_version():
+    """Test major version detection for old and new version schemes."""
+    assert parse_java_version('java version "1.8.0_292"') == (8, "1.8.0_292")
+    assert parse_java_version('openjdk version "17.0.2" 2022-01-18') == (17, "17.0.2")
+    assert parse_java_version('openjdk version "21-ea"')[0] == 21
+    assert parse_java_version('garbage') == (None, None)
+
+    print("✓ Java version parsing test passed")
+
+
+def test_write_configs_keeps_user_flags():
+    """Test that user flags win and rewriting is idempotent."""
+    if os.name == 'nt':
+        print("⊘ Skipping config test on Windows")
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, '.mvn'))
+        with open(os.path.join(tmpdir, '.mvn', 'jvm.config'), 'w') as f:
+            f.write('-Xmx2g -XX:+UseParallelGC -XX:SharedArchiveFile=%s\n' %
+                    os.path.join(tmpdir, '.mvn', 'maven-cds.jsa'))
+
+        configurator = MavenJvmConfigurator(tmpdir, java=_fake_java(tmpdir, '21.0.2'))
+        assert len(configurator.write_configs()) == 3, "Should write both configs and .gitignore"
+        assert configurator.write_configs() == [], "Second run should change nothing"
+
+        flags = open(os.path.join(tmpdir, '.mvn', 'jvm.config')).read().split()
+        assert flags[:2] == ['-Xmx2g', '-XX:+UseParallelGC'], "User flags should be kept"
+        assert '-XX:+UseSerialGC' not in flags, "Should not add a second GC"
+        assert '-XX:TieredStopAtLevel=1' in flags
+        assert '-XX:+AutoCreateSharedArchive' in flags, "JDK 19+ should auto-create the archive"
+        assert '-XX:SharedArchiveFile=%s' % configurator.archive in flags, \
+            "The launcher passes jvm.config verbatim, so the archive path must be absolute"
+        with open(os.path.join(tmpdir, '.mvn', '.gitignore')) as f:
+            ignored = f.read().splitlines()
+        assert ignored == ['jvm.config', 'maven-cds.jsa', 'maven-cds.stamp'], \
+            "Checkout-specific files should not be committed"
+        assert 'no-transfer-progress' in open(os.path.join(tmpdir, '.mvn', 'maven.config')).read()
+
+    assert merge_flags(['-XX:-TieredCompilation'], ['-XX:+TieredCompilation']) == \
+        ['-XX:-TieredCompilation'], "Explicitly disabled flags should stay disabled"
+
+    print("✓ Config writing test passed")
+
+
+def test_refresh_archive_dynamic_dump():
+    """Test archive creation with ArchiveClassesAtExit and the refresh stamp."""
+    if os.name == 'nt':
+        print("⊘ Skipping archive test on Windows")
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mvnw = _script(os.path.join(tmpdir, 'mvnw'), FAKE_MVNW)
+        configurator = MavenJvmConfigurator(tmpdir, mvn=mvnw, java=_fake_java(tmpdir, '17.0.2'),
+                                            out=io.StringIO())
+
+        assert configurator.refresh_archive(), "Should create the archive"
+        assert os.path.isfile(configurator.archive)
+        # Launch through the real wrapper from a module directory; it joins
+        # jvm.config into MAVEN_OPTS and execs the JVM without expanding it
+        os.makedirs(os.path.join(tmpdir, 'jdk', 'bin'))
+        _script(os.path.join(tmpdir, 'jdk', 'bin', 'java'),
+                '#!/bin/sh\nfor arg in "$@"; do echo "$arg"; done\n')
+        wrapper = os.path.join(tmpdir, 'real-mvnw')
+        shutil.copy(os.path.join(os.path.dirname(__file__), '..', 'mvnw'), wrapper)
+        os.makedirs(os.path.join(tmpdir, 'module'))
+        launched = subprocess.run([wrapper, 'validate'],
+                                  cwd=os.path.join(tmpdir, 'module'),
+                                  env=dict(os.environ, JAVA_HOME=os.path.join(tmpdir, 'jdk'),
+                                           MAVEN_SKIP_RC='true'),
+                                  stdout=subprocess.PIPE, universal_newlines=True).stdout
+        assert '-XX:SharedArchiveFile=%s' % configurator.archive in launched.splitlines(), \
+            "The JVM should get a path to the archive that resolves from any directory"
+
+        assert not configurator.refresh_archive(), "Up-to-date archive should be kept"
+        assert configurator.refresh_archive(force=True), "--force should recreate it"
+
+        baseline, tuned = configurator.measure(runs=1)
+        assert baseline > 0 and tuned > 0
+        assert os.path.isfile(os.path.join(tmpdir, '.mvn', 'jvm.config')), \
+            "Measuring should restore jvm.config"
+        assert 'cold start' in configurator.out.getvalue()
+
+    print("✓ Archive refresh test passed")
+
+
+def test_generator_writes_maven_config():
+    """Test that the POM generator can also emit the .mvn configuration."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = os.path.join(tmpdir, 'pom.xml')
+        PomGenerator(quiet=True, maven_config=True).generate(output_path=output)
+
+        jvm_config = os.path.join(tmpdir, '.mvn', 'jvm.config')
+        assert os.path.isfile(jvm_config), "Should write .mvn/jvm.config"
+        assert '-XX:TieredStopAtLevel=1' in open(jvm_config).read()
+        assert os.path.isfile(os.path.join(tmpdir, '.mvn', 'maven.config'))
+
+    print("✓ Generator Maven config test passed")
+
+
+if __name__ == '__main__':
+    print("Running jvmconfig tests...\n")
+
+    try:
+        test_parse_java_version()
+        test_write_configs_keeps_user_flags()
+        test_refresh_archive_dynamic_dump()
+        test_generator_writes_maven_config()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,323 @@
+"""Tests for offline module."""
+
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.effective import ParentResolver
+from jdevtools.offline import OfflineCheck, RepositoryIndex, main
+from jdevtools.pom_generator import PomGenerator
+
+POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>%s</groupId>
+    <artifactId>%s</artifactId>
+    <version>%s</version>
+    %s
+</project>"""
+
+PROJECT_POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <parent>
+        <groupId>com.corp</groupId>
+        <artifactId>corp-parent</artifactId>
+        <version>1</version>
+        <relativePath/>
+    </parent>
+    <artifactId>app</artifactId>
+    <version>1.0</version>
+    <properties><lib.version>2.0</lib.version></properties>
+    <dependencies>
+        <dependency>
+            <groupId>org.lib</groupId>
+            <artifactId>lib</artifactId>
+            <version>${lib.version}</version>
+        </dependency>
+        <dependency>
+            <groupId>org.test</groupId>
+            <artifactId>testkit</artifactId>
+            <version>1.0</version>
+            <scope>test</scope>
+        </dependency>
+    </dependencies>
+    <build>
+        <plugins>
+            <plugin>
+                <artifactId>maven-compiler-plugin</artifactId>
+                <version>3.11.0</version>
+            </plugin>
+        </plugins>
+    </build>
+</project>"""
+
+
+def _install(repository, group_id, artifact_id, version, files=('.pom', '.jar'), body=''):
+    """Put an artifact into a fake local repository."""
+    directory = os.path.join(repository, *group_id.split('.'), artifact_id, version)
+    os.makedirs(directory, exist_ok=True)
+    for suffix in files:
+        with open(os.path.join(directory, '%s-%s%s' % (artifact_id, version, suffix)), 'w') as f:
+            f.write(POM % (group_id, artifact_id, version, body) if suffix == '.pom' else 'x')
+    return directory
+
+
+def _dependencies(*coords):
+    deps = ''.join('<dependency><groupId>%s</groupId><artifactId>%s</artifactId>'
+                   '<version>%s</version>%s</dependency>' % c for c in coords)
+    return '<dependencies>%s</dependencies>' % deps
+
+
+def _install_generator_plugins(repository):
+    _install(repository, 'org.graalvm.buildtools', 'native-maven-plugin',
+             PomGenerator.NATIVE_PLUGIN_VERSION)
+    _install(repository, 'org.codehaus.mojo', 'rpm-maven-plugin', PomGenerator.RPM_PLUGIN_VERSION)
+    _install(repository, 'org.vafer', 'jdeb', PomGenerator.DEB_PLUGIN_VERSION)
+
+
+def _wrapper(project, maven_version='3.9.6'):
+    """Pin the project's Maven version like the Maven wrapper does."""
+    os.makedirs(os.path.join(project, '.mvn', 'wrapper'), exist_ok=True)
+    with open(os.path.join(project, '.mvn', 'wrapper', 'maven-wrapper.properties'), 'w') as f:
+        f.write('distributionUrl=https://repo.maven.apache.org/maven2/org/apache/maven/'
+                'apache-maven/%s/apache-maven-%s-bin.zip\n' % (maven_version, maven_version))
+
+
+def _project(tmpdir, pom=PROJECT_POM):
+    project = os.path.join(tmpdir, 'project')
+    os.makedirs(project)
+    with open(os.path.join(project, 'pom.xml'), 'w') as f:
+        f.write(pom)
+    _wrapper(project)
+    return project
+
+
+def _check(project, repository, goals):
+    index = RepositoryIndex(repository).load()
+    index.refresh()
+    offline = OfflineCheck(project, index, goals, resolver=ParentResolver(repository))
+    return offline.run(), offline
+
+
+def test_incremental_index():
+    """Test that a refresh only re-reads changed directories."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = os.path.join(tmpdir, 'repository')
+        _install(repository, 'org.lib', 'lib', '2.0', files=('.pom', '.jar', '-tests.jar',
+                                                              '.jar.sha1'))
+        _install(repository, 'org.lib', 'other', '1.0', files=('.pom', '.jar.lastUpdated'))
+        snapshot = _install(repository, 'org.lib', 'snap', '1.1-SNAPSHOT', files=())
+        open(os.path.join(snapshot, 'snap-1.1-20240102.030405-7.jar'), 'w').close()
+
+        index = RepositoryIndex(repository)
+        index.refresh()
+        index.save()
+        assert index.has('org.lib', 'lib', '2.0', '.jar')
+        assert index.has('org.lib', 'lib', '2.0', '-tests.jar')
+        assert not index.has('org.lib', 'lib', '2.0', '.jar.sha1')
+        assert index.has('org.lib', 'other', '1.0', '.pom')
+        assert not index.has('org.lib', 'other', '1.0', '.jar'), "Failed downloads do not count"
+        assert index.has('org.lib', 'snap', '1.1-SNAPSHOT', '.jar')
+
+        reloaded = RepositoryIndex(repository).load()
+        # Only the repository root, where the index file was written, is re-read
+        assert reloaded.refresh() == 1
+        assert reloaded.refresh() == 0, "Nothing changed, nothing should be re-read"
+
+        time.sleep(0.01)
+        _install(repository, 'org.lib', 'lib', '2.1')
+        _install(repository, 'org.lib', 'lib', '10.0')
+        assert reloaded.refresh() == 3, "Only the artifact and the new version dirs are re-read"
+        assert reloaded.versions('org.lib', 'lib') == ['10.0', '2.1', '2.0']
+
+    print("✓ Incremental index test passed")
+
+
+def test_readiness_follows_parents_and_transitive_dependencies():
+    """Test that parents, BOMs and transitive dependencies are required."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = os.path.join(tmpdir, 'repository')
+        project = _project(tmpdir)
+        _install(repository, 'com.corp', 'corp-parent', '1', files=('.pom',), body="""
+            <dependencyManagement><dependencies><dependency>
+                <groupId>com.corp</groupId><artifactId>bom</artifactId><version>3</version>
+                <type>pom</type><scope>import</scope>
+            </dependency></dependencies></dependencyManagement>""")
+        _install(repository, 'com.corp', 'bom', '3', files=('.pom',), body="""
+            <dependencyManagement><dependencies><dependency>
+                <groupId>org.lib</groupId><artifactId>core</artifactId><version>5.1</version>
+            </dependency></dependencies></dependencyManagement>""")
+        # lib -> core (version managed by the BOM) and an optional dependency
+        _install(repository, 'org.lib', 'lib', '2.0', body=_dependencies(
+            ('org.lib', 'core', '5.0', ''),
+            ('org.lib', 'extra', '1.0', '<optional>true</optional>')))
+        _install(repository, 'org.apache.maven.plugins', 'maven-resources-plugin', '3.3.1')
+        _install(repository, 'org.apache.maven.plugins', 'maven-compiler-plugin', '3.11.0')
+
+        ready, offline = _check(project, repository, ['compile'])
+        assert not ready
+        assert offline.missing == {'org.lib:core:5.1 (core-5.1.pom)',
+                                   'org.lib:core:5.1 (core-5.1.jar)'}, offline.missing
+
+        _install(repository, 'org.lib', 'core', '5.1')
+        ready, offline = _check(project, repository, ['compile'])
+        assert ready, offline.report()
+
+        # Tests need the test-scoped dependency and surefire as well
+        ready, offline = _check(project, repository, ['test'])
+        assert not ready
+        assert 'org.test:testkit:1.0 (testkit-1.0.jar)' in offline.missing
+        assert 'org.apache.maven.plugins:maven-surefire-plugin:3.2.2 ' \
+            '(maven-surefire-plugin-3.2.2.jar)' in offline.missing, \
+            "Unversioned lifecycle plugins should use the Maven 3.9.6 defaults"
+
+    print("✓ Readiness test passed")
+
+
+def test_unversioned_plugins_and_test_provider():
+    """Test default plugin versions per Maven version and surefire's JUnit Platform provider."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = os.path.join(tmpdir, 'repository')
+        project = _project(tmpdir, POM % ('com.corp', 'app', '1.0', _dependencies(
+            ('org.junit.jupiter', 'junit-jupiter-api', '5.10.1', '<scope>test</scope>'))))
+        for plugin, version in (('maven-resources-plugin', '3.3.1'),
+                                ('maven-compiler-plugin', '3.11.0'),
+                                ('maven-surefire-plugin', '3.2.2'),
+                                ('maven-compiler-plugin', '3.12.1')):
+            _install(repository, 'org.apache.maven.plugins', plugin, version)
+        _install(repository, 'org.junit.jupiter', 'junit-jupiter-api', '5.10.1')
+
+        ready, offline = _check(project, repository, ['test'])
+        assert not ready
+        assert offline.missing == {
+            'org.apache.maven.surefire:surefire-junit-platform:3.2.2 (%s)' % name
+            for name in ('surefire-junit-platform-3.2.2.pom',
+                         'surefire-junit-platform-3.2.2.jar')}, offline.missing
+        _install(repository, 'org.apache.maven.surefire', 'surefire-junit-platform', '3.2.2')
+        ready, offline = _check(project, repository, ['test'])
+        assert ready, offline.report()
+
+        # Another Maven version binds other defaults, so nothing local can be trusted
+        _wrapper(project, '3.8.1')
+        ready, offline = _check(project, repository, ['compile'])
+        assert not ready
+        assert 'org.apache.maven.plugins:maven-compiler-plugin without a version ' \
+            '(no default known for Maven 3.8.1)' in offline.unresolved, offline.unresolved
+        assert not offline.missing, "A newer local compiler plugin must not count"
+
+    print("✓ Unversioned plugin test passed")
+
+
+def test_generated_pom_plugins_and_unresolved_versions():
+    """Test the generated POM's plugins, active profiles and unresolvable versions."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = os.path.join(tmpdir, 'repository')
+        project = os.path.join(tmpdir, 'project')
+        os.makedirs(project)
+        _wrapper(project)
+        pom_path = os.path.join(project, 'pom.xml')
+        generator = PomGenerator(quiet=True, jmh=True)
+        generator.generate(pom_path)
+        for plugin, version in (('maven-resources-plugin', '3.3.1'),
+                                ('maven-compiler-plugin', '3.11.0')):
+            _install(repository, 'org.apache.maven.plugins', plugin, version)
+
+        ready, offline = _check(project, repository, ['compile'])
+        assert not ready
+        assert any(m.startswith('org.graalvm.buildtools:native-maven-plugin:%s '
+                                % PomGenerator.NATIVE_PLUGIN_VERSION) for m in offline.missing)
+
+        _install_generator_plugins(repository)
+        ready, offline = _check(project, repository, ['compile'])
+        assert ready, offline.report()
+
+        # Surefire's version comes from the generated pluginManagement
+        ready, offline = _check(project, repository, ['test'])
+        assert 'org.apache.maven.plugins:maven-surefire-plugin:%s (maven-surefire-plugin-%s.jar)' \
+            % ((PomGenerator.SUREFIRE_PLUGIN_VERSION,) * 2) in offline.missing, offline.missing
+
+        # The jmh profile's plugins are only needed when it is active
+        ready, offline = _check(project, repository, ['-Pjmh', 'compile'])
+        assert not ready
+        assert any(m.startswith('org.codehaus.mojo:build-helper-maven-plugin:%s '
+                                % generator.BUILD_HELPER_PLUGIN_VERSION) for m in offline.missing)
+        ready, offline = _check(project, repository, ['-P', '!jmh', 'compile'])
+        assert ready, offline.report()
+
+        ready, offline = _check(project, repository, ['compile', 'nosuch:goal'])
+        assert not ready and offline.unresolved == {"plugin prefix 'nosuch'"}
+
+        with open(pom_path) as f:
+            pom = f.read()
+        with open(pom_path, 'w') as f:
+            f.write(pom.replace('</project>', _dependencies(
+                ('org.lib', 'lib', '${undefined.version}', '')) + '</project>'))
+        ready, offline = _check(project, repository, ['compile'])
+        assert not ready and offline.unresolved == {'org.lib:lib:${undefined.version}'}
+
+    print("✓ Generated POM plugins test passed")
+
+
+def test_plain_project_does_not_need_generator_plugins():
+    """Test that only the plugins a project declares are required."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = os.path.join(tmpdir, 'repository')
+        project = _project(tmpdir, POM % ('com.corp', 'app', '1.0', """
+            <profiles><profile>
+                <id>ci</id>
+                <activation><property><name>env.ci</name></property></activation>
+                <build><plugins><plugin>
+                    <groupId>org.jacoco</groupId><artifactId>jacoco-maven-plugin</artifactId>
+                    <version>0.8.11</version>
+                </plugin></plugins></build>
+            </profile></profiles>"""))
+        for plugin, version in (('maven-resources-plugin', '3.3.1'),
+                                ('maven-compiler-plugin', '3.11.0')):
+            _install(repository, 'org.apache.maven.plugins', plugin, version)
+
+        ready, offline = _check(project, repository, ['compile'])
+        assert ready, offline.report()
+        ready, offline = _check(project, repository, ['compile', '-Denv.ci'])
+        assert offline.missing == {'org.jacoco:jacoco-maven-plugin:0.8.11 (%s)' % name
+                                   for name in ('jacoco-maven-plugin-0.8.11.pom',
+                                                'jacoco-maven-plugin-0.8.11.jar')}, \
+            offline.missing
+
+    print("✓ Declared plugins test passed")
+
+
+def test_cli_exit_status():
+    """Test that check exits 0 only when the project is ready."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = os.path.join(tmpdir, 'repository')
+        project = _project(tmpdir)
+        common = ['--project', project, '--repository', repository]
+
+        assert main(common + ['check']) == 2
+        assert main(common + ['index']) == 0
+        assert os.path.exists(os.path.join(repository, '.jdevtools-artifact-index.json'))
+
+    print("✓ CLI exit status test passed")
+
+
+if __name__ == '__main__':
+    print("Running offline tests...\n")
+
+    try:
+        test_incremental_index()
+        test_readiness_follows_parents_and_transitive_dependencies()
+        test_unversioned_plugins_and_test_provider()
+        test_generated_pom_plugins_and_unresolved_versions()
+        test_plain_project_does_not_need_generator_plugins()
+        test_cli_exit_status()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
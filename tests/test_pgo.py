@@ -0,0 +1,113 @@
+"""Tests for pgo module."""
+
+import io
+import json
+import os
+import stat
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.pgo import PgoPipeline, version_profile, workload_command
+
+# Stand-in for the Maven wrapper: "builds" shell scripts as native binaries.
+# The instrumented binary writes a profile like a real instrumented image.
+FAKE_MVNW = """#!/bin/sh
+mkdir -p target
+case "$*" in
+  *native-pgo-instrument*)
+    printf '#!/bin/sh\\necho profile-data > default.iprof\\n' > target/app-instrumented
+    chmod +x target/app-instrumented ;;
+  *)
+    echo "$*" >> target/builds.log
+    printf '#!/bin/sh\\nexit 0\\n' > target/app
+    chmod +x target/app ;;
+esac
+"""
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>app</artifactId>
+    <version>1.0</version>
+</project>"""
+
+
+def test_workload_command():
+    """Test expansion of the binary placeholder."""
+    assert workload_command("{binary} --n '1 2'", "/t/app") == ["/t/app", "--n", "1 2"]
+
+    print("✓ Workload command test passed")
+
+
+def test_version_profile_deduplicates():
+    """Test that identical profiles map to the same version."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        iprof = os.path.join(tmpdir, 'default.iprof')
+        profiles_dir = os.path.join(tmpdir, 'pgo')
+        with open(iprof, 'w') as f:
+            f.write('profile-1')
+
+        first = version_profile(iprof, profiles_dir, workload='w')
+        second = version_profile(iprof, profiles_dir, workload='w')
+        assert first == second, "Identical profile should not create a new version"
+
+        with open(iprof, 'w') as f:
+            f.write('profile-2')
+        third = version_profile(iprof, profiles_dir, workload='w')
+        assert third != first, "Changed profile should get a new version"
+
+        with open(os.path.join(profiles_dir, 'profiles.json')) as f:
+            assert len(json.load(f)) == 2, "Index should list both versions"
+        with open(os.path.join(profiles_dir, 'default.iprof')) as f:
+            assert f.read() == 'profile-2', "default.iprof should be the latest"
+
+    print("✓ Profile versioning test passed")
+
+
+def test_pipeline_end_to_end():
+    """Test the instrument, train, optimize and report cycle."""
+    if os.name == 'nt':
+        print("⊘ Skipping pipeline test on Windows")
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, 'pom.xml'), 'w') as f:
+            f.write(POM)
+        mvnw = os.path.join(tmpdir, 'mvnw')
+        with open(mvnw, 'w') as f:
+            f.write(FAKE_MVNW)
+        os.chmod(mvnw, os.stat(mvnw).st_mode | stat.S_IEXEC)
+
+        out = io.StringIO()
+        baseline, optimized, profile = PgoPipeline(
+            tmpdir, "{binary}", runs=2, out=out).run()
+
+        assert os.path.isfile(profile), "Should store the versioned profile"
+        assert baseline.startup is not None and optimized.throughput is not None
+        with open(os.path.join(tmpdir, 'target', 'builds.log')) as f:
+            builds = f.read()
+        assert '-Pnative-pgo -Dnative.pgo.profile=%s' % profile in builds, \
+            "Optimized build should use the versioned profile"
+        assert 'throughput' in out.getvalue(), "Should print the comparison"
+
+    print("✓ PGO pipeline test passed")
+
+
+if __name__ == '__main__':
+    print("Running pgo tests...\n")
+
+    try:
+        test_workload_command()
+        test_version_profile_deduplicates()
+        test_pipeline_end_to_end()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,156 @@
+"""Tests for pom_cache module."""
+
+import os
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.jcompile_dispatch import PomGenerator
+from jdevtools.pom_cache import sidecar_path
+
+EXISTING_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>cached-app</artifactId>
+    <version>1.0</version>
+    <properties>
+        <mainClass>com.test.Main</mainClass>
+    </properties>
+</project>"""
+
+
+def test_repeated_run_is_cached():
+    """Test that an unchanged second run neither rebuilds nor rewrites."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, 'pom.xml')
+
+        generator = PomGenerator()
+        generator.generate(output_path=output_file)
+        assert generator.status == "written", "First run should write"
+        assert os.path.exists(sidecar_path(output_file)), "Should write sidecar"
+        mtime = os.stat(output_file).st_mtime_ns
+
+        generator = PomGenerator()
+        generator.generate(output_path=output_file)
+        assert generator.status == "cached", "Second run should hit the cache"
+        assert os.stat(output_file).st_mtime_ns == mtime, "Should keep mtime"
+
+    print("✓ Cached regeneration test passed")
+
+
+def test_identical_output_not_rewritten():
+    """Test that changed inputs producing identical bytes keep the mtime."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        existing_file = os.path.join(tmpdir, 'existing.xml')
+        output_file = os.path.join(tmpdir, 'pom.xml')
+        with open(existing_file, 'w') as f:
+            f.write(EXISTING_POM)
+
+        PomGenerator(existing_pom=existing_file).generate(output_path=output_file)
+        mtime = os.stat(output_file).st_mtime_ns
+
+        # Whitespace-only edit changes the input fingerprint but not the output
+        with open(existing_file, 'w') as f:
+            f.write(EXISTING_POM + "\n\n")
+
+        generator = PomGenerator(existing_pom=existing_file)
+        generator.generate(output_path=output_file)
+        assert generator.status == "unchanged", "Should detect identical output"
+        assert os.stat(output_file).st_mtime_ns == mtime, "Should keep mtime"
+
+    print("✓ Identical output test passed")
+
+
+def test_modified_output_regenerated():
+    """Test that editing the generated file invalidates the cache."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, 'pom.xml')
+        PomGenerator().generate(output_path=output_file)
+
+        with open(output_file, 'a') as f:
+            f.write("<!-- edited -->\n")
+
+        generator = PomGenerator()
+        generator.generate(output_path=output_file)
+        assert generator.status == "written", "Should rewrite an edited output"
+        with open(output_file) as f:
+            assert "edited" not in f.read(), "Should restore generated content"
+
+    print("✓ Modified output test passed")
+
+
+def test_in_place_regeneration_converges():
+    """Test that regenerating a POM in place is cached from the second run on."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pom_file = os.path.join(tmpdir, 'pom.xml')
+        with open(pom_file, 'w') as f:
+            f.write(EXISTING_POM)
+
+        generator = PomGenerator(existing_pom=pom_file)
+        generator.generate(output_path=pom_file)
+        assert generator.status == "written"
+
+        generator = PomGenerator(existing_pom=pom_file)
+        generator.generate(output_path=pom_file)
+        assert generator.status == "cached", "In-place rerun should be cached"
+
+    print("✓ In-place regeneration test passed")
+
+
+def test_force_bypasses_cache():
+    """Test that disabling the cache always writes the file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = os.path.join(tmpdir, 'pom.xml')
+        PomGenerator().generate(output_path=output_file)
+
+        generator = PomGenerator(use_cache=False)
+        generator.generate(output_path=output_file)
+        assert generator.status == "written", "Should write without cache"
+
+    print("✓ Force regeneration test passed")
+
+
+def test_module_sidecars_in_project_state_dir():
+    """Test that module sidecars live in the reactor root's state directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        module_dir = os.path.join(tmpdir, 'core')
+        os.makedirs(module_dir)
+        for directory in (tmpdir, module_dir):
+            with open(os.path.join(directory, 'pom.xml'), 'w') as f:
+                f.write(EXISTING_POM)
+        # A sidecar left next to the POM by earlier versions is cleaned up
+        legacy = os.path.join(module_dir, '.pom.xml.jdevtools-cache')
+        open(legacy, 'w').close()
+
+        module_pom = os.path.join(module_dir, 'pom.xml')
+        PomGenerator(existing_pom=module_pom).generate(output_path=module_pom)
+
+        expected = os.path.join(tmpdir, '.jdevtools', 'pom-cache', 'core', 'pom.xml.json')
+        assert sidecar_path(module_pom) == expected
+        assert os.path.exists(expected), "Should write sidecar under .jdevtools"
+        assert os.listdir(module_dir) == ['pom.xml'], "Should leave no file next to the POM"
+
+    print("✓ Project state directory test passed")
+
+
+if __name__ == '__main__':
+    print("Running pom_cache tests...\n")
+
+    try:
+        test_repeated_run_is_cached()
+        test_identical_output_not_rewritten()
+        test_modified_output_regenerated()
+        test_in_place_regeneration_converges()
+        test_force_bypasses_cache()
+        test_module_sidecars_in_project_state_dir()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,176 @@
+"""Tests for pom_merge module."""
+
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.jcompile_dispatch import PomGenerator
+from jdevtools.pom_merge import PomMerger
+
+NS = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+
+EXISTING_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <parent>
+        <groupId>com.test</groupId>
+        <artifactId>parent</artifactId>
+        <version>1.0</version>
+    </parent>
+    <artifactId>child</artifactId>
+    <packaging>jar</packaging>
+    <properties>
+        <mainClass>com.test.Main</mainClass>
+        <maven.compiler.source>17</maven.compiler.source>
+    </properties>
+    <dependencyManagement>
+        <dependencies>
+            <dependency>
+                <groupId>org.test</groupId>
+                <artifactId>bom</artifactId>
+                <version>2.0</version>
+                <type>pom</type>
+                <scope>import</scope>
+            </dependency>
+        </dependencies>
+    </dependencyManagement>
+    <dependencies>
+        <dependency>
+            <groupId>org.slf4j</groupId>
+            <artifactId>slf4j-api</artifactId>
+            <version>2.0.0</version>
+        </dependency>
+        <dependency>
+            <groupId>org.slf4j</groupId>
+            <artifactId>slf4j-api</artifactId>
+            <version>2.0.0</version>
+            <classifier>sources</classifier>
+        </dependency>
+    </dependencies>
+    <build>
+        <finalName>child-app</finalName>
+        <plugins>
+            <plugin>
+                <artifactId>maven-shade-plugin</artifactId>
+                <version>3.5.0</version>
+            </plugin>
+        </plugins>
+    </build>
+    <profiles>
+        <profile>
+            <id>ci</id>
+        </profile>
+    </profiles>
+</project>"""
+
+
+def _generate(tmpdir, existing_content, name):
+    existing_file = os.path.join(tmpdir, name + '-existing.xml')
+    output_file = os.path.join(tmpdir, name + '.xml')
+    with open(existing_file, 'w') as f:
+        f.write(existing_content)
+    PomGenerator(existing_pom=existing_file).generate(output_path=output_file)
+    with open(output_file) as f:
+        return f.read()
+
+
+def test_regeneration_is_idempotent():
+    """Test that merging a generated POM into itself changes nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = _generate(tmpdir, EXISTING_POM, 'first')
+        second = _generate(tmpdir, first, 'second')
+        third = _generate(tmpdir, second, 'third')
+
+        assert first == second == third, "Regeneration should be idempotent"
+        assert first.count('<artifactId>slf4j-api</artifactId>') == 2, \
+            "Dependencies should not be duplicated"
+
+    print("✓ Idempotent regeneration test passed")
+
+
+def test_sections_preserved():
+    """Test that plugins, dependency management, profiles and other sections survive."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        content = _generate(tmpdir, EXISTING_POM, 'merged')
+        root = ET.fromstring(content.split('\n', 1)[1])
+
+        assert root.find('mvn:parent/mvn:artifactId', NS).text == 'parent', \
+            "Should keep parent"
+        assert root.find('mvn:packaging', NS).text == 'jar', "Should keep packaging"
+        assert root.find('mvn:dependencyManagement/mvn:dependencies/mvn:dependency',
+                         NS) is not None, "Should keep dependencyManagement"
+        assert root.find('mvn:build/mvn:finalName', NS).text == 'child-app', \
+            "Should keep build settings"
+        plugin_ids = [p.text for p in root.findall(
+            'mvn:build/mvn:plugins/mvn:plugin/mvn:artifactId', NS)]
+        assert 'maven-shade-plugin' in plugin_ids, "Should keep existing plugins"
+        assert 'native-maven-plugin' in plugin_ids, "Should add native-maven-plugin"
+        profile_ids = [p.text for p in root.findall(
+            'mvn:profiles/mvn:profile/mvn:id', NS)]
+        assert 'ci' in profile_ids, "Should keep existing profiles"
+
+        # Generated properties win, existing-only properties are appended
+        props = root.find('mvn:properties', NS)
+        assert props.find('mvn:maven.compiler.source', NS).text == '11'
+        assert props.find('mvn:mainClass', NS).text == 'com.test.Main'
+
+        # Sections appear in canonical POM order
+        order = [child.tag.split('}')[1] for child in root]
+        assert order.index('parent') < order.index('artifactId')
+        assert order.index('dependencies') < order.index('build') < order.index('profiles')
+
+    print("✓ Section preservation test passed")
+
+
+def test_dependency_key():
+    """Test that dependency identity follows Maven coordinates."""
+    merger = PomMerger()
+    dep = ET.fromstring(
+        '<dependency xmlns="http://maven.apache.org/POM/4.0.0">'
+        '<groupId>g</groupId><artifactId>a</artifactId><version>1</version>'
+        '</dependency>')
+    assert merger.dependency_key(dep) == ('g', 'a', 'jar', ''), \
+        "Type should default to jar and classifier to empty"
+
+    print("✓ Dependency key test passed")
+
+
+def test_namespaceless_existing_pom():
+    """Test merging a POM that does not declare the Maven namespace."""
+    existing = """<project>
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.plain</groupId>
+    <artifactId>plain-app</artifactId>
+    <version>0.1</version>
+    <properties><mainClass>com.plain.Main</mainClass></properties>
+</project>"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        content = _generate(tmpdir, existing, 'plain')
+
+        assert 'plain-app' in content, "Should merge artifactId"
+        assert 'com.plain.Main' in content, "Should merge properties"
+        assert 'xmlns=""' not in content, "Should not reset the default namespace"
+
+    print("✓ Namespace-less POM test passed")
+
+
+if __name__ == '__main__':
+    print("Running pom_merge tests...\n")
+
+    try:
+        test_regeneration_is_idempotent()
+        test_sections_preserved()
+        test_dependency_key()
+        test_namespaceless_existing_pom()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
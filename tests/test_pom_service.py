@@ -0,0 +1,250 @@
+"""Tests for pom_service module."""
+
+import http.client
+import os
+import socket
+import sys
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.pom_generator import PomGenerator
+from jdevtools.pom_service import MAX_BODY_BYTES, MAX_GENERATORS, PomHTTPServer, PomService
+
+NS = {'mvn': 'http://maven.apache.org/POM/4.0.0'}
+
+EXISTING = b"""<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>service-%d</artifactId>
+    <version>1.0</version>
+</project>"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP client connection over a Unix socket."""
+
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def _post(connection, url, body=b''):
+    connection.request('POST', url, body=body)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def test_http_generation_and_errors():
+    """Test generation, settings and error replies over HTTP."""
+    server = PomHTTPServer(('127.0.0.1', 0))
+    _serve(server)
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+        connection.request('GET', '/health')
+        assert connection.getresponse().read() == b'ok\n'
+
+        status, body = _post(connection, '/pom?native_profile=release', EXISTING % 1)
+        assert status == 200, body
+        assert body == PomGenerator(native_profile='release').render_bytes(EXISTING % 1)
+        root = ET.fromstring(body)
+        assert root.find('mvn:artifactId', NS).text == 'service-1'
+        assert root.find('mvn:properties/mvn:native.optimization', NS).text == '3'
+
+        # Errors are reported without closing the kept-alive connection
+        assert _post(connection, '/pom', b'<project')[0] == 400
+        assert _post(connection, '/pom?native_profile=fast')[0] == 400
+        assert _post(connection, '/pom?bogus=1')[0] == 400
+        assert _post(connection, '/other')[0] == 404
+        assert _post(connection, '/pom')[0] == 200, "An empty body generates a fresh POM"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✓ HTTP generation test passed")
+
+
+def test_invalid_content_length():
+    """Test that malformed and negative Content-Length headers are rejected."""
+    server = PomHTTPServer(('127.0.0.1', 0))
+    _serve(server)
+    try:
+        for length in ('abc', '-1', str(MAX_BODY_BYTES + 1)):
+            connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1],
+                                                    timeout=5)
+            connection.putrequest('POST', '/pom')
+            connection.putheader('Content-Length', length)
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == (413 if length[0].isdigit() else 400), \
+                (length, response.status)
+            assert response.getheader('Connection') == 'close', length
+            connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("✓ Invalid Content-Length test passed")
+
+
+def test_generator_settings_validated_and_bounded():
+    """Test that generator settings are validated and warm generators are bounded."""
+    service = PomService()
+    for query in ({'native_memory': ['lots']}, {'native_memory': ['8']},
+                  {'native_threads': ['-2']}, {'native_threads': ['100000']}):
+        try:
+            service.generator(query)
+            assert False, "%s should be rejected" % query
+        except ValueError:
+            pass
+
+    first = service.generator({'native_memory': ['8G']})
+    assert service.generator({'native_memory': ['8g']}) is first, "Sizes are case-insensitive"
+    for threads in range(1, MAX_GENERATORS + 5):
+        service.generator({'native_threads': [str(threads)]})
+        service.generator({'native_memory': ['8g']})
+    assert len(service._generators) == MAX_GENERATORS
+    assert service.generator({'native_memory': ['8g']}) is first, \
+        "Recently used generators should stay warm"
+
+    print("✓ Generator settings test passed")
+
+
+def test_concurrent_requests():
+    """Test that concurrent requests each get their own merged POM."""
+    server = PomHTTPServer(('127.0.0.1', 0))
+    _serve(server)
+    results = {}
+
+    def client(i):
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+        for j in range(5):
+            status, body = _post(connection, '/pom', EXISTING % (i * 10 + j))
+            results[i * 10 + j] = (status, ET.fromstring(body).find('mvn:artifactId', NS).text)
+        connection.close()
+
+    try:
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(results) == 40
+    assert all(result == (200, 'service-%d' % n) for n, result in results.items()), results
+
+    print("✓ Concurrent requests test passed")
+
+
+def test_path_confined_to_roots():
+    """Test that path parameters cannot read files outside the project roots."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, 'project')
+        os.makedirs(root)
+        inside = os.path.join(root, 'pom.xml')
+        outside = os.path.join(tmpdir, 'secret.xml')
+        for path, n in ((inside, 1), (outside, 2)):
+            with open(path, 'wb') as f:
+                f.write(EXISTING % n)
+        link = os.path.join(root, 'link.xml')
+        os.symlink(outside, link)
+
+        server = PomHTTPServer(('127.0.0.1', 0), PomService([root]))
+        _serve(server)
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+            status, body = _post(connection, '/pom?path=%s' % inside)
+            assert status == 200 and b'service-1' in body, body
+            for path in (outside, os.path.join(root, '..', 'secret.xml'), link, '/etc/passwd'):
+                status, body = _post(connection, '/pom?path=%s' % path)
+                assert status == 400 and b'outside the project roots' in body, (path, body)
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    assert PomService().roots == []
+    try:
+        PomService().generate({'path': [inside]}, b'')
+        assert False, "Without roots no path should be accepted"
+    except ValueError:
+        pass
+
+    print("✓ Path confinement test passed")
+
+
+def test_unix_socket():
+    """Test serving over a Unix socket."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("⊘ Skipping Unix socket test on this platform")
+        return
+
+    from jdevtools.pom_service import PomUnixServer
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'jpom.sock')
+        existing_path = os.path.join(tmpdir, 'pom.xml')
+        with open(existing_path, 'wb') as f:
+            f.write(EXISTING % 7)
+        server = PomUnixServer(path, PomService([tmpdir]))
+        _serve(server)
+        try:
+            status, body = _post(UnixHTTPConnection(path), '/pom?path=%s' % existing_path)
+            assert status == 200, body
+            assert b'<artifactId>service-7</artifactId>' in body
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert not os.path.exists(path), "The socket file should be removed"
+
+        # A stale socket is replaced, any other file is left alone
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        PomUnixServer(path, PomService()).server_close()
+        try:
+            PomUnixServer(existing_path, PomService())
+            assert False, "A regular file should not be replaced by the socket"
+        except FileExistsError:
+            pass
+        with open(existing_path, 'rb') as f:
+            assert f.read() == EXISTING % 7
+
+    print("✓ Unix socket test passed")
+
+
+if __name__ == '__main__':
+    print("Running pom_service tests...\n")
+
+    try:
+        test_http_generation_and_errors()
+        test_invalid_content_length()
+        test_generator_settings_validated_and_bounded()
+        test_concurrent_requests()
+        test_path_confined_to_roots()
+        test_unix_socket()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,89 @@
+"""Tests for pom_stamp module."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.jcompile_dispatch import main
+from jdevtools.pom_stamp import is_noop, plain_options, stamp_path
+
+EXISTING_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>stamped-app</artifactId>
+    <version>1.0</version>
+</project>"""
+
+
+def test_plain_options():
+    """Test that only runs writing nothing but the POM qualify."""
+    assert plain_options([]) == {}
+    assert plain_options(['--existing', 'a.xml', '--output=b.xml', '--jlink']) == {
+        '--existing': 'a.xml', '--output': 'b.xml', '--jlink': True}
+    for argv in (['--force'], ['--jmh'], ['--batch', '.'], ['--maven-config'],
+                 ['--resolve-parents'], ['--out', 'b.xml'], ['--output'],
+                 ['--output', '--version'], ['--jlink=yes'], ['pom.xml'], ['--help']):
+        assert plain_options(argv) is None, argv
+
+    print("✓ Plain options test passed")
+
+
+def test_repeated_run_uses_stamp():
+    """Test that a repeated run is answered from the stamp until an input changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        existing = os.path.join(tmpdir, 'existing.xml')
+        output = os.path.join(tmpdir, 'pom.xml')
+        with open(existing, 'w') as f:
+            f.write(EXISTING_POM)
+        argv = ['--existing', existing, '--output', output]
+
+        assert is_noop(argv) is None, "No stamp before the first run"
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert main(argv) == 0
+        assert os.path.exists(stamp_path(output)), "Should record the stamp"
+        assert is_noop(argv) == output
+        assert is_noop(argv + ['--appcds']) is None, "A different command is not covered"
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert main(argv) == 0
+        assert out.getvalue().startswith(f"POM file up to date: {output}\n")
+
+        with open(existing, 'a') as f:
+            f.write("\n")
+        assert is_noop(argv) is None, "Editing the existing POM invalidates the stamp"
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert main(argv) == 0
+        assert is_noop(argv) == output
+
+        with open(output, 'a') as f:
+            f.write("<!-- edited -->\n")
+        assert is_noop(argv) is None, "Editing the output invalidates the stamp"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert main(argv + ['--force']) == 0
+        assert is_noop(argv) is None, "A forced rewrite invalidates the stamp"
+
+    print("✓ Repeated run stamp test passed")
+
+
+if __name__ == '__main__':
+    print("Running pom_stamp tests...\n")
+
+    try:
+        test_plain_options()
+        test_repeated_run_uses_stamp()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
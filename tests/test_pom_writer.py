@@ -0,0 +1,99 @@
+"""Tests for pom_writer module."""
+
+import io
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.jcompile_dispatch import PomGenerator
+from jdevtools.pom_writer import POM_NAMESPACE, write_pom
+
+
+def _serialize(root):
+    buffer = io.StringIO()
+    write_pom(root, buffer)
+    return buffer.getvalue()
+
+
+def test_indented_layout():
+    """Test that elements are indented and leaf text stays inline."""
+    root = ET.Element("{%s}project" % POM_NAMESPACE)
+    ET.SubElement(root, "{%s}modelVersion" % POM_NAMESPACE).text = "4.0.0"
+    ET.SubElement(root, "{%s}dependencies" % POM_NAMESPACE)
+
+    assert _serialize(root) == (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">\n'
+        '  <modelVersion>4.0.0</modelVersion>\n'
+        '  <dependencies/>\n'
+        '</project>\n'
+    ), "Should write one element per line with two-space indentation"
+
+    print("✓ Indented layout test passed")
+
+
+def test_escaping():
+    """Test that text and attribute values are escaped."""
+    root = ET.Element("{%s}project" % POM_NAMESPACE)
+    name = ET.SubElement(root, "{%s}name" % POM_NAMESPACE)
+    name.text = "A & B <C>"
+    name.set("combine.self", 'say "hi"')
+
+    content = _serialize(root)
+    assert "A &amp; B &lt;C&gt;" in content, "Should escape element text"
+    assert 'combine.self="say &quot;hi&quot;"' in content, "Should escape attributes"
+    ET.fromstring(content.split("\n", 1)[1])
+
+    print("✓ Escaping test passed")
+
+
+def test_existing_whitespace_dropped():
+    """Test that indentation carried over from a parsed POM is not repeated."""
+    source = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+        <properties>
+            <a>1</a>
+        </properties>
+    </project>"""
+    content = _serialize(ET.fromstring(source))
+
+    assert "  <properties>\n    <a>1</a>\n  </properties>\n" in content, \
+        "Should re-indent parsed elements"
+    assert "\n\n" not in content, "Should not emit blank lines"
+
+    print("✓ Existing whitespace test passed")
+
+
+def test_output_is_deterministic():
+    """Test that repeated generation produces byte-identical files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = os.path.join(tmpdir, 'first.xml')
+        second = os.path.join(tmpdir, 'second.xml')
+        PomGenerator().generate(output_path=first)
+        PomGenerator().generate(output_path=second)
+
+        with open(first, 'rb') as f1, open(second, 'rb') as f2:
+            assert f1.read() == f2.read(), "Output should be byte-identical"
+
+    print("✓ Deterministic output test passed")
+
+
+if __name__ == '__main__':
+    print("Running pom_writer tests...\n")
+
+    try:
+        test_indented_layout()
+        test_escaping()
+        test_existing_whitespace_dropped()
+        test_output_is_deterministic()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,125 @@
+"""Tests for reactor module."""
+
+import io
+import os
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.reactor import discover_poms, read_modules, run_batch
+
+
+def _write_pom(directory, artifact_id, modules=(), broken=False):
+    os.makedirs(directory, exist_ok=True)
+    module_xml = "".join("<module>%s</module>" % m for m in modules)
+    content = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>%s</artifactId>
+    <version>1.0</version>
+    <modules>%s</modules>
+</project>""" % (artifact_id, module_xml)
+    if broken:
+        content = content.replace("</project>", "")
+    with open(os.path.join(directory, 'pom.xml'), 'w') as f:
+        f.write(content)
+
+
+def _make_reactor(tmpdir):
+    _write_pom(tmpdir, 'root', modules=['a', 'b', 'missing'])
+    _write_pom(os.path.join(tmpdir, 'a'), 'a')
+    _write_pom(os.path.join(tmpdir, 'b'), 'b', modules=['c', '../a'])
+    _write_pom(os.path.join(tmpdir, 'b', 'c'), 'c', broken=True)
+
+
+def test_read_modules():
+    """Test reading module entries from a POM."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_reactor(tmpdir)
+        assert read_modules(os.path.join(tmpdir, 'pom.xml')) == ['a', 'b', 'missing']
+
+    print("✓ Read modules test passed")
+
+
+def test_discover_poms():
+    """Test that discovery follows nested modules and visits each POM once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_reactor(tmpdir)
+        found = [os.path.relpath(p, tmpdir) for p in discover_poms(tmpdir)]
+
+        assert found == ['pom.xml', os.path.join('a', 'pom.xml'),
+                         os.path.join('b', 'pom.xml'),
+                         os.path.join('b', 'c', 'pom.xml')], found
+
+    print("✓ Module discovery test passed")
+
+
+def test_batch_isolates_failures():
+    """Test that a broken module fails alone and the rest are generated."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _make_reactor(tmpdir)
+        out = io.StringIO()
+        result = run_batch(tmpdir, jobs=2, out=out)
+
+        assert result.total == 4, "Should process every discovered module"
+        assert result.counts["written"] == 3, "Should regenerate healthy modules"
+        assert result.counts["failed"] == 1, "Should report the broken module"
+        assert "FAILED" in out.getvalue() and "c" in result.failures[0][0]
+
+        with open(os.path.join(tmpdir, 'b', 'pom.xml')) as f:
+            content = f.read()
+        assert 'native-maven-plugin' in content, "Should add generated plugins"
+        assert '<module>c</module>' in content, "Should keep module list"
+
+        result = run_batch(tmpdir, jobs=2, out=io.StringIO())
+        assert result.counts["cached"] == 3, "Unchanged modules should be cached"
+
+    print("✓ Batch failure isolation test passed")
+
+
+def test_batch_keeps_inherited_coordinates():
+    """Test that modules taking groupId and version from their parent keep doing so."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_pom(tmpdir, 'root', modules=['child'])
+        os.makedirs(os.path.join(tmpdir, 'child'))
+        with open(os.path.join(tmpdir, 'child', 'pom.xml'), 'w') as f:
+            f.write("""<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <parent><groupId>com.test</groupId><artifactId>root</artifactId><version>1.0</version></parent>
+    <artifactId>child</artifactId>
+</project>""")
+
+        for options in ({}, {'resolve_parents': True}):
+            result = run_batch(tmpdir, jobs=1, generator_options=options, out=io.StringIO())
+            assert result.counts["failed"] == 0, result.failures
+            with open(os.path.join(tmpdir, 'child', 'pom.xml')) as f:
+                content = f.read()
+            assert 'com.example' not in content and '1.0-SNAPSHOT' not in content, \
+                "Template coordinates should not replace inherited ones (%s)" % options
+            assert '<artifactId>child</artifactId>' in content
+        assert '<properties/>' not in content, "Emptied properties should be dropped"
+        with open(os.path.join(tmpdir, 'pom.xml')) as f:
+            assert '<groupId>com.test</groupId>' in f.read(), "Declared coordinates stay"
+
+    print("✓ Inherited coordinates test passed")
+
+
+if __name__ == '__main__':
+    print("Running reactor tests...\n")
+
+    try:
+        test_read_modules()
+        test_discover_poms()
+        test_batch_isolates_failures()
+        test_batch_keeps_inherited_coordinates()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,170 @@
+"""Tests for shard module."""
+
+import contextlib
+import io
+import json
+import os
+import struct
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.shard import assign_shards, main, parse_shard, record_durations
+
+REPORT = """<?xml version="1.0" encoding="UTF-8"?>
+<testsuite xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" name="%s" time="%s" tests="1">
+  <properties><property name="java.version" value="17"/></properties>
+  <testcase name="works" classname="%s" time="%s"/>
+</testsuite>
+"""
+
+POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>app</artifactId>
+    <version>1.0</version>
+</project>"""
+
+
+def _class_bytes(name):
+    """Build a minimal class file without references."""
+    pool = []
+    for text in (name, 'java/lang/Object'):
+        data = text.encode('utf-8')
+        pool.append(b'\x01' + struct.pack('>H', len(data)) + data)
+        pool.append(b'\x07' + struct.pack('>H', len(pool)))
+    return (b'\xca\xfe\xba\xbe' + struct.pack('>HHH', 0, 52, len(pool) + 1) + b''.join(pool) +
+            struct.pack('>HHHHHHH', 0x21, 2, 4, 0, 0, 0, 0))
+
+
+def _write_report(module_dir, name, seconds):
+    reports = os.path.join(module_dir, 'target', 'surefire-reports')
+    os.makedirs(reports, exist_ok=True)
+    with open(os.path.join(reports, 'TEST-%s.xml' % name), 'w') as f:
+        f.write(REPORT % (name, seconds, name, seconds))
+
+
+def test_parse_shard():
+    """Test shard specification parsing."""
+    assert parse_shard('2/4') == (2, 4)
+    for bad in ('0/4', '5/4', '1', 'a/b', '1/0'):
+        try:
+            parse_shard(bad)
+            assert False, "Should reject %s" % bad
+        except ValueError:
+            pass
+
+    print("✓ Shard parsing test passed")
+
+
+def test_assign_shards_balances_durations():
+    """Test that longest-first assignment evens out shard totals."""
+    durations = {'A': 10.0, 'B': 7.0, 'C': 6.0, 'D': 5.0, 'E': 4.0, 'F': 3.0}
+    shards = assign_shards(list(durations) + ['New'], durations, 3)
+
+    assert sorted(t for shard in shards for t in shard) == sorted(list(durations) + ['New']), \
+        "Every test should be in exactly one shard"
+    totals = [sum(durations.get(t, 5.0) for t in shard) for shard in shards]
+    assert max(totals) - min(totals) <= 4.0, "Shards should finish close together: %s" % totals
+    assert shards == assign_shards(list(reversed(list(durations))) + ['New'], durations, 3), \
+        "Assignment should not depend on input order"
+
+    print("✓ Shard balancing test passed")
+
+
+def test_record_durations_keeps_history():
+    """Test that report durations are merged into the persisted history."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        module_dir = os.path.join(tmpdir, 'core')
+        _write_report(module_dir, 'com.x.FastTest', '0.5')
+        _write_report(module_dir, 'com.x.SlowTest', '1,234.5')
+        path = os.path.join(tmpdir, '.jdevtools', 'test-durations.json')
+
+        durations = record_durations(path, [module_dir])
+        assert durations == {'com.x.FastTest': 0.5, 'com.x.SlowTest': 1234.5}, durations
+
+        # After mvn clean the history is still there
+        os.remove(os.path.join(module_dir, 'target', 'surefire-reports',
+                               'TEST-com.x.SlowTest.xml'))
+        assert record_durations(path, [module_dir])['com.x.SlowTest'] == 1234.5
+
+        # Durations recorded by another shard are merged, local reports win
+        other = os.path.join(tmpdir, 'other.json')
+        with open(other, 'w') as f:
+            json.dump({'com.x.OtherTest': 3.0, 'com.x.FastTest': 9.0}, f)
+        durations = record_durations(path, [module_dir], merge=[other])
+        assert durations == {'com.x.FastTest': 0.5, 'com.x.SlowTest': 1234.5,
+                             'com.x.OtherTest': 3.0}, durations
+
+    print("✓ Duration history test passed")
+
+
+def test_shards_ignore_local_reports():
+    """Test that shards with different local reports still partition the same tests."""
+    tests = ['com.x.%sTest' % name for name in ('A', 'B', 'C', 'D', 'E', 'F')]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        shared = os.path.join(tmpdir, 'durations.json')
+        with open(shared, 'w') as f:
+            json.dump({'com.x.ATest': 10.0, 'com.x.BTest': 7.0, 'com.x.CTest': 6.0}, f)
+        with open(shared) as f:
+            shared_content = f.read()
+
+        # Two CI machines, each left with reports of the shard it ran last time
+        checkouts = []
+        for machine, seconds in (('one', '500'), ('two', '0.01')):
+            project = os.path.join(tmpdir, machine)
+            os.makedirs(project)
+            with open(os.path.join(project, 'pom.xml'), 'w') as f:
+                f.write(POM)
+            classes = os.path.join(project, 'target', 'test-classes', 'com', 'x')
+            os.makedirs(classes)
+            for test in tests:
+                with open(os.path.join(classes, test.split('.')[-1] + '.class'), 'wb') as f:
+                    f.write(_class_bytes(test.replace('.', '/')))
+            _write_report(project, 'com.x.DTest', seconds)
+            checkouts.append(project)
+
+        shards = []
+        for index, project in enumerate(checkouts, 1):
+            out, err = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                assert main(['--shard', '%d/2' % index, '--durations', shared,
+                             '--project', project]) == 0, err.getvalue()
+            shards.append(out.getvalue().split()[0])
+        selected = [set(shard.split('=', 1)[1].split(',')) for shard in shards]
+        assert not selected[0] & selected[1], "No test class should run on both shards"
+        assert selected[0] | selected[1] == set(tests), \
+            "Every test class should run on exactly one shard: %s" % selected
+        with open(shared) as f:
+            assert f.read() == shared_content, "Sharding should not modify the durations file"
+
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            try:
+                main(['--shard', '1/2', '--project', checkouts[0]])
+                assert False, "Sharding without a shared durations file should be refused"
+            except SystemExit as e:
+                assert e.code == 2
+        assert '--durations' in err.getvalue()
+
+    print("✓ Shared durations test passed")
+
+
+if __name__ == '__main__':
+    print("Running shard tests...\n")
+
+    try:
+        test_parse_shard()
+        test_assign_shards_balances_durations()
+        test_record_durations_keeps_history()
+        test_shards_ignore_local_reports()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,130 @@
+"""Tests for surefire_db module."""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.surefire_db import SurefireHistory, main, parse_report
+
+
+def _report(suite, cases, system_out=""):
+    """Build a surefire report from (name, time, child_xml) test cases."""
+    body = "".join('<testcase name="%s" classname="%s" time="%s">%s</testcase>'
+                   % (name, suite, time, child) for name, time, child in cases)
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<testsuite name="%s" tests="%d">'
+            '<properties><property name="a" value="b"/></properties>%s'
+            '<system-out><![CDATA[%s]]></system-out></testsuite>'
+            % (suite, len(cases), body, system_out))
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    return path
+
+
+def test_parse_report_statuses():
+    """Test outcome detection and parsing of a report larger than one chunk."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write(os.path.join(tmpdir, 'TEST-com.x.ATest.xml'), _report('com.x.ATest', [
+            ('ok', '0.5', ''),
+            ('bad', '1,200.5', '<failure message="boom">trace</failure>'),
+            ('skip', '0', '<skipped/>'),
+            ('rerun', '0.2', '<flakyFailure message="once"><stackTrace>t</stackTrace></flakyFailure>'),
+        ], system_out='x' * (3 * 1024 * 1024)))
+        sha, results = parse_report(path)
+
+        assert len(sha) == 64
+        assert results == [
+            ('com.x.ATest', 'ok', 0.5, 'passed'),
+            ('com.x.ATest', 'bad', 1200.5, 'failed'),
+            ('com.x.ATest', 'skip', 0.0, 'skipped'),
+            ('com.x.ATest', 'rerun', 0.2, 'flaky'),
+        ], results
+
+    print("✓ Report parsing test passed")
+
+
+def test_ingest_is_idempotent():
+    """Test that re-ingesting the same reports adds nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _write(os.path.join(tmpdir, 'TEST-com.x.ATest.xml'),
+                      _report('com.x.ATest', [('ok', '0.5', '')]))
+        history = SurefireHistory(os.path.join(tmpdir, 'history.db'))
+        try:
+            assert history.ingest([path]) == (1, 1)
+            assert history.ingest([path]) == (0, 0), "Unchanged file should be skipped"
+            os.utime(path, ns=(1, 1))
+            assert history.ingest([path]) == (0, 0), "Same content should be skipped"
+            runs = history.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            assert runs == 1, "Runs without new reports should not be recorded"
+        finally:
+            history.close()
+
+    print("✓ Idempotent ingestion test passed")
+
+
+def test_queries_across_runs():
+    """Test the slowest, slowing and flaky queries."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        history = SurefireHistory(os.path.join(tmpdir, 'history.db'))
+        try:
+            for run, (grow, flip) in enumerate([(1.0, ''), (1.5, '<error/>'),
+                                                (2.0, ''), (2.6, '')]):
+                path = _write(os.path.join(tmpdir, str(run), 'TEST-com.x.ATest.xml'),
+                              _report('com.x.ATest', [('grows', grow, ''),
+                                                      ('steady', '3.0', ''),
+                                                      ('flips', '0.1', flip)]))
+                history.ingest([path])
+
+            slowest = history.slowest(limit=1)
+            assert slowest[0][:2] == ('com.x.ATest', 'steady')
+            slowing = history.slowing()
+            assert [row[1] for row in slowing] == ['grows'], slowing
+            assert slowing[0][2:4] == (1.0, 2.6)
+            flaky = history.flaky()
+            assert flaky == [('com.x.ATest', 'flips', 3, 1, 0)], flaky
+        finally:
+            history.close()
+
+    print("✓ History queries test passed")
+
+
+def test_cli_ingests_project_reports():
+    """Test the ingest and query commands on a project layout."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write(os.path.join(tmpdir, 'target', 'surefire-reports', 'TEST-com.x.ATest.xml'),
+               _report('com.x.ATest', [('ok', '0.5', '')]))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert main(['--project', tmpdir, 'ingest']) == 0
+            assert main(['--project', tmpdir, 'slowest']) == 0
+        assert 'Recorded 1 test result(s) from 1 new report(s)' in out.getvalue()
+        assert 'com.x.ATest.ok  0.500s' in out.getvalue()
+        assert os.path.isfile(os.path.join(tmpdir, '.jdevtools', 'test-history.db'))
+
+    print("✓ History CLI test passed")
+
+
+if __name__ == '__main__':
+    print("Running surefire_db tests...\n")
+
+    try:
+        test_parse_report_statuses()
+        test_ingest_is_idempotent()
+        test_queries_across_runs()
+        test_cli_ingests_project_reports()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)
@@ -0,0 +1,339 @@
+"""Tests for watch module."""
+
+import contextlib
+import io
+import os
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from jdevtools.class_index import ClassIndex
+from jdevtools.watch import (IncrementalCompiler, InotifyWatcher, JavacServer, PollingWatcher,
+                             main, wait_for_changes)
+
+POM = """<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <groupId>com.test</groupId>
+    <artifactId>app</artifactId>
+    <version>1.0</version>
+    <properties>
+        <maven.compiler.release>17</maven.compiler.release>
+        <project.build.sourceEncoding>UTF-8</project.build.sourceEncoding>
+    </properties>
+    %s
+</project>"""
+
+# Answers requests like the real server; sources containing "Broken" fail
+FAKE_JAVA = """#!%s
+import sys
+with open(sys.argv[1] + '.starts', 'a') as f:
+    f.write('started\\n')
+request = []
+for line in sys.stdin:
+    line = line.rstrip('\\n')
+    if line:
+        request.append(line)
+        continue
+    broken = [arg for arg in request if arg.endswith('.java') and 'Broken' in arg]
+    for source in broken:
+        print('%%s:1: error: cannot find symbol' %% source)
+    print('@@jdevtools-javac exit=%%d' %% (1 if broken else 0), flush=True)
+    request = []
+""" % sys.executable
+
+
+def _class_bytes(name, refs=(), constant=False):
+    """Build a minimal class file referencing other classes, optionally with a constant."""
+    pool = []
+    for text in (name, 'java/lang/Object') + tuple(refs):
+        data = text.encode('utf-8')
+        pool.append(b'\x01' + struct.pack('>H', len(data)) + data)
+        pool.append(b'\x07' + struct.pack('>H', len(pool)))
+    fields = struct.pack('>H', 0)
+    if constant:
+        # static final int MAX = 7, with its ConstantValue attribute
+        for text in ('ConstantValue', 'MAX', 'I'):
+            pool.append(b'\x01' + struct.pack('>H', len(text)) + text.encode('utf-8'))
+        pool.append(b'\x03' + struct.pack('>i', 7))
+        count = len(pool)
+        fields = struct.pack('>HHHHHHIH', 1, 0x19, count - 2, count - 1, 1, count - 3, 2, count)
+    return (b'\xca\xfe\xba\xbe' + struct.pack('>HHH', 0, 52, len(pool) + 1) + b''.join(pool) +
+            struct.pack('>HHHH', 0x21, 2, 4, 0) + fields + struct.pack('>HH', 0, 0))
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
+
+
+def _make_project(tmpdir):
+    """Service <- Controller <- ControllerTest, Util is used by nobody."""
+    _write(os.path.join(tmpdir, 'pom.xml'), POM % '')
+    main_dir = os.path.join(tmpdir, 'src', 'main', 'java', 'com', 'x')
+    test_dir = os.path.join(tmpdir, 'src', 'test', 'java', 'com', 'x')
+    classes = os.path.join(tmpdir, 'target', 'classes', 'com', 'x')
+    test_classes = os.path.join(tmpdir, 'target', 'test-classes', 'com', 'x')
+    for directory, output, name, refs in (
+            (main_dir, classes, 'Service', ()),
+            (main_dir, classes, 'Controller', ('com/x/Service',)),
+            (main_dir, classes, 'Util', ()),
+            (test_dir, test_classes, 'ControllerTest', ('com/x/Controller',))):
+        _write(os.path.join(directory, name + '.java'), 'class %s {}' % name)
+        _write(os.path.join(output, name + '.class'), _class_bytes('com/x/' + name, refs))
+    _write(os.path.join(classes, 'Util$Inner.class'), _class_bytes('com/x/Util$Inner'))
+    _write(os.path.join(tmpdir, '.jdevtools', 'watch-classpath.txt'), '/repo/lib.jar')
+    return main_dir, test_dir
+
+
+class RecordingCompiler:
+    def __init__(self):
+        self.calls = []
+
+    def compile(self, options, sources):
+        self.calls.append((options, [os.path.basename(s) for s in sources]))
+        broken = []
+        for source in sources:
+            with open(source) as f:
+                if 'error' in f.read():
+                    broken.append(source)
+        return not broken, ''.join('%s:1: error\n' % source for source in broken)
+
+
+def _burst(paths, delay=0.05):
+    """Write files shortly after the watcher started waiting."""
+    def write():
+        for path in paths:
+            _write(path, 'class X {}')
+    timer = threading.Timer(delay, write)
+    timer.start()
+    return timer
+
+
+def test_watchers_debounce_bursts():
+    """Test that both watchers report a burst of changes as one set."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = os.path.join(tmpdir, 'src', 'main', 'java')
+        os.makedirs(os.path.join(root, 'com'))
+        watchers = [PollingWatcher([root], interval=0.02)]
+        if sys.platform.startswith('linux'):
+            watchers.append(InotifyWatcher([root]))
+        for watcher in watchers:
+            created = [os.path.join(root, 'com', 'A.java'), os.path.join(root, 'com', 'B.java'),
+                       os.path.join(root, 'com', 'sub', 'C.java'),
+                       os.path.join(root, 'com', 'notes.txt')]
+            timer = _burst(created)
+            changed = wait_for_changes(watcher, debounce=0.3)
+            timer.join()
+            assert changed == set(created[:3]), (type(watcher).__name__, changed)
+            assert watcher.poll(0.05) == set(), "The burst should be fully consumed"
+
+            os.remove(created[0])
+            assert watcher.poll(1.0) == {created[0]}, "Deletions are changes, too"
+            for path in created:
+                if os.path.exists(path):
+                    os.remove(path)
+            watcher.poll(0.1)
+            watcher.close()
+
+    print("✓ Watcher debounce test passed")
+
+
+def test_incremental_compile_of_dependents():
+    """Test that a cycle compiles changed sources and dependents, main before test."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main_dir, test_dir = _make_project(tmpdir)
+        compiler = RecordingCompiler()
+        index = ClassIndex(tmpdir)
+        index.update()
+        builder = IncrementalCompiler(tmpdir, compiler=compiler, index=index,
+                                      out=io.StringIO())
+
+        cycle = builder.compile({os.path.join(main_dir, 'Service.java')})
+        assert cycle.ok and (cycle.changed, cycle.dependents) == (1, 2)
+        (main_options, main_sources), (test_options, test_sources) = compiler.calls
+        assert main_sources == ['Controller.java', 'Service.java']
+        assert test_sources == ['ControllerTest.java']
+        assert main_options[:5] == ['-g', '--release', '17', '-encoding', 'UTF-8']
+        classpath = test_options[test_options.index('-classpath') + 1].split(os.pathsep)
+        assert classpath == [os.path.join(tmpdir, 'target', 'test-classes'),
+                             os.path.join(tmpdir, 'target', 'classes'), '/repo/lib.jar']
+        assert 'source(s) compiled in' in cycle.summary()
+
+        compiler.calls = []
+        os.remove(os.path.join(main_dir, 'Util.java'))
+        cycle = builder.compile({os.path.join(main_dir, 'Util.java')})
+        assert cycle.deleted == 1 and compiler.calls == []
+        classes = os.listdir(os.path.join(tmpdir, 'target', 'classes', 'com', 'x'))
+        assert sorted(classes) == ['Controller.class', 'Service.class'], \
+            "Class files of the deleted source, nested ones included, should be removed"
+
+    print("✓ Incremental compile test passed")
+
+
+def test_failed_cycle_is_retried():
+    """Test that sources of a failed or skipped batch are compiled in the next cycle."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main_dir, _ = _make_project(tmpdir)
+        compiler = RecordingCompiler()
+        index = ClassIndex(tmpdir)
+        index.update()
+        builder = IncrementalCompiler(tmpdir, compiler=compiler, index=index,
+                                      out=io.StringIO())
+
+        util = os.path.join(main_dir, 'Util.java')
+        _write(util, 'class Util { error }')
+        cycle = builder.compile({os.path.join(main_dir, 'Service.java'), util})
+        assert not cycle.ok and 'Util.java:1: error' in cycle.diagnostics
+        assert len(compiler.calls) == 1, "Tests should not compile against a failed main batch"
+
+        compiler.calls = []
+        _write(util, 'class Util {}')
+        cycle = builder.compile({util})
+        assert cycle.ok and cycle.retried == 3, cycle.summary()
+        (_, main_sources), (_, test_sources) = compiler.calls
+        assert main_sources == ['Controller.java', 'Service.java', 'Util.java'], \
+            "Service and its dependent from the failed cycle should be compiled again"
+        assert test_sources == ['ControllerTest.java'], "The skipped test batch should run"
+        assert '3 retried' in cycle.summary()
+
+        compiler.calls = []
+        builder.compile({util})
+        assert compiler.calls == [(compiler.calls[0][0], ['Util.java'])], \
+            "Nothing should stay pending after a successful cycle"
+
+    print("✓ Failed cycle retry test passed")
+
+
+def test_constant_change_recompiles_module():
+    """Test that changing a class with inlined constants recompiles every source."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main_dir, _ = _make_project(tmpdir)
+        _write(os.path.join(tmpdir, 'target', 'classes', 'com', 'x', 'Util.class'),
+               _class_bytes('com/x/Util', constant=True))
+        compiler = RecordingCompiler()
+        index = ClassIndex(tmpdir)
+        index.update()
+        builder = IncrementalCompiler(tmpdir, compiler=compiler, index=index,
+                                      out=io.StringIO())
+
+        cycle = builder.compile({os.path.join(main_dir, 'Util.java')})
+        assert cycle.ok and cycle.full and (cycle.changed, cycle.dependents) == (1, 3)
+        (_, main_sources), (_, test_sources) = compiler.calls
+        assert main_sources == ['Controller.java', 'Service.java', 'Util.java'], \
+            "Users of the constant have no reference to Util and must be recompiled too"
+        assert test_sources == ['ControllerTest.java']
+        assert 'full rebuild' in cycle.summary()
+
+        compiler.calls = []
+        cycle = builder.compile({os.path.join(main_dir, 'Service.java')})
+        assert not cycle.full and compiler.calls[0][1] == ['Controller.java', 'Service.java']
+
+    print("✓ Constant change test passed")
+
+
+def test_javac_server_stays_warm():
+    """Test the compiler protocol and that one JVM serves every request."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        java = os.path.join(tmpdir, 'java')
+        _write(java, FAKE_JAVA)
+        os.chmod(java, os.stat(java).st_mode | stat.S_IEXEC)
+        server = JavacServer(os.path.join(tmpdir, 'server'), java=java)
+        try:
+            ok, diagnostics = server.compile(['-d', 'out'], ['A.java'])
+            assert ok and diagnostics == ''
+            ok, diagnostics = server.compile(['-d', 'out'], ['A.java', 'Broken.java'])
+            assert not ok and 'Broken.java:1: error' in diagnostics
+        finally:
+            server.close()
+        source = os.path.join(tmpdir, 'server', 'JavacServer.java')
+        with open(source) as f:
+            assert 'public class JavacServer' in f.read()
+        with open(source + '.starts') as f:
+            assert f.read().count('started') == 1, "The JVM should be started once"
+
+    print("✓ Javac server test passed")
+
+
+def test_cli_rejects_aggregator():
+    """Test that watch mode refuses multi-module aggregators."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write(os.path.join(tmpdir, 'pom.xml'), POM % '<modules><module>core</module></modules>')
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            assert main(['--project', tmpdir]) == 1
+        assert 'single module' in err.getvalue()
+
+    print("✓ Aggregator rejection test passed")
+
+
+def test_watch_module_of_reactor():
+    """Test that jcompile --watch watches a module with the reactor's wrapper."""
+    if os.name == 'nt':
+        print("⊘ Skipping watch script test on Windows")
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write(os.path.join(tmpdir, 'pom.xml'), POM % '<modules><module>core</module></modules>')
+        module = os.path.join(tmpdir, 'core')
+        _make_project(module)
+        repo_dir = os.path.join(os.path.dirname(__file__), '..')
+        for name in ('jcompile', 'mvnw'):
+            with open(os.path.join(repo_dir, name)) as f:
+                _write(os.path.join(tmpdir, name), f.read())
+        # The wrapper records where it ran; python3 prints the watch command
+        _write(os.path.join(tmpdir, 'mvnw'),
+               '#!/bin/sh\npwd > "%s"\n' % os.path.join(tmpdir, 'mvnw-ran'))
+        bin_dir = os.path.join(tmpdir, 'bin')
+        _write(os.path.join(bin_dir, 'python3'),
+               '#!/bin/sh\n[ "$2" = jdevtools.offline ] && exit 1\necho "$@"\n')
+        for path in (os.path.join(tmpdir, 'jcompile'), os.path.join(tmpdir, 'mvnw'),
+                     os.path.join(bin_dir, 'python3')):
+            os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+        env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ['PATH'])
+        for cwd, args in ((module, []), (tmpdir, ['--module', 'core'])):
+            output = subprocess.run([os.path.join(tmpdir, 'jcompile'), '--watch'] + args,
+                                    cwd=cwd, env=env, stdout=subprocess.PIPE,
+                                    universal_newlines=True).stdout
+            command = output.splitlines()[-1].split()
+            assert command[:2] == ['-m', 'jdevtools.watch'], output
+            project = os.path.join(cwd, command[command.index('--project') + 1])
+            assert os.path.realpath(project) == \
+                os.path.realpath(module), "The module, not the reactor root, is watched"
+            assert command[command.index('--mvn') + 1] == os.path.join(tmpdir, 'mvnw')
+
+        builder = IncrementalCompiler(module, compiler=RecordingCompiler(), out=io.StringIO(),
+                                      mvn=os.path.join(tmpdir, 'mvnw'))
+        builder.initial_build()
+        with open(os.path.join(tmpdir, 'mvnw-ran')) as f:
+            assert os.path.realpath(f.read().strip()) == os.path.realpath(module), \
+                "The reactor's wrapper should build the module"
+
+    print("✓ Reactor module watch test passed")
+
+
+if __name__ == '__main__':
+    print("Running watch tests...\n")
+
+    try:
+        test_watchers_debounce_bursts()
+        test_incremental_compile_of_dependents()
+        test_failed_cycle_is_retried()
+        test_constant_change_recompiles_module()
+        test_javac_server_stays_warm()
+        test_cli_rejects_aggregator()
+        test_watch_module_of_reactor()
+
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
+        sys.exit(1)